@@ -1,22 +1,61 @@
 # src/api/dependencies.py
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import List, Optional
+from uuid import UUID
+from fastapi import HTTPException, Query, Response
 from fastapi.params import Depends
+from src.api.schemas import ChunkResponse, PageParams, Projection
 from src.infrastructure.repositories.base_repo import ILibraryRepository
 from src.infrastructure.repositories.in_memory_repo import InMemoryLibraryRepository
+from src.infrastructure.repositories.durable_repo import DurableLibraryRepository
 from src.services.library_service import LibraryService
 from src.services.document_service import DocumentService
 from src.services.chunk_service import ChunkService
 from src.services.search_service import SearchService
 from src.infrastructure.embeddings.base_client import IEmbeddingsClient
 from src.infrastructure.embeddings.cohere_client import CohereClient
-from src.infrastructure.config import COHERE_API_KEY
+from src.infrastructure.embeddings.cached_client import CachedEmbeddingsClient
+from src.infrastructure.embeddings.batching_client import (
+    MicroBatchingEmbeddingsClient,
+)
+from src.infrastructure.embeddings.dedup import DeduplicatingEmbeddingsClient
+from src.infrastructure.config import (
+    COHERE_API_KEY,
+    REPOSITORY_COPY_ON_WRITE,
+    REPOSITORY_DATA_DIR,
+    REPOSITORY_SNAPSHOT_EVERY,
+    REPOSITORY_FSYNC,
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_REQUESTS_PER_SECOND,
+    EMBEDDING_MAX_WAIT_MS,
+    SEARCH_EXECUTOR_WORKERS,
+)
 
 # ============================================================================
 # SINGLETON INSTANCES
 # ============================================================================
 
-library_repository: ILibraryRepository = InMemoryLibraryRepository()
+library_repository: ILibraryRepository
+if REPOSITORY_DATA_DIR:
+    library_repository = DurableLibraryRepository(
+        REPOSITORY_DATA_DIR,
+        snapshot_every=REPOSITORY_SNAPSHOT_EVERY,
+        fsync=REPOSITORY_FSYNC,
+    )
+else:
+    library_repository = InMemoryLibraryRepository(
+        copy_on_write=REPOSITORY_COPY_ON_WRITE
+    )
+
+# Dedicated to CPU-bound index searches, so they neither block the event loop
+# nor compete with the threadpool that serves the sync endpoints
+search_executor = ThreadPoolExecutor(
+    max_workers=SEARCH_EXECUTOR_WORKERS, thread_name_prefix="search"
+)
 
 # ============================================================================
 # DEPENDENCY PROVIDERS
@@ -27,9 +66,25 @@ library_repository: ILibraryRepository = InMemoryLibraryRepository()
 def get_embeddings_client() -> IEmbeddingsClient:
     """
     Provides a singleton Cohere embeddings client.
-    LRU Cache ensures we reuse the connection pool across requests.
+    LRU Cache ensures we reuse the connection pool across requests, and the
+    embedding cache it wraps is shared by every service. Each call embeds
+    its distinct texts once, and cache misses of concurrent requests are
+    coalesced into shared Cohere calls.
     """
-    return CohereClient(api_key=COHERE_API_KEY)
+    client: IEmbeddingsClient = CohereClient(
+        api_key=COHERE_API_KEY,
+        max_concurrency=EMBEDDING_MAX_CONCURRENCY,
+        max_requests_per_second=EMBEDDING_REQUESTS_PER_SECOND or None,
+    )
+    if EMBEDDING_MAX_WAIT_MS > 0:
+        client = MicroBatchingEmbeddingsClient(
+            client, max_wait_ms=EMBEDDING_MAX_WAIT_MS
+        )
+    return DeduplicatingEmbeddingsClient(
+        CachedEmbeddingsClient(
+            client, max_bytes=EMBEDDING_CACHE_MAX_BYTES, path=EMBEDDING_CACHE_PATH
+        )
+    )
 
 
 def get_library_service() -> LibraryService:
@@ -57,5 +112,84 @@ def get_search_service(
     embeddings_client: IEmbeddingsClient = Depends(get_embeddings_client),
 ) -> SearchService:
     return SearchService(
-        repository=library_repository, embeddings_client=embeddings_client
+        repository=library_repository,
+        embeddings_client=embeddings_client,
+        executor=search_executor,
     )
+
+
+def _parse_projection(
+    include_embedding: bool, fields: Optional[str], include_documents: bool
+) -> Projection:
+    selected = None
+    if fields is not None:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = selected - set(ChunkResponse.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown chunk fields: {', '.join(sorted(unknown))}.",
+            )
+    return Projection(
+        include_embedding=include_embedding,
+        fields=selected,
+        include_documents=include_documents,
+    )
+
+
+def get_projection(
+    include_embedding: bool = Query(
+        True, description="Include chunk embeddings in the response."
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated chunk fields to return, e.g. 'text,metadata'. "
+        "'id' is always returned.",
+    ),
+    include_documents: bool = Query(
+        True, description="Include the documents (and their chunks) of libraries."
+    ),
+) -> Projection:
+    """Response projection for the library, document and chunk endpoints."""
+    return _parse_projection(include_embedding, fields, include_documents)
+
+
+def get_search_projection(
+    include_embedding: bool = Query(
+        False, description="Include the embeddings of the matched chunks."
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated chunk fields to return, e.g. 'text,metadata'. "
+        "'id' is always returned.",
+    ),
+) -> Projection:
+    """Response projection for search results, which leave out embeddings by default."""
+    return _parse_projection(include_embedding, fields, True)
+
+
+# Largest page a client may request
+MAX_PAGE_SIZE = 1000
+
+
+def get_page_params(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Maximum number of items to return. All of them when omitted.",
+    ),
+    after: Optional[UUID] = Query(
+        None,
+        description="Cursor: return the items whose id comes after this one. "
+        "Pass the 'X-Next-Cursor' header of the previous page.",
+    ),
+) -> PageParams:
+    """Cursor pagination for the list endpoints."""
+    return PageParams(limit=limit, after=after)
+
+
+def set_next_cursor(response: Response, page: PageParams, ids: List[UUID]):
+    """Points the client at the next page when this one came back full."""
+    if page.limit is not None and len(ids) == page.limit:
+        response.headers["X-Next-Cursor"] = str(ids[-1])
@@ -3,7 +3,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response, status
 from src.api import schemas
 from src.services.chunk_service import ChunkService
-from src.api.dependencies import get_chunk_service
+from src.api.dependencies import (
+    get_chunk_service,
+    get_page_params,
+    get_projection,
+    set_next_cursor,
+)
 
 router = APIRouter()
 
@@ -12,34 +17,41 @@ router = APIRouter()
     "/libraries/{library_id}/documents/{document_id}/chunks",
     status_code=status.HTTP_201_CREATED,
     response_model=schemas.ChunkResponse,
+    response_model_exclude_unset=True,
 )
-def create_chunk(
+async def create_chunk(
     library_id: UUID,
     document_id: UUID,
     chunk_data: schemas.ChunkCreate,
     response: Response,
+    projection: schemas.Projection = Depends(get_projection),
     service: ChunkService = Depends(get_chunk_service),
 ):
-    chunk = service.create_chunk(library_id, document_id, chunk_data)
+    chunk = await service.acreate_chunk(library_id, document_id, chunk_data)
     response.headers["Location"] = (
         f"/libraries/{library_id}/documents/{document_id}/chunks/{chunk.uid}"
     )
-    return schemas.ChunkResponse.from_model(chunk, library_id, document_id)
+    return schemas.ChunkResponse.from_model(chunk, library_id, document_id, projection)
 
 
 @router.get(
     "/libraries/{library_id}/documents/{document_id}/chunks",
     status_code=status.HTTP_200_OK,
     response_model=List[schemas.ChunkResponse],
+    response_model_exclude_unset=True,
 )
 def list_chunks(
     library_id: UUID,
     document_id: UUID,
+    response: Response,
+    page: schemas.PageParams = Depends(get_page_params),
+    projection: schemas.Projection = Depends(get_projection),
     service: ChunkService = Depends(get_chunk_service),
 ):
-    chunks = service.list_chunks(library_id, document_id)
+    chunks = service.list_chunks(library_id, document_id, page.limit, page.after)
+    set_next_cursor(response, page, [chunk.uid for chunk in chunks])
     return [
-        schemas.ChunkResponse.from_model(chunk, library_id, document_id)
+        schemas.ChunkResponse.from_model(chunk, library_id, document_id, projection)
         for chunk in chunks
     ]
 
@@ -48,31 +60,35 @@ def list_chunks(
     "/libraries/{library_id}/documents/{document_id}/chunks/{chunk_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.ChunkResponse,
+    response_model_exclude_unset=True,
 )
 def get_chunk(
     library_id: UUID,
     document_id: UUID,
     chunk_id: UUID,
+    projection: schemas.Projection = Depends(get_projection),
     service: ChunkService = Depends(get_chunk_service),
 ):
     chunk = service.get_chunk(library_id, document_id, chunk_id)
-    return schemas.ChunkResponse.from_model(chunk, library_id, document_id)
+    return schemas.ChunkResponse.from_model(chunk, library_id, document_id, projection)
 
 
 @router.put(
     "/libraries/{library_id}/documents/{document_id}/chunks/{chunk_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.ChunkResponse,
+    response_model_exclude_unset=True,
 )
-def update_chunk(
+async def update_chunk(
     library_id: UUID,
     document_id: UUID,
     chunk_id: UUID,
     chunk_data: schemas.ChunkUpdate,
+    projection: schemas.Projection = Depends(get_projection),
     service: ChunkService = Depends(get_chunk_service),
 ):
-    chunk = service.update_chunk(library_id, document_id, chunk_id, chunk_data)
-    return schemas.ChunkResponse.from_model(chunk, library_id, document_id)
+    chunk = await service.aupdate_chunk(library_id, document_id, chunk_id, chunk_data)
+    return schemas.ChunkResponse.from_model(chunk, library_id, document_id, projection)
 
 
 @router.delete(
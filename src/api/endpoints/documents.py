@@ -5,7 +5,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response, status
 from src.api import schemas
 from src.services.document_service import DocumentService
-from src.api.dependencies import get_document_service
+from src.api.dependencies import (
+    get_document_service,
+    get_page_params,
+    get_projection,
+    set_next_cursor,
+)
 
 router = APIRouter()
 
@@ -14,58 +19,72 @@ router = APIRouter()
     "/libraries/{library_id}/documents",
     status_code=status.HTTP_201_CREATED,
     response_model=schemas.DocumentResponse,
+    response_model_exclude_unset=True,
 )
-def create_document(
+async def create_document(
     library_id: UUID,
     document_data: schemas.DocumentCreate,
     response: Response,
+    projection: schemas.Projection = Depends(get_projection),
     service: DocumentService = Depends(get_document_service),
 ):
-    document = service.create_document(library_id, document_data)
+    document = await service.acreate_document(library_id, document_data)
     response.headers["Location"] = f"/libraries/{library_id}/documents/{document.uid}"
-    return schemas.DocumentResponse.from_model(document, library_id)
+    return schemas.DocumentResponse.from_model(document, library_id, projection)
 
 
 @router.get(
     "/libraries/{library_id}/documents",
     status_code=status.HTTP_200_OK,
     response_model=List[schemas.DocumentResponse],
+    response_model_exclude_unset=True,
 )
 def list_documents(
     library_id: UUID,
+    response: Response,
+    page: schemas.PageParams = Depends(get_page_params),
+    projection: schemas.Projection = Depends(get_projection),
     service: DocumentService = Depends(get_document_service),
 ):
-    documents = service.list_documents(library_id)
-    return [schemas.DocumentResponse.from_model(doc, library_id) for doc in documents]
+    documents = service.list_documents(library_id, page.limit, page.after)
+    set_next_cursor(response, page, [doc.uid for doc in documents])
+    return [
+        schemas.DocumentResponse.from_model(doc, library_id, projection)
+        for doc in documents
+    ]
 
 
 @router.get(
     "/libraries/{library_id}/documents/{document_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.DocumentResponse,
+    response_model_exclude_unset=True,
 )
 def get_document(
     library_id: UUID,
     document_id: UUID,
+    projection: schemas.Projection = Depends(get_projection),
     service: DocumentService = Depends(get_document_service),
 ):
     document = service.get_document(library_id, document_id)
-    return schemas.DocumentResponse.from_model(document, library_id)
+    return schemas.DocumentResponse.from_model(document, library_id, projection)
 
 
 @router.put(
     "/libraries/{library_id}/documents/{document_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.DocumentResponse,
+    response_model_exclude_unset=True,
 )
 def update_document(
     library_id: UUID,
     document_id: UUID,
     document_data: schemas.DocumentUpdate,
+    projection: schemas.Projection = Depends(get_projection),
     service: DocumentService = Depends(get_document_service),
 ):
     document = service.update_document(library_id, document_id, document_data)
-    return schemas.DocumentResponse.from_model(document, library_id)
+    return schemas.DocumentResponse.from_model(document, library_id, projection)
 
 
 @router.delete(
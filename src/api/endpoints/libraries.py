@@ -5,56 +5,79 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response, status
 from src.api import schemas
 from src.services.library_service import LibraryService
-from src.api.dependencies import get_library_service
+from src.api.dependencies import (
+    get_library_service,
+    get_page_params,
+    get_projection,
+    set_next_cursor,
+)
 
 router = APIRouter()
 
 
 @router.post(
-    "/", status_code=status.HTTP_201_CREATED, response_model=schemas.LibraryResponse
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=schemas.LibraryResponse,
+    response_model_exclude_unset=True,
 )
 def create_library(
     library_data: schemas.LibraryCreate,
     response: Response,  # Inject Response to set headers
+    projection: schemas.Projection = Depends(get_projection),
     service: LibraryService = Depends(get_library_service),
 ):
     library = service.create_library(library_data)
     response.headers["Location"] = f"/libraries/{library.uid}"
-    return schemas.LibraryResponse.from_model(library)
+    return schemas.LibraryResponse.from_model(library, projection)
 
 
 @router.get(
-    "/", status_code=status.HTTP_200_OK, response_model=List[schemas.LibraryResponse]
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=List[schemas.LibraryResponse],
+    response_model_exclude_unset=True,
 )
-def list_libraries(service: LibraryService = Depends(get_library_service)):
-    libraries = service.list_libraries()
-    return [schemas.LibraryResponse.from_model(lib) for lib in libraries]
+def list_libraries(
+    response: Response,
+    page: schemas.PageParams = Depends(get_page_params),
+    projection: schemas.Projection = Depends(get_projection),
+    service: LibraryService = Depends(get_library_service),
+):
+    libraries = service.list_libraries(page.limit, page.after)
+    set_next_cursor(response, page, [lib.uid for lib in libraries])
+    return [schemas.LibraryResponse.from_model(lib, projection) for lib in libraries]
 
 
 @router.get(
     "/{library_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.LibraryResponse,
+    response_model_exclude_unset=True,
 )
 def get_library(
-    library_id: UUID, service: LibraryService = Depends(get_library_service)
+    library_id: UUID,
+    projection: schemas.Projection = Depends(get_projection),
+    service: LibraryService = Depends(get_library_service),
 ):
     library = service.get_library(library_id)
-    return schemas.LibraryResponse.from_model(library)
+    return schemas.LibraryResponse.from_model(library, projection)
 
 
 @router.put(
     "/{library_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.LibraryResponse,
+    response_model_exclude_unset=True,
 )
 def update_library(
     library_id: UUID,
     library_data: schemas.LibraryUpdate,
+    projection: schemas.Projection = Depends(get_projection),
     service: LibraryService = Depends(get_library_service),
 ):
     library = service.update_library(library_id, library_data)
-    return schemas.LibraryResponse.from_model(library)
+    return schemas.LibraryResponse.from_model(library, projection)
 
 
 @router.delete("/{library_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, status, Response
 
 from src.api import schemas
 from src.services.search_service import SearchService
-from src.api.dependencies import get_search_service
+from src.api.dependencies import get_search_service, get_search_projection
 
 router = APIRouter()
 
@@ -26,7 +26,7 @@ def create_library_index(
     """
     Creates (or recreates) a named vector index for a library.
 
-    - **index_type**: 'avl' and 'lsh' are currently supported.
+    - **index_type**: 'flat', 'avl', 'lsh', 'hnsw', 'ivf' and 'pq' are currently supported.
     - **metric**: 'cosine' (default) or 'euclidean'.
     """
     service.create_index(library_id, index_name, index_config)
@@ -91,22 +91,58 @@ def list_all_library_indices(
     "/libraries/{library_id}/search/{index_name}",
     status_code=status.HTTP_200_OK,
     response_model=List[schemas.SearchResult],
+    response_model_exclude_unset=True,
 )
-def search_in_library(
+async def search_in_library(
     library_id: UUID,
     index_name: str,
     query: schemas.SearchQuery,
+    projection: schemas.Projection = Depends(get_search_projection),
     service: SearchService = Depends(get_search_service),
 ):
     """
     Performs a k-NN vector search using a specific named index.
     You can provide either 'query_embedding' (raw vector) or 'query_text' (to be embedded by the backend).
+    Chunk embeddings are left out of the results unless 'include_embedding=true'.
+    'filter' restricts the results to chunks whose metadata matches it.
+    'hybrid' also ranks 'query_text' by keywords (BM25) and fuses both rankings.
     """
-    results = service.search_chunks(
+    results = await service.asearch_chunks(
         library_id=library_id,
         index_name=index_name,
         query_embedding=query.query_embedding,
         k=query.k,
         query_text=query.query_text,
+        ef_search=query.ef_search,
+        nprobe=query.nprobe,
+        num_probes=query.num_probes,
+        projection=projection,
+        metadata_filter=query.filter,
+        hybrid=query.hybrid,
     )
     return results
+
+
+@router.post(
+    "/libraries/{library_id}/search/{index_name}/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=List[List[schemas.SearchResult]],
+    response_model_exclude_unset=True,
+)
+async def batch_search_in_library(
+    library_id: UUID,
+    index_name: str,
+    batch: schemas.BatchSearchQuery,
+    projection: schemas.Projection = Depends(get_search_projection),
+    service: SearchService = Depends(get_search_service),
+):
+    """
+    Performs many k-NN searches against one named index in a single request.
+    Returns one result list per query, in the order of 'queries'.
+    """
+    return await service.asearch_chunks_batch(
+        library_id=library_id,
+        index_name=index_name,
+        queries=batch.queries,
+        projection=projection,
+    )
@@ -1,14 +1,15 @@
 # src/api/schemas.py
 
 from pydantic import BaseModel, Field, model_validator
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from uuid import UUID
 
 # Import core domain models that response schemas will be built FROM
-from src.core.models import Chunk, Document, Library, IndexMetadata
+from src.core.models import Chunk, Document, Library, IndexMetadata, Embedding
 
 # Import core enums that are used in request schemas
-from src.core.indexing.enums import IndexType, Metric
+from src.core.indexing.enums import IndexType, Metric, Quantization, FusionMethod
+from src.core.indexing.metadata_index import FilterExpression
 
 API_MODEL_CONFIG = {"from_attributes": True}
 
@@ -22,7 +23,7 @@ class IndexCreate(BaseModel):
 
     index_type: IndexType = Field(
         default=IndexType.AVL,
-        description="The type of index to build ('avl' for dynamic exact search, 'lsh' for approximate search).",
+        description="The type of index to build ('flat' for fast exact search, 'avl' for dynamic exact search, 'lsh', 'hnsw' or 'ivf' for approximate search, 'pq' for compressed approximate search).",
     )
 
     metric: Metric = Field(
@@ -33,6 +34,7 @@ class IndexCreate(BaseModel):
     num_bits: int = Field(
         default=8,
         gt=0,
+        le=64,
         description="Bits for LSH. More bits = higher precision, lower recall.",
     )
 
@@ -42,6 +44,66 @@ class IndexCreate(BaseModel):
         description="Tables for LSH. More tables = higher recall, more memory.",
     )
 
+    num_probes: int = Field(
+        default=0,
+        ge=0,
+        description="Default extra LSH buckets probed per table (multi-probe). Can be overridden per search.",
+    )
+
+    m: int = Field(
+        default=16,
+        ge=2,
+        description="Neighbours per node for HNSW (2*m on the bottom layer). More = higher recall, more memory.",
+    )
+
+    ef_construction: int = Field(
+        default=200,
+        gt=0,
+        description="Beam width while building HNSW. More = better graph quality, slower inserts.",
+    )
+
+    ef_search: int = Field(
+        default=50,
+        gt=0,
+        description="Default beam width for HNSW queries. Can be overridden per search.",
+    )
+
+    n_lists: int = Field(
+        default=64,
+        gt=0,
+        description="Number of k-means partitions (posting lists) for IVF.",
+    )
+
+    nprobe: int = Field(
+        default=8,
+        gt=0,
+        description="Default number of IVF lists scanned per query. Can be overridden per search.",
+    )
+
+    num_subspaces: int = Field(
+        default=8,
+        gt=0,
+        description="PQ sub-vectors per vector (bytes stored per vector). More = more accurate, more memory.",
+    )
+
+    num_centroids: int = Field(
+        default=256,
+        gt=0,
+        le=256,
+        description="PQ codebook size per subspace. At most 256 so codes fit in one byte.",
+    )
+
+    quantization: Quantization = Field(
+        default=Quantization.NONE,
+        description="Stored vector format: 'none' (float32), 'float16' or 'int8' (per-dimension min/max calibration). Ignored by 'pq'.",
+    )
+
+    rerank_factor: int = Field(
+        default=0,
+        ge=0,
+        description="If > 0, PQ and quantized indices re-rank the top k * rerank_factor candidates with exact scores.",
+    )
+
     seed: Optional[int] = Field(
         default=None, description="Random seed for reproducible index creation."
     )
@@ -53,6 +115,7 @@ class IndexConfigResponse(BaseModel):
     model_config = API_MODEL_CONFIG
     index_type: IndexType
     metric: Metric
+    quantization: Quantization = Quantization.NONE
 
 
 class IndexStatusResponse(BaseModel):
@@ -72,6 +135,53 @@ class AllIndicesStatusResponse(BaseModel):
     indices: Dict[str, IndexStatusResponse]
 
 
+# ============================================================================
+# RESPONSE PROJECTION
+# ============================================================================
+
+
+class Projection(BaseModel):
+    """
+    Which parts of chunks, documents and libraries a response carries. Built
+    from query parameters (see `dependencies.get_projection`). Left-out fields
+    stay unset on the response models, and the routes that accept a
+    projection serialize with `response_model_exclude_unset`.
+    """
+
+    include_embedding: bool = True
+    # Chunk fields to return; None returns every field ('id' is always kept)
+    fields: Optional[Set[str]] = None
+    include_documents: bool = True
+
+    def chunk_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fields is not None:
+            return {
+                name: value
+                for name, value in values.items()
+                if name == "id" or name in self.fields
+            }
+        if not self.include_embedding:
+            values.pop("embedding")
+        return values
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+
+class PageParams(BaseModel):
+    """
+    Cursor pagination of the list endpoints, built from query parameters (see
+    `dependencies.get_page_params`). Items are ordered by id; `after` is the id
+    of the last item of the previous page. Without `limit` everything after
+    the cursor is returned.
+    """
+
+    limit: Optional[int] = Field(None, gt=0)
+    after: Optional[UUID] = None
+
+
 # ============================================================================
 # CHUNK SCHEMAS
 # ============================================================================
@@ -90,22 +200,33 @@ class ChunkUpdate(BaseModel):
 class ChunkResponse(BaseModel):
     model_config = API_MODEL_CONFIG
     id: UUID
-    document_id: UUID
-    library_id: UUID
-    text: str
-    embedding: Optional[List[float]] = None
-    metadata: Dict[str, Any]
+    # Optional so a projection can leave them out
+    document_id: Optional[UUID] = None
+    library_id: Optional[UUID] = None
+    text: Optional[str] = None
+    # Kept as the chunk's float32 array; converted to a list only in the JSON response
+    embedding: Optional[Embedding] = None
+    metadata: Optional[Dict[str, Any]] = None
 
     @classmethod
-    def from_model(cls, chunk: Chunk, library_id: UUID, document_id: UUID):
-        return cls(
-            id=chunk.uid,
-            document_id=document_id,
-            library_id=library_id,
-            text=chunk.text,
-            embedding=chunk.embedding,
-            metadata=chunk.metadata,
-        )
+    def from_model(
+        cls,
+        chunk: Chunk,
+        library_id: UUID,
+        document_id: UUID,
+        projection: Optional[Projection] = None,
+    ):
+        values = {
+            "id": chunk.uid,
+            "document_id": document_id,
+            "library_id": library_id,
+            "text": chunk.text,
+            "embedding": chunk.embedding,
+            "metadata": chunk.metadata,
+        }
+        if projection is not None:
+            values = projection.chunk_values(values)
+        return cls(**values)
 
 
 # ============================================================================
@@ -130,9 +251,11 @@ class DocumentResponse(BaseModel):
     chunks: Dict[UUID, ChunkResponse]
 
     @classmethod
-    def from_model(cls, doc: Document, library_id: UUID):
+    def from_model(
+        cls, doc: Document, library_id: UUID, projection: Optional[Projection] = None
+    ):
         chunks_response = {
-            uid: ChunkResponse.from_model(chunk, library_id, doc.uid)
+            uid: ChunkResponse.from_model(chunk, library_id, doc.uid, projection)
             for uid, chunk in doc.chunks.items()
         }
         return cls(
@@ -160,12 +283,16 @@ class LibraryResponse(BaseModel):
     model_config = API_MODEL_CONFIG
     id: UUID
     metadata: Dict[str, Any]
-    documents: Dict[UUID, DocumentResponse]
+    # Left unset (and out of the response) when documents are not requested
+    documents: Optional[Dict[UUID, DocumentResponse]] = None
 
     @classmethod
-    def from_model(cls, lib: Library):
+    def from_model(cls, lib: Library, projection: Optional[Projection] = None):
+        if projection is not None and not projection.include_documents:
+            return cls(id=lib.uid, metadata=lib.metadata)
+
         docs_response = {
-            uid: DocumentResponse.from_model(doc, lib.uid)
+            uid: DocumentResponse.from_model(doc, lib.uid, projection)
             for uid, doc in lib.documents.items()
         }
         return cls(id=lib.uid, metadata=lib.metadata, documents=docs_response)
@@ -176,11 +303,50 @@ class LibraryResponse(BaseModel):
 # ============================================================================
 
 
+class HybridSearch(BaseModel):
+    """Ranks `query_text` with BM25 next to the vector search and fuses both rankings."""
+
+    fusion: FusionMethod = Field(
+        FusionMethod.RRF,
+        description="'rrf' (reciprocal rank fusion) or 'weighted' (weighted sum of min-max normalized scores).",
+    )
+    vector_weight: float = Field(
+        0.5,
+        ge=0.0,
+        le=1.0,
+        description="Weight of the vector ranking; the BM25 ranking gets the rest.",
+    )
+
+
 class SearchQuery(BaseModel):
     # Accepts either text or embedding for search
     query_text: Optional[str] = None
     query_embedding: Optional[List[float]] = None
     k: int = Field(3, gt=0)
+    ef_search: Optional[int] = Field(
+        None,
+        gt=0,
+        description="HNSW beam width for this query. Higher = better recall, slower search.",
+    )
+    nprobe: Optional[int] = Field(
+        None,
+        gt=0,
+        description="IVF lists scanned for this query. Higher = better recall, slower search.",
+    )
+    num_probes: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Extra LSH buckets probed per table for this query. Higher = better recall, slower search.",
+    )
+    filter: Optional[FilterExpression] = Field(
+        None,
+        description="Only chunks whose metadata matches are returned, e.g. "
+        '{"lang": {"$in": ["en", "fr"]}, "year": {"$gte": 2020}}.',
+    )
+    hybrid: Optional[HybridSearch] = Field(
+        None,
+        description="Set to also match 'query_text' by keywords (BM25). Similarities are then fused scores.",
+    )
 
     @model_validator(mode="after")
     def check_input_exists(self):
@@ -188,9 +354,15 @@ class SearchQuery(BaseModel):
             raise ValueError(
                 "Either 'query_text' or 'query_embedding' must be provided."
             )
+        if self.hybrid is not None and not self.query_text:
+            raise ValueError("Hybrid search requires 'query_text'.")
         return self
 
 
+class BatchSearchQuery(BaseModel):
+    queries: List[SearchQuery] = Field(..., min_length=1, max_length=1000)
+
+
 class SearchResult(BaseModel):
     chunk: ChunkResponse
     similarity: float
@@ -1,22 +1,25 @@
 # src/core/indexing/avl_index.py
 
 from uuid import UUID
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Mapping, Tuple, Optional
 import numpy as np
 import heapq
 
 from src.core.models import Chunk
 from .base_index import VectorIndex
-from .enums import IndexType, Metric
+from .enums import IndexType, Metric, Quantization
+from .metadata_index import ChunkFilter
+from .quantization import ScalarQuantizer, rerank_exact
+from .vector_store import VectorStore
 
 
 class AvlNode:
     """A node in the AVL Tree."""
 
-    def __init__(self, chunk: Chunk, vector: np.ndarray):
+    def __init__(self, chunk: Chunk, row: int):
         self.key: UUID = chunk.uid  # The key for sorting is the chunk's UUID
         self.chunk: Chunk = chunk
-        self.vector: np.ndarray = vector
+        self.row: int = row  # The node's vector in the index's VectorStore
         self.height: int = 1
         self.left: Optional[AvlNode] = None
         self.right: Optional[AvlNode] = None
@@ -28,12 +31,28 @@ class AvlIndex(VectorIndex):
     The tree is balanced based on the chunk UUIDs, providing O(log N) for
     additions, updates, and deletions.
     Search requires a full O(N) traversal of all nodes.
+
+    Node vectors live in a VectorStore, in the configured `quantization`
+    format; nodes only hold their row.
     """
 
-    def __init__(self, metric: Metric = Metric.COSINE):
+    def __init__(
+        self,
+        metric: Metric = Metric.COSINE,
+        quantization: Quantization = Quantization.NONE,
+        rerank_factor: int = 0,
+    ):
+        """
+        Args:
+        quantization: Stored vector format ('none', 'float16' or 'int8').
+        rerank_factor: If > 0 and vectors are quantized, re-rank the top k * rerank_factor results exactly.
+        """
         self._metric = metric
+        self._quantizer = ScalarQuantizer(quantization)
+        self._rerank_factor = rerank_factor
         self.root: Optional[AvlNode] = None
         self._vector_count = 0
+        self._vectors = VectorStore(self._quantizer.dtype)
 
     @property
     def index_type(self) -> IndexType:
@@ -50,57 +69,110 @@ class AvlIndex(VectorIndex):
     def build(self, chunks: List[Chunk]):
         self.root = None
         self._vector_count = 0
-        for chunk in chunks:
-            if chunk.embedding:
-                self.insert(chunk)
+        self._vectors.clear()
+
+        self._quantizer.reset()
+
+        valid_chunks = list(
+            {c.uid: c for c in chunks if c.embedding is not None}.values()
+        )
+        if not valid_chunks:
+            return
+
+        vectors = np.array(
+            [self._prepare_vector(c.embedding) for c in valid_chunks],
+            dtype=np.float32,
+        )
+        # Calibrate the quantizer on the whole batch before encoding
+        self._quantizer.fit(vectors)
+        rows = self._vectors.put_many(valid_chunks, self._quantizer.encode(vectors))
+
+        for chunk, row in zip(valid_chunks, rows.tolist()):
+            self.root = self._insert_node(self.root, chunk, row)
 
     def insert(self, chunk: Chunk):
         """Inserts a single chunk into the tree."""
-        if not chunk.embedding:
+        if chunk.embedding is None:
             return
 
-        vector = np.array(chunk.embedding, dtype=np.float32)
-        if self.metric == Metric.COSINE:
-            norm = np.linalg.norm(vector)
-            if norm > 0:
-                vector /= norm
-
-        self.root = self._insert_node(self.root, chunk, vector)
+        vector = self._quantizer.encode(self._prepare_vector(chunk.embedding))
+        row = self._vectors.put(chunk, vector)
+        self.root = self._insert_node(self.root, chunk, row)
 
     def delete(self, chunk_id: UUID):
         """Deletes a single chunk from the tree by its UUID."""
         if self.root:
             self.root = self._delete_node(self.root, chunk_id)
+            self._vectors.delete(chunk_id)
 
-    def search(self, query_embedding: List[float], k: int) -> List[Tuple[Chunk, float]]:
+    def search(
+        self, query_embedding: List[float], k: int, **search_params
+    ) -> List[Tuple[Chunk, float]]:
         """
         Performs an exhaustive search over all nodes in the tree using a Heap.
 
         This implementation uses a Priority Queue (heapq) to maintain only the
         top-k candidates during traversal. This is memory efficient O(k) but
         less CPU efficient than fully vectorized NumPy operations for large datasets.
+
+        With quantized storage and a `rerank_factor`, the heap keeps the top
+        k * rerank_factor approximate candidates, which are then re-ranked exactly.
         """
         if self.root is None:
             return []
+        return self._search(query_embedding, k)
+
+    def search_filtered(
+        self,
+        query_embedding: List[float],
+        k: int,
+        chunk_filter: ChunkFilter,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Exact filtered search. The traversal skips the nodes that do not
+        match; selective filters look up the rows of the matching chunks
+        instead of traversing the tree at all.
+        """
+        if self.root is None or not len(chunk_filter):
+            return []
 
-        query_vector = np.array(query_embedding, dtype=np.float32)
+        if chunk_filter.prefilter:
+            nodes = []
+            for chunk in chunk_filter.chunks():
+                row = self._vectors.row(chunk.uid)
+                if row is not None:
+                    nodes.append((chunk, row))
+            return self._search(query_embedding, k, nodes=nodes)
+        return self._search(query_embedding, k, chunk_filter=chunk_filter)
+
+    def _search(
+        self,
+        query_embedding: List[float],
+        k: int,
+        chunk_filter: Optional[ChunkFilter] = None,
+        nodes: Optional[List[Tuple[Chunk, int]]] = None,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Top-k over the whole tree, over its nodes in `chunk_filter`, or over
+        the given (chunk, row) `nodes`.
+        """
 
-        # Pre-process query vector based on metric
-        if self.metric == Metric.COSINE:
-            norm = np.linalg.norm(query_vector)
-            if norm > 0:
-                query_vector /= norm
+        final_k = k
+        rerank = self._quantizer.is_lossy and self._rerank_factor > 0
+        if rerank:
+            k = k * self._rerank_factor
+
+        query_vector = self._prepare_vector(query_embedding)
+        prepared_query = self._quantizer.prepare_query(query_vector)
+        vectors = self._vectors.vectors
 
         # Min-heap to store tuples of (score_priority, chunk).
         # Python's heapq is a min-heap (pops the smallest value).
         candidates_heap = []
 
-        def _visit_node(node: Optional[AvlNode]):
-            if not node:
-                return
-
-            # 1. Calculate score for the current node
-            vector = node.vector
+        def _score(chunk: Chunk, row: int):
+            # 1. Calculate score for the node
 
             if self.metric == Metric.COSINE:
                 # Cosine Similarity (Dot product of normalized vectors).
@@ -108,10 +180,10 @@ class AvlIndex(VectorIndex):
                 # We want to keep the K largest values.
                 # If we push the score directly, heappop will remove the SMALLEST score.
                 # This leaves us with the largest scores in the heap.
-                score = float(np.dot(vector, query_vector))
+                score = float(self._quantizer.dot(vectors[row], prepared_query))
 
                 # chunk.uid as tiebreaker
-                heapq.heappush(candidates_heap, (score, node.chunk.uid, node.chunk))
+                heapq.heappush(candidates_heap, (score, chunk.uid, chunk))
 
             elif self.metric == Metric.EUCLIDEAN:
                 # Euclidean Distance.
@@ -120,19 +192,36 @@ class AvlIndex(VectorIndex):
                 # We need to simulate a Max-Heap to pop the LARGEST distance (the worst candidate).
                 # We store -distance. The "smallest" number is the one with largest magnitude (e.g. -10 < -2).
                 # heappop will remove -10 (distance 10), keeping -2 (distance 2).
+                vector = self._quantizer.decode(vectors[row])
                 dist = float(np.linalg.norm(vector - query_vector))
-                heapq.heappush(candidates_heap, (-dist, node.chunk.uid, node.chunk))
+                heapq.heappush(candidates_heap, (-dist, chunk.uid, chunk))
 
             # 2. Maintain heap size
             if len(candidates_heap) > k:
                 heapq.heappop(candidates_heap)
 
+        def _visit_node(node: Optional[AvlNode]):
+            if not node:
+                return
+
+            # Non-matching nodes are traversed but not scored
+            if chunk_filter is None or node.key in chunk_filter:
+                _score(node.chunk, node.row)
+
             # 3. Continue traversal
             _visit_node(node.left)
             _visit_node(node.right)
 
-        # Start the recursive traversal
-        _visit_node(self.root)
+        if nodes is None:
+            # Start the recursive traversal
+            _visit_node(self.root)
+        else:
+            for chunk, row in nodes:
+                _score(chunk, row)
+
+        if rerank:
+            candidates = [chunk for _, _, chunk in candidates_heap]
+            return rerank_exact(query_embedding, candidates, final_k, self.metric)
 
         # 4. Sort and Format Results
         results = []
@@ -153,22 +242,64 @@ class AvlIndex(VectorIndex):
 
         return results
 
+    # --- Persistence ---
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "metric": self._metric,
+            "quantization": self._quantizer.mode,
+            "rerank_factor": self._rerank_factor,
+        }
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Only the vector store is written; the tree is rebuilt from the sorted keys."""
+        arrays = self._quantizer.dump_arrays()
+        arrays.update(self._vectors.dump_arrays())
+        return {}, arrays
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, Chunk],
+    ):
+        self._quantizer.restore_arrays(arrays)
+        self._vectors.restore_arrays(arrays, chunks)
+
+        nodes = sorted(
+            ((self._vectors.chunk(row), row) for row in arrays.get("rows", ())),
+            key=lambda node: node[0].uid,
+        )
+        self.root = self._build_balanced(nodes, 0, len(nodes))
+        self._vector_count = len(nodes)
+
+    def _build_balanced(
+        self, nodes: List[Tuple[Chunk, int]], start: int, end: int
+    ) -> Optional[AvlNode]:
+        """Builds a perfectly balanced subtree from key-sorted nodes [start, end) in O(n)."""
+        if start >= end:
+            return None
+        mid = (start + end) // 2
+        node = AvlNode(*nodes[mid])
+        node.left = self._build_balanced(nodes, start, mid)
+        node.right = self._build_balanced(nodes, mid + 1, end)
+        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+        return node
+
     # --- AVL Tree Core Logic ---
 
-    def _insert_node(
-        self, node: Optional[AvlNode], chunk: Chunk, vector: np.ndarray
-    ) -> AvlNode:
+    def _insert_node(self, node: Optional[AvlNode], chunk: Chunk, row: int) -> AvlNode:
         # 1. Standard Binary Search Tree insertion
         if not node:
             self._vector_count += 1
-            return AvlNode(chunk, vector)
+            return AvlNode(chunk, row)
         elif chunk.uid < node.key:
-            node.left = self._insert_node(node.left, chunk, vector)
+            node.left = self._insert_node(node.left, chunk, row)
         elif chunk.uid > node.key:
-            node.right = self._insert_node(node.right, chunk, vector)
+            node.right = self._insert_node(node.right, chunk, row)
         else:  # Key already exists, perform an update
             node.chunk = chunk
-            node.vector = vector
+            node.row = row
             return node
 
         # 2. Update height of the ancestor node
@@ -242,7 +373,7 @@ class AvlIndex(VectorIndex):
             temp = self._get_min_value_node(node.right)
             node.key = temp.key
             node.chunk = temp.chunk
-            node.vector = temp.vector
+            node.row = temp.row
 
             node.right = self._delete_node(node.right, temp.key)
 
@@ -279,11 +410,11 @@ class AvlIndex(VectorIndex):
         return self._get_height(node.left) - self._get_height(node.right) if node else 0
 
     def _in_order_traversal(
-        self, node: Optional[AvlNode], result_list: List[Tuple[Chunk, np.ndarray]]
+        self, node: Optional[AvlNode], result_list: List[Tuple[Chunk, int]]
     ):
         """Recursively traverses the tree to collect all nodes."""
         if not node:
             return
         self._in_order_traversal(node.left, result_list)
-        result_list.append((node.chunk, node.vector))
+        result_list.append((node.chunk, node.row))
         self._in_order_traversal(node.right, result_list)
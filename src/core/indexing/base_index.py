@@ -1,13 +1,24 @@
 # src/core/indexing/base_index.py
 
+import json
+import math
+import os
 from abc import ABC, abstractmethod
-from typing import List, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, TYPE_CHECKING
 from uuid import UUID
 
+import numpy as np
+
 from .enums import IndexType, Metric
+from .quantization import rerank_exact
 
 if TYPE_CHECKING:
     from src.core.models import Chunk
+    from .metadata_index import ChunkFilter
+
+# Bumped whenever the on-disk layout written by `VectorIndex.save` changes
+INDEX_FORMAT_VERSION = 1
+_HEADER_FILE = "header.json"
 
 
 class VectorIndex(ABC):
@@ -17,13 +28,78 @@ class VectorIndex(ABC):
         """Builds the index from a list of chunks."""
         pass
 
+    @abstractmethod
+    def insert(self, chunk: "Chunk"):
+        """Inserts a single chunk, replacing any existing entry with the same uid."""
+        pass
+
+    @abstractmethod
+    def delete(self, chunk_id: UUID):
+        """Removes a single chunk by its uid. Unknown uids are ignored."""
+        pass
+
     @abstractmethod
     def search(
-        self, query_embedding: List[float], k: int
+        self, query_embedding: List[float], k: int, **search_params
     ) -> List[Tuple["Chunk", float]]:
-        """Searches the index for the k-nearest neighbors."""
+        """
+        Searches the index for the k-nearest neighbors.
+
+        `search_params` carries optional per-query tuning knobs (e.g. `ef_search`).
+        Each index reads the knobs it understands and ignores the rest.
+        """
         pass
 
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int, **search_params
+    ) -> List[List[Tuple["Chunk", float]]]:
+        """
+        Searches many queries at once and returns one result list per query.
+
+        The default runs `search` per query. Indices that can score a whole
+        batch in one matrix product override it.
+        """
+        return [self.search(query, k, **search_params) for query in query_embeddings]
+
+    def search_filtered(
+        self,
+        query_embedding: List[float],
+        k: int,
+        chunk_filter: "ChunkFilter",
+        **search_params,
+    ) -> List[Tuple["Chunk", float]]:
+        """
+        Searches only the chunks in `chunk_filter`.
+
+        Selective filters are answered by exactly scoring the matching chunks
+        (pre-filter). Otherwise the regular search over-fetches by the inverse
+        of the selectivity and drops what does not match, doubling the fetch
+        until k results pass or the index is exhausted (post-filter). Indices
+        that can filter inside their own scan or candidate generation override
+        this.
+        """
+        if k <= 0 or not len(chunk_filter) or self.vector_count == 0:
+            return []
+        if chunk_filter.prefilter:
+            return self._search_prefiltered(query_embedding, k, chunk_filter)
+
+        fetch = min(math.ceil(k / chunk_filter.selectivity), self.vector_count)
+        while True:
+            results = self.search(query_embedding, fetch, **search_params)
+            matches = [
+                (chunk, score) for chunk, score in results if chunk.uid in chunk_filter
+            ]
+            if len(matches) >= k or len(results) < fetch or fetch >= self.vector_count:
+                return matches[:k]
+            fetch = min(fetch * 2, self.vector_count)
+
+    def _search_prefiltered(
+        self, query_embedding: List[float], k: int, chunk_filter: "ChunkFilter"
+    ) -> List[Tuple["Chunk", float]]:
+        """Exact scores of the matching chunks that have an embedding."""
+        candidates = [c for c in chunk_filter.chunks() if c.embedding is not None]
+        return rerank_exact(query_embedding, candidates, k, self.metric)
+
     @property
     @abstractmethod
     def index_type(self) -> IndexType:
@@ -41,3 +117,147 @@ class VectorIndex(ABC):
     def vector_count(self) -> int:
         """The number of vectors currently in the index."""
         pass
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        """
+        Writes the index to the directory `path`.
+
+        The layout is a `header.json` (format version, index type, constructor
+        parameters and scalar state) plus one `.npy` file per array: the
+        contiguous vector blocks in their stored format, and the index's own
+        structures (LSH planes and signatures, graph adjacency, centroids...).
+        Chunks are referenced by uid. The header is written last, so a
+        directory without one is an incomplete save.
+        """
+        state, arrays = self._dump_state()
+        os.makedirs(path, exist_ok=True)
+
+        for name, array in arrays.items():
+            with open(os.path.join(path, f"{name}.npy"), "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+                f.flush()
+                os.fsync(f.fileno())
+
+        header = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "index_type": self.index_type.value,
+            "params": self._params(),
+            "state": state,
+            "arrays": sorted(arrays),
+        }
+        tmp_path = os.path.join(path, _HEADER_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(header, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(path, _HEADER_FILE))
+
+    @classmethod
+    def load(cls, path: str, chunks: Mapping[UUID, "Chunk"]) -> "VectorIndex":
+        """
+        Opens an index written by `save`. `chunks` resolves the saved uids to
+        the caller's Chunk objects.
+
+        Arrays are memory-mapped copy-on-write (`mmap_mode="c"`): opening is
+        cheap, pages are read on first use and shared through the page cache
+        by every process mapping the same files, and later inserts or deletes
+        stay private to this process.
+        """
+        header = read_index_header(path)
+        index = cls(**header["params"])
+        if index.index_type.value != header["index_type"]:
+            raise ValueError(
+                f"Index at '{path}' is a '{header['index_type']}' index, "
+                f"not '{index.index_type.value}'."
+            )
+
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
+            for name in header["arrays"]
+        }
+        index._restore_state(header["state"], arrays, chunks)
+        return index
+
+    def _params(self) -> Dict[str, Any]:
+        """Constructor arguments that recreate an empty index with this configuration."""
+        raise NotImplementedError(f"{type(self).__name__} does not support save().")
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """JSON-serializable scalar state, and the arrays to write."""
+        raise NotImplementedError(f"{type(self).__name__} does not support save().")
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, "Chunk"],
+    ):
+        """Inverse of `_dump_state` on an index fresh from `_params`."""
+        raise NotImplementedError(f"{type(self).__name__} does not support load().")
+
+    # --- Internal helpers ---
+
+    def _prepare_vector(self, embedding: List[float]) -> np.ndarray:
+        """The embedding as float32, unit-normalized under the cosine metric."""
+        vector = np.array(embedding, dtype=np.float32)
+        if self.metric == Metric.COSINE:
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector /= norm
+        return vector
+
+
+def read_index_header(path: str) -> Dict[str, Any]:
+    """Reads and validates the header of an index directory written by `save`."""
+    with open(os.path.join(path, _HEADER_FILE)) as f:
+        header = json.load(f)
+    if header.get("format_version") != INDEX_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported index format version {header.get('format_version')} "
+            f"at '{path}' (expected {INDEX_FORMAT_VERSION})."
+        )
+    return header
+
+
+def uids_to_array(uids: Iterable[UUID]) -> np.ndarray:
+    """Packs uids into an (n, 16) uint8 array."""
+    packed = np.frombuffer(b"".join(uid.bytes for uid in uids), dtype=np.uint8)
+    return packed.reshape(-1, 16)
+
+
+def top_k_rows(order_keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    Row ids of the k smallest keys, sorted ascending. np.argpartition selects
+    them without sorting all N keys.
+    """
+    if k >= len(order_keys):
+        return np.argsort(order_keys, kind="stable")
+
+    candidates = np.argpartition(order_keys, k - 1)[:k]
+    return candidates[np.argsort(order_keys[candidates], kind="stable")]
+
+
+def top_k_rows_batch(order_keys: np.ndarray, k: int) -> np.ndarray:
+    """Row-wise `top_k_rows` for a (Q, N) key matrix. Returns (Q, min(k, N))."""
+    if k >= order_keys.shape[1]:
+        return np.argsort(order_keys, axis=1, kind="stable")
+
+    candidates = np.argpartition(order_keys, k - 1, axis=1)[:, :k]
+    candidate_keys = np.take_along_axis(order_keys, candidates, axis=1)
+    order = np.argsort(candidate_keys, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def resolve_chunks(uids: np.ndarray, chunks: Mapping[UUID, "Chunk"]) -> List["Chunk"]:
+    """Maps an (n, 16) uid array back to Chunk objects, in order."""
+    data = uids.tobytes()
+    resolved = []
+    for offset in range(0, len(data), 16):
+        uid = UUID(bytes=data[offset : offset + 16])
+        chunk = chunks.get(uid)
+        if chunk is None:
+            raise ValueError(f"Saved index references unknown chunk {uid}.")
+        resolved.append(chunk)
+    return resolved
@@ -0,0 +1,192 @@
+# src/core/indexing/bitmap.py
+
+from typing import Dict, Iterable, Iterator, Set, Union
+import numpy as np
+
+# Rows are split by their high 16 bits into containers of 65536 rows
+_CONTAINER_BITS = 16
+_LOW_MASK = (1 << _CONTAINER_BITS) - 1
+_WORDS = (1 << _CONTAINER_BITS) // 64  # A dense container is 1024 uint64 words (8 KiB)
+
+# Sparse containers hold up to this many rows; past it a bitmap is smaller
+_SPARSE_MAX = 4096
+
+Container = Union[Set[int], np.ndarray]
+
+
+class RowBitmap:
+    """
+    Roaring-style compressed set of row ids.
+
+    Rows are grouped by their high 16 bits. Each group is a container holding
+    the low 16 bits, either as a set (up to 4096 rows) or as a 65536-bit
+    bitmap of uint64 words. Sparse groups cost a few bytes per row, dense ones
+    a fixed 8 KiB. Intersections and unions work container by container, and
+    bitmap pairs are combined with one vectorized word operation.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, rows: Iterable[int] = ()):
+        self._containers: Dict[int, Container] = {}
+        for row in rows:
+            self.add(row)
+
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __contains__(self, row: int) -> bool:
+        container = self._containers.get(row >> _CONTAINER_BITS)
+        if container is None:
+            return False
+        low = row & _LOW_MASK
+        if isinstance(container, set):
+            return low in container
+        return bool((int(container[low >> 6]) >> (low & 63)) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        """Rows in ascending order."""
+        for high in sorted(self._containers):
+            base = high << _CONTAINER_BITS
+            for low in _lows(self._containers[high]).tolist():
+                yield base + low
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RowBitmap):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def add(self, row: int):
+        high, low = row >> _CONTAINER_BITS, row & _LOW_MASK
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = {low}
+        elif isinstance(container, set):
+            container.add(low)
+            if len(container) > _SPARSE_MAX:
+                self._containers[high] = _to_dense(container)
+        else:
+            container[low >> 6] |= np.uint64(1 << (low & 63))
+
+    def discard(self, row: int):
+        high, low = row >> _CONTAINER_BITS, row & _LOW_MASK
+        container = self._containers.get(high)
+        if container is None:
+            return
+        if isinstance(container, set):
+            container.discard(low)
+            if not container:
+                del self._containers[high]
+            return
+
+        container[low >> 6] &= ~np.uint64(1 << (low & 63))
+        # Back to a set well below the threshold, so add/discard cycles around
+        # it do not convert every time
+        if _cardinality(container) <= _SPARSE_MAX // 2:
+            self._containers[high] = set(_lows(container).tolist())
+
+    def copy(self) -> "RowBitmap":
+        result = RowBitmap()
+        result._containers = {h: c.copy() for h, c in self._containers.items()}
+        return result
+
+    def to_array(self) -> np.ndarray:
+        """Rows in ascending order, as an int64 array."""
+        parts = [
+            (high << _CONTAINER_BITS) + np.asarray(_lows(self._containers[high]))
+            for high in sorted(self._containers)
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts).astype(np.int64, copy=False)
+
+    def __and__(self, other: "RowBitmap") -> "RowBitmap":
+        result = RowBitmap()
+        small, large = sorted((self, other), key=lambda b: len(b._containers))
+        for high, a in small._containers.items():
+            b = large._containers.get(high)
+            if b is None:
+                continue
+            container = _intersect(a, b)
+            # Dense results are never empty (see `_intersect`)
+            if isinstance(container, np.ndarray) or container:
+                result._containers[high] = container
+        return result
+
+    def __or__(self, other: "RowBitmap") -> "RowBitmap":
+        result = self.copy()
+        result |= other
+        return result
+
+    def __ior__(self, other: "RowBitmap") -> "RowBitmap":
+        for high, b in other._containers.items():
+            a = self._containers.get(high)
+            self._containers[high] = b.copy() if a is None else _union(a, b)
+        return self
+
+    @classmethod
+    def union(cls, bitmaps: Iterable["RowBitmap"]) -> "RowBitmap":
+        result = cls()
+        for bitmap in bitmaps:
+            result |= bitmap
+        return result
+
+
+# --- Container helpers ---
+
+
+def _cardinality(container: Container) -> int:
+    if isinstance(container, set):
+        return len(container)
+    return int(np.bitwise_count(container).sum())
+
+
+def _lows(container: Container) -> np.ndarray:
+    """The low bits held by a container, ascending."""
+    if isinstance(container, set):
+        return np.array(sorted(container), dtype=np.int64)
+    bits = np.unpackbits(
+        container.astype("<u8", copy=False).view(np.uint8), bitorder="little"
+    )
+    return np.flatnonzero(bits)
+
+
+def _to_dense(lows: Iterable[int]) -> np.ndarray:
+    words = np.zeros(_WORDS, dtype=np.uint64)
+    values = np.fromiter(lows, dtype=np.int64)
+    np.bitwise_or.at(
+        words, values >> 6, np.left_shift(np.uint64(1), (values & 63).astype(np.uint64))
+    )
+    return words
+
+
+def _dense_contains(words: np.ndarray, lows: np.ndarray) -> np.ndarray:
+    shifts = (lows & 63).astype(np.uint64)
+    return ((words[lows >> 6] >> shifts) & np.uint64(1)).astype(bool)
+
+
+def _intersect(a: Container, b: Container) -> Container:
+    if isinstance(a, set) and isinstance(b, set):
+        return a & b
+    if isinstance(a, set) or isinstance(b, set):
+        sparse, dense = (a, b) if isinstance(a, set) else (b, a)
+        lows = np.fromiter(sparse, dtype=np.int64, count=len(sparse))
+        return set(lows[_dense_contains(dense, lows)].tolist())
+
+    words = a & b
+    if _cardinality(words) <= _SPARSE_MAX:
+        return set(_lows(words).tolist())
+    return words
+
+
+def _union(a: Container, b: Container) -> Container:
+    if isinstance(a, set) and isinstance(b, set):
+        merged = a | b
+        return _to_dense(merged) if len(merged) > _SPARSE_MAX else merged
+    if isinstance(a, set) or isinstance(b, set):
+        sparse, dense = (a, b) if isinstance(a, set) else (b, a)
+        return dense | _to_dense(sparse)
+    return a | b
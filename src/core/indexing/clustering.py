@@ -0,0 +1,70 @@
+# src/core/indexing/clustering.py
+
+import numpy as np
+
+from .enums import Metric
+
+
+def assign_to_centroids(
+    vectors: np.ndarray, centroids: np.ndarray, metric: Metric = Metric.EUCLIDEAN
+) -> np.ndarray:
+    """Returns the index of the nearest centroid for every row of `vectors`."""
+    dots = vectors @ centroids.T
+    if metric == Metric.COSINE:
+        return np.argmax(dots, axis=1)
+    centroid_sq = np.einsum("ij,ij->i", centroids, centroids)
+    return np.argmin(centroid_sq[None, :] - 2.0 * dots, axis=1)
+
+
+def kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    rng: np.random.Generator,
+    metric: Metric = Metric.EUCLIDEAN,
+    iterations: int = 20,
+    max_points_per_cluster: int = 256,
+) -> np.ndarray:
+    """
+    Lloyd's k-means on a bounded random sample of `vectors`.
+
+    With the cosine metric the centroids are re-normalized after every step
+    (spherical k-means). Empty clusters are re-seeded with random sample
+    points. Returns a float32 array of shape (n_clusters, dim).
+    """
+    max_points = n_clusters * max_points_per_cluster
+    if len(vectors) > max_points:
+        sample = vectors[rng.choice(len(vectors), max_points, replace=False)]
+    else:
+        sample = vectors
+
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+
+    previous = None
+    for _ in range(iterations):
+        assignments = assign_to_centroids(sample, centroids, metric)
+        if previous is not None and np.array_equal(assignments, previous):
+            break  # Converged: no point changed cluster
+        previous = assignments
+
+        # Per-cluster sums via one sort + reduceat (much faster than np.add.at)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        order = np.argsort(assignments, kind="stable")
+        present = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            counts[empty] = 1
+
+        new_centroids = sums / counts[:, None]
+        if metric == Metric.COSINE:
+            norms = np.linalg.norm(new_centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            new_centroids /= norms
+
+        centroids = new_centroids.astype(np.float32)
+
+    return centroids
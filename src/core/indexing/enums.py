@@ -7,6 +7,10 @@ class IndexType(str, Enum):
 
     AVL = "avl"
     LSH = "lsh"
+    FLAT = "flat"
+    HNSW = "hnsw"
+    IVF = "ivf"
+    PQ = "pq"
 
 
 class Metric(str, Enum):
@@ -14,3 +18,18 @@ class Metric(str, Enum):
 
     COSINE = "cosine"
     EUCLIDEAN = "euclidean"
+
+
+class Quantization(str, Enum):
+    """Enumeration for the stored vector representations."""
+
+    NONE = "none"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+
+
+class FusionMethod(str, Enum):
+    """Enumeration for the ways hybrid search merges its rankings."""
+
+    RRF = "rrf"
+    WEIGHTED = "weighted"
@@ -0,0 +1,365 @@
+# src/core/indexing/flat_index.py
+
+import math
+from uuid import UUID
+from typing import Any, List, Mapping, Tuple, Dict, Optional
+import numpy as np
+
+from src.core.models import Chunk
+from .base_index import (
+    VectorIndex,
+    uids_to_array,
+    resolve_chunks,
+    top_k_rows,
+    top_k_rows_batch,
+)
+from .enums import IndexType, Metric, Quantization
+from .metadata_index import ChunkFilter
+from .quantization import ScalarQuantizer, rerank_exact
+
+
+class FlatIndex(VectorIndex):
+    """
+    An exact (brute-force) vector index backed by one contiguous float32 matrix.
+
+    Every vector lives in a row of a preallocated matrix, so a search is a
+    single matrix-vector product followed by a top-k partial sort. Deletes
+    move the last row into the freed slot, keeping the matrix dense.
+
+    With `quantization`, the matrix holds float16 or int8 rows and is
+    scored in place; an optional exact re-rank fixes the final order.
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        metric: Metric = Metric.COSINE,
+        quantization: Quantization = Quantization.NONE,
+        rerank_factor: int = 0,
+    ):
+        """
+        Args:
+        quantization: Stored vector format ('none', 'float16' or 'int8').
+        rerank_factor: If > 0 and vectors are quantized, re-rank the top k * rerank_factor rows exactly.
+        """
+        self._metric = metric
+        self._quantizer = ScalarQuantizer(quantization)
+        self._rerank_factor = rerank_factor
+        self._dimension: int = 0
+
+        # Row-aligned storage. Only the first `_count` rows are valid.
+        self._matrix: Optional[np.ndarray] = None
+        self._sq_norms: Optional[np.ndarray] = None  # Used by Euclidean only
+        self._count: int = 0
+
+        # uid <-> row mapping
+        self._uid_to_row: Dict[UUID, int] = {}
+        self._row_chunks: List[Chunk] = []
+
+    @property
+    def index_type(self) -> IndexType:
+        return IndexType.FLAT
+
+    @property
+    def metric(self) -> Metric:
+        return self._metric
+
+    @property
+    def vector_count(self) -> int:
+        return self._count
+
+    def build(self, chunks: List[Chunk]):
+        """Bulk build. Vectors are stacked into the matrix in one pass."""
+        valid_chunks = list(
+            {c.uid: c for c in chunks if c.embedding is not None}.values()
+        )
+
+        self._dimension = 0
+        self._matrix = None
+        self._sq_norms = None
+        self._count = 0
+        self._uid_to_row.clear()
+        self._row_chunks.clear()
+        self._quantizer.reset()
+
+        if not valid_chunks:
+            return
+
+        vectors = np.array([c.embedding for c in valid_chunks], dtype=np.float32)
+        if self.metric == Metric.COSINE:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors /= norms
+
+        self._dimension = vectors.shape[1]
+        self._allocate(max(self._INITIAL_CAPACITY, len(valid_chunks)))
+
+        self._quantizer.fit(vectors)
+        codes = self._quantizer.encode(vectors)
+        decoded = self._quantizer.decode(codes)
+
+        n = len(valid_chunks)
+        self._matrix[:n] = codes
+        self._sq_norms[:n] = np.einsum("ij,ij->i", decoded, decoded)
+        self._count = n
+
+        for row, chunk in enumerate(valid_chunks):
+            self._uid_to_row[chunk.uid] = row
+            self._row_chunks.append(chunk)
+
+    def insert(self, chunk: Chunk):
+        """Inserts a chunk, or overwrites its row in place if it already exists."""
+        if chunk.embedding is None:
+            return
+
+        vector = self._prepare_vector(chunk.embedding)
+
+        if self._dimension == 0:
+            self._dimension = len(vector)
+            self._allocate(self._INITIAL_CAPACITY)
+        elif len(vector) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, got {len(vector)}"
+            )
+
+        row = self._uid_to_row.get(chunk.uid)
+        if row is None:
+            if self._count == self._matrix.shape[0]:
+                self._grow()
+            row = self._count
+            self._count += 1
+            self._uid_to_row[chunk.uid] = row
+            self._row_chunks.append(chunk)
+        else:
+            self._row_chunks[row] = chunk
+
+        code = self._quantizer.encode(vector)
+        decoded = self._quantizer.decode(code)
+        self._matrix[row] = code
+        self._sq_norms[row] = float(np.dot(decoded, decoded))
+
+    def delete(self, chunk_id: UUID):
+        """Removes a chunk by moving the last row into its slot (swap-with-last)."""
+        row = self._uid_to_row.pop(chunk_id, None)
+        if row is None:
+            return
+
+        last = self._count - 1
+        if row != last:
+            moved_chunk = self._row_chunks[last]
+            self._matrix[row] = self._matrix[last]
+            self._sq_norms[row] = self._sq_norms[last]
+            self._row_chunks[row] = moved_chunk
+            self._uid_to_row[moved_chunk.uid] = row
+
+        self._row_chunks.pop()
+        self._count = last
+
+    def search(
+        self, query_embedding: List[float], k: int, **search_params
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Exact search: one matrix-vector product over all rows, then
+        np.argpartition to select the top-k without sorting all N scores.
+        """
+        if self._count == 0 or k <= 0:
+            return []
+        return self._scan(query_embedding, k)
+
+    def search_filtered(
+        self,
+        query_embedding: List[float],
+        k: int,
+        chunk_filter: ChunkFilter,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Exact filtered search. Selective filters score only the matching rows,
+        gathered from the matrix. Broad ones score every row and walk the
+        top of the ranking until k matching rows are found.
+        """
+        if self._count == 0 or k <= 0 or not len(chunk_filter):
+            return []
+
+        if chunk_filter.prefilter:
+            rows = [
+                self._uid_to_row[chunk.uid]
+                for chunk in chunk_filter.chunks()
+                if chunk.uid in self._uid_to_row
+            ]
+            if not rows:
+                return []
+            return self._scan(query_embedding, k, rows=np.array(rows))
+        return self._scan(query_embedding, k, chunk_filter=chunk_filter)
+
+    def _scan(
+        self,
+        query_embedding: List[float],
+        k: int,
+        rows: Optional[np.ndarray] = None,
+        chunk_filter: Optional[ChunkFilter] = None,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Scores all rows, or only `rows`, and returns the top k. With a
+        `chunk_filter`, rows that do not match are skipped.
+        """
+        query_vector = self._prepare_vector(query_embedding)
+        if len(query_vector) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, got {len(query_vector)}"
+            )
+
+        if rows is None:
+            vectors = self._matrix[: self._count]
+            sq_norms = self._sq_norms[: self._count]
+        else:
+            vectors = self._matrix[rows]
+            sq_norms = self._sq_norms[rows]
+        dots = self._quantizer.dot(vectors, self._quantizer.prepare_query(query_vector))
+
+        if self.metric == Metric.COSINE:
+            # Higher is better
+            scores = dots
+            order_keys = -scores
+        else:
+            # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2. Lower is better.
+            sq_dist = sq_norms - 2.0 * dots
+            sq_dist += float(np.dot(query_vector, query_vector))
+            scores = np.sqrt(np.maximum(sq_dist, 0.0))
+            order_keys = scores
+
+        rerank = self._quantizer.is_lossy and self._rerank_factor > 0
+        n_results = k * self._rerank_factor if rerank else k
+        if chunk_filter is None:
+            top = top_k_rows(order_keys, n_results)
+        else:
+            top = self._top_k_matching(order_keys, n_results, chunk_filter)
+        chunks = [self._row_chunks[row if rows is None else rows[row]] for row in top]
+
+        if rerank:
+            return rerank_exact(query_embedding, chunks, k, self.metric)
+        return [(chunk, float(scores[row])) for chunk, row in zip(chunks, top)]
+
+    def _top_k_matching(
+        self, order_keys: np.ndarray, k: int, chunk_filter: ChunkFilter
+    ) -> List[int]:
+        """
+        `top_k_rows` restricted to rows in `chunk_filter`. Takes the top
+        k / selectivity rows and doubles that until k of them match.
+        """
+        n = len(order_keys)
+        fetch = min(math.ceil(k / chunk_filter.selectivity), n)
+        while True:
+            top = top_k_rows(order_keys, fetch)
+            matching = [
+                row for row in top.tolist() if self._row_chunks[row].uid in chunk_filter
+            ]
+            if len(matching) >= k or fetch >= n:
+                return matching[:k]
+            fetch = min(fetch * 2, n)
+
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int, **search_params
+    ) -> List[List[Tuple[Chunk, float]]]:
+        """
+        Exact search for Q queries at once: one (Q, N) matrix product, then a
+        row-wise np.argpartition for every query's top-k.
+        """
+        if self._count == 0 or k <= 0:
+            return [[] for _ in query_embeddings]
+
+        queries = np.array(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[1] != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, "
+                f"got queries of shape {queries.shape}"
+            )
+        if self.metric == Metric.COSINE:
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            queries /= norms
+
+        dots = self._quantizer.dot_batch(self._matrix[: self._count], queries)
+
+        if self.metric == Metric.COSINE:
+            scores = dots
+            order_keys = -scores
+        else:
+            sq_dist = self._sq_norms[: self._count] - 2.0 * dots
+            sq_dist += np.einsum("ij,ij->i", queries, queries)[:, None]
+            scores = np.sqrt(np.maximum(sq_dist, 0.0))
+            order_keys = scores
+
+        rerank = self._quantizer.is_lossy and self._rerank_factor > 0
+        top_rows = top_k_rows_batch(
+            order_keys, k * self._rerank_factor if rerank else k
+        )
+
+        results = []
+        for q, rows in enumerate(top_rows.tolist()):
+            if rerank:
+                candidates = [self._row_chunks[row] for row in rows]
+                results.append(
+                    rerank_exact(query_embeddings[q], candidates, k, self.metric)
+                )
+            else:
+                results.append(
+                    [(self._row_chunks[row], float(scores[q, row])) for row in rows]
+                )
+        return results
+
+    # --- Persistence ---
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "metric": self._metric,
+            "quantization": self._quantizer.mode,
+            "rerank_factor": self._rerank_factor,
+        }
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        arrays = self._quantizer.dump_arrays()
+        if self._dimension:
+            arrays["vectors"] = self._matrix[: self._count]
+            arrays["sq_norms"] = self._sq_norms[: self._count]
+            arrays["uids"] = uids_to_array(chunk.uid for chunk in self._row_chunks)
+        return {"dimension": self._dimension}, arrays
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, Chunk],
+    ):
+        self._quantizer.restore_arrays(arrays)
+        self._dimension = state["dimension"]
+        if not self._dimension:
+            return
+
+        self._row_chunks = resolve_chunks(arrays["uids"], chunks)
+        self._uid_to_row = {
+            chunk.uid: row for row, chunk in enumerate(self._row_chunks)
+        }
+        self._count = len(self._row_chunks)
+        if self._count:
+            # The mapped block is full: the first insert grows it into memory
+            self._matrix = arrays["vectors"]
+            self._sq_norms = arrays["sq_norms"]
+        else:
+            self._allocate(self._INITIAL_CAPACITY)
+
+    # --- Internal helpers ---
+
+    def _allocate(self, capacity: int):
+        self._matrix = np.zeros(
+            (capacity, self._dimension), dtype=self._quantizer.dtype
+        )
+        self._sq_norms = np.zeros(capacity, dtype=np.float32)
+
+    def _grow(self):
+        """Doubles the capacity, amortizing reallocation to O(1) per insert."""
+        old_matrix, old_norms = self._matrix, self._sq_norms
+        self._allocate(old_matrix.shape[0] * 2)
+        self._matrix[: self._count] = old_matrix[: self._count]
+        self._sq_norms[: self._count] = old_norms[: self._count]
@@ -0,0 +1,71 @@
+# src/core/indexing/fusion.py
+
+from typing import Dict, List, Tuple, TYPE_CHECKING
+from uuid import UUID
+
+from .enums import FusionMethod, Metric
+
+if TYPE_CHECKING:
+    from src.core.models import Chunk
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original
+# paper, and damps the weight of the very first ranks
+RRF_K = 60
+
+
+def fuse_rankings(
+    vector_hits: List[Tuple["Chunk", float]],
+    text_hits: List[Tuple["Chunk", float]],
+    k: int,
+    method: FusionMethod = FusionMethod.RRF,
+    vector_weight: float = 0.5,
+    metric: Metric = Metric.COSINE,
+) -> List[Tuple["Chunk", float]]:
+    """
+    Merges a vector and a text ranking (best first) into the k best chunks.
+
+    - RRF scores a chunk by `weight / (RRF_K + rank)` summed over the rankings
+      holding it. Only ranks matter, so the two score scales never meet.
+    - WEIGHTED min-max normalizes each ranking's scores to [0, 1] and sums
+      them with the weights. A chunk missing from a ranking scores 0 there.
+
+    The vector ranking gets `vector_weight`, the text ranking the rest.
+    `metric` is the one of the vector index: its Euclidean scores are
+    distances, so the lowest one normalizes to 1.
+    """
+    weighted = [
+        (vector_hits, vector_weight, metric == Metric.EUCLIDEAN),
+        (text_hits, 1.0 - vector_weight, False),
+    ]
+    chunks: Dict[UUID, "Chunk"] = {}
+    fused: Dict[UUID, float] = {}
+
+    for hits, weight, lower_is_better in weighted:
+        if method == FusionMethod.RRF:
+            contributions = [
+                weight / (RRF_K + rank) for rank in range(1, len(hits) + 1)
+            ]
+        else:
+            contributions = [
+                weight * score for score in _normalized(hits, lower_is_better)
+            ]
+        for (chunk, _), contribution in zip(hits, contributions):
+            chunks.setdefault(chunk.uid, chunk)
+            fused[chunk.uid] = fused.get(chunk.uid, 0.0) + contribution
+
+    top = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(chunks[chunk_id], score) for chunk_id, score in top]
+
+
+def _normalized(
+    hits: List[Tuple["Chunk", float]], lower_is_better: bool
+) -> List[float]:
+    if not hits:
+        return []
+    scores = [score for _, score in hits]
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    if lower_is_better:
+        return [(high - score) / (high - low) for score in scores]
+    return [(score - low) / (high - low) for score in scores]
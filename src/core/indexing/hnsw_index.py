@@ -0,0 +1,540 @@
+# src/core/indexing/hnsw_index.py
+
+import heapq
+import math
+from uuid import UUID
+from typing import Any, List, Mapping, Tuple, Dict, Set, Optional
+import numpy as np
+
+from src.core.models import Chunk
+from .base_index import VectorIndex, uids_to_array, resolve_chunks
+from .enums import IndexType, Metric, Quantization
+from .metadata_index import ChunkFilter
+from .quantization import ScalarQuantizer, rerank_exact
+
+
+class HnswIndex(VectorIndex):
+    """
+    Hierarchical Navigable Small World (HNSW) graph index (approximate search).
+
+    Every vector is a node in a stack of proximity graphs. Upper layers are
+    sparse "express lanes" used for a greedy descent; the bottom layer holds
+    every node and is explored with a best-first beam of width `ef`.
+
+    Deletes are tombstones: the node keeps routing traffic but is never
+    returned, and the neighbours it links to are relinked around it. Later
+    inserts reuse tombstoned slots, so the graph is never rebuilt on a write.
+
+    Node vectors are stored in the configured `quantization` format and all
+    graph distances (construction and search) are computed from it.
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        metric: Metric = Metric.COSINE,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 50,
+        seed: Optional[int] = None,
+        quantization: Quantization = Quantization.NONE,
+        rerank_factor: int = 0,
+    ):
+        """
+        Args:
+        m: Max neighbours per node on upper layers (2 * m on layer 0). Higher = better recall, more memory.
+        ef_construction: Beam width while inserting. Higher = better graph quality, slower inserts.
+        ef_search: Default beam width while searching. Can be overridden per query.
+        seed: Optional seed for reproducible level assignment.
+        quantization: Stored vector format ('none', 'float16' or 'int8').
+        rerank_factor: If > 0 and vectors are quantized, re-rank the top k * rerank_factor results exactly.
+        """
+        if m < 2:
+            raise ValueError("HNSW parameter 'm' must be at least 2.")
+
+        self._metric = metric
+        self._m = m
+        self._m0 = 2 * m
+        self._ef_construction = ef_construction
+        self._ef_search = ef_search
+        self._level_mult = 1.0 / math.log(m)
+        self._rng = np.random.default_rng(seed)
+        self._quantizer = ScalarQuantizer(quantization)
+        self._rerank_factor = rerank_factor
+
+        self._dimension: int = 0
+        self._vectors: Optional[np.ndarray] = None  # (capacity, dim), row == node id
+        self._node_count: int = 0  # Allocated node ids, including tombstones
+
+        # Per-node graph state. _links[node][level] is that node's neighbour list.
+        self._links: List[List[List[int]]] = []
+        self._node_chunks: List[Optional[Chunk]] = []
+        self._uid_to_node: Dict[UUID, int] = {}
+        self._deleted: Set[int] = set()
+
+        self._entry_point: Optional[int] = None
+        self._max_level: int = -1
+
+    @property
+    def index_type(self) -> IndexType:
+        return IndexType.HNSW
+
+    @property
+    def metric(self) -> Metric:
+        return self._metric
+
+    @property
+    def vector_count(self) -> int:
+        return len(self._uid_to_node)
+
+    def build(self, chunks: List[Chunk]):
+        """Bulk build by repeated insertion."""
+        self._reset()
+        valid_chunks = list(
+            {c.uid: c for c in chunks if c.embedding is not None}.values()
+        )
+
+        if valid_chunks and self._quantizer.is_lossy:
+            # Calibrate the quantizer on the whole batch before encoding
+            self._quantizer.fit(
+                np.array(
+                    [self._prepare_vector(c.embedding) for c in valid_chunks],
+                    dtype=np.float32,
+                )
+            )
+
+        for chunk in valid_chunks:
+            self.insert(chunk)
+
+    def insert(self, chunk: Chunk):
+        """
+        Inserts a chunk. An existing entry with the same uid is replaced.
+        A tombstoned slot is reused, keeping its level, before a new node
+        is allocated.
+        """
+        if chunk.embedding is None:
+            return
+
+        vector = self._prepare_vector(chunk.embedding)
+
+        if self._dimension and len(vector) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, got {len(vector)}"
+            )
+
+        if chunk.uid in self._uid_to_node:
+            self.delete(chunk.uid)
+
+        if self._dimension == 0:
+            self._dimension = len(vector)
+            self._vectors = np.zeros(
+                (self._INITIAL_CAPACITY, self._dimension),
+                dtype=self._quantizer.dtype,
+            )
+
+        if self._deleted:
+            node = self._deleted.pop()
+            self._vectors[node] = self._quantizer.encode(vector)
+            self._node_chunks[node] = chunk
+            level = len(self._links[node]) - 1
+        else:
+            node = self._allocate_node(vector)
+            level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+            self._links.append([[] for _ in range(level + 1)])
+            self._node_chunks.append(chunk)
+        self._uid_to_node[chunk.uid] = node
+
+        if self._entry_point is None:
+            self._entry_point = node
+            self._max_level = level
+            return
+
+        # 1. Greedy descent through the layers above the new node's level
+        entry = [(self._distance(vector, self._entry_point), self._entry_point)]
+        for level_c in range(self._max_level, level, -1):
+            entry = self._search_layer(vector, entry, 1, level_c)
+
+        # 2. Connect the node on every layer it belongs to. A reused slot
+        # routes through its old links until they are replaced, and is never
+        # its own neighbour; tombstones are not linked to.
+        for level_c in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(
+                vector, entry, self._ef_construction, level_c
+            )
+            neighbours = self._select_neighbours(
+                [
+                    (dist, n)
+                    for dist, n in candidates
+                    if n != node and n not in self._deleted
+                ],
+                self._m,
+            )
+            self._links[node][level_c] = neighbours
+
+            max_links = self._m0 if level_c == 0 else self._m
+            for neighbour in neighbours:
+                links = self._links[neighbour][level_c]
+                if node in links:
+                    continue
+                links.append(node)
+                if len(links) > max_links:
+                    # Shrink the neighbour's list with the same heuristic
+                    base = self._quantizer.decode(self._vectors[neighbour])
+                    dists = self._distances(base, links)
+                    ranked = list(zip(dists.tolist(), links))
+                    self._links[neighbour][level_c] = self._select_neighbours(
+                        ranked, max_links
+                    )
+
+            entry = candidates
+
+        if level > self._max_level:
+            self._entry_point = node
+            self._max_level = level
+
+    def delete(self, chunk_id: UUID):
+        """
+        Tombstones a chunk and relinks the neighbours it links to, so the
+        cost is bounded by the node's degree, not by the graph's size.
+        """
+        node = self._uid_to_node.pop(chunk_id, None)
+        if node is None:
+            return
+
+        self._deleted.add(node)
+        self._node_chunks[node] = None
+
+        if not self._uid_to_node:
+            self._reset()
+        else:
+            self._repair_neighbours(node)
+
+    def search(
+        self,
+        query_embedding: List[float],
+        k: int,
+        ef_search: Optional[int] = None,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Greedy descent to layer 0, then a best-first search with a beam of
+        `ef_search` (never smaller than k). Larger beams trade latency for recall.
+        With quantized vectors and a `rerank_factor`, the best k * rerank_factor
+        nodes are re-ranked exactly.
+        """
+        if self._entry_point is None or not self._uid_to_node:
+            return []
+        return self._search(query_embedding, k, ef_search)
+
+    def search_filtered(
+        self,
+        query_embedding: List[float],
+        k: int,
+        chunk_filter: ChunkFilter,
+        ef_search: Optional[int] = None,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Filtered search. Selective filters score the matching chunks exactly.
+        Otherwise the layer-0 beam routes through every node but only keeps
+        matching ones as results, like tombstones, so it runs until it holds
+        `ef` matching nodes.
+        """
+        if self._entry_point is None or not self._uid_to_node or not len(chunk_filter):
+            return []
+        if chunk_filter.prefilter:
+            return self._search_prefiltered(query_embedding, k, chunk_filter)
+        return self._search(query_embedding, k, ef_search, chunk_filter)
+
+    def _search(
+        self,
+        query_embedding: List[float],
+        k: int,
+        ef_search: Optional[int],
+        chunk_filter: Optional[ChunkFilter] = None,
+    ) -> List[Tuple[Chunk, float]]:
+        query_vector = self._prepare_vector(query_embedding)
+        if len(query_vector) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, got {len(query_vector)}"
+            )
+
+        rerank = self._quantizer.is_lossy and self._rerank_factor > 0
+        n_results = k * self._rerank_factor if rerank else k
+        ef = max(ef_search or self._ef_search, n_results)
+
+        entry = [(self._distance(query_vector, self._entry_point), self._entry_point)]
+        for level_c in range(self._max_level, 0, -1):
+            entry = self._search_layer(query_vector, entry, 1, level_c)
+
+        nearest = self._search_layer(
+            query_vector, entry, ef, 0, live_only=True, chunk_filter=chunk_filter
+        )
+
+        if rerank:
+            candidates = [self._node_chunks[node] for _, node in nearest[:n_results]]
+            return rerank_exact(query_embedding, candidates, k, self.metric)
+
+        results = []
+        for dist, node in nearest[:k]:
+            results.append((self._node_chunks[node], self._to_score(dist)))
+
+        return results
+
+    # --- HNSW Core Logic ---
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry: List[Tuple[float, int]],
+        ef: int,
+        level: int,
+        live_only: bool = False,
+        chunk_filter: Optional[ChunkFilter] = None,
+    ) -> List[Tuple[float, int]]:
+        """
+        Best-first search on one layer. Returns up to `ef` (distance, node)
+        pairs sorted by ascending distance. With `live_only`, tombstoned nodes
+        are traversed but kept out of the result set, and so are the nodes
+        outside `chunk_filter`.
+        """
+
+        def excluded(node: int) -> bool:
+            if live_only and node in self._deleted:
+                return True
+            return (
+                chunk_filter is not None
+                and self._node_chunks[node].uid not in chunk_filter
+            )
+
+        visited = {node for _, node in entry}
+        candidates = list(entry)  # Min-heap on distance
+        heapq.heapify(candidates)
+        results = [
+            (-dist, node)  # Max-heap on distance via negation
+            for dist, node in entry
+            if not excluded(node)
+        ]
+        heapq.heapify(results)
+
+        while candidates:
+            dist, node = heapq.heappop(candidates)
+            if len(results) >= ef and dist > -results[0][0]:
+                break
+
+            neighbours = [n for n in self._links[node][level] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+
+            # One vectorized distance computation per expanded node
+            for n_dist, neighbour in zip(
+                self._distances(query, neighbours).tolist(), neighbours
+            ):
+                if len(results) < ef or n_dist < -results[0][0]:
+                    heapq.heappush(candidates, (n_dist, neighbour))
+                    if excluded(neighbour):
+                        continue
+                    heapq.heappush(results, (-n_dist, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted((-neg_dist, node) for neg_dist, node in results)
+
+    def _repair_neighbours(self, node: int):
+        """
+        Drops a tombstoned node from the lists of the live neighbours it links
+        to, refilling each from the node's own neighbours with the selection
+        heuristic. The node keeps its links: edges from nodes it does not
+        link to still route through it until its slot is reused.
+        """
+        for level_c, node_links in enumerate(self._links[node]):
+            max_links = self._m0 if level_c == 0 else self._m
+            for neighbour in node_links:
+                links = self._links[neighbour][level_c]
+                if neighbour in self._deleted or node not in links:
+                    continue
+                candidates = [
+                    n
+                    for n in set(links + node_links)
+                    if n != neighbour and n not in self._deleted
+                ]
+                base = self._quantizer.decode(self._vectors[neighbour])
+                dists = self._distances(base, candidates)
+                self._links[neighbour][level_c] = self._select_neighbours(
+                    list(zip(dists.tolist(), candidates)), max_links
+                )
+
+    def _select_neighbours(
+        self, candidates: List[Tuple[float, int]], max_links: int
+    ) -> List[int]:
+        """
+        Neighbour selection heuristic (Malkov & Yashunin, Alg. 4). `candidates`
+        are (distance to base, node) pairs. A candidate is kept only if it is
+        closer to the base than to every neighbour kept
+        so far, which spreads links across directions. Pruned candidates fill
+        any remaining slots to preserve connectivity.
+        """
+        unique = {node: dist for dist, node in candidates}
+        ranked = sorted((dist, node) for node, dist in unique.items())
+        if len(ranked) <= max_links:
+            return [node for _, node in ranked]
+
+        nodes = [node for _, node in ranked]
+        base_dists = np.array([dist for dist, _ in ranked], dtype=np.float32)
+
+        # All candidate-to-candidate distances in one matrix product
+        vectors = self._quantizer.decode(self._vectors[nodes])
+        gram = vectors @ vectors.T
+        if self.metric == Metric.COSINE:
+            pairwise = 1.0 - gram
+        else:
+            sq_norms = np.diag(gram)
+            pairwise = sq_norms[:, None] + sq_norms[None, :] - 2.0 * gram
+
+        # occluded[i, j]: candidate j (if kept) is at least as close to i as the base is
+        occluded = pairwise <= base_dists[:, None]
+        blocked = np.zeros(len(nodes), dtype=bool)
+
+        selected: List[int] = []
+        pruned: List[int] = []
+        for i in range(len(nodes)):
+            if len(selected) >= max_links:
+                break
+            if blocked[i]:
+                pruned.append(i)
+            else:
+                selected.append(i)
+                blocked |= occluded[:, i]
+
+        selected.extend(pruned[: max_links - len(selected)])
+        return [nodes[i] for i in selected]
+
+    # --- Persistence ---
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "metric": self._metric,
+            "m": self._m,
+            "ef_construction": self._ef_construction,
+            "ef_search": self._ef_search,
+            "quantization": self._quantizer.mode,
+            "rerank_factor": self._rerank_factor,
+        }
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        The adjacency is flattened node by node, level by level: node i owns
+        `levels[i]` lists, and list j (in that global order) is
+        `links[offsets[j]:offsets[j + 1]]`. Tombstones keep their node ids.
+        """
+        state = {
+            "dimension": self._dimension,
+            "entry_point": self._entry_point,
+            "max_level": self._max_level,
+            "rng": self._rng.bit_generator.state,
+        }
+        arrays = self._quantizer.dump_arrays()
+        if self._entry_point is None:
+            return state, arrays
+
+        lists = [links for node_links in self._links for links in node_links]
+        live = sorted(self._uid_to_node.items(), key=lambda item: item[1])
+
+        arrays["vectors"] = self._vectors[: self._node_count]
+        arrays["levels"] = np.array(
+            [len(node_links) for node_links in self._links], dtype=np.int32
+        )
+        arrays["offsets"] = np.cumsum([0] + [len(links) for links in lists])
+        arrays["links"] = np.fromiter(
+            (n for links in lists for n in links), dtype=np.int32
+        )
+        arrays["live_nodes"] = np.array([node for _, node in live], dtype=np.int64)
+        arrays["uids"] = uids_to_array(uid for uid, _ in live)
+        return state, arrays
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, Chunk],
+    ):
+        self._quantizer.restore_arrays(arrays)
+        self._rng.bit_generator.state = state["rng"]
+        if state["entry_point"] is None:
+            return
+
+        self._dimension = state["dimension"]
+        self._entry_point = state["entry_point"]
+        self._max_level = state["max_level"]
+        self._vectors = arrays["vectors"]
+        self._node_count = len(self._vectors)
+
+        # Adjacency lists stay mutable Python lists, as inserts rewire them
+        links = arrays["links"].tolist()
+        offsets = arrays["offsets"].tolist()
+        position = 0
+        self._links = []
+        for level_count in arrays["levels"].tolist():
+            self._links.append(
+                [
+                    links[offsets[j] : offsets[j + 1]]
+                    for j in range(position, position + level_count)
+                ]
+            )
+            position += level_count
+
+        self._node_chunks = [None] * self._node_count
+        live_nodes = arrays["live_nodes"].tolist()
+        for node, chunk in zip(live_nodes, resolve_chunks(arrays["uids"], chunks)):
+            self._node_chunks[node] = chunk
+            self._uid_to_node[chunk.uid] = node
+        self._deleted = set(range(self._node_count)) - set(live_nodes)
+
+    # --- Internal helpers ---
+
+    def _distances(self, query: np.ndarray, nodes: List[int]) -> np.ndarray:
+        """Internal distance: 1 - cosine, or squared Euclidean. Lower is closer."""
+        vectors = self._vectors[nodes]
+        if self.metric == Metric.COSINE:
+            return 1.0 - self._quantizer.dot(
+                vectors, self._quantizer.prepare_query(query)
+            )
+        diff = self._quantizer.decode(vectors) - query
+        return np.einsum("ij,ij->i", diff, diff)
+
+    def _distance(self, query: np.ndarray, node: int) -> float:
+        return float(self._distances(query, [node])[0])
+
+    def _to_score(self, dist: float) -> float:
+        """Converts an internal distance back to the API's similarity/distance."""
+        if self.metric == Metric.COSINE:
+            return 1.0 - dist
+        return math.sqrt(max(dist, 0.0))
+
+    def _allocate_node(self, vector: np.ndarray) -> int:
+        if self._node_count == self._vectors.shape[0]:
+            grown = np.zeros(
+                (self._vectors.shape[0] * 2, self._dimension),
+                dtype=self._quantizer.dtype,
+            )
+            grown[: self._node_count] = self._vectors[: self._node_count]
+            self._vectors = grown
+
+        node = self._node_count
+        self._vectors[node] = self._quantizer.encode(vector)
+        self._node_count += 1
+        return node
+
+    def _reset(self):
+        self._quantizer.reset()
+        self._dimension = 0
+        self._vectors = None
+        self._node_count = 0
+        self._links = []
+        self._node_chunks = []
+        self._uid_to_node = {}
+        self._deleted = set()
+        self._entry_point = None
+        self._max_level = -1
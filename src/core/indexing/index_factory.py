@@ -1,10 +1,18 @@
 # src/core/indexing/index_factory.py
 
-from typing import Type, Dict
-from .base_index import VectorIndex
-from .enums import IndexType, Metric
+from typing import Type, Dict, Mapping, TYPE_CHECKING
+from uuid import UUID
+from .base_index import VectorIndex, read_index_header
+from .enums import IndexType, Metric, Quantization
 from .avl_index import AvlIndex
 from .lsh_index import LshIndex
+from .flat_index import FlatIndex
+from .hnsw_index import HnswIndex
+from .ivf_index import IvfIndex
+from .pq_index import PqIndex
+
+if TYPE_CHECKING:
+    from src.core.models import Chunk
 
 
 class IndexFactory:
@@ -13,6 +21,10 @@ class IndexFactory:
     _index_classes: Dict[IndexType, Type[VectorIndex]] = {
         IndexType.AVL: AvlIndex,
         IndexType.LSH: LshIndex,
+        IndexType.FLAT: FlatIndex,
+        IndexType.HNSW: HnswIndex,
+        IndexType.IVF: IvfIndex,
+        IndexType.PQ: PqIndex,
     }
 
     @staticmethod
@@ -21,6 +33,7 @@ class IndexFactory:
         metric: Metric = Metric.COSINE,
         num_bits: int = 8,
         num_tables: int = 3,
+        quantization: Quantization = Quantization.NONE,
         **kwargs,
     ) -> VectorIndex:
         """Creates an instance of the specified vector index."""
@@ -28,12 +41,60 @@ class IndexFactory:
         if not index_class:
             raise ValueError(f"Unknown index type: {index_type}")
 
-        elif index_type == IndexType.AVL:
-            return index_class(metric=metric)
+        # Stored vector format, shared by every index that keeps raw vectors
+        storage = {
+            "quantization": quantization,
+            "rerank_factor": kwargs.get("rerank_factor", 0),
+        }
+
+        if index_type in (IndexType.AVL, IndexType.FLAT):
+            return index_class(metric=metric, **storage)
 
         elif index_type == IndexType.LSH:
             return index_class(
-                num_bits=num_bits, num_tables=num_tables, seed=kwargs.get("seed")
+                num_bits=num_bits,
+                num_tables=num_tables,
+                seed=kwargs.get("seed"),
+                num_probes=kwargs.get("num_probes", 0),
+                **storage,
+            )
+
+        elif index_type == IndexType.HNSW:
+            return index_class(
+                metric=metric,
+                m=kwargs.get("m", 16),
+                ef_construction=kwargs.get("ef_construction", 200),
+                ef_search=kwargs.get("ef_search", 50),
+                seed=kwargs.get("seed"),
+                **storage,
+            )
+
+        elif index_type == IndexType.IVF:
+            return index_class(
+                metric=metric,
+                n_lists=kwargs.get("n_lists", 64),
+                nprobe=kwargs.get("nprobe", 8),
+                seed=kwargs.get("seed"),
+                **storage,
+            )
+
+        elif index_type == IndexType.PQ:
+            # PQ codes are already compressed, so `quantization` does not apply
+            return index_class(
+                metric=metric,
+                num_subspaces=kwargs.get("num_subspaces", 8),
+                num_centroids=kwargs.get("num_centroids", 256),
+                rerank_factor=kwargs.get("rerank_factor", 0),
+                seed=kwargs.get("seed"),
             )
 
         return index_class()
+
+    @staticmethod
+    def load_index(path: str, chunks: Mapping[UUID, "Chunk"]) -> VectorIndex:
+        """Opens an index written by `VectorIndex.save`, whatever its type."""
+        header = read_index_header(path)
+        index_class = IndexFactory._index_classes.get(IndexType(header["index_type"]))
+        if not index_class:
+            raise ValueError(f"Unknown index type: {header['index_type']}")
+        return index_class.load(path, chunks)
@@ -0,0 +1,426 @@
+# src/core/indexing/ivf_index.py
+
+from uuid import UUID
+from typing import Any, List, Mapping, Tuple, Dict, Optional
+import numpy as np
+
+from src.core.models import Chunk
+from .base_index import VectorIndex, uids_to_array, resolve_chunks, top_k_rows
+from .enums import IndexType, Metric, Quantization
+from .clustering import kmeans, assign_to_centroids
+from .metadata_index import ChunkFilter
+from .quantization import ScalarQuantizer, rerank_exact
+
+
+class _PostingList:
+    """A dense, growable block of vectors assigned to one centroid."""
+
+    def __init__(self, dimension: int, dtype: np.dtype, capacity: int = 64):
+        self.vectors = np.zeros((capacity, dimension), dtype=dtype)
+        self.chunks: List[Chunk] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.chunks)
+
+    def append(self, chunk: Chunk, vector: np.ndarray) -> int:
+        row = self.size
+        if row == self.vectors.shape[0]:
+            grown = np.zeros((row * 2, self.vectors.shape[1]), dtype=self.vectors.dtype)
+            grown[:row] = self.vectors[:row]
+            self.vectors = grown
+        self.vectors[row] = vector
+        self.chunks.append(chunk)
+        return row
+
+    def remove(self, row: int) -> Optional[Chunk]:
+        """Swap-with-last removal. Returns the chunk that moved into `row`, if any."""
+        last = self.size - 1
+        moved = None
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            moved = self.chunks[last]
+            self.chunks[row] = moved
+        self.chunks.pop()
+        return moved
+
+
+class IvfIndex(VectorIndex):
+    """
+    Inverted File (IVF) index (approximate search).
+
+    A k-means coarse quantizer partitions the vectors into `n_lists` posting
+    lists. A query only scans the `nprobe` lists whose centroids are closest,
+    one vectorized block per list. `nprobe` is the recall/throughput dial.
+
+    The quantizer retrains itself when the data has doubled since the last
+    training, or when inserts have made the posting lists badly skewed.
+
+    Posting lists hold vectors in the configured `quantization` format. The
+    quantizer is recalibrated at every (re)training.
+    """
+
+    _KMEANS_ITERATIONS = 20
+    _MAX_TRAINING_POINTS_PER_LIST = 256
+
+    def __init__(
+        self,
+        metric: Metric = Metric.COSINE,
+        n_lists: int = 64,
+        nprobe: int = 8,
+        skew_threshold: float = 4.0,
+        seed: Optional[int] = None,
+        quantization: Quantization = Quantization.NONE,
+        rerank_factor: int = 0,
+    ):
+        """
+        Args:
+        n_lists: Number of k-means centroids (posting lists).
+        nprobe: Default number of lists scanned per query. Can be overridden per query.
+        skew_threshold: Retrain when the largest list exceeds this multiple of the mean list size.
+        seed: Optional seed for reproducible k-means initialization.
+        quantization: Stored vector format ('none', 'float16' or 'int8').
+        rerank_factor: If > 0 and vectors are quantized, re-rank the top k * rerank_factor candidates exactly.
+        """
+        self._metric = metric
+        self._n_lists = n_lists
+        self._nprobe = nprobe
+        self._skew_threshold = skew_threshold
+        self._rng = np.random.default_rng(seed)
+        self._quantizer = ScalarQuantizer(quantization)
+        self._rerank_factor = rerank_factor
+
+        self._dimension: int = 0
+        self._centroids: Optional[np.ndarray] = None  # (lists, dim)
+        self._lists: List[_PostingList] = []
+        self._uid_to_pos: Dict[UUID, Tuple[int, int]] = {}  # uid -> (list, row)
+
+        self._trained_count: int = 0  # Vectors seen by the last training
+        self._inserts_since_train: int = 0
+
+    @property
+    def index_type(self) -> IndexType:
+        return IndexType.IVF
+
+    @property
+    def metric(self) -> Metric:
+        return self._metric
+
+    @property
+    def vector_count(self) -> int:
+        return len(self._uid_to_pos)
+
+    def build(self, chunks: List[Chunk]):
+        """Trains the coarse quantizer on all embeddings and fills the posting lists."""
+        valid_chunks = list(
+            {c.uid: c for c in chunks if c.embedding is not None}.values()
+        )
+
+        self._dimension = 0
+        self._centroids = None
+        self._lists = []
+        self._uid_to_pos.clear()
+        self._trained_count = 0
+        self._inserts_since_train = 0
+        self._quantizer.reset()
+
+        if not valid_chunks:
+            return
+
+        vectors = np.array([c.embedding for c in valid_chunks], dtype=np.float32)
+        if self.metric == Metric.COSINE:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors /= norms
+
+        self._dimension = vectors.shape[1]
+        self._train(valid_chunks, vectors)
+
+    def insert(self, chunk: Chunk):
+        """Assigns a chunk to its nearest centroid's posting list."""
+        if chunk.embedding is None:
+            return
+
+        vector = self._prepare_vector(chunk.embedding)
+
+        if self._dimension == 0:
+            # First vector of an empty index becomes the first centroid
+            self._dimension = len(vector)
+            self._centroids = vector[None, :].copy()
+            self._lists = [_PostingList(self._dimension, self._quantizer.dtype)]
+        elif len(vector) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, got {len(vector)}"
+            )
+
+        if chunk.uid in self._uid_to_pos:
+            self.delete(chunk.uid)
+
+        list_id = int(self._nearest_lists(vector, 1)[0])
+        row = self._lists[list_id].append(chunk, self._quantizer.encode(vector))
+        self._uid_to_pos[chunk.uid] = (list_id, row)
+
+        self._inserts_since_train += 1
+        if self._needs_retrain():
+            self._retrain()
+
+    def delete(self, chunk_id: UUID):
+        """Removes a chunk from its posting list (swap-with-last inside the list)."""
+        pos = self._uid_to_pos.pop(chunk_id, None)
+        if pos is None:
+            return
+
+        list_id, row = pos
+        moved = self._lists[list_id].remove(row)
+        if moved is not None:
+            self._uid_to_pos[moved.uid] = (list_id, row)
+
+    def search(
+        self,
+        query_embedding: List[float],
+        k: int,
+        nprobe: Optional[int] = None,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Scans the `nprobe` posting lists closest to the query, with one
+        matrix-vector product per list, and merges their top-k candidates.
+        """
+        if not self._uid_to_pos or k <= 0:
+            return []
+        return self._search(query_embedding, k, nprobe)
+
+    def search_filtered(
+        self,
+        query_embedding: List[float],
+        k: int,
+        chunk_filter: ChunkFilter,
+        nprobe: Optional[int] = None,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Filtered search. Selective filters score the matching chunks exactly.
+        Otherwise only the matching entries of each probed list are scored,
+        and lists keep being probed, closest first, past `nprobe` until
+        there are k candidates.
+        """
+        if not self._uid_to_pos or k <= 0 or not len(chunk_filter):
+            return []
+        if chunk_filter.prefilter:
+            return self._search_prefiltered(query_embedding, k, chunk_filter)
+        return self._search(query_embedding, k, nprobe, chunk_filter)
+
+    def _search(
+        self,
+        query_embedding: List[float],
+        k: int,
+        nprobe: Optional[int],
+        chunk_filter: Optional[ChunkFilter] = None,
+    ) -> List[Tuple[Chunk, float]]:
+        query_vector = self._prepare_vector(query_embedding)
+        if len(query_vector) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, got {len(query_vector)}"
+            )
+
+        rerank = self._quantizer.is_lossy and self._rerank_factor > 0
+        final_k = k
+        if rerank:
+            k = k * self._rerank_factor
+
+        nprobe = nprobe or self._nprobe
+        if chunk_filter is None:
+            probe_lists = self._nearest_lists(query_vector, nprobe)
+        else:
+            # Every list in probe order; the scan stops once it has enough
+            probe_lists = self._nearest_lists(query_vector, len(self._lists))
+        prepared_query = self._quantizer.prepare_query(query_vector)
+
+        all_keys: List[np.ndarray] = []
+        all_chunks: List[Chunk] = []
+        for probed, list_id in enumerate(probe_lists):
+            if chunk_filter is not None and probed >= nprobe and len(all_chunks) >= k:
+                break
+            posting = self._lists[list_id]
+            if posting.size == 0:
+                continue
+            keys = self._list_distances(
+                query_vector, prepared_query, posting.vectors[: posting.size]
+            )
+            chunks = posting.chunks
+            if chunk_filter is not None:
+                matching = [i for i, c in enumerate(chunks) if c.uid in chunk_filter]
+                keys = keys[matching]
+                chunks = [chunks[i] for i in matching]
+            all_keys.append(keys)
+            all_chunks.extend(chunks)
+
+        if not all_chunks:
+            return []
+
+        keys = np.concatenate(all_keys)
+        top = top_k_rows(keys, k)
+
+        if rerank:
+            candidates = [all_chunks[i] for i in top]
+            return rerank_exact(query_embedding, candidates, final_k, self.metric)
+
+        return [(all_chunks[i], self._to_score(float(keys[i]))) for i in top]
+
+    # --- Persistence ---
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "metric": self._metric,
+            "n_lists": self._n_lists,
+            "nprobe": self._nprobe,
+            "skew_threshold": self._skew_threshold,
+            "quantization": self._quantizer.mode,
+            "rerank_factor": self._rerank_factor,
+        }
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Posting lists are written back to back as one block; `list_sizes` splits it."""
+        state = {
+            "dimension": self._dimension,
+            "trained_count": self._trained_count,
+            "inserts_since_train": self._inserts_since_train,
+            "rng": self._rng.bit_generator.state,
+        }
+        arrays = self._quantizer.dump_arrays()
+        if self._centroids is None:
+            return state, arrays
+
+        arrays["centroids"] = self._centroids
+        arrays["vectors"] = np.concatenate(
+            [posting.vectors[: posting.size] for posting in self._lists]
+        )
+        arrays["list_sizes"] = np.array(
+            [posting.size for posting in self._lists], dtype=np.int64
+        )
+        arrays["uids"] = uids_to_array(
+            chunk.uid for posting in self._lists for chunk in posting.chunks
+        )
+        return state, arrays
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, Chunk],
+    ):
+        self._quantizer.restore_arrays(arrays)
+        self._rng.bit_generator.state = state["rng"]
+        self._trained_count = state["trained_count"]
+        self._inserts_since_train = state["inserts_since_train"]
+        if "centroids" not in arrays:
+            return
+
+        self._dimension = state["dimension"]
+        self._centroids = np.array(arrays["centroids"])
+        vectors = arrays["vectors"]
+        all_chunks = resolve_chunks(arrays["uids"], chunks)
+
+        start = 0
+        for list_id, size in enumerate(arrays["list_sizes"].tolist()):
+            posting = _PostingList(self._dimension, self._quantizer.dtype)
+            if size:
+                # A full view of the mapped block: the first append grows it into memory
+                posting.vectors = vectors[start : start + size]
+                posting.chunks = all_chunks[start : start + size]
+            for row, chunk in enumerate(posting.chunks):
+                self._uid_to_pos[chunk.uid] = (list_id, row)
+            self._lists.append(posting)
+            start += size
+
+    # --- Coarse quantizer ---
+
+    def _train(self, chunks: List[Chunk], vectors: np.ndarray):
+        """Runs k-means over `vectors` and rebuilds all posting lists from scratch."""
+        n_lists = max(1, min(self._n_lists, len(chunks)))
+        self._centroids = kmeans(
+            vectors,
+            n_lists,
+            self._rng,
+            metric=self.metric,
+            iterations=self._KMEANS_ITERATIONS,
+            max_points_per_cluster=self._MAX_TRAINING_POINTS_PER_LIST,
+        )
+        self._lists = [
+            _PostingList(self._dimension, self._quantizer.dtype) for _ in range(n_lists)
+        ]
+        self._uid_to_pos.clear()
+
+        assignments = assign_to_centroids(vectors, self._centroids, self.metric)
+        self._quantizer.fit(vectors)
+        codes = self._quantizer.encode(vectors)
+        for chunk, vector, list_id in zip(chunks, codes, assignments.tolist()):
+            row = self._lists[list_id].append(chunk, vector)
+            self._uid_to_pos[chunk.uid] = (list_id, row)
+
+        self._trained_count = len(chunks)
+        self._inserts_since_train = 0
+
+    def _retrain(self):
+        chunks: List[Chunk] = []
+        blocks: List[np.ndarray] = []
+        for posting in self._lists:
+            chunks.extend(posting.chunks)
+            blocks.append(posting.vectors[: posting.size])
+
+        if self._quantizer.is_lossy:
+            # Retrain from the exact embeddings, not the lossy stored vectors
+            vectors = np.array(
+                [self._prepare_vector(c.embedding) for c in chunks], dtype=np.float32
+            )
+        else:
+            vectors = np.concatenate(blocks)
+        self._train(chunks, vectors)
+
+    def _needs_retrain(self) -> bool:
+        """
+        Retrain when the data has doubled since the last training (the
+        centroids no longer represent it), or when the largest list exceeds
+        `skew_threshold` x the mean size. The skew check waits for the data
+        to grow by a quarter, so inherently skewed data can't cause a
+        retraining loop.
+        """
+        count = len(self._uid_to_pos)
+        if count >= 2 * max(self._trained_count, 1):
+            return True
+
+        if self._inserts_since_train < max(self._n_lists, self._trained_count // 4):
+            return False
+
+        sizes = [posting.size for posting in self._lists]
+        mean_size = count / len(sizes)
+        return max(sizes) > self._skew_threshold * mean_size
+
+    def _nearest_lists(self, vector: np.ndarray, nprobe: int) -> np.ndarray:
+        return top_k_rows(self._distances(vector, self._centroids), nprobe)
+
+    # --- Internal helpers ---
+
+    def _distances(self, query: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """Internal distance: 1 - cosine, or squared Euclidean. Lower is closer."""
+        if self.metric == Metric.COSINE:
+            return 1.0 - vectors @ query
+        diff = vectors - query
+        return np.einsum("ij,ij->i", diff, diff)
+
+    def _list_distances(
+        self,
+        query: np.ndarray,
+        prepared_query: Tuple[np.ndarray, float],
+        vectors: np.ndarray,
+    ) -> np.ndarray:
+        """`_distances` over a posting list block, scored on its stored format."""
+        if self.metric == Metric.COSINE:
+            return 1.0 - self._quantizer.dot(vectors, prepared_query)
+        diff = self._quantizer.decode(vectors) - query
+        return np.einsum("ij,ij->i", diff, diff)
+
+    def _to_score(self, dist: float) -> float:
+        if self.metric == Metric.COSINE:
+            return 1.0 - dist
+        return float(np.sqrt(max(dist, 0.0)))
@@ -1,13 +1,15 @@
 # src/core/indexing/lsh_index.py
 
 from uuid import UUID
-from typing import List, Tuple, Dict, Set, Optional
+from typing import Any, List, Mapping, Tuple, Dict, Set, Optional
 import numpy as np
 import heapq
 
 from src.core.models import Chunk
-from .base_index import VectorIndex
-from .enums import IndexType, Metric
+from .base_index import VectorIndex, top_k_rows
+from .enums import IndexType, Metric, Quantization
+from .quantization import ScalarQuantizer, rerank_exact
+from .vector_store import VectorStore
 from src.core.exceptions import IndexNotReady
 
 
@@ -15,6 +17,10 @@ class LshIndex(VectorIndex):
     """
     Locality Sensitive Hashing (LSH) using Random Projections.
     Best for Cosine Similarity. Supports dynamic updates.
+
+    Multi-probe querying: besides the query's own bucket, each table can also
+    visit `num_probes` neighbouring buckets, obtained by flipping the bits
+    whose projections were closest to zero (Lv et al., 2007).
     """
 
     def __init__(
@@ -22,29 +28,42 @@ class LshIndex(VectorIndex):
         num_bits: int = 8,
         num_tables: int = 3,
         seed: Optional[int] = None,
+        quantization: Quantization = Quantization.NONE,
+        rerank_factor: int = 0,
+        num_probes: int = 0,
     ):
         """
         Args:
         num_bits: Number of hyperplanes per table. Higher = fewer collisions (precision), lower recall.
         num_tables: Number of independent hash tables. Higher = higher recall, more memory.
         seed: Optional seed for reproducibility. If None, uses entropy from OS.
+        num_probes: Default number of extra buckets probed per table. Can be overridden per query.
+        quantization: Stored vector format ('none', 'float16' or 'int8').
+        rerank_factor: If > 0 and vectors are quantized, re-rank the top k * rerank_factor candidates exactly.
         """
+        if not 1 <= num_bits <= 64:
+            raise ValueError("LSH 'num_bits' must be between 1 and 64.")
+
         self._num_bits = num_bits
         self._num_tables = num_tables
+        self._num_probes = num_probes
         self._metric = Metric.COSINE
+        self._quantizer = ScalarQuantizer(quantization)
+        self._rerank_factor = rerank_factor
 
         self._rng = np.random.default_rng(seed)
 
-        # List of hyperplanes (random normal vectors) for each table
-        # Shape per table: (dimension, num_bits)
-        self._planes: List[np.ndarray] = []
+        # Hyperplanes of every table side by side, shape (dimension, num_tables * num_bits).
+        # Columns [t * num_bits, (t + 1) * num_bits) belong to table t.
+        self._planes: Optional[np.ndarray] = None
+        # Bit i of a signature is shifted by i when packing it into an integer
+        self._bit_shifts = np.arange(num_bits, dtype=np.uint64)
 
-        # List of hash tables. Each table maps a hash string to a list of chunk UUIDs
-        self._tables: List[Dict[str, Set[UUID]]] = []
+        # List of hash tables. Each table maps an integer signature to a set of chunk UUIDs
+        self._tables: List[Dict[int, Set[UUID]]] = []
 
-        # Storage for the actual vectors/chunks for re-ranking
-        self._chunks: Dict[UUID, Chunk] = {}
-        self._vectors: Dict[UUID, np.ndarray] = {}
+        # Vectors (in the quantizer's stored format) and chunks for re-ranking
+        self._vectors = VectorStore(self._quantizer.dtype)
         self._dimension: int = 0
 
     @property
@@ -57,60 +76,108 @@ class LshIndex(VectorIndex):
 
     @property
     def vector_count(self) -> int:
-        return len(self._chunks)
+        return len(self._vectors)
 
     def _initialize_planes(self, dimension: int):
         """Initializes random hyperplanes if not already done."""
-        if not self._planes:
+        if self._planes is None:
             self._dimension = dimension
 
-            for _ in range(self._num_tables):
-                # Create random vectors from normal distribution
-                planes = self._rng.standard_normal((dimension, self._num_bits))
-                self._planes.append(planes)
-                self._tables.append({})
-
-    def _hash_vector(self, vector: np.ndarray, table_index: int) -> str:
-        """Computes the hash signature (bit string) for a vector in a specific table."""
-        # Projection: dot product determines which side of the hyperplane the vector is on
-        # Result shape: (num_bits,)
-        projections = np.dot(vector, self._planes[table_index])
+            # Drawn table by table, then stacked, so one matmul hashes every table
+            self._planes = np.hstack(
+                [
+                    self._rng.standard_normal((dimension, self._num_bits))
+                    for _ in range(self._num_tables)
+                ]
+            ).astype(np.float32)
+            self._tables = [{} for _ in range(self._num_tables)]
 
-        # Convert to bits: 1 if > 0, else 0
-        bits = (projections > 0).astype(int)
-
-        # Convert numpy array of bits to a string "1010..."
-        return "".join(bits.astype(str))
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Projects one vector or a batch on every table's planes with a single
+        matmul. Returns shape (num_tables, num_bits) or (n, num_tables, num_bits).
+        """
+        projections = vectors @ self._planes
+        return projections.reshape(
+            projections.shape[:-1] + (self._num_tables, self._num_bits)
+        )
+
+    def _pack(self, projections: np.ndarray) -> np.ndarray:
+        """Packs projection signs into uint64 keys; bit i is set when plane i is > 0."""
+        bits = (projections > 0).astype(np.uint64)
+        return np.bitwise_or.reduce(bits << self._bit_shifts, axis=-1)
+
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        """Every table's integer signature, shape (num_tables,) or (n, num_tables)."""
+        return self._pack(self._project(vectors))
+
+    @staticmethod
+    def _probe_masks(margins: np.ndarray, num_probes: int) -> List[int]:
+        """
+        XOR masks of the `num_probes` most likely neighbouring buckets for
+        one table, best first. A perturbation set (bits to flip) scores the
+        sum of its squared projection margins. Sets are generated in score
+        order with the shift/expand heap of Lv et al., on bits sorted by margin.
+        """
+        order = np.argsort(margins)
+        sq = (margins[order] ** 2).tolist()
+        bits = [1 << int(b) for b in order]
+
+        masks: List[int] = []
+        heap = [(sq[0], (0,))]
+        while heap and len(masks) < num_probes:
+            score, positions = heapq.heappop(heap)
+            masks.append(sum(bits[p] for p in positions))
+
+            last = positions[-1]
+            if last + 1 < len(sq):
+                # Shift: replace the last bit with the next one
+                heapq.heappush(
+                    heap,
+                    (score - sq[last] + sq[last + 1], positions[:-1] + (last + 1,)),
+                )
+                # Expand: also flip the next bit
+                heapq.heappush(heap, (score + sq[last + 1], positions + (last + 1,)))
+
+        return masks
 
     def build(self, chunks: List[Chunk]):
-        """Bulk build."""
+        """Bulk build. All signatures are computed with one matmul."""
         # 1. Clear existing data
-        self._chunks.clear()
         self._vectors.clear()
-        self._planes.clear()
-        self._tables.clear()
+        self._planes = None
+        self._tables = []
         self._dimension = 0
+        self._quantizer.reset()
 
-        valid_chunks = [c for c in chunks if c.embedding]
+        valid_chunks = list(
+            {c.uid: c for c in chunks if c.embedding is not None}.values()
+        )
         if not valid_chunks:
             return
 
+        vectors = np.array(
+            [self._prepare_vector(c.embedding) for c in valid_chunks], dtype=np.float32
+        )
+
         # Initialize dimensions based on the first vector
-        dim = len(valid_chunks[0].embedding)
-        self._initialize_planes(dim)
+        self._initialize_planes(vectors.shape[1])
 
-        for chunk in valid_chunks:
-            self.insert(chunk)
+        self._quantizer.fit(vectors)
+        stored = self._quantizer.encode(vectors)
+        signatures = self._signatures(self._quantizer.decode(stored)).tolist()
+
+        self._vectors.put_many(valid_chunks, stored)
+        for chunk, keys in zip(valid_chunks, signatures):
+            for table, key in zip(self._tables, keys):
+                table.setdefault(key, set()).add(chunk.uid)
 
     def insert(self, chunk: Chunk):
         """Adds a single chunk to the index dynamically."""
-        if not chunk.embedding:
+        if chunk.embedding is None:
             return
 
-        vector = np.array(chunk.embedding, dtype=np.float32)
-        norm = np.linalg.norm(vector)
-        if norm > 0:
-            vector /= norm
+        vector = self._prepare_vector(chunk.embedding)
 
         # Check dimension consistency
         if self._dimension == 0:
@@ -124,85 +191,132 @@ class LshIndex(VectorIndex):
             self.delete(chunk.uid)
 
         # Store data
-        self._chunks[chunk.uid] = chunk
-        self._vectors[chunk.uid] = vector
+        stored = self._quantizer.encode(vector)
+        self._vectors.put(chunk, stored)
 
-        # Index into each table
-        for i in range(self._num_tables):
-            signature = self._hash_vector(vector, i)
-            if signature not in self._tables[i]:
-                self._tables[i][signature] = set()
-            self._tables[i][signature].add(chunk.uid)
+        # Index into each table. The stored vector is hashed (not the input),
+        # so delete() recomputes exactly the same signatures.
+        signatures = self._signatures(self._quantizer.decode(stored)).tolist()
+        for table, key in zip(self._tables, signatures):
+            table.setdefault(key, set()).add(chunk.uid)
 
     def delete(self, chunk_id: UUID):
         """Removes a chunk from the index."""
         if chunk_id not in self._vectors:
             return
 
-        vector = self._vectors[chunk_id]
+        vector = self._quantizer.decode(self._vectors[chunk_id])
 
         # Remove from all tables
-        for i in range(self._num_tables):
-            signature = self._hash_vector(vector, i)
-            if signature in self._tables[i]:
-                self._tables[i][signature].discard(chunk_id)
+        for table, key in zip(self._tables, self._signatures(vector).tolist()):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(chunk_id)
                 # Cleanup empty buckets to save memory
-                if not self._tables[i][signature]:
-                    del self._tables[i][signature]
+                if not bucket:
+                    del table[key]
 
         # Remove storage
-        self._chunks.pop(chunk_id, None)
-        self._vectors.pop(chunk_id, None)
+        self._vectors.delete(chunk_id)
 
-    def search(self, query_embedding: List[float], k: int) -> List[Tuple[Chunk, float]]:
+    def search(
+        self,
+        query_embedding: List[float],
+        k: int,
+        num_probes: Optional[int] = None,
+        **search_params,
+    ) -> List[Tuple[Chunk, float]]:
         """
         Approximate search using LSH buckets + Brute-force re-ranking with a Min-Heap.
+        Each table visits the query's bucket plus up to `num_probes` neighbouring
+        buckets, ordered by the smallest projection margins.
         """
-        if not self._planes or not self._vectors:
+        if self._planes is None or not len(self._vectors) or k <= 0:
             return []
 
-        query_vector = np.array(query_embedding, dtype=np.float32)
-        norm = np.linalg.norm(query_vector)
-        if norm > 0:
-            query_vector /= norm
+        query_vector = self._prepare_vector(query_embedding)
+        projections = self._project(query_vector)
+        probes = self._num_probes if num_probes is None else num_probes
 
         # 1. Collect Candidates
         candidate_ids: Set[UUID] = set()
-        for i in range(self._num_tables):
-            signature = self._hash_vector(query_vector, i)
+        for table, key, table_projections in zip(
+            self._tables, self._pack(projections).tolist(), projections
+        ):
             # Add all IDs found in this bucket
-            bucket_ids = self._tables[i].get(signature, set())
-            candidate_ids.update(bucket_ids)
+            candidate_ids.update(table.get(key, ()))
+            if probes > 0:
+                for mask in self._probe_masks(np.abs(table_projections), probes):
+                    candidate_ids.update(table.get(key ^ mask, ()))
 
         if not candidate_ids:
             return []
 
-        # 2. Re-rank Candidates using Min-Heap
-        # Candidates list
-        candidates = list(candidate_ids)
-
-        # Min-heap to store (score, unique_id, chunk)
-        candidates_heap = []
-
-        for uid in candidates:
-            chunk = self._chunks[uid]
-            vector = self._vectors[uid]
-
-            score = float(np.dot(vector, query_vector))
-
-            heapq.heappush(candidates_heap, (score, uid, chunk))
-
-            if len(candidates_heap) > k:
-                heapq.heappop(candidates_heap)
-
-        # 3. Sort and Format Results
-        # The heap contains the top-k, but unsorted (or sorted by min).
-        # We want descending order (highest score first).
-        results = []
-
-        sorted_candidates = sorted(candidates_heap, key=lambda x: x[0], reverse=True)
+        # 2. Re-rank Candidates: one gather of their rows and one product
+        rows = np.fromiter(
+            (self._vectors.row(uid) for uid in candidate_ids),
+            dtype=np.int64,
+            count=len(candidate_ids),
+        )
+
+        final_k = k
+        rerank = self._quantizer.is_lossy and self._rerank_factor > 0
+        if rerank:
+            k = k * self._rerank_factor
+        prepared_query = self._quantizer.prepare_query(query_vector)
+
+        scores = self._quantizer.dot(self._vectors.vectors[rows], prepared_query)
+        # 3. Sort and Format Results (highest score first)
+        top = top_k_rows(-scores, k)
+
+        if rerank:
+            candidates = [self._vectors.chunk(rows[i]) for i in top]
+            return rerank_exact(query_embedding, candidates, final_k, self.metric)
+
+        return [(self._vectors.chunk(rows[i]), float(scores[i])) for i in top]
+
+    # --- Persistence ---
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "num_bits": self._num_bits,
+            "num_tables": self._num_tables,
+            "num_probes": self._num_probes,
+            "quantization": self._quantizer.mode,
+            "rerank_factor": self._rerank_factor,
+        }
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        Bucket tables are written as one (n, num_tables) uint64 signature
+        matrix, aligned with the store's live `rows`; `_restore_state` regroups it.
+        """
+        state = {"dimension": self._dimension, "rng": self._rng.bit_generator.state}
+        arrays = self._quantizer.dump_arrays()
+        if self._planes is not None:
+            arrays.update(self._vectors.dump_arrays())
+            arrays["planes"] = self._planes
+            live = arrays["vectors"][arrays["rows"]]
+            arrays["signatures"] = self._signatures(self._quantizer.decode(live))
+        return state, arrays
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, Chunk],
+    ):
+        self._quantizer.restore_arrays(arrays)
+        self._rng.bit_generator.state = state["rng"]
+        if "planes" not in arrays:
+            return
 
-        for score, _, chunk in sorted_candidates:
-            results.append((chunk, score))
+        self._dimension = state["dimension"]
+        self._planes = np.array(arrays["planes"])
+        self._tables = [{} for _ in range(self._num_tables)]
+        self._vectors.restore_arrays(arrays, chunks)
 
-        return results
+        for row, keys in zip(arrays["rows"].tolist(), arrays["signatures"].tolist()):
+            uid = self._vectors.chunk(row).uid
+            for table, key in zip(self._tables, keys):
+                table.setdefault(key, set()).add(uid)
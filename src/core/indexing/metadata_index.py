@@ -0,0 +1,339 @@
+# src/core/indexing/metadata_index.py
+
+import bisect
+from typing import Any, Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
+from uuid import UUID
+
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+from typing_extensions import Annotated
+
+from .bitmap import RowBitmap
+
+if TYPE_CHECKING:
+    from src.core.models import Chunk
+
+# Filters passing at most this share of a library's chunks are answered by
+# scoring just those chunks (pre-filter); broader ones filter the candidates
+# of a regular index search (post-filter).
+PREFILTER_SELECTIVITY = 0.05
+
+# (key, type tag, value). The tag keeps True apart from 1 and "1" apart from 1.
+Term = Tuple[str, str, Hashable]
+
+_RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+
+
+def _term(key: str, value: Any) -> Optional[Term]:
+    """The inverted-index term of a metadata value; None for values that are not indexed."""
+    if isinstance(value, bool):
+        return (key, "bool", value)
+    if isinstance(value, (int, float)):
+        # NaN equals nothing, itself included
+        return (key, "number", value) if value == value else None
+    if isinstance(value, str):
+        return (key, "str", value)
+    if value is None:
+        return (key, "null", None)
+    return None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# ============================================================================
+# FILTER EXPRESSIONS
+# ============================================================================
+
+
+class MetadataFilter:
+    """
+    A parsed filter over `Chunk.metadata`, in a MongoDB-like syntax:
+
+        {"tenant": "acme"}                              equality
+        {"lang": {"$in": ["en", "fr"]}}                 membership
+        {"year": {"$gte": 2020, "$lt": 2024}}           numeric range
+        {"$or": [{"source": "wiki"}, {"stars": {"$gt": 4}}]}
+
+    The fields of one object must all match (and); "$and" and "$or" take a
+    list of such objects. Values are strings, numbers, booleans or null.
+    """
+
+    def __init__(self, expression: Dict[str, Any]):
+        self.expression = expression
+        self._root = _parse_object(expression)
+
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        """The rows of `index` whose chunks match."""
+        return self._root.evaluate(index)
+
+    def __repr__(self) -> str:
+        return f"MetadataFilter({self.expression!r})"
+
+
+def parse_filter(value: Any) -> MetadataFilter:
+    if isinstance(value, MetadataFilter):
+        return value
+    if not isinstance(value, dict):
+        raise ValueError("A filter must be an object.")
+    return MetadataFilter(value)
+
+
+# A filter expression in API schemas: validated into a MetadataFilter, and
+# serialized back to the expression it was parsed from
+FilterExpression = Annotated[
+    MetadataFilter,
+    PlainValidator(parse_filter),
+    PlainSerializer(lambda metadata_filter: metadata_filter.expression),
+    WithJsonSchema({"type": "object"}),
+]
+
+
+class _Node:
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        raise NotImplementedError
+
+
+class _Equals(_Node):
+    def __init__(self, term: Term):
+        self.term = term
+
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        return index.posting(self.term)
+
+
+class _In(_Node):
+    def __init__(self, terms: List[Term]):
+        self.terms = terms
+
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        return RowBitmap.union(index.posting(term) for term in self.terms)
+
+
+class _Range(_Node):
+    def __init__(self, key: str, bounds: Dict[str, float]):
+        self.key = key
+        self.bounds = bounds
+
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        values = index.numbers(self.key)
+        start, end = 0, len(values)
+        if "$gt" in self.bounds:
+            start = max(start, bisect.bisect_right(values, self.bounds["$gt"]))
+        if "$gte" in self.bounds:
+            start = max(start, bisect.bisect_left(values, self.bounds["$gte"]))
+        if "$lt" in self.bounds:
+            end = min(end, bisect.bisect_left(values, self.bounds["$lt"]))
+        if "$lte" in self.bounds:
+            end = min(end, bisect.bisect_right(values, self.bounds["$lte"]))
+        return RowBitmap.union(
+            index.posting((self.key, "number", value)) for value in values[start:end]
+        )
+
+
+class _And(_Node):
+    def __init__(self, children: List[_Node]):
+        self.children = children
+
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        # Smallest first, so the running intersection shrinks fastest
+        bitmaps = sorted((child.evaluate(index) for child in self.children), key=len)
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result
+
+
+class _Or(_Node):
+    def __init__(self, children: List[_Node]):
+        self.children = children
+
+    def evaluate(self, index: "MetadataIndex") -> RowBitmap:
+        return RowBitmap.union(child.evaluate(index) for child in self.children)
+
+
+def _parse_object(expression: Any) -> _Node:
+    if not isinstance(expression, dict) or not expression:
+        raise ValueError("Filter conditions must be non-empty objects.")
+
+    nodes = []
+    for key, condition in expression.items():
+        if key in ("$and", "$or"):
+            if not isinstance(condition, list) or not condition:
+                raise ValueError(f"'{key}' takes a non-empty list of conditions.")
+            children = [_parse_object(child) for child in condition]
+            nodes.append(_And(children) if key == "$and" else _Or(children))
+        elif key.startswith("$"):
+            raise ValueError(f"Unknown filter operator '{key}'.")
+        else:
+            nodes.append(_parse_field(key, condition))
+    return nodes[0] if len(nodes) == 1 else _And(nodes)
+
+
+def _parse_field(key: str, condition: Any) -> _Node:
+    if not isinstance(condition, dict):
+        return _Equals(_scalar_term(key, condition))
+    if not condition:
+        raise ValueError(f"Empty condition for '{key}'.")
+
+    nodes = []
+    bounds = {}
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            nodes.append(_Equals(_scalar_term(key, operand)))
+        elif operator == "$in":
+            if not isinstance(operand, list) or not operand:
+                raise ValueError(f"'$in' on '{key}' takes a non-empty list.")
+            nodes.append(_In([_scalar_term(key, value) for value in operand]))
+        elif operator in _RANGE_OPERATORS:
+            if not _is_number(operand) or operand != operand:
+                raise ValueError(f"'{operator}' on '{key}' takes a number.")
+            bounds[operator] = operand
+        else:
+            raise ValueError(f"Unknown filter operator '{operator}' on '{key}'.")
+    if bounds:
+        nodes.append(_Range(key, bounds))
+    return nodes[0] if len(nodes) == 1 else _And(nodes)
+
+
+def _scalar_term(key: str, value: Any) -> Term:
+    term = _term(key, value)
+    if term is None:
+        raise ValueError(
+            f"Filter values for '{key}' must be strings, numbers, booleans or null."
+        )
+    return term
+
+
+# ============================================================================
+# INVERTED INDEX
+# ============================================================================
+
+
+class MetadataIndex:
+    """
+    Inverted index over the metadata of a library's chunks.
+
+    Every chunk gets a row (rows of removed chunks are reused), and every
+    scalar metadata value a posting: a RowBitmap of the rows holding it.
+    Numeric values are also kept sorted per key, so a range is the union
+    of the postings between two bisections. Non-scalar values are not indexed
+    and never match.
+    """
+
+    def __init__(self):
+        self._uid_to_row: Dict[UUID, int] = {}
+        self._row_chunks: List[Optional["Chunk"]] = []
+        self._free: List[int] = []
+        self._postings: Dict[Term, RowBitmap] = {}
+        self._numbers: Dict[str, List[float]] = {}  # key -> sorted distinct values
+
+    def __len__(self) -> int:
+        return len(self._uid_to_row)
+
+    def posting(self, term: Term) -> RowBitmap:
+        return self._postings.get(term) or RowBitmap()
+
+    def numbers(self, key: str) -> List[float]:
+        return self._numbers.get(key, [])
+
+    def put(self, chunk: "Chunk"):
+        """Indexes a chunk, replacing the entry of a previous version."""
+        row = self._uid_to_row.get(chunk.uid)
+        if row is None:
+            row = self._free.pop() if self._free else len(self._row_chunks)
+            if row == len(self._row_chunks):
+                self._row_chunks.append(None)
+            self._uid_to_row[chunk.uid] = row
+        else:
+            previous = self._row_chunks[row]
+            if previous.metadata == chunk.metadata:
+                self._row_chunks[row] = chunk
+                return
+            self._unindex(row, previous)
+
+        self._row_chunks[row] = chunk
+        for key, value in chunk.metadata.items():
+            term = _term(key, value)
+            if term is None:
+                continue
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = RowBitmap()
+                if term[1] == "number":
+                    bisect.insort(self._numbers.setdefault(key, []), value)
+            posting.add(row)
+
+    def delete(self, chunk_id: UUID):
+        row = self._uid_to_row.pop(chunk_id, None)
+        if row is None:
+            return
+        self._unindex(row, self._row_chunks[row])
+        self._row_chunks[row] = None
+        self._free.append(row)
+
+    def select(self, metadata_filter: MetadataFilter) -> "ChunkFilter":
+        return ChunkFilter(self, metadata_filter.evaluate(self))
+
+    def copy(self) -> "MetadataIndex":
+        """An independent copy that shares the (immutable) chunks."""
+        copied = MetadataIndex()
+        copied._uid_to_row = dict(self._uid_to_row)
+        copied._row_chunks = list(self._row_chunks)
+        copied._free = list(self._free)
+        copied._postings = {term: p.copy() for term, p in self._postings.items()}
+        copied._numbers = {key: list(v) for key, v in self._numbers.items()}
+        return copied
+
+    def _unindex(self, row: int, chunk: "Chunk"):
+        for key, value in chunk.metadata.items():
+            term = _term(key, value)
+            posting = self._postings.get(term) if term is not None else None
+            if posting is None:
+                continue
+            posting.discard(row)
+            if not posting:
+                del self._postings[term]
+                if term[1] == "number":
+                    values = self._numbers[key]
+                    del values[bisect.bisect_left(values, value)]
+                    if not values:
+                        del self._numbers[key]
+
+
+class ChunkFilter:
+    """
+    The chunks of one library that match a MetadataFilter, as handed to the
+    vector indices. Membership is an O(1) uid -> row -> bitmap lookup.
+
+    `prefilter` tells an index which strategy the selectivity calls for:
+    score only the matching chunks, or filter the candidates of its
+    regular search, widening it until enough of them pass.
+    """
+
+    def __init__(self, index: MetadataIndex, rows: RowBitmap):
+        self._index = index
+        self._rows = rows
+        self._count = len(rows)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, chunk_id: UUID) -> bool:
+        row = self._index._uid_to_row.get(chunk_id)
+        return row is not None and row in self._rows
+
+    @property
+    def selectivity(self) -> float:
+        """The share of the library's chunks that match."""
+        return self._count / len(self._index) if len(self._index) else 0.0
+
+    @property
+    def prefilter(self) -> bool:
+        return self.selectivity <= PREFILTER_SELECTIVITY
+
+    def chunks(self) -> List["Chunk"]:
+        row_chunks = self._index._row_chunks
+        return [row_chunks[row] for row in self._rows.to_array().tolist()]
@@ -0,0 +1,310 @@
+# src/core/indexing/pq_index.py
+
+from uuid import UUID
+from typing import Any, List, Mapping, Tuple, Dict, Optional
+import numpy as np
+
+from src.core.models import Chunk
+from .base_index import VectorIndex, uids_to_array, resolve_chunks, top_k_rows
+from .enums import IndexType, Metric
+from .clustering import kmeans
+from .quantization import rerank_exact
+
+
+class PqIndex(VectorIndex):
+    """
+    Product Quantization (PQ) index (approximate, compressed search).
+
+    Each vector is split into `num_subspaces` sub-vectors, and each
+    sub-vector is replaced by the id of its nearest centroid in that
+    subspace's codebook. A vector is stored as `num_subspaces` uint8 codes
+    (e.g. 64 bytes instead of 4 KB for a 1024-dim float32 vector).
+
+    Search uses Asymmetric Distance Computation (ADC): the query stays
+    uncompressed, a (subspaces x centroids) lookup table is precomputed,
+    and every code row is scored with table lookups. The top
+    `k * rerank_factor` candidates can optionally be re-ranked exactly
+    from the chunks' own embeddings.
+
+    Codebooks are trained in `build()` and retrained whenever the data has
+    doubled since the last training.
+    """
+
+    _INITIAL_CAPACITY = 1024
+    _KMEANS_ITERATIONS = 15
+
+    def __init__(
+        self,
+        metric: Metric = Metric.COSINE,
+        num_subspaces: int = 8,
+        num_centroids: int = 256,
+        rerank_factor: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+        num_subspaces: Number of sub-vectors (bytes per stored vector). More = more accurate, more memory.
+        num_centroids: Codebook size per subspace (at most 256, so codes fit in uint8).
+        rerank_factor: If > 0, re-rank the top k * rerank_factor ADC candidates with exact scores.
+        seed: Optional seed for reproducible codebook training.
+        """
+        if not 1 <= num_centroids <= 256:
+            raise ValueError("PQ 'num_centroids' must be between 1 and 256.")
+
+        self._metric = metric
+        self._num_subspaces = num_subspaces
+        self._num_centroids = num_centroids
+        self._rerank_factor = rerank_factor
+        self._rng = np.random.default_rng(seed)
+
+        self._dimension: int = 0
+        self._sub_dim: int = 0  # Dimension of each sub-vector (after zero padding)
+
+        # (subspaces, centroids, sub_dim). Codebooks may hold fewer centroids
+        # than `num_centroids` while the index is small.
+        self._codebooks: Optional[np.ndarray] = None
+        self._trained_count: int = 0
+
+        # Row-aligned storage. Only the first `_count` rows are valid.
+        self._codes: Optional[np.ndarray] = None  # (capacity, subspaces) uint8
+        self._count: int = 0
+        self._uid_to_row: Dict[UUID, int] = {}
+        self._row_chunks: List[Chunk] = []
+
+    @property
+    def index_type(self) -> IndexType:
+        return IndexType.PQ
+
+    @property
+    def metric(self) -> Metric:
+        return self._metric
+
+    @property
+    def vector_count(self) -> int:
+        return self._count
+
+    def build(self, chunks: List[Chunk]):
+        """Trains the per-subspace codebooks and encodes every chunk."""
+        valid_chunks = list(
+            {c.uid: c for c in chunks if c.embedding is not None}.values()
+        )
+
+        self._dimension = 0
+        self._sub_dim = 0
+        self._codebooks = None
+        self._trained_count = 0
+        self._codes = None
+        self._count = 0
+        self._uid_to_row.clear()
+        self._row_chunks.clear()
+
+        if not valid_chunks:
+            return
+
+        self._dimension = len(valid_chunks[0].embedding)
+        self._sub_dim = -(-self._dimension // self._num_subspaces)  # ceil division
+        self._train(valid_chunks)
+
+    def insert(self, chunk: Chunk):
+        """Encodes a chunk with the current codebooks (upsert by uid)."""
+        if chunk.embedding is None:
+            return
+
+        if self._dimension == 0:
+            self.build([chunk])
+            return
+        if len(chunk.embedding) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, "
+                f"got {len(chunk.embedding)}"
+            )
+
+        code = self._encode(self._prepare_matrix([chunk.embedding]))[0]
+
+        row = self._uid_to_row.get(chunk.uid)
+        if row is None:
+            if self._count == self._codes.shape[0]:
+                grown = np.zeros(
+                    (self._codes.shape[0] * 2, self._num_subspaces), dtype=np.uint8
+                )
+                grown[: self._count] = self._codes[: self._count]
+                self._codes = grown
+            row = self._count
+            self._count += 1
+            self._uid_to_row[chunk.uid] = row
+            self._row_chunks.append(chunk)
+        else:
+            self._row_chunks[row] = chunk
+
+        self._codes[row] = code
+
+        if self._count >= 2 * self._trained_count:
+            self._train(list(self._row_chunks))
+
+    def delete(self, chunk_id: UUID):
+        """Removes a chunk by moving the last code row into its slot."""
+        row = self._uid_to_row.pop(chunk_id, None)
+        if row is None:
+            return
+
+        last = self._count - 1
+        if row != last:
+            moved_chunk = self._row_chunks[last]
+            self._codes[row] = self._codes[last]
+            self._row_chunks[row] = moved_chunk
+            self._uid_to_row[moved_chunk.uid] = row
+
+        self._row_chunks.pop()
+        self._count = last
+
+    def search(
+        self, query_embedding: List[float], k: int, **search_params
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        ADC search over the uint8 codes, followed by an optional exact
+        re-rank of the top `k * rerank_factor` candidates.
+        """
+        if self._count == 0 or k <= 0:
+            return []
+
+        if len(query_embedding) != self._dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self._dimension}, "
+                f"got {len(query_embedding)}"
+            )
+
+        query_vector = self._prepare_matrix([query_embedding])[0]
+        query_subs = query_vector.reshape(self._num_subspaces, self._sub_dim)
+
+        # 1. Lookup table: (subspaces, centroids)
+        if self.metric == Metric.COSINE:
+            table = np.einsum("mcd,md->mc", self._codebooks, query_subs)
+            keys = -self._lookup(table)  # Higher similarity = smaller key
+        else:
+            diff = self._codebooks - query_subs[:, None, :]
+            table = np.einsum("mcd,mcd->mc", diff, diff)
+            keys = self._lookup(table)
+
+        # 2. Candidate selection on the approximate scores
+        n_candidates = k * self._rerank_factor if self._rerank_factor > 0 else k
+        rows = top_k_rows(keys, n_candidates)
+
+        if self._rerank_factor > 0:
+            candidates = [self._row_chunks[r] for r in rows]
+            return rerank_exact(query_embedding, candidates, k, self.metric)
+
+        if self.metric == Metric.COSINE:
+            return [(self._row_chunks[r], float(-keys[r])) for r in rows]
+        return [(self._row_chunks[r], float(np.sqrt(max(keys[r], 0.0)))) for r in rows]
+
+    # --- Persistence ---
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "metric": self._metric,
+            "num_subspaces": self._num_subspaces,
+            "num_centroids": self._num_centroids,
+            "rerank_factor": self._rerank_factor,
+        }
+
+    def _dump_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        state = {
+            "dimension": self._dimension,
+            "sub_dim": self._sub_dim,
+            "trained_count": self._trained_count,
+            "rng": self._rng.bit_generator.state,
+        }
+        arrays: Dict[str, np.ndarray] = {}
+        if self._codebooks is not None:
+            arrays["codebooks"] = self._codebooks
+            arrays["codes"] = self._codes[: self._count]
+            arrays["uids"] = uids_to_array(chunk.uid for chunk in self._row_chunks)
+        return state, arrays
+
+    def _restore_state(
+        self,
+        state: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        chunks: Mapping[UUID, Chunk],
+    ):
+        self._rng.bit_generator.state = state["rng"]
+        if "codebooks" not in arrays:
+            return
+
+        self._dimension = state["dimension"]
+        self._sub_dim = state["sub_dim"]
+        self._trained_count = state["trained_count"]
+        self._codebooks = arrays["codebooks"]
+        self._row_chunks = resolve_chunks(arrays["uids"], chunks)
+        self._uid_to_row = {
+            chunk.uid: row for row, chunk in enumerate(self._row_chunks)
+        }
+        self._count = len(self._row_chunks)
+        if self._count:
+            self._codes = arrays["codes"]
+        else:
+            self._codes = np.zeros(
+                (self._INITIAL_CAPACITY, self._num_subspaces), dtype=np.uint8
+            )
+
+    # --- Product quantizer ---
+
+    def _train(self, chunks: List[Chunk]):
+        """Trains one codebook per subspace, then re-encodes all chunks."""
+        vectors = self._prepare_matrix([c.embedding for c in chunks])
+        subs = vectors.reshape(len(chunks), self._num_subspaces, self._sub_dim)
+        n_centroids = min(self._num_centroids, len(chunks))
+
+        self._codebooks = np.stack(
+            [
+                kmeans(
+                    np.ascontiguousarray(subs[:, j, :]),
+                    n_centroids,
+                    self._rng,
+                    iterations=self._KMEANS_ITERATIONS,
+                )
+                for j in range(self._num_subspaces)
+            ]
+        )
+        self._trained_count = len(chunks)
+
+        self._codes = np.zeros(
+            (max(self._INITIAL_CAPACITY, len(chunks)), self._num_subspaces),
+            dtype=np.uint8,
+        )
+        self._codes[: len(chunks)] = self._encode(vectors)
+        self._count = len(chunks)
+        self._row_chunks = list(chunks)
+        self._uid_to_row = {chunk.uid: row for row, chunk in enumerate(chunks)}
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest codebook centroid per subspace -> (n, subspaces) uint8 codes."""
+        subs = vectors.reshape(len(vectors), self._num_subspaces, self._sub_dim)
+        codes = np.empty((len(vectors), self._num_subspaces), dtype=np.uint8)
+        for j in range(self._num_subspaces):
+            codebook = self._codebooks[j]
+            sq = np.einsum("ij,ij->i", codebook, codebook)
+            codes[:, j] = np.argmin(sq[None, :] - 2.0 * subs[:, j, :] @ codebook.T, 1)
+        return codes
+
+    def _lookup(self, table: np.ndarray) -> np.ndarray:
+        """Sums one table entry per subspace for every stored code row."""
+        codes = self._codes[: self._count]
+        n_centroids = table.shape[1]
+        offsets = np.arange(self._num_subspaces) * n_centroids
+        return np.take(table.ravel(), codes + offsets).sum(axis=1)
+
+    # --- Internal helpers ---
+
+    def _prepare_matrix(self, embeddings: List[List[float]]) -> np.ndarray:
+        """float32, normalized for cosine and zero-padded to subspaces * sub_dim."""
+        vectors = np.array(embeddings, dtype=np.float32)
+        if self.metric == Metric.COSINE:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors /= norms
+
+        padding = self._num_subspaces * self._sub_dim - self._dimension
+        if padding:
+            vectors = np.pad(vectors, ((0, 0), (0, padding)))
+        return vectors
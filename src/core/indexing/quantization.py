@@ -0,0 +1,167 @@
+# src/core/indexing/quantization.py
+
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
+import numpy as np
+
+from .enums import Metric, Quantization
+
+if TYPE_CHECKING:
+    from src.core.models import Chunk
+
+
+class ScalarQuantizer:
+    """
+    Stores vectors as float32, float16 or int8 and scores queries directly
+    on the stored representation.
+
+    int8 uses per-dimension min/max calibration: dimension j is mapped
+    linearly from [min_j, max_j] onto [-128, 127]. A stored vector decodes
+    to `offset + code * scale`, so a dot product with a query `q` is
+    `code . (scale * q) + offset . q`: one pass over the int8 codes with a
+    pre-scaled query.
+
+    `fit()` calibrates on a batch (indices call it from `build()`). Until
+    then, int8 falls back to a symmetric [-a, a] range, where `a` is the
+    largest magnitude in the first vectors encoded. For unit-normalized
+    (cosine) vectors that is [-1, 1]. Values outside the range are clipped.
+    """
+
+    # Rows scored per block, so the float32 upcast of int8 codes stays in cache
+    _BLOCK_ROWS = 4096
+
+    def __init__(self, mode: Quantization = Quantization.NONE):
+        self.mode = mode
+        self._scale: Optional[np.ndarray] = None  # int8 only, (dim,)
+        self._offset: Optional[np.ndarray] = None  # int8 only, (dim,)
+
+    @property
+    def dtype(self) -> np.dtype:
+        if self.mode == Quantization.INT8:
+            return np.dtype(np.int8)
+        if self.mode == Quantization.FLOAT16:
+            return np.dtype(np.float16)
+        return np.dtype(np.float32)
+
+    @property
+    def is_lossy(self) -> bool:
+        return self.mode != Quantization.NONE
+
+    def reset(self):
+        """Drops the calibration, e.g. before an index is rebuilt."""
+        self._scale = self._offset = None
+
+    def fit(self, vectors: np.ndarray):
+        """Per-dimension min/max calibration (int8 only)."""
+        self.reset()
+        if self.mode != Quantization.INT8 or len(vectors) == 0:
+            return
+
+        low = vectors.min(axis=0).astype(np.float32)
+        high = vectors.max(axis=0).astype(np.float32)
+        span = high - low
+        # Constant dimensions still need a non-zero step
+        flat = span == 0
+        low[flat] -= 1.0
+        span[flat] = 2.0
+        self._set_range(low, span)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """float32 vectors (one or a batch) -> stored representation."""
+        if self.mode == Quantization.NONE:
+            return np.asarray(vectors, dtype=np.float32)
+        if self.mode == Quantization.FLOAT16:
+            return np.asarray(vectors, dtype=np.float16)
+
+        if self._scale is None:
+            bound = max(float(np.abs(vectors).max()), 1e-6)
+            dim = vectors.shape[-1]
+            self._set_range(
+                np.full(dim, -bound, dtype=np.float32),
+                np.full(dim, 2.0 * bound, dtype=np.float32),
+            )
+
+        codes = np.rint((vectors - self._offset) / self._scale)
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Stored representation -> approximate float32 vectors."""
+        if self.mode == Quantization.INT8:
+            return codes.astype(np.float32) * self._scale + self._offset
+        return np.asarray(codes, dtype=np.float32)
+
+    def prepare_query(self, query: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Folds the int8 scale/offset into the query once per search."""
+        if self.mode == Quantization.INT8:
+            return query * self._scale, float(np.dot(self._offset, query))
+        return query, 0.0
+
+    def dot(self, codes: np.ndarray, prepared: Tuple[np.ndarray, float]):
+        """Dot products between stored vectors (one or a matrix) and a prepared query."""
+        weights, bias = prepared
+        if codes.ndim == 1 or self.mode == Quantization.NONE:
+            return codes @ weights + bias
+
+        out = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), self._BLOCK_ROWS):
+            block = codes[start : start + self._BLOCK_ROWS]
+            out[start : start + len(block)] = block.astype(np.float32) @ weights
+        return out + bias
+
+    def dot_batch(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """(Q, N) dot products between Q float32 queries and N stored vectors."""
+        if self.mode == Quantization.NONE:
+            return queries @ codes.T
+
+        weights = queries * self._scale if self.mode == Quantization.INT8 else queries
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), self._BLOCK_ROWS):
+            block = codes[start : start + self._BLOCK_ROWS]
+            out[:, start : start + len(block)] = weights @ block.astype(np.float32).T
+        if self.mode == Quantization.INT8:
+            out += (queries @ self._offset)[:, None]
+        return out
+
+    def dump_arrays(self) -> Dict[str, np.ndarray]:
+        """The int8 calibration, for `VectorIndex.save` (empty when not calibrated)."""
+        if self._scale is None:
+            return {}
+        return {"quantizer_scale": self._scale, "quantizer_offset": self._offset}
+
+    def restore_arrays(self, arrays: Dict[str, np.ndarray]):
+        if "quantizer_scale" in arrays:
+            self._scale = np.array(arrays["quantizer_scale"])
+            self._offset = np.array(arrays["quantizer_offset"])
+
+    def _set_range(self, low: np.ndarray, span: np.ndarray):
+        self._scale = span / 255.0
+        # code = -128 decodes to `low`
+        self._offset = low + 128.0 * self._scale
+
+
+def rerank_exact(
+    query_embedding: List[float],
+    candidates: List["Chunk"],
+    k: int,
+    metric: Metric,
+) -> List[Tuple["Chunk", float]]:
+    """
+    Re-scores approximate candidates with exact float32 math on the chunks'
+    own embeddings and returns the best k.
+    """
+    if not candidates:
+        return []
+
+    query_vector = np.array(query_embedding, dtype=np.float32)
+    vectors = np.array([c.embedding for c in candidates], dtype=np.float32)
+
+    if metric == Metric.COSINE:
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        query_norm = np.linalg.norm(query_vector) or 1.0
+        scores = (vectors @ query_vector) / (norms * query_norm)
+        order = np.argsort(-scores, kind="stable")[:k]
+    else:
+        scores = np.linalg.norm(vectors - query_vector, axis=1)
+        order = np.argsort(scores, kind="stable")[:k]
+
+    return [(candidates[i], float(scores[i])) for i in order]
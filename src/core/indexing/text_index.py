@@ -0,0 +1,117 @@
+# src/core/indexing/text_index.py
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from src.core.models import Chunk
+    from .metadata_index import ChunkFilter
+
+# Words, and compounds of words joined by - . / : (product codes, versions,
+# paths, error codes). A compound is indexed whole and as its parts, so
+# "ERR-1042" matches "err-1042" exactly and also "err" or "1042".
+_TOKEN = re.compile(r"\w+(?:[-./:]\w+)*")
+_SEPARATOR = re.compile(r"[-./:]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of `text`, in order, compounds followed by their parts."""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        terms.append(token)
+        parts = _SEPARATOR.split(token)
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+class TextIndex:
+    """
+    Okapi BM25 inverted index over the text of a library's chunks.
+
+    Each term maps to the chunks holding it and their term frequency; chunk
+    lengths and their total give the average length BM25 normalizes by.
+    Inserts and deletes only touch the postings of the chunk's own terms,
+    so the index is maintained incrementally by the library's writes.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[UUID, int]] = {}  # term -> chunk -> tf
+        self._lengths: Dict[UUID, int] = {}
+        self._chunks: Dict[UUID, "Chunk"] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def put(self, chunk: "Chunk"):
+        """Indexes a chunk, replacing the entry of a previous version."""
+        previous = self._chunks.get(chunk.uid)
+        if previous is not None:
+            if previous.text == chunk.text:
+                self._chunks[chunk.uid] = chunk
+                return
+            self.delete(chunk.uid)
+
+        counts = Counter(tokenize(chunk.text))
+        for term, frequency in counts.items():
+            self._postings.setdefault(term, {})[chunk.uid] = frequency
+        length = sum(counts.values())
+        self._lengths[chunk.uid] = length
+        self._total_length += length
+        self._chunks[chunk.uid] = chunk
+
+    def delete(self, chunk_id: UUID):
+        chunk = self._chunks.pop(chunk_id, None)
+        if chunk is None:
+            return
+        for term in set(tokenize(chunk.text)):
+            posting = self._postings[term]
+            del posting[chunk_id]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id)
+
+    def search(
+        self, query: str, k: int, chunk_filter: Optional["ChunkFilter"] = None
+    ) -> List[Tuple["Chunk", float]]:
+        """
+        The k chunks with the highest BM25 score for `query`, best first.
+        Only chunks sharing at least one term with the query are returned.
+        """
+        if k <= 0 or not self._chunks:
+            return []
+
+        n = len(self._chunks)
+        average_length = self._total_length / n or 1.0
+        scores: Dict[UUID, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for chunk_id, frequency in posting.items():
+                norm = self.k1 * (
+                    1 - self.b + self.b * self._lengths[chunk_id] / average_length
+                )
+                scores[chunk_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        if chunk_filter is not None:
+            scores = {uid: s for uid, s in scores.items() if uid in chunk_filter}
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self._chunks[chunk_id], score) for chunk_id, score in top]
+
+    def copy(self) -> "TextIndex":
+        """An independent copy that shares the (immutable) chunks."""
+        copied = TextIndex(self.k1, self.b)
+        copied._postings = {term: dict(p) for term, p in self._postings.items()}
+        copied._lengths = dict(self._lengths)
+        copied._chunks = dict(self._chunks)
+        copied._total_length = self._total_length
+        return copied
@@ -0,0 +1,158 @@
+# src/core/indexing/vector_store.py
+
+from uuid import UUID
+from typing import Dict, List, Mapping, Optional, TYPE_CHECKING
+import numpy as np
+
+from .base_index import uids_to_array, resolve_chunks
+
+if TYPE_CHECKING:
+    from src.core.models import Chunk
+
+
+class VectorStore:
+    """
+    Columnar storage for an index's vectors: one growable array in the
+    stored format (float32, float16 or int8), a uid -> row map and a
+    free-list.
+
+    Rows are stable. Deleting a vector pushes its row on the free-list,
+    where the next insert picks it up, so indices can keep row ids in their
+    own structures. Reads return views into the array, so a gather of
+    candidate rows is a single fancy-indexing operation.
+
+    `dump_arrays` / `restore_arrays` plug into `VectorIndex.save`; a restored
+    store keeps the memory-mapped array until it has to grow.
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, dtype: np.dtype = np.float32):
+        self._dtype = np.dtype(dtype)
+        self._vectors: Optional[np.ndarray] = None  # (capacity, dim)
+        self._high_water: int = 0  # Rows [0, high_water) have been handed out
+        self._free: List[int] = []
+        self._uid_to_row: Dict[UUID, int] = {}
+        self._row_chunks: List[Optional["Chunk"]] = []
+
+    def __len__(self) -> int:
+        return len(self._uid_to_row)
+
+    def __contains__(self, uid: UUID) -> bool:
+        return uid in self._uid_to_row
+
+    def __getitem__(self, uid: UUID) -> np.ndarray:
+        """The stored vector of `uid` (a view, not a copy)."""
+        return self._vectors[self._uid_to_row[uid]]
+
+    @property
+    def dimension(self) -> int:
+        return 0 if self._vectors is None else self._vectors.shape[1]
+
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        """Every handed-out row, including freed ones. Index it with live row ids."""
+        return None if self._vectors is None else self._vectors[: self._high_water]
+
+    def row(self, uid: UUID) -> Optional[int]:
+        return self._uid_to_row.get(uid)
+
+    def chunk(self, row: int) -> "Chunk":
+        return self._row_chunks[row]
+
+    def put(self, chunk: "Chunk", vector: np.ndarray) -> int:
+        """Stores `vector` (already in the stored format) for `chunk`; upserts by uid."""
+        if self._vectors is None:
+            self._vectors = np.zeros(
+                (self._INITIAL_CAPACITY, len(vector)), dtype=self._dtype
+            )
+        elif len(vector) != self.dimension:
+            raise ValueError(
+                f"Vector dimension mismatch. Expected {self.dimension}, got {len(vector)}"
+            )
+
+        row = self._uid_to_row.get(chunk.uid)
+        if row is None:
+            row = self._allocate()
+            self._uid_to_row[chunk.uid] = row
+
+        self._vectors[row] = vector
+        self._row_chunks[row] = chunk
+        return row
+
+    def put_many(self, chunks: List["Chunk"], vectors: np.ndarray) -> np.ndarray:
+        """Bulk `put` of new uids into an empty store, with one array copy."""
+        if self._uid_to_row:
+            return np.array([self.put(c, v) for c, v in zip(chunks, vectors)])
+
+        n = len(chunks)
+        self._vectors = np.zeros(
+            (max(self._INITIAL_CAPACITY, n), vectors.shape[1]), dtype=self._dtype
+        )
+        self._vectors[:n] = vectors
+        self._high_water = n
+        self._row_chunks = list(chunks)
+        self._uid_to_row = {chunk.uid: row for row, chunk in enumerate(chunks)}
+        return np.arange(n)
+
+    def delete(self, uid: UUID) -> Optional[int]:
+        """Frees the row of `uid` and returns it (None for unknown uids)."""
+        row = self._uid_to_row.pop(uid, None)
+        if row is not None:
+            self._row_chunks[row] = None
+            self._free.append(row)
+        return row
+
+    def clear(self):
+        self._vectors = None
+        self._high_water = 0
+        self._free = []
+        self._uid_to_row = {}
+        self._row_chunks = []
+
+    # --- Persistence ---
+
+    def dump_arrays(self) -> Dict[str, np.ndarray]:
+        if self._vectors is None:
+            return {}
+        live = list(self._uid_to_row.items())
+        return {
+            "vectors": self._vectors[: self._high_water],
+            "rows": np.array([row for _, row in live], dtype=np.int64),
+            "uids": uids_to_array(uid for uid, _ in live),
+        }
+
+    def restore_arrays(
+        self, arrays: Dict[str, np.ndarray], chunks: Mapping[UUID, "Chunk"]
+    ):
+        self.clear()
+        if "vectors" not in arrays:
+            return
+
+        self._vectors = arrays["vectors"]
+        self._high_water = len(self._vectors)
+        self._row_chunks = [None] * self._high_water
+        rows = arrays["rows"].tolist()
+        for row, chunk in zip(rows, resolve_chunks(arrays["uids"], chunks)):
+            self._row_chunks[row] = chunk
+            self._uid_to_row[chunk.uid] = row
+        self._free = sorted(set(range(self._high_water)) - set(rows), reverse=True)
+
+    # --- Internal helpers ---
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        if self._high_water == self._vectors.shape[0]:
+            # Doubling amortizes reallocation to O(1) per insert
+            grown = np.zeros(
+                (max(1, 2 * self._high_water), self.dimension), dtype=self._dtype
+            )
+            grown[: self._high_water] = self._vectors[: self._high_water]
+            self._vectors = grown
+
+        row = self._high_water
+        self._high_water += 1
+        self._row_chunks.append(None)
+        return row
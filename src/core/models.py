@@ -1,12 +1,30 @@
 # src/core/models.py
 
-from pydantic import BaseModel, Field, PrivateAttr
-from typing import Dict, List, Optional, Any
+import bisect
+import copy
+import numpy as np
+from pydantic import (
+    BaseModel,
+    Field,
+    PlainSerializer,
+    PlainValidator,
+    PrivateAttr,
+    WithJsonSchema,
+)
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
+from typing_extensions import Annotated
 from uuid import UUID, uuid4
 from typing import TYPE_CHECKING
 
 # Import the enums directly, as they are part of the core logic
-from src.core.indexing.enums import IndexType, Metric
+from src.core.indexing.enums import IndexType, Metric, Quantization
+from src.core.indexing.metadata_index import (
+    ChunkFilter,
+    MetadataFilter,
+    MetadataIndex,
+)
+from src.core.indexing.text_index import TextIndex
+from src.core.exceptions import DocumentNotFound, ChunkNotFound
 
 if TYPE_CHECKING:
     from src.core.indexing.base_index import VectorIndex
@@ -24,7 +42,30 @@ class IndexConfig(BaseModel):
 
     index_type: IndexType
     metric: Metric
-    # Add other potential config params here as needed
+
+    # LSH parameters
+    num_bits: int = 8
+    num_tables: int = 3
+    num_probes: int = 0
+
+    # HNSW parameters
+    m: int = 16
+    ef_construction: int = 200
+    ef_search: int = 50
+
+    # IVF parameters
+    n_lists: int = 64
+    nprobe: int = 8
+
+    # PQ parameters
+    num_subspaces: int = 8
+    num_centroids: int = 256
+
+    # Stored vector format (all indices except PQ) and exact re-ranking
+    quantization: Quantization = Quantization.NONE
+    rerank_factor: int = 0
+
+    seed: Optional[int] = None
 
 
 class IndexMetadata(BaseModel):
@@ -38,6 +79,59 @@ class IndexMetadata(BaseModel):
     )
 
 
+# ============================================================================
+# EMBEDDINGS
+# ============================================================================
+
+
+def to_embedding(value: Any) -> np.ndarray:
+    """
+    Validates an embedding into a read-only, 1-D float32 array.
+
+    Lists are converted once; read-only float32 arrays (every embedding that
+    was already validated) pass through without a copy. Embeddings are never
+    mutated in place, so copies of a chunk can share the buffer.
+    """
+    if (
+        isinstance(value, np.ndarray)
+        and value.dtype == np.float32
+        and not value.flags.writeable
+    ):
+        array = value
+    else:
+        array = np.array(value, dtype=np.float32)
+        array.flags.writeable = False
+    if array.ndim != 1:
+        raise ValueError("An embedding must be a flat list of numbers.")
+    return array
+
+
+# float32 in memory; a list of numbers only when serialized to JSON
+Embedding = Annotated[
+    np.ndarray,
+    PlainValidator(to_embedding),
+    PlainSerializer(lambda array: array.tolist(), when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+
+def page_keys(
+    keys: List[UUID], limit: Optional[int] = None, after: Optional[UUID] = None
+) -> List[UUID]:
+    """
+    Returns up to `limit` of the sorted `keys` that come after the cursor
+    `after`, in O(log n + page). The cursor does not need to exist anymore.
+    """
+    start = bisect.bisect_right(keys, after) if after is not None else 0
+    end = start + limit if limit is not None else len(keys)
+    return keys[start:end]
+
+
 # ============================================================================
 # MAIN DOMAIN MODELS
 # ============================================================================
@@ -46,11 +140,21 @@ class IndexMetadata(BaseModel):
 class Chunk(BaseModel):
     """Core Chunk model containing text, embedding, and a unique identifier."""
 
+    # Assigned embeddings go through `to_embedding` as well
+    model_config = {"validate_assignment": True}
+
     uid: UUID = Field(default_factory=uuid4)
     text: str
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Embedding] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "Chunk":
+        # The embedding is read-only, so deep copies share it instead of copying
+        memo = {} if memo is None else memo
+        if self.embedding is not None:
+            memo[id(self.embedding)] = self.embedding
+        return super().__deepcopy__(memo)
+
 
 class Document(BaseModel):
     """Core Document model containing chunks and metadata."""
@@ -73,8 +177,37 @@ class Library(BaseModel):
 
     _indices: Dict[str, "VectorIndex"] = PrivateAttr(default_factory=dict)
 
+    # Copy-on-write bookkeeping. None means this library owns everything it
+    # references; on a draft made by `fork` it holds the document ids and index
+    # names already copied away from the snapshot the draft was forked from.
+    _owned: Optional[Set[Union[UUID, str]]] = PrivateAttr(default=None)
+
     version: int = Field(default=1, description="Optimistic locking version")
 
+    # chunk uid -> uid of the document holding it, kept in step with `documents`
+    # by the targeted writes. Like the indices, drafts forked with
+    # `copy_indices=False` update the shared map in place.
+    _chunk_documents: Dict[UUID, UUID] = PrivateAttr(default_factory=dict)
+    _owns_chunk_map: bool = PrivateAttr(default=True)
+
+    # Sorted document ids and sorted chunk ids per document, for pagination.
+    # Built on first use and dropped by the writes that add or remove ids.
+    _document_order: Optional[List[UUID]] = PrivateAttr(default=None)
+    _chunk_orders: Dict[UUID, List[UUID]] = PrivateAttr(default_factory=dict)
+
+    # Inverted index over chunk metadata for filtered search. Shared with
+    # drafts like the chunk map, and copied before a draft changes it.
+    _metadata_index: MetadataIndex = PrivateAttr(default_factory=MetadataIndex)
+    _owns_metadata_index: bool = PrivateAttr(default=True)
+
+    # BM25 index over chunk text for keyword and hybrid search, shared and
+    # copied the same way.
+    _text_index: TextIndex = PrivateAttr(default_factory=TextIndex)
+    _owns_text_index: bool = PrivateAttr(default=True)
+
+    def model_post_init(self, __context: Any):
+        self.reindex_chunk_documents()
+
     @property
     def indices(self) -> Dict[str, "VectorIndex"]:
         """Exposes the internal runtime indices safely."""
@@ -86,3 +219,303 @@ class Library(BaseModel):
 
     def get_index(self, name: str) -> Optional["VectorIndex"]:
         return self._indices.get(name)
+
+    def find_document(self, chunk_id: UUID) -> Optional[Document]:
+        """Returns the document holding `chunk_id` in O(1), or None."""
+        doc_id = self._chunk_documents.get(chunk_id)
+        document = self.documents.get(doc_id) if doc_id is not None else None
+        if document is None or chunk_id not in document.chunks:
+            return None
+        return document
+
+    def filter_chunks(self, metadata_filter: MetadataFilter) -> ChunkFilter:
+        """The chunks whose metadata matches `metadata_filter`, for `search_filtered`."""
+        return self._metadata_index.select(metadata_filter)
+
+    def text_search(
+        self, query: str, k: int, metadata_filter: Optional[MetadataFilter] = None
+    ) -> List[Tuple[Chunk, float]]:
+        """The k chunks ranking highest for `query` under BM25, best first."""
+        chunk_filter = self.filter_chunks(metadata_filter) if metadata_filter else None
+        return self._text_index.search(query, k, chunk_filter)
+
+    def reindex_chunk_documents(self):
+        """
+        Rebuilds the chunk -> document map and the metadata and text indices from
+        `documents`. The targeted writes keep them current; this is only
+        needed after `documents` was changed directly, as drafts passed to
+        `update` may be.
+        """
+        self._chunk_documents = {
+            chunk_id: doc_id
+            for doc_id, document in self.documents.items()
+            for chunk_id in document.chunks
+        }
+        self._owns_chunk_map = True
+        self._document_order = None
+        self._chunk_orders = {}
+
+        self._metadata_index = MetadataIndex()
+        self._owns_metadata_index = True
+        self._text_index = TextIndex()
+        self._owns_text_index = True
+        for document in self.documents.values():
+            for chunk in document.chunks.values():
+                self._metadata_index.put(chunk)
+                self._text_index.put(chunk)
+
+    def reindex_changed_documents(self, previous: "Library"):
+        """
+        Like `reindex_chunk_documents`, but only for the documents that are
+        not the same objects as in `previous`, the version this library's maps
+        and indices were derived from. Unchanged documents cost nothing, so an
+        `update` that leaves `documents` alone does no indexing work.
+        """
+        removed = [
+            doc_id for doc_id in previous.documents if doc_id not in self.documents
+        ]
+        changed = [
+            doc_id
+            for doc_id, document in self.documents.items()
+            if previous.documents.get(doc_id) is not document
+        ]
+        if not removed and not changed:
+            return
+
+        for doc_id in removed:
+            old_chunks = list(previous.documents[doc_id].chunks)
+            self._chunk_orders.pop(doc_id, None)
+            self._map_chunks(doc_id, [], old_chunks)
+            self._index_chunk_contents([], old_chunks)
+
+        for doc_id in changed:
+            document = self.documents[doc_id]
+            old = previous.documents.get(doc_id)
+            old_chunks = old.chunks if old is not None else {}
+            upserts = [
+                chunk
+                for chunk_id, chunk in document.chunks.items()
+                if old_chunks.get(chunk_id) is not chunk
+            ]
+            deletes = [cid for cid in old_chunks if cid not in document.chunks]
+            self._chunk_orders.pop(doc_id, None)
+            self._map_chunks(doc_id, [chunk.uid for chunk in upserts], deletes)
+            self._index_chunk_contents(upserts, deletes)
+
+        if removed or any(doc_id not in previous.documents for doc_id in changed):
+            self._document_order = None
+
+    def document_page(
+        self, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Document]:
+        """Returns up to `limit` documents whose ids come after `after`, ordered by id."""
+        if self._document_order is None:
+            self._document_order = sorted(self.documents)
+        return [
+            self.documents[uid] for uid in page_keys(self._document_order, limit, after)
+        ]
+
+    def chunk_page(
+        self, doc_id: UUID, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Chunk]:
+        """Returns up to `limit` chunks of a document after `after`, ordered by id."""
+        document = self.documents.get(doc_id)
+        if document is None:
+            raise DocumentNotFound(f"Document {doc_id} not found in library {self.uid}")
+        order = self._chunk_orders.get(doc_id)
+        if order is None:
+            order = self._chunk_orders[doc_id] = sorted(document.chunks)
+        return [document.chunks[uid] for uid in page_keys(order, limit, after)]
+
+    def fork(self, copy_indices: bool = True) -> "Library":
+        """
+        Returns a writable draft that structurally shares this library's
+        documents, chunks and indices. Containers are copied up front (they are
+        just references); documents and indices are copied on first write
+        through `writable_document` and `writable_index`.
+
+        With `copy_indices=False` the draft updates the shared indices in place,
+        which is only safe while readers of this library are locked out.
+        """
+        draft = self.model_copy(
+            update={
+                "documents": dict(self.documents),
+                "metadata": dict(self.metadata),
+                "index_metadata": {
+                    name: meta.model_copy()
+                    for name, meta in self.index_metadata.items()
+                },
+            }
+        )
+        draft._indices = dict(self._indices)
+        draft._owned = set() if copy_indices else set(self._indices)
+        draft._chunk_documents = self._chunk_documents
+        draft._owns_chunk_map = not copy_indices
+        # Its own dict, so orders the snapshot builds later never leak into the draft
+        draft._chunk_orders = dict(self._chunk_orders)
+        draft._metadata_index = self._metadata_index
+        draft._owns_metadata_index = not copy_indices
+        draft._text_index = self._text_index
+        draft._owns_text_index = not copy_indices
+        return draft
+
+    def freeze(self):
+        """Marks everything as shared, so later writes copy before mutating."""
+        self._owned = set()
+        self._owns_chunk_map = False
+        self._owns_metadata_index = False
+        self._owns_text_index = False
+
+    def writable_document(self, doc_id: UUID) -> Optional[Document]:
+        """Returns a document that can be mutated in place without touching a snapshot."""
+        document = self.documents.get(doc_id)
+        if document is None or self._owned is None or doc_id in self._owned:
+            return document
+
+        document = document.model_copy(
+            update={
+                "chunks": dict(document.chunks),
+                "metadata": dict(document.metadata),
+            }
+        )
+        self.documents[doc_id] = document
+        self._owned.add(doc_id)
+        return document
+
+    def writable_index(self, name: str) -> Optional["VectorIndex"]:
+        """Returns an index that can be mutated in place without touching a snapshot."""
+        index = self._indices.get(name)
+        if index is None or self._owned is None or name in self._owned:
+            return index
+
+        # Chunks are never mutated once stored, so the copy keeps referencing them
+        memo = {
+            id(chunk): chunk
+            for document in self.documents.values()
+            for chunk in document.chunks.values()
+        }
+        index = copy.deepcopy(index, memo)
+        self._indices[name] = index
+        self._owned.add(name)
+        return index
+
+    # --- Targeted writes ---
+
+    def put_document(self, document: Document):
+        """Upserts a document, indexing only its new, replaced or removed chunks."""
+        previous = self.documents.get(document.uid)
+        old_chunks = previous.chunks if previous else {}
+
+        upserts = [
+            chunk
+            for chunk_id, chunk in document.chunks.items()
+            if old_chunks.get(chunk_id) is not chunk
+        ]
+        deletes = [
+            chunk_id for chunk_id in old_chunks if chunk_id not in document.chunks
+        ]
+
+        self.documents[document.uid] = document
+        if previous is None:
+            self._document_order = None
+        self._chunk_orders.pop(document.uid, None)
+        self._map_chunks(document.uid, [chunk.uid for chunk in upserts], deletes)
+        self._index_chunk_contents(upserts, deletes)
+        self.apply_index_delta(upserts, deletes)
+
+    def delete_document(self, doc_id: UUID):
+        """Removes a document and its chunks from every index."""
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            raise DocumentNotFound(f"Document {doc_id} not found in library {self.uid}")
+        self._document_order = None
+        self._chunk_orders.pop(doc_id, None)
+        self._map_chunks(doc_id, [], list(document.chunks))
+        self._index_chunk_contents([], list(document.chunks))
+        self.apply_index_delta([], list(document.chunks))
+
+    def put_chunk(self, doc_id: UUID, chunk: Chunk):
+        """Upserts a chunk of an existing document and re-indexes it."""
+        document = self.writable_document(doc_id)
+        if document is None:
+            raise DocumentNotFound(f"Document {doc_id} not found in library {self.uid}")
+        previous = document.chunks.get(chunk.uid)
+        document.chunks[chunk.uid] = chunk
+        if previous is None:
+            self._chunk_orders.pop(doc_id, None)
+            self._map_chunks(doc_id, [chunk.uid], [])
+        self._index_chunk_contents([chunk], [])
+
+        # Metadata-only updates keep the embedding and need no re-indexing
+        if previous is None or previous.embedding is not chunk.embedding:
+            self.apply_index_delta([chunk], [])
+
+    def delete_chunk(self, doc_id: UUID, chunk_id: UUID):
+        """Removes a chunk from its document and from every index."""
+        document = self.writable_document(doc_id)
+        if document is None:
+            raise DocumentNotFound(f"Document {doc_id} not found in library {self.uid}")
+        if chunk_id not in document.chunks:
+            raise ChunkNotFound(f"Chunk {chunk_id} not found in document {doc_id}")
+        del document.chunks[chunk_id]
+        self._chunk_orders.pop(doc_id, None)
+        self._map_chunks(doc_id, [], [chunk_id])
+        self._index_chunk_contents([], [chunk_id])
+        self.apply_index_delta([], [chunk_id])
+
+    def apply_index_delta(self, upserts: List[Chunk], deletes: List[UUID]):
+        """
+        Applies chunk changes to every index and refreshes their vector counts.
+        Upserted chunks without an embedding are removed from the indices.
+        """
+        if not upserts and not deletes:
+            return
+
+        for name in list(self._indices):
+            index = self.writable_index(name)
+            for chunk_id in deletes:
+                index.delete(chunk_id)
+            for chunk in upserts:
+                if chunk.embedding is not None:
+                    index.insert(chunk)
+                else:
+                    index.delete(chunk.uid)
+
+            if name in self.index_metadata:
+                self.index_metadata[name].vector_count = index.vector_count
+
+    def _map_chunks(self, doc_id: UUID, added: List[UUID], removed: List[UUID]):
+        """Points `added` chunks at `doc_id` and forgets `removed` ones it held."""
+        if not added and not removed:
+            return
+        if not self._owns_chunk_map:
+            self._chunk_documents = dict(self._chunk_documents)
+            self._owns_chunk_map = True
+
+        chunk_documents = self._chunk_documents
+        for chunk_id in removed:
+            if chunk_documents.get(chunk_id) == doc_id:
+                del chunk_documents[chunk_id]
+        for chunk_id in added:
+            chunk_documents[chunk_id] = doc_id
+
+    def _index_chunk_contents(self, upserts: List[Chunk], deletes: List[UUID]):
+        """
+        Applies chunk changes to the metadata and text indices, copying them
+        first if shared. Both skip chunks whose indexed field is unchanged.
+        """
+        if not upserts and not deletes:
+            return
+        if not self._owns_metadata_index:
+            self._metadata_index = self._metadata_index.copy()
+            self._owns_metadata_index = True
+        if not self._owns_text_index:
+            self._text_index = self._text_index.copy()
+            self._owns_text_index = True
+
+        for chunk_id in deletes:
+            self._metadata_index.delete(chunk_id)
+            self._text_index.delete(chunk_id)
+        for chunk in upserts:
+            self._metadata_index.put(chunk)
+            self._text_index.put(chunk)
@@ -14,3 +14,37 @@ COHERE_API_KEY = os.getenv("COHERE_API_KEY")
 # Fail Fast: Prevent the app from starting without critical config
 if not COHERE_API_KEY:
     raise ValueError("FATAL: COHERE_API_KEY environment variable is not set.")
+
+# Serve immutable library snapshots instead of deep copies (see InMemoryLibraryRepository)
+REPOSITORY_COPY_ON_WRITE = os.getenv("REPOSITORY_COPY_ON_WRITE", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Durable storage: when set, libraries are journaled to this directory and
+# recovered from it on startup (see DurableLibraryRepository)
+REPOSITORY_DATA_DIR = os.getenv("REPOSITORY_DATA_DIR")
+REPOSITORY_SNAPSHOT_EVERY = int(os.getenv("REPOSITORY_SNAPSHOT_EVERY", "10000"))
+REPOSITORY_FSYNC = os.getenv("REPOSITORY_FSYNC", "true").lower() in ("1", "true", "yes")
+
+# Embedding cache (see CachedEmbeddingsClient): memory budget of the LRU tier,
+# and an optional SQLite file that keeps embeddings across restarts
+EMBEDDING_CACHE_MAX_BYTES = int(
+    os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024**2))
+)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")
+
+# Cohere batching (see CohereClient): batches in flight per call, and an optional
+# cap on request starts per second shared by all calls
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+EMBEDDING_REQUESTS_PER_SECOND = float(os.getenv("EMBEDDING_REQUESTS_PER_SECOND", "0"))
+
+# Coalescing window for concurrent embedding calls (see
+# MicroBatchingEmbeddingsClient); 0 disables coalescing
+EMBEDDING_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5"))
+
+# Threads that run index searches for the async endpoints, off the event loop
+SEARCH_EXECUTOR_WORKERS = int(
+    os.getenv("SEARCH_EXECUTOR_WORKERS", str(os.cpu_count() or 4))
+)
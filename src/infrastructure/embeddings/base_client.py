@@ -1,7 +1,8 @@
 # src/infrastructure/embeddings/base_client.py
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence
 
 
 class IEmbeddingsClient(ABC):
@@ -14,3 +15,22 @@ class IEmbeddingsClient(ABC):
         Takes a list of texts and returns a list of their embedding vectors.
         """
         pass
+
+    async def aget_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[List[float]]:
+        """
+        Async variant of `get_embeddings`. Clients backed by a network call
+        override it with a native async implementation; the default runs the
+        blocking call in a worker thread so the event loop is never blocked.
+        """
+        return await asyncio.to_thread(self.get_embeddings, texts, input_type)
+
+
+def check_embedding_count(vectors: Sequence[Sequence[float]], texts: List[str]):
+    """Raises unless the provider returned exactly one vector per text."""
+    if len(vectors) != len(texts):
+        raise ValueError(
+            f"Embeddings provider returned {len(vectors)} vectors "
+            f"for {len(texts)} texts."
+        )
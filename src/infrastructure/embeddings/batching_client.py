@@ -0,0 +1,184 @@
+# src/infrastructure/embeddings/batching_client.py
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from .base_client import IEmbeddingsClient, check_embedding_count
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.texts: List[str] = []
+        self.results: Optional[List[Sequence[float]]] = None
+        self.error: Optional[Exception] = None
+        self.done = False
+
+
+class _AsyncPendingBatch:
+    def __init__(self):
+        self.texts: List[str] = []
+        self.full = asyncio.Event()
+        self.future = asyncio.get_running_loop().create_future()
+        self.flush: Optional[asyncio.Task] = None
+
+
+class MicroBatchingEmbeddingsClient(IEmbeddingsClient):
+    """
+    Coalesces concurrent embedding calls into shared provider calls.
+
+    Works like the group commit of the write-ahead log: the first caller to
+    find no open batch for its input type opens one and becomes its leader.
+    Callers arriving in the next `max_wait_ms` append their texts to it and
+    wait. The leader then sends the whole batch in one provider call, before
+    the window ends if the batch reaches `max_batch_size` texts. Each caller
+    receives the slice of the results for its own texts, or the error if the
+    provider call failed.
+
+    Calls with more than `max_batch_size` texts are already batches and go
+    straight to the wrapped client.
+
+    `aget_embeddings` coalesces coroutines the same way on the event loop.
+    There the provider call runs in a task of its own, so cancelling one
+    waiting request never strands the others.
+    """
+
+    def __init__(
+        self,
+        client: IEmbeddingsClient,
+        max_wait_ms: float = 5.0,
+        max_batch_size: int = 96,
+    ):
+        self._client = client
+        self._max_wait = max_wait_ms / 1000.0
+        self._max_batch_size = max_batch_size
+        self._cond = threading.Condition()
+        self._open: Dict[str, _PendingBatch] = {}  # input_type -> batch being filled
+        self._async_open: Dict[str, _AsyncPendingBatch] = {}
+
+        self.stats = {"calls": 0, "provider_calls": 0}
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self._client, "model_name", type(self._client).__name__)
+
+    def get_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[Sequence[float]]:
+        if not texts:
+            return []
+        if len(texts) > self._max_batch_size:
+            with self._cond:
+                self.stats["calls"] += 1
+                self.stats["provider_calls"] += 1
+            return self._client.get_embeddings(texts, input_type=input_type)
+
+        with self._cond:
+            self.stats["calls"] += 1
+            batch = self._open.get(input_type)
+            leader = (
+                batch is None or len(batch.texts) + len(texts) > self._max_batch_size
+            )
+            if leader:
+                # A full batch is closed here; its leader sends it right away
+                batch = _PendingBatch()
+                self._open[input_type] = batch
+                self._cond.notify_all()
+
+            offset = len(batch.texts)
+            batch.texts.extend(texts)
+            if len(batch.texts) >= self._max_batch_size:
+                self._cond.notify_all()
+
+            if leader:
+                deadline = time.monotonic() + self._max_wait
+                while (
+                    self._open.get(input_type) is batch
+                    and len(batch.texts) < self._max_batch_size
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._open.get(input_type) is batch:
+                    del self._open[input_type]
+                self.stats["provider_calls"] += 1
+            else:
+                while not batch.done:
+                    self._cond.wait()
+
+        if leader:
+            self._send(batch, input_type)
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[offset : offset + len(texts)]
+
+    async def aget_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[Sequence[float]]:
+        if not texts:
+            return []
+        if len(texts) > self._max_batch_size:
+            with self._cond:
+                self.stats["calls"] += 1
+                self.stats["provider_calls"] += 1
+            return await self._client.aget_embeddings(texts, input_type=input_type)
+
+        with self._cond:
+            self.stats["calls"] += 1
+
+        # Only the event loop thread touches the async batches
+        batch = self._async_open.get(input_type)
+        if batch is None or len(batch.texts) + len(texts) > self._max_batch_size:
+            if batch is not None:
+                batch.full.set()
+            batch = _AsyncPendingBatch()
+            self._async_open[input_type] = batch
+            batch.flush = asyncio.create_task(self._aflush(batch, input_type))
+
+        offset = len(batch.texts)
+        batch.texts.extend(texts)
+        if len(batch.texts) >= self._max_batch_size:
+            batch.full.set()
+
+        results = await asyncio.shield(batch.future)
+        return results[offset : offset + len(texts)]
+
+    # --- Internal helpers ---
+
+    async def _aflush(self, batch: _AsyncPendingBatch, input_type: str):
+        try:
+            await asyncio.wait_for(batch.full.wait(), self._max_wait)
+        except asyncio.TimeoutError:
+            pass
+        if self._async_open.get(input_type) is batch:
+            del self._async_open[input_type]
+        with self._cond:
+            self.stats["provider_calls"] += 1
+
+        try:
+            results = await self._client.aget_embeddings(
+                batch.texts, input_type=input_type
+            )
+            check_embedding_count(results, batch.texts)
+        except Exception as e:
+            batch.future.set_exception(e)
+        else:
+            batch.future.set_result(results)
+
+    def _send(self, batch: _PendingBatch, input_type: str):
+        try:
+            results = self._client.get_embeddings(batch.texts, input_type=input_type)
+            check_embedding_count(results, batch.texts)
+        except Exception as e:
+            results, error = None, e
+        else:
+            error = None
+
+        with self._cond:
+            batch.results = results
+            batch.error = error
+            batch.done = True
+            self._cond.notify_all()
@@ -0,0 +1,212 @@
+# src/infrastructure/embeddings/cached_client.py
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .base_client import IEmbeddingsClient, check_embedding_count
+
+# (model_name, input_type, sha256(text))
+CacheKey = Tuple[str, str, bytes]
+
+
+class CachedEmbeddingsClient(IEmbeddingsClient):
+    """
+    Caching decorator for any IEmbeddingsClient.
+
+    Embeddings are looked up by (model_name, input_type, sha256(text)): first
+    in a bounded in-memory LRU, then, if `path` is given, in a SQLite file that
+    survives restarts. Only the texts missing from both tiers are sent to the
+    wrapped client, in a single call. The memory tier is bounded by the bytes
+    held, not by the number of entries, so one limit works for any dimension.
+
+    Cached vectors are returned as read-only float32 arrays, which `Chunk`
+    stores without another copy.
+    """
+
+    # Approximate per-entry cost besides the vector itself (key, dict slot, array header)
+    _ENTRY_OVERHEAD = 200
+
+    def __init__(
+        self,
+        client: IEmbeddingsClient,
+        model_name: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[str] = None,
+    ):
+        self._client = client
+        self._model_name = model_name or getattr(
+            client, "model_name", type(client).__name__
+        )
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._disk = _DiskCache(path) if path else None
+
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    def get_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[np.ndarray]:
+        results, missing = self._lookup(texts, input_type)
+
+        if missing and self._disk is not None:
+            self._promote(self._disk.get_many(list(missing)), results, missing)
+
+        if missing:
+            keys = list(missing)
+            vectors = self._client.get_embeddings(
+                [texts[missing[key][0]] for key in keys], input_type=input_type
+            )
+            vectors = self._store(keys, vectors, results, missing)
+            if self._disk is not None:
+                self._disk.put_many(list(zip(keys, vectors)))
+
+        return results
+
+    async def aget_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[np.ndarray]:
+        results, missing = self._lookup(texts, input_type)
+
+        if missing and self._disk is not None:
+            found = await asyncio.to_thread(self._disk.get_many, list(missing))
+            self._promote(found, results, missing)
+
+        if missing:
+            keys = list(missing)
+            vectors = await self._client.aget_embeddings(
+                [texts[missing[key][0]] for key in keys], input_type=input_type
+            )
+            vectors = self._store(keys, vectors, results, missing)
+            if self._disk is not None:
+                await asyncio.to_thread(self._disk.put_many, list(zip(keys, vectors)))
+
+        return results
+
+    def clear(self):
+        """Empties the memory tier; the disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+    # --- Internal helpers ---
+
+    def _lookup(
+        self, texts: List[str], input_type: str
+    ) -> Tuple[List[Optional[np.ndarray]], Dict[CacheKey, List[int]]]:
+        """Fills the memory hits; returns the positions of the rest, grouped by key."""
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[CacheKey, List[int]] = {}
+
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = self._key(text, input_type)
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.setdefault(key, []).append(i)
+                    continue
+                self._entries.move_to_end(key)
+                results[i] = vector
+                self.stats["hits"] += 1
+        return results, missing
+
+    def _promote(self, found, results, missing):
+        """Moves disk hits into memory and into `results`."""
+        with self._lock:
+            for key, vector in found.items():
+                self._remember(key, vector)
+                for i in missing.pop(key):
+                    results[i] = vector
+                    self.stats["disk_hits"] += 1
+
+    def _store(self, keys, vectors, results, missing):
+        """Caches the provider's vectors for `keys` in memory and fills their positions."""
+        check_embedding_count(vectors, keys)
+        vectors = [self._freeze(v) for v in vectors]
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+                for i in missing[key]:
+                    results[i] = vector
+                    self.stats["misses"] += 1
+        return vectors
+
+    def _key(self, text: str, input_type: str) -> CacheKey:
+        return (
+            self._model_name,
+            input_type,
+            hashlib.sha256(text.encode()).digest(),
+        )
+
+    def _remember(self, key: CacheKey, vector: np.ndarray):
+        """Adds an entry to the memory tier and evicts the least recently used ones."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+
+        self._entries[key] = vector
+        self._bytes += vector.nbytes + self._ENTRY_OVERHEAD
+        while self._bytes > self._max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes + self._ENTRY_OVERHEAD
+            self.stats["evictions"] += 1
+
+    @staticmethod
+    def _freeze(vector: Sequence[float]) -> np.ndarray:
+        array = np.array(vector, dtype=np.float32)
+        array.flags.writeable = False
+        return array
+
+
+class _DiskCache:
+    """SQLite tier of CachedEmbeddingsClient; vectors are stored as raw float32 bytes."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, input_type TEXT NOT NULL, text_hash BLOB NOT NULL, "
+            "vector BLOB NOT NULL, PRIMARY KEY (model, input_type, text_hash))"
+        )
+        self._db.commit()
+
+    def get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, np.ndarray]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings "
+                    "WHERE model = ? AND input_type = ? AND text_hash = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    # frombuffer over bytes is already read-only
+                    found[key] = np.frombuffer(row[0], dtype=np.float32)
+        return found
+
+    def put_many(self, items):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [(*key, vector.tobytes()) for key, vector in items],
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
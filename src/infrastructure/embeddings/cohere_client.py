@@ -1,11 +1,36 @@
+import asyncio
+import random
+import threading
+import time
 import cohere
+import httpx
+from cohere.core.api_error import ApiError
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from .base_client import IEmbeddingsClient
 
 # Removed internal config import in favor of top-level or injection
 
+# Provider answers worth retrying: rate limited, or temporarily unavailable
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
 
 class CohereClient(IEmbeddingsClient):
+    """
+    Cohere embeddings client.
+
+    Texts are sent in batches of BATCH_SIZE. Up to `max_concurrency` batches
+    are in flight at once on a shared thread pool, and results keep the
+    order of the input. `max_requests_per_second` spaces out request starts
+    across all calls. A batch that fails with a transient error (rate limit,
+    5xx, network) is retried on its own with jittered exponential backoff;
+    only when its retries run out does the whole call fail.
+
+    `aget_embeddings` does the same on cohere.AsyncClient: batches are
+    gathered on the event loop, up to `max_concurrency` in flight across all
+    calls, without holding a thread while they wait on the network.
+    """
+
     # Batch limit for Cohere API
     BATCH_SIZE = 96
 
@@ -13,10 +38,32 @@ class CohereClient(IEmbeddingsClient):
         self,
         api_key: str,  # Dependency Injection: Pass key here; do not import internally
         model_name: str = "embed-english-v3.0",
+        max_concurrency: int = 4,
+        max_requests_per_second: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
     ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
         self._api_key = api_key
         self._model_name = model_name
         self._client = None
+        self._async_client = None
+        self._max_concurrency = max_concurrency
+        self._rate_limiter = (
+            _RateLimiter(max_requests_per_second) if max_requests_per_second else None
+        )
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._async_limiter: Optional[asyncio.Semaphore] = None
+        self._async_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
 
     @property
     def client(self):
@@ -24,6 +71,12 @@ class CohereClient(IEmbeddingsClient):
             self._client = cohere.Client(self._api_key)
         return self._client
 
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = cohere.AsyncClient(self._api_key)
+        return self._async_client
+
     def get_embeddings(
         self,
         texts: List[str],
@@ -32,20 +85,141 @@ class CohereClient(IEmbeddingsClient):
         if not texts:
             return []
 
+        starts = range(0, len(texts), self.BATCH_SIZE)
+        batches = [texts[i : i + self.BATCH_SIZE] for i in starts]
+
+        if len(batches) == 1 or self._max_concurrency == 1:
+            results = [
+                self._embed_batch(i, batch, input_type)
+                for i, batch in zip(starts, batches)
+            ]
+        else:
+            # map yields in submission order, so the output order is preserved
+            results = self._get_executor().map(
+                self._embed_batch, starts, batches, [input_type] * len(batches)
+            )
+
+        all_embeddings = []
+        for embeddings in results:
+            all_embeddings.extend(embeddings)
+        return all_embeddings
+
+    async def aget_embeddings(
+        self,
+        texts: List[str],
+        input_type: str = "search_document",
+    ) -> List[List[float]]:
+        if not texts:
+            return []
+
+        semaphore = self._get_async_limiter()
+
+        async def embed(offset: int) -> List[List[float]]:
+            async with semaphore:
+                return await self._aembed_batch(
+                    offset, texts[offset : offset + self.BATCH_SIZE], input_type
+                )
+
+        # gather returns results in the order of its arguments
+        results = await asyncio.gather(
+            *(embed(i) for i in range(0, len(texts), self.BATCH_SIZE))
+        )
+
         all_embeddings = []
+        for embeddings in results:
+            all_embeddings.extend(embeddings)
+        return all_embeddings
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
 
-        for i in range(0, len(texts), self.BATCH_SIZE):
-            batch = texts[i : i + self.BATCH_SIZE]
+    # --- Internal helpers ---
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_concurrency,
+                    thread_name_prefix="cohere-embed",
+                )
+            return self._executor
+
+    def _get_async_limiter(self) -> asyncio.Semaphore:
+        """
+        The semaphore shared by the async calls on the running loop. A
+        semaphore belongs to one loop, so another loop gets a fresh one.
+        """
+        loop = asyncio.get_running_loop()
+        with self._executor_lock:
+            if self._async_limiter is None or self._async_limiter_loop is not loop:
+                self._async_limiter = asyncio.Semaphore(self._max_concurrency)
+                self._async_limiter_loop = loop
+            return self._async_limiter
+
+    def _embed_batch(
+        self, offset: int, batch: List[str], input_type: str
+    ) -> List[List[float]]:
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                time.sleep(self._rate_limiter.reserve())
             try:
                 response = self.client.embed(
                     texts=batch, model=self._model_name, input_type=input_type
                 )
-                all_embeddings.extend(response.embeddings)
+                return response.embeddings
             except Exception as e:
-                # Log error and re-raise or handle per resiliency policy
-                raise ConnectionError(
-                    f"Cohere API failed on batch {i}: {str(e)}"
-                ) from e
+                delay = self._retry_delay(offset, attempt, e)
+            time.sleep(delay)
+            attempt += 1
 
-        return all_embeddings
+    async def _aembed_batch(
+        self, offset: int, batch: List[str], input_type: str
+    ) -> List[List[float]]:
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                await asyncio.sleep(self._rate_limiter.reserve())
+            try:
+                response = await self.async_client.embed(
+                    texts=batch, model=self._model_name, input_type=input_type
+                )
+                return response.embeddings
+            except Exception as e:
+                delay = self._retry_delay(offset, attempt, e)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, offset: int, attempt: int, error: Exception) -> float:
+        """Backoff before retrying a failed batch; raises once it must not be retried."""
+        if attempt < self._max_retries and self._is_transient(error):
+            # Full jitter keeps retrying batches from synchronizing
+            return random.uniform(0, self._backoff_base * 2**attempt)
+        # Log error and re-raise or handle per resiliency policy
+        raise ConnectionError(
+            f"Cohere API failed on batch {offset}: {str(error)}"
+        ) from error
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, ApiError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+class _RateLimiter:
+    """Spaces request starts at least 1 / rate seconds apart, across threads."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def reserve(self) -> float:
+        """Books the next request slot and returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        return slot - now
@@ -0,0 +1,94 @@
+# src/infrastructure/embeddings/dedup.py
+
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+from .base_client import IEmbeddingsClient, check_embedding_count
+
+
+def dedupe_texts(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    Splits `texts` into its distinct texts (in first-seen order) and, for each
+    position, the index of its text among them.
+
+    Callers embed only the distinct texts and scatter the vectors back with
+    `vectors[slot]`.
+    """
+    positions: Dict[str, int] = {}
+    unique_texts: List[str] = []
+    slots: List[int] = []
+    for text in texts:
+        slot = positions.get(text)
+        if slot is None:
+            slot = positions[text] = len(unique_texts)
+            unique_texts.append(text)
+        slots.append(slot)
+    return unique_texts, slots
+
+
+class DeduplicatingEmbeddingsClient(IEmbeddingsClient):
+    """
+    Deduplicating decorator for any IEmbeddingsClient.
+
+    Each call sends only its distinct texts to the wrapped client and
+    scatters the vectors back, so every position of a text receives the same
+    vector object. Parsers produce many identical chunks (page footers,
+    disclaimers, empty cells): they cost one embedding, and positions sharing
+    a vector object also share its memory once it is stored on a `Chunk`.
+
+    `stats` totals the texts received and the distinct texts sent over every
+    call; `dedup_ratio()` is the share of duplicates among them.
+    """
+
+    def __init__(self, client: IEmbeddingsClient):
+        self._client = client
+        self._lock = threading.Lock()
+
+        self.stats = {"texts": 0, "unique_texts": 0}
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self._client, "model_name", type(self._client).__name__)
+
+    def get_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[Sequence[float]]:
+        unique_texts, slots = self._dedupe(texts)
+        if not unique_texts:
+            return []
+        vectors = self._client.get_embeddings(unique_texts, input_type=input_type)
+        return self._scatter(vectors, unique_texts, slots)
+
+    async def aget_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[Sequence[float]]:
+        unique_texts, slots = self._dedupe(texts)
+        if not unique_texts:
+            return []
+        vectors = await self._client.aget_embeddings(
+            unique_texts, input_type=input_type
+        )
+        return self._scatter(vectors, unique_texts, slots)
+
+    def dedup_ratio(self) -> float:
+        """Fraction of the texts received that were duplicates within their call."""
+        with self._lock:
+            if not self.stats["texts"]:
+                return 0.0
+            return 1.0 - self.stats["unique_texts"] / self.stats["texts"]
+
+    # --- Internal helpers ---
+
+    def _dedupe(self, texts: List[str]) -> Tuple[List[str], List[int]]:
+        unique_texts, slots = dedupe_texts(texts)
+        with self._lock:
+            self.stats["texts"] += len(texts)
+            self.stats["unique_texts"] += len(unique_texts)
+        return unique_texts, slots
+
+    @staticmethod
+    def _scatter(
+        vectors: List[Sequence[float]], unique_texts: List[str], slots: List[int]
+    ) -> List[Sequence[float]]:
+        check_embedding_count(vectors, unique_texts)
+        return [vectors[slot] for slot in slots]
@@ -48,3 +48,9 @@ class FakeEmbeddingsClient(IEmbeddingsClient):
                 embeddings.append(random_vector)
 
         return embeddings
+
+    async def aget_embeddings(
+        self, texts: List[str], input_type: str = "search_document"
+    ) -> List[List[float]]:
+        # Pure computation, no need for a worker thread
+        return self.get_embeddings(texts, input_type)
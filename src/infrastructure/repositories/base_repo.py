@@ -1,9 +1,10 @@
 # src/infrastructure/repositories/base_repo.py
 
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
 from uuid import UUID
-from src.core.models import Library
+from src.core.models import Library, Document, Chunk, page_keys
 
 
 class ILibraryRepository(ABC):
@@ -17,10 +18,56 @@ class ILibraryRepository(ABC):
     def get_by_id(self, library_id: UUID) -> Library:
         pass
 
+    def get_for_update(self, library_id: UUID) -> Library:
+        """
+        Returns a library the caller may mutate and then pass to `update`.
+        Writers use this instead of `get_by_id`, whose result may be a shared,
+        read-only snapshot.
+        """
+        return self.get_by_id(library_id)
+
+    @contextmanager
+    def snapshot(self, library_id: UUID) -> Iterator[Library]:
+        """
+        Yields a read-only library whose indices stay consistent with its
+        documents until the block exits. Searches run inside this block.
+        """
+        yield self.get_by_id(library_id)
+
     @abstractmethod
     def list_all(self) -> List[Library]:
         pass
 
+    # --- Pagination ---
+    # Pages are ordered by id; `after` is the id of the last item of the
+    # previous page. The defaults read everything; implementations override
+    # them to touch only the requested page.
+
+    def list_page(
+        self, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Library]:
+        libraries = {library.uid: library for library in self.list_all()}
+        return [libraries[uid] for uid in page_keys(sorted(libraries), limit, after)]
+
+    def list_documents(
+        self,
+        library_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[UUID] = None,
+    ) -> List[Document]:
+        with self.snapshot(library_id) as library:
+            return library.document_page(limit, after)
+
+    def list_chunks(
+        self,
+        library_id: UUID,
+        doc_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[UUID] = None,
+    ) -> List[Chunk]:
+        with self.snapshot(library_id) as library:
+            return library.chunk_page(doc_id, limit, after)
+
     @abstractmethod
     def update(self, library: Library) -> None:
         pass
@@ -32,3 +79,32 @@ class ILibraryRepository(ABC):
     @abstractmethod
     def clear(self) -> None:
         pass
+
+    # --- Targeted writes ---
+    # Each one bumps the library version and touches only the affected
+    # documents, chunks and index entries. The defaults fall back to a full
+    # read-modify-write; implementations override them with in-place versions.
+
+    def _modify(self, library_id: UUID, change: Callable[[Library], None]) -> None:
+        library = self.get_for_update(library_id)
+        change(library)
+        self.update(library)
+
+    def put_document(self, library_id: UUID, document: Document) -> None:
+        self._modify(library_id, lambda library: library.put_document(document))
+
+    def delete_document(self, library_id: UUID, doc_id: UUID) -> None:
+        self._modify(library_id, lambda library: library.delete_document(doc_id))
+
+    def put_chunk(self, library_id: UUID, doc_id: UUID, chunk: Chunk) -> None:
+        self._modify(library_id, lambda library: library.put_chunk(doc_id, chunk))
+
+    def delete_chunk(self, library_id: UUID, doc_id: UUID, chunk_id: UUID) -> None:
+        self._modify(library_id, lambda library: library.delete_chunk(doc_id, chunk_id))
+
+    def apply_index_delta(
+        self, library_id: UUID, upserts: List[Chunk], deletes: List[UUID]
+    ) -> None:
+        self._modify(
+            library_id, lambda library: library.apply_index_delta(upserts, deletes)
+        )
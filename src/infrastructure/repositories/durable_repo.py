@@ -0,0 +1,407 @@
+# src/infrastructure/repositories/durable_repo.py
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from src.core.models import Library, Document, Chunk, IndexMetadata
+from src.core.indexing.index_factory import IndexFactory
+from .in_memory_repo import InMemoryLibraryRepository
+from .wal import WriteAheadLog
+
+logger = logging.getLogger(__name__)
+
+_FILE_PATTERN = re.compile(r"^(snapshot|wal|indices)-(\d{8})(\.json|\.log)?$")
+
+
+class DurableLibraryRepository(InMemoryLibraryRepository):
+    """
+    Copy-on-write in-memory repository that survives restarts.
+
+    Every mutation is appended to a write-ahead log (JSON lines) under the
+    library's write lock and made durable with group-commit fsync before the
+    call returns. Every `snapshot_every` records a background checkpoint writes
+    a compacted snapshot of all libraries and starts a new log segment; older
+    files are then deleted.
+
+    On startup the latest snapshot is loaded and the segments after it are
+    replayed. Each record carries the library version it produced, so records
+    already reflected in the snapshot are skipped.
+
+    Checkpoints also save every built index (`VectorIndex.save`). Recovery
+    memory-maps them and replays the log on top, so a restart does not pay
+    for a rebuild; only indices that are missing, unreadable or were
+    reconfigured after the snapshot are rebuilt from `index_metadata`.
+
+    Files in `data_dir`: `snapshot-<generation>.json`, `indices-<generation>/`
+    and `wal-<generation>.log`, where a log holds the records written after
+    the snapshot of its generation.
+    """
+
+    def __init__(
+        self, data_dir: str, snapshot_every: Optional[int] = 10_000, fsync: bool = True
+    ):
+        # Published libraries must be immutable so checkpoints can serialize
+        # them without holding locks
+        super().__init__(copy_on_write=True)
+
+        self._data_dir = data_dir
+        self._snapshot_every = snapshot_every
+        self._local = threading.local()
+
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+
+        self.stats: Dict[str, Any] = {
+            "recovery_seconds": 0.0,
+            "records_replayed": 0,
+            "snapshots_written": 0,
+            "snapshot_bytes": 0,
+            "indices_loaded": 0,
+            "indices_rebuilt": 0,
+        }
+
+        os.makedirs(data_dir, exist_ok=True)
+        self._generation = self._recover()
+        self._wal = WriteAheadLog(self._path("wal", self._generation), fsync=fsync)
+
+    # --- Public API ---
+
+    def checkpoint(self):
+        """
+        Writes a compacted snapshot and drops the log segments it covers.
+
+        Targeted writes update indices in place, so each library's indices
+        are saved under its read lock, together with the version they match.
+        """
+        with self._checkpoint_lock:
+            generation = self._generation + 1
+
+            # Every record in the old segment was applied before this point,
+            # so the snapshot taken below contains its effects
+            self._wal.rotate(self._path("wal", generation))
+            with self._lock.read_lock():
+                library_ids = list(self._data)
+
+            index_dir = self._path("indices", generation)
+            if os.path.exists(index_dir):
+                # Left over from an interrupted checkpoint
+                shutil.rmtree(index_dir)
+
+            libraries: List[Library] = []
+            saved_indices: Dict[str, List[Dict[str, Any]]] = {}
+            for library_id in library_ids:
+                with self._library_lock(library_id).read_lock():
+                    library = self._data.get(library_id)
+                    if library is None:
+                        continue
+                    saved_indices[str(library_id)] = self._save_indices(
+                        library, os.path.join(index_dir, str(library_id))
+                    )
+                libraries.append(library)
+
+            payload = {
+                "generation": generation,
+                "libraries": [library.model_dump(mode="json") for library in libraries],
+                "indices": saved_indices,
+            }
+            path = self._path("snapshot", generation)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            self._generation = generation
+            self.stats["snapshots_written"] += 1
+            self.stats["snapshot_bytes"] += os.path.getsize(path)
+
+            for kind, file_generation, file_path in self._files():
+                if file_generation < generation:
+                    if kind == "indices":
+                        shutil.rmtree(file_path)
+                    else:
+                        os.remove(file_path)
+
+    def close(self):
+        """Waits for a running checkpoint and flushes the log."""
+        thread = self._checkpoint_thread
+        if thread is not None:
+            thread.join()
+        self._wal.close()
+
+    @property
+    def wal_stats(self) -> Dict[str, int]:
+        """Records, bytes and fsyncs written to the log by this process."""
+        return dict(self._wal.stats)
+
+    # --- Journaling ---
+
+    def _on_commit(self, op: str, library_id: Optional[UUID], **changes) -> None:
+        self._local.seq = self._wal.append(self._record(op, library_id, **changes))
+
+    def _after_commit(self) -> None:
+        self._wal.sync(self._local.seq)
+
+        if (
+            self._snapshot_every
+            and self._wal.records_since_rotate >= self._snapshot_every
+            and not self._checkpoint_lock.locked()
+        ):
+            self._checkpoint_thread = threading.Thread(
+                target=self.checkpoint, daemon=True
+            )
+            self._checkpoint_thread.start()
+
+    @staticmethod
+    def _record(op: str, library_id: Optional[UUID], **changes) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"op": op}
+        if library_id is not None:
+            record["library_id"] = str(library_id)
+
+        library: Optional[Library] = changes.get("library")
+        if library is not None:
+            record["version"] = library.version
+
+        if op == "add":
+            record["library"] = library.model_dump(mode="json")
+        elif op == "update":
+            # Drafts share unchanged documents with the previous version, so
+            # only documents that are new objects need to be written
+            previous: Library = changes["previous"]
+            record["metadata"] = library.model_dump(mode="json", include={"metadata"})[
+                "metadata"
+            ]
+            record["index_metadata"] = {
+                name: meta.model_dump(mode="json")
+                for name, meta in library.index_metadata.items()
+            }
+            record["documents"] = [
+                document.model_dump(mode="json")
+                for doc_id, document in library.documents.items()
+                if previous.documents.get(doc_id) is not document
+            ]
+            record["deleted_documents"] = [
+                str(doc_id)
+                for doc_id in previous.documents
+                if doc_id not in library.documents
+            ]
+        elif op == "put_document":
+            record["document"] = changes["document"].model_dump(mode="json")
+        elif op == "delete_document":
+            record["doc_id"] = str(changes["doc_id"])
+        elif op == "put_chunk":
+            record["doc_id"] = str(changes["doc_id"])
+            record["chunk"] = changes["chunk"].model_dump(mode="json")
+        elif op == "delete_chunk":
+            record["doc_id"] = str(changes["doc_id"])
+            record["chunk_id"] = str(changes["chunk_id"])
+        elif op == "apply_index_delta":
+            record["upserts"] = [
+                chunk.model_dump(mode="json") for chunk in changes["upserts"]
+            ]
+            record["deletes"] = [str(chunk_id) for chunk_id in changes["deletes"]]
+        return record
+
+    def _save_indices(self, library: Library, directory: str) -> List[Dict[str, Any]]:
+        """Saves a library's indices; returns the snapshot entries describing them."""
+        saved = []
+        for position, (name, index) in enumerate(library.indices.items()):
+            metadata = library.index_metadata.get(name)
+            if metadata is None:
+                continue
+            path = os.path.join(directory, str(position))
+            try:
+                index.save(path)
+            except NotImplementedError:
+                continue
+            saved.append(
+                {
+                    "name": name,
+                    "path": os.path.relpath(path, self._data_dir),
+                    "config": metadata.config.model_dump(mode="json"),
+                }
+            )
+        return saved
+
+    # --- Recovery ---
+
+    def _recover(self) -> int:
+        start = time.perf_counter()
+
+        files = self._files()
+        snapshots = [g for kind, g, _ in files if kind == "snapshot"]
+        base = max(snapshots, default=0)
+
+        # library id -> index name -> config of the index loaded from disk
+        loaded: Dict[UUID, Dict[str, Dict[str, Any]]] = {}
+        if snapshots:
+            with open(self._path("snapshot", base)) as f:
+                payload = json.load(f)
+            for data in payload["libraries"]:
+                library = Library.model_validate(data)
+                self._data[library.uid] = library
+            for library_id, entries in payload.get("indices", {}).items():
+                library = self._data.get(UUID(library_id))
+                if library is not None:
+                    loaded[library.uid] = self._load_indices(library, entries)
+
+        segments = sorted((g, path) for kind, g, path in files if kind == "wal")
+        generation = base
+        for segment_generation, path in segments:
+            if segment_generation < base:
+                continue
+            records, valid_bytes = WriteAheadLog.read(path)
+            if valid_bytes < os.path.getsize(path):
+                logger.warning(f"Truncating torn tail of write-ahead log {path}.")
+                with open(path, "r+b") as f:
+                    f.truncate(valid_bytes)
+
+            for record in records:
+                self._replay(record)
+            self.stats["records_replayed"] += len(records)
+            generation = segment_generation
+
+        for library in self._data.values():
+            self._rebuild_indices(library, loaded.get(library.uid, {}))
+            library.freeze()
+
+        self.stats["recovery_seconds"] = time.perf_counter() - start
+        logger.info(
+            f"Recovered {len(self._data)} libraries from '{self._data_dir}' "
+            f"({self.stats['records_replayed']} log records, "
+            f"{self.stats['indices_loaded']} indices loaded, "
+            f"{self.stats['indices_rebuilt']} rebuilt) in "
+            f"{self.stats['recovery_seconds']:.3f}s."
+        )
+        return generation
+
+    def _replay(self, record: Dict[str, Any]):
+        op = record["op"]
+
+        if op == "clear":
+            self._data.clear()
+            return
+        if op == "add":
+            library = Library.model_validate(record["library"])
+            self._data.setdefault(library.uid, library)
+            return
+
+        library_id = UUID(record["library_id"])
+        library = self._data.get(library_id)
+        if op == "delete":
+            self._data.pop(library_id, None)
+            return
+
+        # Already part of the snapshot (or of an earlier record)
+        if library is None or record["version"] <= library.version:
+            return
+
+        if op == "update":
+            library.metadata = record["metadata"]
+            library.index_metadata = {
+                name: IndexMetadata.model_validate(meta)
+                for name, meta in record["index_metadata"].items()
+            }
+            # Through the targeted writes, so indices loaded from the
+            # snapshot follow the documents
+            for data in record["documents"]:
+                library.put_document(Document.model_validate(data))
+            for doc_id in record["deleted_documents"]:
+                if UUID(doc_id) in library.documents:
+                    library.delete_document(UUID(doc_id))
+        elif op == "put_document":
+            library.put_document(Document.model_validate(record["document"]))
+        elif op == "delete_document":
+            library.delete_document(UUID(record["doc_id"]))
+        elif op == "put_chunk":
+            library.put_chunk(
+                UUID(record["doc_id"]), Chunk.model_validate(record["chunk"])
+            )
+        elif op == "delete_chunk":
+            library.delete_chunk(UUID(record["doc_id"]), UUID(record["chunk_id"]))
+        elif op == "apply_index_delta":
+            library.apply_index_delta(
+                [Chunk.model_validate(data) for data in record["upserts"]],
+                [UUID(chunk_id) for chunk_id in record["deletes"]],
+            )
+
+        library.version = record["version"]
+
+    def _load_indices(
+        self, library: Library, entries: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Memory-maps the indices saved with a snapshot into `library`."""
+        chunks = {
+            chunk.uid: chunk
+            for document in library.documents.values()
+            for chunk in document.chunks.values()
+        }
+        loaded = {}
+        for entry in entries:
+            path = os.path.join(self._data_dir, entry["path"])
+            try:
+                index = IndexFactory.load_index(path, chunks)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not load index from '{path}', rebuilding: {e}")
+                continue
+            library.add_index(entry["name"], index)
+            loaded[entry["name"]] = entry["config"]
+            self.stats["indices_loaded"] += 1
+        return loaded
+
+    def _rebuild_indices(self, library: Library, loaded: Dict[str, Dict[str, Any]]):
+        """
+        Builds the indices of `index_metadata` that were not loaded from the
+        snapshot (or whose configuration changed since), and drops loaded
+        indices that were deleted.
+        """
+        for name in list(library.indices):
+            if name not in library.index_metadata:
+                library.indices.pop(name)
+
+        chunks: Optional[List[Chunk]] = None
+        for name, metadata in library.index_metadata.items():
+            index = library.get_index(name)
+            if index is None or loaded.get(name) != metadata.config.model_dump(
+                mode="json"
+            ):
+                if chunks is None:
+                    chunks = [
+                        chunk
+                        for document in library.documents.values()
+                        for chunk in document.chunks.values()
+                        if chunk.embedding is not None
+                    ]
+                index = IndexFactory.create_index(**metadata.config.model_dump())
+                index.build(chunks)
+                library.add_index(name, index)
+                self.stats["indices_rebuilt"] += 1
+            metadata.vector_count = index.vector_count
+
+    # --- Files ---
+
+    def _path(self, kind: str, generation: int) -> str:
+        extension = {"snapshot": ".json", "wal": ".log"}.get(kind, "")
+        return os.path.join(self._data_dir, f"{kind}-{generation:08d}{extension}")
+
+    def _files(self):
+        files = []
+        for name in os.listdir(self._data_dir):
+            match = _FILE_PATTERN.match(name)
+            if match:
+                files.append(
+                    (
+                        match.group(1),
+                        int(match.group(2)),
+                        os.path.join(self._data_dir, name),
+                    )
+                )
+        return files
@@ -1,35 +1,98 @@
 # src/infrastructure/repositories/in_memory_repo.py
 
-from typing import Dict, List
+import copy
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
 from uuid import UUID
-from src.core.models import Library
+from src.core.models import Library, Document, Chunk, page_keys
 from src.core.exceptions import LibraryNotFound
 from .base_repo import ILibraryRepository
 from src.infrastructure.concurrency.rwlock import RWLock
 
 
 class InMemoryLibraryRepository(ILibraryRepository):
-    def __init__(self):
+    """
+    Thread-safe in-memory repository with optimistic version checks.
+
+    By default every read and write deep-copies the library. With
+    `copy_on_write=True` stored libraries are immutable snapshots: readers get
+    them without copying, and writers get a `Library.fork` draft that shares all
+    unchanged documents, chunks and indices with the snapshot it came from.
+
+    Targeted writes (`put_chunk`, `put_document`, ...) update the indices in
+    place under the library's write lock, so their cost does not depend on the
+    library size. Code that reads indices must do so inside `snapshot`.
+
+    Each library has its own RWLock, created lazily, so work on one library
+    never blocks another. The global lock only guards creation and deletion.
+    Lock order is always global -> library.
+    """
+
+    def __init__(self, copy_on_write: bool = False):
         self._data: Dict[UUID, Library] = {}
         self._lock = RWLock()
+        self._copy_on_write = copy_on_write
+        # Sorted library ids for `list_page`; rebuilt after adds and deletes
+        self._library_order: Optional[List[UUID]] = None
+
+        self._library_locks: Dict[UUID, RWLock] = {}
+        self._library_locks_guard = threading.Lock()
+
+    def _library_lock(self, library_id: UUID) -> RWLock:
+        """Returns the lock of a library, creating it on first use."""
+        with self._library_locks_guard:
+            lock = self._library_locks.get(library_id)
+            if lock is None:
+                lock = self._library_locks[library_id] = RWLock()
+            return lock
+
+    # --- Commit hooks ---
+
+    def _on_commit(self, op: str, library_id: Optional[UUID], **changes) -> None:
+        """
+        Called under the write lock after every successful mutation, so calls
+        for one library arrive in commit order. Durable subclasses journal here.
+        """
+        pass
+
+    def _after_commit(self) -> None:
+        """Called after the write lock is released, before the write returns."""
+        pass
 
     # --- WRITERS (Exclusive Access) ---
 
     def add(self, library: Library) -> None:
-        lib_copy = library.model_copy(deep=True)
+        if self._copy_on_write:
+            # One memo for fields and private attributes, so indices keep
+            # pointing at the same Chunk objects as the documents do
+            lib_copy = copy.deepcopy(library)
+            lib_copy.freeze()
+        else:
+            lib_copy = library.model_copy(deep=True)
 
         with self._lock.write_lock():
             if lib_copy.uid in self._data:
                 raise ValueError(f"Library with id {lib_copy.uid} already exists.")
 
             self._data[lib_copy.uid] = lib_copy
+            self._library_order = None
+            self._on_commit("add", lib_copy.uid, library=lib_copy)
+
+        self._after_commit()
 
     def update(self, library: Library) -> None:
         # Increments version to signal change
         new_version = library.version + 1
 
-        lib_copy = library.model_copy(deep=True, update={"version": new_version})
-        with self._lock.write_lock():
+        if self._copy_on_write:
+            # The draft itself becomes the new snapshot
+            lib_copy = library
+        else:
+            lib_copy = library.model_copy(deep=True, update={"version": new_version})
+
+        with self._library_lock(library.uid).write_lock():
+            # Single dict reads are atomic; add/delete swap entries under the global lock
             current_entry = self._data.get(library.uid)
 
             if not current_entry:
@@ -42,31 +105,209 @@ class InMemoryLibraryRepository(ILibraryRepository):
                     "Please retry operation."
                 )
 
+            # Drafts may have had their documents changed directly; only
+            # documents that are new objects are re-indexed
+            lib_copy.reindex_changed_documents(current_entry)
+            if self._copy_on_write:
+                lib_copy.version = new_version
+                lib_copy.freeze()
             self._data[lib_copy.uid] = lib_copy
+            self._on_commit(
+                "update", lib_copy.uid, library=lib_copy, previous=current_entry
+            )
 
             # Updates the caller's object to reflect the new accepted version
             library.version = new_version
 
+        self._after_commit()
+
+    def _apply(
+        self, library_id: UUID, change: Callable[[Library], None], op: str, **changes
+    ) -> None:
+        """
+        Applies a targeted write under the library's write lock. Indices are
+        updated in place, so the cost does not grow with the library; readers
+        that search them do so under the read lock (see `snapshot`).
+        """
+        with self._library_lock(library_id).write_lock():
+            library = self._data.get(library_id)
+            if not library:
+                raise LibraryNotFound(f"Library with id {library_id} not found")
+
+            if self._copy_on_write:
+                # New version sharing the untouched documents with the snapshot
+                draft = library.fork(copy_indices=False)
+                change(draft)
+                draft.version = library.version + 1
+                draft.freeze()
+                self._data[library_id] = draft
+                library = draft
+            else:
+                change(library)
+                library.version += 1
+
+            self._on_commit(op, library_id, library=library, **changes)
+
+        self._after_commit()
+
+    def put_document(self, library_id: UUID, document: Document) -> None:
+        if not self._copy_on_write:
+            document = document.model_copy(deep=True)
+        self._apply(
+            library_id,
+            lambda library: library.put_document(document),
+            "put_document",
+            document=document,
+        )
+
+    def delete_document(self, library_id: UUID, doc_id: UUID) -> None:
+        self._apply(
+            library_id,
+            lambda library: library.delete_document(doc_id),
+            "delete_document",
+            doc_id=doc_id,
+        )
+
+    def put_chunk(self, library_id: UUID, doc_id: UUID, chunk: Chunk) -> None:
+        if not self._copy_on_write:
+            chunk = chunk.model_copy(deep=True)
+        self._apply(
+            library_id,
+            lambda library: library.put_chunk(doc_id, chunk),
+            "put_chunk",
+            doc_id=doc_id,
+            chunk=chunk,
+        )
+
+    def delete_chunk(self, library_id: UUID, doc_id: UUID, chunk_id: UUID) -> None:
+        self._apply(
+            library_id,
+            lambda library: library.delete_chunk(doc_id, chunk_id),
+            "delete_chunk",
+            doc_id=doc_id,
+            chunk_id=chunk_id,
+        )
+
+    def apply_index_delta(
+        self, library_id: UUID, upserts: List[Chunk], deletes: List[UUID]
+    ) -> None:
+        self._apply(
+            library_id,
+            lambda library: library.apply_index_delta(upserts, deletes),
+            "apply_index_delta",
+            upserts=upserts,
+            deletes=deletes,
+        )
+
     def delete(self, library_id: UUID) -> None:
         with self._lock.write_lock():
-            if library_id not in self._data:
-                raise LibraryNotFound(f"Library with id {library_id} not found")
-            del self._data[library_id]
+            # Waits for in-flight readers and writers of this library
+            with self._library_lock(library_id).write_lock():
+                if library_id not in self._data:
+                    raise LibraryNotFound(f"Library with id {library_id} not found")
+                del self._data[library_id]
+                self._library_order = None
+                self._on_commit("delete", library_id)
+
+            with self._library_locks_guard:
+                self._library_locks.pop(library_id, None)
+
+        self._after_commit()
 
     def clear(self) -> None:
         with self._lock.write_lock():
             self._data.clear()
+            self._library_order = None
+            self._on_commit("clear", None)
+            with self._library_locks_guard:
+                self._library_locks.clear()
+
+        self._after_commit()
 
     # --- READERS (Shared Access) ---
 
     def get_by_id(self, library_id: UUID) -> Library:
-        with self._lock.read_lock():
+        with self._library_lock(library_id).read_lock():
             library = self._data.get(library_id)
             if not library:
                 raise LibraryNotFound(f"Library with id {library_id} not found")
+            if self._copy_on_write:
+                # Snapshots are never mutated, so sharing them is safe
+                return library
             # Returning a deep copy to prevent external mutations
             return library.model_copy(deep=True)
 
+    def get_for_update(self, library_id: UUID) -> Library:
+        if not self._copy_on_write:
+            return self.get_by_id(library_id)
+
+        with self._library_lock(library_id).read_lock():
+            library = self._data.get(library_id)
+            if not library:
+                raise LibraryNotFound(f"Library with id {library_id} not found")
+            return library.fork()
+
+    @contextmanager
+    def snapshot(self, library_id: UUID) -> Iterator[Library]:
+        # Yields the stored library itself; the read lock holds off writers
+        with self._library_lock(library_id).read_lock():
+            library = self._data.get(library_id)
+            if not library:
+                raise LibraryNotFound(f"Library with id {library_id} not found")
+            yield library
+
     def list_all(self) -> List[Library]:
         with self._lock.read_lock():
-            return [lib.model_copy(deep=True) for lib in self._data.values()]
+            library_ids = list(self._data)
+
+        libraries = []
+        for library_id in library_ids:
+            try:
+                libraries.append(self.get_by_id(library_id))
+            except LibraryNotFound:
+                # Deleted since the listing was taken
+                continue
+        return libraries
+
+    def list_page(
+        self, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Library]:
+        # The global read lock is held only to slice the ids
+        with self._lock.read_lock():
+            if self._library_order is None:
+                self._library_order = sorted(self._data)
+            library_ids = page_keys(self._library_order, limit, after)
+
+        libraries = []
+        for library_id in library_ids:
+            try:
+                libraries.append(self.get_by_id(library_id))
+            except LibraryNotFound:
+                continue
+        return libraries
+
+    def list_documents(
+        self,
+        library_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[UUID] = None,
+    ) -> List[Document]:
+        # Only the page is copied, not the library
+        with self.snapshot(library_id) as library:
+            documents = library.document_page(limit, after)
+            if self._copy_on_write:
+                return documents
+            return [document.model_copy(deep=True) for document in documents]
+
+    def list_chunks(
+        self,
+        library_id: UUID,
+        doc_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[UUID] = None,
+    ) -> List[Chunk]:
+        with self.snapshot(library_id) as library:
+            chunks = library.chunk_page(doc_id, limit, after)
+            if self._copy_on_write:
+                return chunks
+            return [chunk.model_copy(deep=True) for chunk in chunks]
@@ -0,0 +1,122 @@
+# src/infrastructure/repositories/wal.py
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class WriteAheadLog:
+    """
+    Append-only JSON-lines log with group commit.
+
+    `append` only buffers a record and returns its sequence number; `sync`
+    blocks until that record is on disk. Whichever waiting thread finds no
+    flush in progress writes out everything buffered so far with a single
+    fsync, so concurrent writers share the cost of each sync.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self._fsync = fsync
+        self._file = open(path, "ab")
+        self._cond = threading.Condition()
+
+        self._buffer: List[bytes] = []
+        self._appended = 0  # Sequence number of the last buffered record
+        self._durable = 0  # Sequence number of the last record on disk
+        self._flushing = False
+        self._error: Optional[Exception] = None
+
+        self.records_since_rotate = 0
+        self.stats = {"records_written": 0, "bytes_written": 0, "syncs": 0}
+
+    def append(self, record: Dict[str, Any]) -> int:
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        with self._cond:
+            self._buffer.append(line)
+            self._appended += 1
+            self.records_since_rotate += 1
+            return self._appended
+
+    def sync(self, seq: int):
+        """Blocks until every record up to `seq` has been written (and fsynced)."""
+        with self._cond:
+            while self._durable < seq:
+                if self._error is not None:
+                    raise IOError("Write-ahead log is unusable") from self._error
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+
+                # Become the leader of the next group commit
+                self._flushing = True
+                batch, self._buffer = self._buffer, []
+                upto = self._appended
+                self._cond.release()
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    self._error = e
+                    raise
+                finally:
+                    self._cond.acquire()
+                    self._flushing = False
+                    self._cond.notify_all()
+
+                self._durable = upto
+
+    def rotate(self, path: str):
+        """
+        Flushes every buffered record to the current file, then directs later
+        appends to a new file at `path`.
+        """
+        with self._cond:
+            self._drain()
+            self._file.close()
+            self._file = open(path, "ab")
+            self.records_since_rotate = 0
+
+    def close(self):
+        with self._cond:
+            self._drain()
+            self._file.close()
+
+    def _drain(self):
+        """Writes out the buffer. The caller holds the condition's lock."""
+        while self._flushing:
+            self._cond.wait()
+        batch, self._buffer = self._buffer, []
+        self._write(batch)
+        self._durable = self._appended
+
+    def _write(self, batch: List[bytes]):
+        if not batch:
+            return
+        data = b"".join(batch)
+        self._file.write(data)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+        self.stats["records_written"] += len(batch)
+        self.stats["bytes_written"] += len(data)
+        self.stats["syncs"] += 1
+
+    @staticmethod
+    def read(path: str) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Returns the records of a log file and the byte length of its valid
+        prefix. A torn last line (crash mid-write) ends the valid prefix.
+        """
+        records: List[Dict[str, Any]] = []
+        valid_bytes = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        return records, valid_bytes
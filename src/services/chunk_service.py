@@ -1,14 +1,13 @@
 # src/services/chunk_service.py
 
+import asyncio
 from uuid import UUID
-from typing import List
-from src.core.models import Library, Chunk
+from typing import List, Optional
+from src.core.models import Document, Chunk, to_embedding
 from src.api.schemas import ChunkCreate, ChunkUpdate
 from src.infrastructure.repositories.base_repo import ILibraryRepository
 from src.core.exceptions import DocumentNotFound
 from src.core.exceptions import ChunkNotFound
-from src.core.indexing.avl_index import AvlIndex
-from src.core.indexing.lsh_index import LshIndex
 from src.infrastructure.embeddings.base_client import IEmbeddingsClient
 
 
@@ -32,112 +31,109 @@ class ChunkService:
             raise ChunkNotFound(f"Chunk {chunk_id} not found in document {doc_id}")
         return chunk
 
-    def list_chunks(self, library_id: UUID, doc_id: UUID) -> List[Chunk]:
-        library = self.repository.get_by_id(library_id)
-        document = library.documents.get(doc_id)
+    def list_chunks(
+        self,
+        library_id: UUID,
+        doc_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[UUID] = None,
+    ) -> List[Chunk]:
+        """Chunks ordered by id, up to `limit` of those after the `after` cursor."""
+        return self.repository.list_chunks(library_id, doc_id, limit, after)
+
+    def _require_document(self, library_id: UUID, doc_id: UUID) -> Document:
+        """Validates the target of a write without copying the library."""
+        with self.repository.snapshot(library_id) as library:
+            document = library.documents.get(doc_id)
         if not document:
             raise DocumentNotFound(
                 f"Document {doc_id} not found in library {library_id}"
             )
-        return list(document.chunks.values())
-
-    def _update_indices_on_add_update(self, library: Library, chunk: Chunk):
-        """Updates all indices of a library after a chunk addition/update."""
-        for index_name, index in library.indices.items():
-            if isinstance(index, LshIndex):
-                index.delete(chunk.uid)  # Remove old entry if exists
-                index.insert(chunk)
-
-            elif isinstance(index, AvlIndex):
-                index.insert(chunk)
-
-            # Also update the corresponding metadata object.
-            if index_name in library.index_metadata:
-                library.index_metadata[index_name].vector_count = index.vector_count
-
-    def _update_indices_on_delete(self, library: Library, chunk_id: UUID):
-        """Updates all indices of a library after a chunk deletion."""
-        for index_name, index in list(library.indices.items()):
-            if isinstance(index, (AvlIndex, LshIndex)):
-                index.delete(chunk_id)
-
-                # Also update the corresponding metadata object.
-                if index_name in library.index_metadata:
-                    library.index_metadata[index_name].vector_count = index.vector_count
-            else:
-                pass
+        return document
+
+    def _require_chunk(self, library_id: UUID, doc_id: UUID, chunk_id: UUID) -> Chunk:
+        document = self._require_document(library_id, doc_id)
+
+        chunk = document.chunks.get(chunk_id)
+        if not chunk:
+            raise ChunkNotFound(f"Chunk {chunk_id} not found in document {doc_id}")
+        return chunk
 
     def create_chunk(
         self, library_id: UUID, doc_id: UUID, chunk_create: ChunkCreate
     ) -> Chunk:
-
-        library = self.repository.get_by_id(library_id)
-        document = library.documents.get(doc_id)
-        if not document:
-            # This check is now implicit, but good to be aware of
-            raise DocumentNotFound(
-                f"Document {doc_id} not found in library {library_id}"
-            )
+        # Fail before paying for an embedding
+        self._require_document(library_id, doc_id)
 
         chunk = Chunk(**chunk_create.model_dump())
         if chunk.text:
             chunk.embedding = self.embeddings_client.get_embeddings([chunk.text])[0]
 
-        document.chunks[chunk.uid] = chunk
+        self.repository.put_chunk(library_id, doc_id, chunk)
+
+        return chunk
+
+    async def acreate_chunk(
+        self, library_id: UUID, doc_id: UUID, chunk_create: ChunkCreate
+    ) -> Chunk:
+        """Async variant of `create_chunk`; repository calls run in worker threads."""
+        await asyncio.to_thread(self._require_document, library_id, doc_id)
 
-        self._update_indices_on_add_update(library, chunk)
+        chunk = Chunk(**chunk_create.model_dump())
+        if chunk.text:
+            embeddings = await self.embeddings_client.aget_embeddings([chunk.text])
+            chunk.embedding = embeddings[0]
 
-        self.repository.update(library)
+        await asyncio.to_thread(self.repository.put_chunk, library_id, doc_id, chunk)
 
         return chunk
 
     def update_chunk(
         self, library_id: UUID, doc_id: UUID, chunk_id: UUID, chunk_update: ChunkUpdate
     ) -> Chunk:
-        library = self.repository.get_by_id(library_id)
-        document = library.documents.get(doc_id)
-        if not document:
-            raise DocumentNotFound(
-                f"Document {doc_id} not found in library {library_id}"
-            )
-
-        chunk = document.chunks.get(chunk_id)
-        if not chunk:
-            raise ChunkNotFound(f"Chunk {chunk_id} not found in document {doc_id}")
+        chunk = self._require_chunk(library_id, doc_id, chunk_id)
 
         update_data = chunk_update.model_dump(exclude_unset=True)
 
-        embedding_changed = False
+        # A new text means a new embedding; otherwise the indices are left alone
         if chunk_update.text is not None:
             new_embedding = self.embeddings_client.get_embeddings([chunk_update.text])[
                 0
             ]
-            update_data["embedding"] = new_embedding
-            embedding_changed = True
+            update_data["embedding"] = to_embedding(new_embedding)
 
         updated_chunk = chunk.model_copy(update=update_data)
-        document.chunks[chunk_id] = updated_chunk
+        self.repository.put_chunk(library_id, doc_id, updated_chunk)
+
+        return updated_chunk
+
+    async def aupdate_chunk(
+        self, library_id: UUID, doc_id: UUID, chunk_id: UUID, chunk_update: ChunkUpdate
+    ) -> Chunk:
+        """Async variant of `update_chunk`; repository calls run in worker threads."""
+        chunk = await asyncio.to_thread(
+            self._require_chunk, library_id, doc_id, chunk_id
+        )
 
-        # Update indices only if text was changed (and thus embedding)
-        if embedding_changed:
-            self._update_indices_on_add_update(library, updated_chunk)
+        update_data = chunk_update.model_dump(exclude_unset=True)
+
+        if chunk_update.text is not None:
+            embeddings = await self.embeddings_client.aget_embeddings(
+                [chunk_update.text]
+            )
+            update_data["embedding"] = to_embedding(embeddings[0])
 
-        self.repository.update(library)
+        updated_chunk = chunk.model_copy(update=update_data)
+        await asyncio.to_thread(
+            self.repository.put_chunk, library_id, doc_id, updated_chunk
+        )
 
         return updated_chunk
 
     def delete_chunk(self, library_id: UUID, doc_id: UUID, chunk_id: UUID) -> None:
-        library = self.repository.get_by_id(library_id)
-        document = library.documents.get(doc_id)
-        if not document:
-            raise DocumentNotFound(
-                f"Document {doc_id} not found in library {library_id}"
-            )
+        document = self._require_document(library_id, doc_id)
 
         if chunk_id not in document.chunks:
             raise ChunkNotFound(f"Chunk {chunk_id} not found in document {doc_id}")
 
-        del document.chunks[chunk_id]
-
-        self._update_indices_on_delete(library, chunk_id)
-        self.repository.update(library)
+        self.repository.delete_chunk(library_id, doc_id, chunk_id)
@@ -1,10 +1,9 @@
 # src/services/document_service.py
 
+import asyncio
 from uuid import UUID
-from typing import List
-from src.core.models import Document, Chunk, Library
-from src.core.indexing.avl_index import AvlIndex
-from src.core.indexing.lsh_index import LshIndex
+from typing import List, Optional, Tuple
+from src.core.models import Document, Chunk, to_embedding
 from src.api.schemas import DocumentCreate, DocumentUpdate
 from src.infrastructure.repositories.base_repo import ILibraryRepository
 from src.infrastructure.embeddings.base_client import IEmbeddingsClient
@@ -19,51 +18,42 @@ class DocumentService:
         self.embeddings_client = embeddings_client
 
     def create_document(self, library_id: UUID, doc_create: DocumentCreate) -> Document:
-        library = self.repository.get_by_id(library_id)
+        # Fail before paying for embeddings
+        self._require_library(library_id)
 
-        document_data = doc_create.model_dump(exclude={"chunks"})
-        document = Document(**document_data)
+        document, chunks_to_embed = self._new_document(doc_create)
 
         # Batch processing of chunk embeddings
-        if doc_create.chunks:
-            chunks_to_embed: List[Chunk] = []
-            texts_to_embed: List[str] = []
-
-            temp_chunks = []
-            for chunk_create in doc_create.chunks:
-                chunk = Chunk(**chunk_create.model_dump())
-
-                if chunk.text:
-                    chunks_to_embed.append(chunk)
-                    texts_to_embed.append(chunk.text)
+        if chunks_to_embed:
+            vectors = self.embeddings_client.get_embeddings(
+                [c.text for c in chunks_to_embed]
+            )
+            self._assign_embeddings(chunks_to_embed, vectors)
 
-                temp_chunks.append(chunk)
+        # Stores the document and indexes its chunks in one targeted write
+        self.repository.put_document(library_id, document)
+        return document
 
-            if texts_to_embed:
-                vectors = self.embeddings_client.get_embeddings(texts_to_embed)
+    async def acreate_document(
+        self, library_id: UUID, doc_create: DocumentCreate
+    ) -> Document:
+        """
+        Async variant of `create_document`: the embeddings are awaited and
+        the blocking repository calls run in worker threads.
+        """
+        await asyncio.to_thread(self._require_library, library_id)
 
-                for chunk, vector in zip(chunks_to_embed, vectors):
-                    chunk.embedding = vector
+        document, chunks_to_embed = self._new_document(doc_create)
 
-            for chunk in temp_chunks:
-                document.chunks[chunk.uid] = chunk
-                self._update_indices_on_add(library, chunk)
+        if chunks_to_embed:
+            vectors = await self.embeddings_client.aget_embeddings(
+                [c.text for c in chunks_to_embed]
+            )
+            self._assign_embeddings(chunks_to_embed, vectors)
 
-        library.documents[document.uid] = document
-        self.repository.update(library)
+        await asyncio.to_thread(self.repository.put_document, library_id, document)
         return document
 
-    def _update_indices_on_add(self, library: Library, chunk: Chunk):
-        if not chunk.embedding:
-            return
-
-        for index_name, index in library.indices.items():
-            if isinstance(index, (AvlIndex, LshIndex)):
-                index.insert(chunk)
-
-                if index_name in library.index_metadata:
-                    library.index_metadata[index_name].vector_count = index.vector_count
-
     def get_document(self, library_id: UUID, doc_id: UUID) -> Document:
         library = self.repository.get_by_id(library_id)
         document = library.documents.get(doc_id)
@@ -73,15 +63,20 @@ class DocumentService:
             )
         return document
 
-    def list_documents(self, library_id: UUID) -> List[Document]:
-        library = self.repository.get_by_id(library_id)
-        return list(library.documents.values())
+    def list_documents(
+        self,
+        library_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[UUID] = None,
+    ) -> List[Document]:
+        """Documents ordered by id, up to `limit` of those after the `after` cursor."""
+        return self.repository.list_documents(library_id, limit, after)
 
     def update_document(
         self, library_id: UUID, doc_id: UUID, doc_update: DocumentUpdate
     ) -> Document:
-        library = self.repository.get_by_id(library_id)
-        document = library.documents.get(doc_id)
+        with self.repository.snapshot(library_id) as library:
+            document = library.documents.get(doc_id)
         if not document:
             raise DocumentNotFound(
                 f"Document {doc_id} not found in library {library_id}"
@@ -90,28 +85,47 @@ class DocumentService:
         update_data = doc_update.model_dump(exclude_unset=True)
         updated_document = document.model_copy(update=update_data)
 
-        library.documents[doc_id] = updated_document
-        self.repository.update(library)
+        # Chunks are shared with the previous version, so no index work is done
+        self.repository.put_document(library_id, updated_document)
         return updated_document
 
     def delete_document(self, library_id: UUID, doc_id: UUID) -> None:
-        library = self.repository.get_by_id(library_id)
-        if doc_id not in library.documents:
-            raise DocumentNotFound(
-                f"Document {doc_id} not found in library {library_id}"
-            )
+        with self.repository.snapshot(library_id) as library:
+            if doc_id not in library.documents:
+                raise DocumentNotFound(
+                    f"Document {doc_id} not found in library {library_id}"
+                )
+
+        self.repository.delete_document(library_id, doc_id)
 
-        document = library.documents[doc_id]
+    # --- Internal helpers ---
 
-        if document.chunks:
-            for chunk_id in document.chunks:
-                for index in library.indices.values():
-                    if isinstance(index, (AvlIndex, LshIndex)):
-                        index.delete(chunk_id)
+    def _require_library(self, library_id: UUID):
+        with self.repository.snapshot(library_id):
+            pass
 
-        for index_name, index in library.indices.items():
-            if index_name in library.index_metadata:
-                library.index_metadata[index_name].vector_count = index.vector_count
+    def _new_document(self, doc_create: DocumentCreate) -> Tuple[Document, List[Chunk]]:
+        """Builds the document and its chunks; returns the chunks that need an embedding."""
+        document_data = doc_create.model_dump(exclude={"chunks"})
+        document = Document(**document_data)
 
-        del library.documents[doc_id]
-        self.repository.update(library)
+        chunks_to_embed: List[Chunk] = []
+        for chunk_create in doc_create.chunks or []:
+            chunk = Chunk(**chunk_create.model_dump())
+            if chunk.text:
+                chunks_to_embed.append(chunk)
+            document.chunks[chunk.uid] = chunk
+        return document, chunks_to_embed
+
+    @staticmethod
+    def _assign_embeddings(chunks: List[Chunk], vectors):
+        """
+        Stores the vectors on their chunks. Identical texts come back as one
+        vector object from a deduplicating client, and keep sharing one array.
+        """
+        embeddings = {}
+        for chunk, vector in zip(chunks, vectors):
+            embedding = embeddings.get(id(vector))
+            if embedding is None:
+                embedding = embeddings[id(vector)] = to_embedding(vector)
+            chunk.embedding = embedding
@@ -1,7 +1,7 @@
 # src/services/library_service.py
 
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from src.core.models import Library
 from src.api.schemas import LibraryCreate, LibraryUpdate
 from src.infrastructure.repositories.base_repo import ILibraryRepository
@@ -22,17 +22,12 @@ class LibraryService:
     def update_library(
         self, library_id: UUID, library_update: LibraryUpdate
     ) -> Library:
-        library = self.repository.get_by_id(library_id)
+        library = self.repository.get_for_update(library_id)
 
-        # 1. Get current data
-        current_data = library.model_dump()
-
-        # 2. Merge with update data
+        # Fields are validated by the update schema. The copy keeps the
+        # documents (and the structures indexing them), so nothing is rebuilt.
         update_data = library_update.model_dump(exclude_unset=True)
-        current_data.update(update_data)
-
-        # 3. Create new instance to enforce validation rules
-        updated_library = Library(**current_data)
+        updated_library = library.model_copy(update=update_data)
 
         self.repository.update(updated_library)
         return updated_library
@@ -40,5 +35,8 @@ class LibraryService:
     def delete_library(self, library_id: UUID) -> None:
         self.repository.delete(library_id)
 
-    def list_libraries(self) -> List[Library]:
-        return self.repository.list_all()
+    def list_libraries(
+        self, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Library]:
+        """Libraries ordered by id, up to `limit` of those after the `after` cursor."""
+        return self.repository.list_page(limit, after)
@@ -1,50 +1,65 @@
 # src/services/search_service.py
 
+import asyncio
+import functools
 import logging
 from uuid import UUID
-from typing import List, Dict, Optional
-
-from src.api.schemas import SearchResult, IndexCreate, ChunkResponse
+from concurrent.futures import Executor, Future
+from typing import List, Dict, Optional, Tuple
+
+from src.api.schemas import (
+    SearchResult,
+    SearchQuery,
+    IndexCreate,
+    ChunkResponse,
+    Projection,
+    HybridSearch,
+)
 from src.infrastructure.embeddings.base_client import IEmbeddingsClient
 from src.infrastructure.repositories.base_repo import ILibraryRepository
-from src.core.indexing.index_factory import IndexFactory, IndexType
+from src.core.indexing.index_factory import IndexFactory, IndexType, Metric
 from src.core.models import Chunk, Library, IndexMetadata, IndexConfig
+from src.core.indexing.metadata_index import MetadataFilter
+from src.core.indexing.fusion import fuse_rankings
 from src.core.exceptions import IndexNotReady, IndexNotFound
 from src.core.exceptions import VectorDimensionMismatch
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Each leg of a hybrid search ranks this many candidates (k, if larger)
+# before the two rankings are fused
+HYBRID_CANDIDATES = 50
+
 
 class SearchService:
     def __init__(
-        self, repository: ILibraryRepository, embeddings_client: IEmbeddingsClient
+        self,
+        repository: ILibraryRepository,
+        embeddings_client: IEmbeddingsClient,
+        executor: Optional[Executor] = None,
     ):
         self.repository = repository
         self.embeddings_client = embeddings_client
+        # Runs the async searches' index work; None means the loop's default executor
+        self.executor = executor
 
     def create_index(self, library_id: UUID, index_name: str, api_config: IndexCreate):
         """Creates an index and attaches it to the Library object in the repository."""
-        library = self.repository.get_by_id(library_id)
+        library = self.repository.get_for_update(library_id)
 
         all_chunks: List[Chunk] = [
             chunk
             for document in library.documents.values()
             for chunk in document.chunks.values()
-            if chunk.embedding
+            if chunk.embedding is not None
         ]
 
         # 1. Create the core IndexConfig object from the API's IndexCreate object.
-        core_config = IndexConfig(
-            index_type=api_config.index_type,
-            metric=api_config.metric,
-        )
+        core_config = IndexConfig(**api_config.model_dump())
 
         # 2. Use the properties from the core_config to create the index.
-        index = IndexFactory.create_index(
-            index_type=core_config.index_type,
-            metric=core_config.metric,
-        )
+        index = IndexFactory.create_index(**core_config.model_dump())
 
         index.build(all_chunks)
 
@@ -83,7 +98,7 @@ class SearchService:
 
     def delete_index(self, library_id: UUID, index_name: str):
         """Deletes a named index from a library."""
-        library = self.repository.get_by_id(library_id)
+        library = self.repository.get_for_update(library_id)
 
         if index_name not in library.index_metadata:
             # Corrected exception: The resource does not exist, so it's not 'NotReady'
@@ -104,66 +119,556 @@ class SearchService:
         k: int,
         query_embedding: Optional[List[float]] = None,
         query_text: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        num_probes: Optional[int] = None,
+        projection: Optional[Projection] = None,
+        metadata_filter: Optional[MetadataFilter] = None,
+        hybrid: Optional[HybridSearch] = None,
     ) -> List[SearchResult]:
         """
         Performs a search using the index attached to the library.
-        Handles embedding generation if raw text is provided.
+        Handles embedding generation if raw text is provided. `projection`
+        selects the chunk fields of the results (all of them by default),
+        and `metadata_filter` restricts them to chunks whose metadata matches.
+        With `hybrid`, `query_text` is also ranked by the library's BM25 index
+        and the two rankings are fused. The BM25 leg runs on the service's
+        executor while the query is embedded and the vector index searched.
         """
         # 1. Validation
-        if not query_text and not query_embedding:
-            raise ValueError(
-                "Either 'query_text' or 'query_embedding' must be provided."
+        self._validate_query(query_text, query_embedding, hybrid)
+
+        if hybrid is not None:
+            return self._search_hybrid(
+                library_id,
+                index_name,
+                k,
+                query_text,
+                self._search_params(ef_search, nprobe, num_probes),
+                projection,
+                metadata_filter,
+                hybrid,
             )
 
         # 2. Resolve Query Vector
         query_vector = query_embedding
 
         if query_text:
+            query_vector = self._first_embedding(
+                self.embeddings_client.get_embeddings(
+                    texts=[query_text], input_type="search_query"
+                )
+            )
+
+        # 3-5. Search the index and hydrate the results
+        return self._search_vector(
+            library_id,
+            index_name,
+            query_vector,
+            k,
+            ef_search,
+            nprobe,
+            num_probes,
+            projection,
+            metadata_filter,
+        )
+
+    async def asearch_chunks(
+        self,
+        library_id: UUID,
+        index_name: str,
+        k: int,
+        query_embedding: Optional[List[float]] = None,
+        query_text: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        num_probes: Optional[int] = None,
+        projection: Optional[Projection] = None,
+        metadata_filter: Optional[MetadataFilter] = None,
+        hybrid: Optional[HybridSearch] = None,
+    ) -> List[SearchResult]:
+        """
+        Async variant of `search_chunks`. The query text is embedded without
+        blocking the event loop, and the CPU-bound index search runs on the
+        service's executor. The BM25 leg of a hybrid search runs concurrently
+        with the embedding call and the vector search.
+        """
+        self._validate_query(query_text, query_embedding, hybrid)
+
+        if hybrid is not None:
+            return await self._asearch_hybrid(
+                library_id,
+                index_name,
+                k,
+                query_text,
+                self._search_params(ef_search, nprobe, num_probes),
+                projection,
+                metadata_filter,
+                hybrid,
+            )
+
+        query_vector = query_embedding
+
+        if query_text:
+            query_vector = self._first_embedding(
+                await self.embeddings_client.aget_embeddings(
+                    texts=[query_text], input_type="search_query"
+                )
+            )
+
+        return await self._run_search(
+            self._search_vector,
+            library_id,
+            index_name,
+            query_vector,
+            k,
+            ef_search,
+            nprobe,
+            num_probes,
+            projection,
+            metadata_filter,
+        )
+
+    def search_chunks_batch(
+        self,
+        library_id: UUID,
+        index_name: str,
+        queries: List[SearchQuery],
+        projection: Optional[Projection] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Runs many searches against one index. The library is fetched once,
+        the `query_text`s are embedded in a single call, and
+        plain (unfiltered, non-hybrid) queries sharing the same k and tuning
+        knobs go through one `index.search_batch` call. The BM25 legs of
+        hybrid queries run on the service's executor meanwhile. Results are
+        returned in the order of `queries`.
+        """
+        text_leg = self._submit_batch_text_hits(library_id, queries)
+
+        # 1. Resolve all query vectors, embedding the texts in one call
+        text_positions = self._batch_text_positions(queries)
+        embeddings = []
+        if text_positions:
             embeddings = self.embeddings_client.get_embeddings(
+                texts=[queries[i].query_text for i in text_positions],
+                input_type="search_query",
+            )
+        query_vectors = self._batch_query_vectors(queries, text_positions, embeddings)
+
+        # 2-4. Search the index once per group of compatible queries
+        return self._search_vectors(
+            library_id, index_name, queries, query_vectors, projection, text_leg
+        )
+
+    async def asearch_chunks_batch(
+        self,
+        library_id: UUID,
+        index_name: str,
+        queries: List[SearchQuery],
+        projection: Optional[Projection] = None,
+    ) -> List[List[SearchResult]]:
+        """Async variant of `search_chunks_batch` (see `asearch_chunks`)."""
+        text_leg = self._submit_batch_text_hits(library_id, queries)
+
+        text_positions = self._batch_text_positions(queries)
+        embeddings = []
+        if text_positions:
+            embeddings = await self.embeddings_client.aget_embeddings(
+                texts=[queries[i].query_text for i in text_positions],
+                input_type="search_query",
+            )
+        query_vectors = self._batch_query_vectors(queries, text_positions, embeddings)
+
+        return await self._run_search(
+            self._search_vectors,
+            library_id,
+            index_name,
+            queries,
+            query_vectors,
+            projection,
+            text_leg,
+        )
+
+    # --- Internal helpers ---
+
+    def _search_hybrid(
+        self,
+        library_id: UUID,
+        index_name: str,
+        k: int,
+        query_text: str,
+        search_params: Dict[str, int],
+        projection: Optional[Projection],
+        metadata_filter: Optional[MetadataFilter],
+        hybrid: HybridSearch,
+    ) -> List[SearchResult]:
+        depth = max(k, HYBRID_CANDIDATES)
+        text_leg = self._submit(
+            self._text_hits, library_id, query_text, depth, metadata_filter
+        )
+
+        query_vector = self._first_embedding(
+            self.embeddings_client.get_embeddings(
                 texts=[query_text], input_type="search_query"
             )
+        )
+        vector_hits, metric = self._vector_hits(
+            library_id, index_name, query_vector, depth, search_params, metadata_filter
+        )
+
+        fused = fuse_rankings(
+            vector_hits,
+            text_leg.result(),
+            k,
+            hybrid.fusion,
+            hybrid.vector_weight,
+            metric,
+        )
+        return self._hydrate_hits(library_id, index_name, fused, projection)
+
+    async def _asearch_hybrid(
+        self,
+        library_id: UUID,
+        index_name: str,
+        k: int,
+        query_text: str,
+        search_params: Dict[str, int],
+        projection: Optional[Projection],
+        metadata_filter: Optional[MetadataFilter],
+        hybrid: HybridSearch,
+    ) -> List[SearchResult]:
+        depth = max(k, HYBRID_CANDIDATES)
+
+        async def vector_leg() -> Tuple[List[Tuple[Chunk, float]], Metric]:
+            query_vector = self._first_embedding(
+                await self.embeddings_client.aget_embeddings(
+                    texts=[query_text], input_type="search_query"
+                )
+            )
+            return await self._run_search(
+                self._vector_hits,
+                library_id,
+                index_name,
+                query_vector,
+                depth,
+                search_params,
+                metadata_filter,
+            )
+
+        (vector_hits, metric), text_hits = await asyncio.gather(
+            vector_leg(),
+            self._run_search(
+                self._text_hits, library_id, query_text, depth, metadata_filter
+            ),
+        )
+        fused = fuse_rankings(
+            vector_hits, text_hits, k, hybrid.fusion, hybrid.vector_weight, metric
+        )
+        return await self._run_search(
+            self._hydrate_hits, library_id, index_name, fused, projection
+        )
 
-            if not embeddings:
-                raise ValueError(
-                    "Failed to generate embedding for the provided query text."
+    def _submit(self, fn, *args) -> Future:
+        """
+        Starts `fn` on the search executor. Without one it runs right away,
+        and the returned future is already done.
+        """
+        if self.executor is not None:
+            return self.executor.submit(fn, *args)
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _submit_batch_text_hits(
+        self, library_id: UUID, queries: List[SearchQuery]
+    ) -> Optional[Future]:
+        """Starts the BM25 legs of the hybrid queries of a batch, if any."""
+        if not any(q.hybrid is not None for q in queries):
+            return None
+        return self._submit(self._batch_text_hits, library_id, queries)
+
+    def _batch_text_hits(
+        self, library_id: UUID, queries: List[SearchQuery]
+    ) -> Dict[int, List[Tuple[Chunk, float]]]:
+        with self.repository.snapshot(library_id) as library:
+            return {
+                i: library.text_search(
+                    q.query_text, max(q.k, HYBRID_CANDIDATES), q.filter
                 )
+                for i, q in enumerate(queries)
+                if q.hybrid is not None
+            }
+
+    async def _run_search(self, fn, *args):
+        """Runs CPU-bound index work on the search executor, off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args))
+
+    @staticmethod
+    def _validate_query(
+        query_text: Optional[str],
+        query_embedding: Optional[List[float]],
+        hybrid: Optional[HybridSearch] = None,
+    ):
+        if not query_text and not query_embedding:
+            raise ValueError(
+                "Either 'query_text' or 'query_embedding' must be provided."
+            )
+        if hybrid is not None and not query_text:
+            raise ValueError("Hybrid search requires 'query_text'.")
 
-            query_vector = embeddings[0]
+    @staticmethod
+    def _first_embedding(embeddings: List[List[float]]) -> List[float]:
+        if not embeddings:
+            raise ValueError(
+                "Failed to generate embedding for the provided query text."
+            )
+        return embeddings[0]
+
+    @staticmethod
+    def _batch_text_positions(queries: List[SearchQuery]) -> List[int]:
+        """Positions of the queries that are embedded from their text."""
+        return [i for i, q in enumerate(queries) if q.query_text]
+
+    @staticmethod
+    def _batch_query_vectors(
+        queries: List[SearchQuery],
+        text_positions: List[int],
+        embeddings: List[List[float]],
+    ) -> List[Optional[List[float]]]:
+        query_vectors: List[Optional[List[float]]] = [
+            q.query_embedding for q in queries
+        ]
+        if not text_positions:
+            return query_vectors
 
-        # 3. Retrieve Library and Index
-        library = self.repository.get_by_id(library_id)
-        index = library.indices.get(index_name)
+        if not embeddings or len(embeddings) != len(text_positions):
+            raise ValueError(
+                "Failed to generate embeddings for the provided query texts."
+            )
 
-        if not index:
-            raise IndexNotReady(
-                f"Index '{index_name}' is not ready for search. It may need to be rebuilt."
+        for i, embedding in zip(text_positions, embeddings):
+            query_vectors[i] = embedding
+        return query_vectors
+
+    def _search_vector(
+        self,
+        library_id: UUID,
+        index_name: str,
+        query_vector: List[float],
+        k: int,
+        ef_search: Optional[int],
+        nprobe: Optional[int],
+        num_probes: Optional[int],
+        projection: Optional[Projection],
+        metadata_filter: Optional[MetadataFilter],
+    ) -> List[SearchResult]:
+        # 3. Retrieve Library and Index. Indices may be updated in place by
+        # targeted writes, so the search runs inside the repository snapshot.
+        with self.repository.snapshot(library_id) as library:
+            index = self._require_index(library, index_name)
+
+            # 4. Perform Search
+            search_params = self._search_params(ef_search, nprobe, num_probes)
+
+            raw_results = self._index_search(
+                library, index, query_vector, k, search_params, metadata_filter
             )
 
-        # 4. Perform Search
-        # Pass the resolved query_vector
+            # 5. Result Hydration & Consistency Check
+            return self._hydrate_results(library, index_name, raw_results, projection)
+
+    def _search_vectors(
+        self,
+        library_id: UUID,
+        index_name: str,
+        queries: List[SearchQuery],
+        query_vectors: List[List[float]],
+        projection: Optional[Projection],
+        text_leg: Optional[Future] = None,
+    ) -> List[List[SearchResult]]:
+        # 2. Retrieve Library and Index (once for the whole batch)
+        with self.repository.snapshot(library_id) as library:
+            index = self._require_index(library, index_name)
+
+            # 3. Group queries that can share one batched index call
+            results: List[List[SearchResult]] = [[] for _ in queries]
+            groups: Dict[Tuple, List[int]] = {}
+            hybrid_hits: Dict[int, List[Tuple[Chunk, float]]] = {}
+            for i, q in enumerate(queries):
+                if q.filter is not None or q.hybrid is not None:
+                    # Each filter selects its own chunks, and hybrid queries
+                    # rank more candidates: these are searched on their own
+                    search_params = self._search_params(
+                        q.ef_search, q.nprobe, q.num_probes
+                    )
+                    k = q.k if q.hybrid is None else max(q.k, HYBRID_CANDIDATES)
+                    raw_results = self._index_search(
+                        library, index, query_vectors[i], k, search_params, q.filter
+                    )
+                    if q.hybrid is not None:
+                        # Fused once the BM25 legs are in (step 5)
+                        hybrid_hits[i] = raw_results
+                        continue
+                    results[i] = self._hydrate_results(
+                        library, index_name, raw_results, projection
+                    )
+                    continue
+                key = (q.k, q.ef_search, q.nprobe, q.num_probes)
+                groups.setdefault(key, []).append(i)
+
+            # 4. Perform Search
+            for (k, ef_search, nprobe, num_probes), positions in groups.items():
+                search_params = self._search_params(ef_search, nprobe, num_probes)
+                try:
+                    raw_batches = index.search_batch(
+                        [query_vectors[i] for i in positions], k, **search_params
+                    )
+                except ValueError as e:
+                    raise VectorDimensionMismatch(
+                        f"Vector dimension mismatch. Index expects consistent dimensions, "
+                        f"but got an incompatible query vector. Underlying error: {str(e)}"
+                    )
+
+                for i, raw_results in zip(positions, raw_batches):
+                    results[i] = self._hydrate_results(
+                        library, index_name, raw_results, projection
+                    )
+
+            metric = index.metric
+
+        # 5. Fuse the hybrid queries' rankings. Their BM25 legs are waited for
+        # outside the snapshot: they take a read lock of their own, which a
+        # waiting writer would hold off for as long as this one is held.
+        if hybrid_hits:
+            text_hits = text_leg.result()
+            fused = {}
+            for i, vector_hits in hybrid_hits.items():
+                hybrid = queries[i].hybrid
+                fused[i] = fuse_rankings(
+                    vector_hits,
+                    text_hits[i],
+                    queries[i].k,
+                    hybrid.fusion,
+                    hybrid.vector_weight,
+                    metric,
+                )
+            with self.repository.snapshot(library_id) as library:
+                for i, hits in fused.items():
+                    results[i] = self._hydrate_results(
+                        library, index_name, hits, projection
+                    )
+
+        return results
+
+    def _vector_hits(
+        self,
+        library_id: UUID,
+        index_name: str,
+        query_vector: List[float],
+        k: int,
+        search_params: Dict[str, int],
+        metadata_filter: Optional[MetadataFilter],
+    ) -> Tuple[List[Tuple[Chunk, float]], Metric]:
+        """The index hits, and the metric that tells how to read their scores."""
+        with self.repository.snapshot(library_id) as library:
+            index = self._require_index(library, index_name)
+            hits = self._index_search(
+                library, index, query_vector, k, search_params, metadata_filter
+            )
+            return hits, index.metric
+
+    def _text_hits(
+        self,
+        library_id: UUID,
+        query_text: str,
+        k: int,
+        metadata_filter: Optional[MetadataFilter],
+    ) -> List[Tuple[Chunk, float]]:
+        with self.repository.snapshot(library_id) as library:
+            return library.text_search(query_text, k, metadata_filter)
+
+    def _hydrate_hits(
+        self,
+        library_id: UUID,
+        index_name: str,
+        hits: List[Tuple[Chunk, float]],
+        projection: Optional[Projection],
+    ) -> List[SearchResult]:
+        with self.repository.snapshot(library_id) as library:
+            return self._hydrate_results(library, index_name, hits, projection)
+
+    @staticmethod
+    def _index_search(
+        library: Library,
+        index,
+        query_vector: List[float],
+        k: int,
+        search_params: Dict[str, int],
+        metadata_filter: Optional[MetadataFilter],
+    ) -> List[Tuple[Chunk, float]]:
         try:
-            raw_results = index.search(query_vector, k)
+            if metadata_filter is None:
+                return index.search(query_vector, k, **search_params)
+            return index.search_filtered(
+                query_vector, k, library.filter_chunks(metadata_filter), **search_params
+            )
         except ValueError as e:
             raise VectorDimensionMismatch(
                 f"Vector dimension mismatch. Index expects consistent dimensions, "
                 f"but got an incompatible query vector. Underlying error: {str(e)}"
             )
+
+    @staticmethod
+    def _require_index(library: Library, index_name: str):
+        index = library.indices.get(index_name)
+        if not index:
+            raise IndexNotReady(
+                f"Index '{index_name}' is not ready for search. It may need to be rebuilt."
+            )
+        return index
+
+    @staticmethod
+    def _search_params(
+        ef_search: Optional[int], nprobe: Optional[int], num_probes: Optional[int]
+    ) -> Dict[str, int]:
+        """Per-query tuning knobs are only forwarded when the caller set them."""
+        search_params = {}
+        if ef_search is not None:
+            search_params["ef_search"] = ef_search
+        if nprobe is not None:
+            search_params["nprobe"] = nprobe
+        if num_probes is not None:
+            search_params["num_probes"] = num_probes
+        return search_params
+
+    def _hydrate_results(
+        self,
+        library: Library,
+        index_name: str,
+        raw_results: List[Tuple[Chunk, float]],
+        projection: Optional[Projection] = None,
+    ) -> List[SearchResult]:
+        """Maps index hits back to the library's chunks, skipping stale entries."""
+        library_id = library.uid
         validated_results: List[SearchResult] = []
 
-        # 5. Result Hydration & Consistency Check
         for index_chunk, score in raw_results:
             found_chunk_response: Optional[ChunkResponse] = None
 
-            for document in library.documents.values():
-                if index_chunk.uid in document.chunks:
-                    domain_chunk = document.chunks[index_chunk.uid]
-
-                    found_chunk_response = ChunkResponse.from_model(
-                        chunk=domain_chunk,
-                        library_id=library.uid,
-                        document_id=document.uid,
-                    )
-                    break
+            # O(1) through the library's chunk -> document map
+            document = library.find_document(index_chunk.uid)
+            if document is not None:
+                found_chunk_response = ChunkResponse.from_model(
+                    chunk=document.chunks[index_chunk.uid],
+                    library_id=library.uid,
+                    document_id=document.uid,
+                    projection=projection,
+                )
 
             if found_chunk_response:
                 validated_results.append(
@@ -1,7 +1,9 @@
 # tests/fakes.py
 
+import time
 from uuid import uuid4
 from typing import Dict, Any, List, Optional
+from src.infrastructure.embeddings.fake_client import FakeEmbeddingsClient
 
 # ============================================================================
 # Fake Domain Model Classes for Unit Testing
@@ -42,7 +44,7 @@ class FakeChunkResponse:
         self.metadata = metadata
 
     @classmethod
-    def from_model(cls, chunk, library_id, document_id):
+    def from_model(cls, chunk, library_id, document_id, projection=None):
         return cls(
             id=chunk.uid,
             document_id=document_id,
@@ -108,6 +110,13 @@ class FakeLibrary:
         """Simulates Pydantic model_dump by returning instance attributes."""
         return self.__dict__.copy()
 
+    def find_document(self, chunk_id):
+        """Simulates the chunk -> document lookup with a scan."""
+        for document in self.documents.values():
+            if chunk_id in document.chunks:
+                return document
+        return None
+
 
 # ============================================================================
 # Fake API Schema Classes for Unit Testing
@@ -167,3 +176,23 @@ class FakeIndexMetadata:
 
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
+
+
+# ============================================================================
+# Fake Embeddings Clients
+# ============================================================================
+
+
+class CountingEmbeddingsClient(FakeEmbeddingsClient):
+    """Records every batch of texts that reaches the provider."""
+
+    def __init__(self, dimension: int = 3, delay: float = 0.0):
+        super().__init__(dimension)
+        self.delay = delay
+        self.calls = []
+
+    def get_embeddings(self, texts, input_type="search_document"):
+        self.calls.append((list(texts), input_type))
+        if self.delay:
+            time.sleep(self.delay)
+        return super().get_embeddings(texts, input_type)
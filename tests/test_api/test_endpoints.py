@@ -434,3 +434,95 @@ def test_document_contains_chunks(client):
 def test_invalid_uuid_format(client):
     response = client.get("/libraries/not-a-uuid")
     assert response.status_code == 422
+
+
+# ============================================================================
+# PAGINATION TESTS (3 tests)
+# ============================================================================
+def test_list_libraries_with_cursor(client):
+    ids = sorted(create_library_via_api(client)["id"] for _ in range(3))
+
+    response = client.get("/libraries/", params={"limit": 2})
+    assert [lib["id"] for lib in response.json()] == ids[:2]
+    cursor = response.headers["X-Next-Cursor"]
+    assert cursor == ids[1]
+
+    response = client.get("/libraries/", params={"limit": 2, "after": cursor})
+    assert [lib["id"] for lib in response.json()] == ids[2:]
+    # A short page is the last one
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_documents_and_chunks_with_cursor(client):
+    lib = create_library_via_api(client)
+    doc_ids = sorted(create_document_via_api(client, lib["id"])["id"] for _ in range(3))
+    chunk_ids = sorted(
+        create_chunk_via_api(client, lib["id"], doc_ids[0], {"text": str(i)})["id"]
+        for i in range(3)
+    )
+
+    response = client.get(
+        f"/libraries/{lib['id']}/documents", params={"limit": 1, "after": doc_ids[0]}
+    )
+    assert [doc["id"] for doc in response.json()] == doc_ids[1:2]
+
+    response = client.get(
+        f"/libraries/{lib['id']}/documents/{doc_ids[0]}/chunks",
+        params={"after": chunk_ids[0]},
+    )
+    assert [chunk["id"] for chunk in response.json()] == chunk_ids[1:]
+
+
+def test_invalid_page_size(client):
+    response = client.get("/libraries/", params={"limit": 0})
+    assert response.status_code == 422
+
+
+# ============================================================================
+# RESPONSE PROJECTION TESTS (4 tests)
+# ============================================================================
+def test_chunk_without_embedding(client):
+    lib = create_library_via_api(client)
+    doc = create_document_via_api(client, lib["id"])
+    chunk = create_chunk_via_api(client, lib["id"], doc["id"], {"text": "c1"})
+    response = client.get(
+        f"/libraries/{lib['id']}/documents/{doc['id']}/chunks/{chunk['id']}",
+        params={"include_embedding": "false"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert "embedding" not in data
+    assert data["text"] == "c1"
+
+
+def test_list_chunks_with_selected_fields(client):
+    lib = create_library_via_api(client)
+    doc = create_document_via_api(client, lib["id"])
+    create_chunk_via_api(client, lib["id"], doc["id"], {"text": "c1"})
+    response = client.get(
+        f"/libraries/{lib['id']}/documents/{doc['id']}/chunks",
+        params={"fields": "text,metadata"},
+    )
+    assert response.status_code == 200
+    assert set(response.json()[0]) == {"id", "text", "metadata"}
+
+
+def test_unknown_projection_field(client):
+    lib = create_library_via_api(client)
+    response = client.get(
+        f"/libraries/{lib['id']}/documents", params={"fields": "text,bogus"}
+    )
+    assert response.status_code == 422
+    assert "bogus" in response.json()["detail"]
+
+
+def test_libraries_without_documents(client):
+    lib = create_library_via_api(client)
+    create_document_via_api(client, lib["id"])
+    response = client.get("/libraries/", params={"include_documents": "false"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": lib["id"], "metadata": lib["metadata"]}]
+
+    # The default response keeps the documents
+    response = client.get(f"/libraries/{lib['id']}")
+    assert len(response.json()["documents"]) == 1
@@ -10,7 +10,7 @@ from tests.test_api.test_endpoints import create_chunk_via_api
 # Pytest will automatically discover and inject fixtures from conftest.py
 
 # This list drives the parameterized tests. All index types are included.
-SUPPORTED_INDEX_TYPES = ["avl", "lsh"]
+SUPPORTED_INDEX_TYPES = ["avl", "lsh", "flat", "hnsw", "ivf", "pq"]
 
 # ============================================================================
 # Test Data & Payloads
@@ -171,6 +171,203 @@ def test_search_finds_correct_nearest_neighbor(
     assert 0.95 < second_result["similarity"] < top_result["similarity"]
 
 
+@pytest.mark.parametrize("quantization", ["float16", "int8"])
+def test_quantized_index_search(
+    client,
+    quantization,
+    create_library_via_api,
+    create_document_via_api,
+    create_chunk_via_api,
+    create_index_via_api,
+):
+    """
+    QA Goal: Verify that quantized storage is reported in the index config and
+    that re-ranked searches still return exact similarities.
+    """
+    lib = create_library_via_api()
+    doc = create_document_via_api(library_id=lib["id"])
+    for text, embedding in VECTOR_DATA.items():
+        create_chunk_via_api(
+            lib["id"], doc["id"], {"text": text, "embedding": embedding}
+        )
+
+    payload = {"index_type": "flat", "quantization": quantization, "rerank_factor": 2}
+    status_data = create_index_via_api(lib["id"], "quantized", payload)
+    assert status_data["config"]["quantization"] == quantization
+
+    response = client.post(
+        f"/libraries/{lib['id']}/search/quantized",
+        json={"query_embedding": VECTOR_DATA["cat"], "k": 1},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()
+    assert results[0]["chunk"]["text"] == "cat"
+    assert results[0]["similarity"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("index_type", SUPPORTED_INDEX_TYPES)
+def test_batch_search_returns_one_result_list_per_query(
+    client, library_with_all_indices, index_type
+):
+    """
+    QA Goal: Verify the batch endpoint answers every query, in order, with the
+    same top result as the single-query endpoint.
+    """
+    lib_id = library_with_all_indices["id"]
+    index_name = f"{index_type}-index"
+
+    queries = [
+        {"query_embedding": VECTOR_DATA["cat"], "k": 1},
+        {"query_embedding": VECTOR_DATA["dog"], "k": 1},
+        {"query_embedding": VECTOR_DATA["computer"], "k": 2},
+    ]
+    response = client.post(
+        f"/libraries/{lib_id}/search/{index_name}/batch", json={"queries": queries}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    batches = response.json()
+    assert len(batches) == len(queries)
+    assert len(batches[2]) <= 2
+    for query, results in zip(queries, batches):
+        single = client.post(f"/libraries/{lib_id}/search/{index_name}", json=query)
+        assert results == single.json()
+
+
+def test_search_results_leave_out_embeddings_by_default(
+    client, library_with_all_indices
+):
+    """
+    QA Goal: Search results skip the embedding unless it is asked for, and
+    'fields' narrows the chunk down further.
+    """
+    lib_id = library_with_all_indices["id"]
+    url = f"/libraries/{lib_id}/search/flat-index"
+    payload = {"query_embedding": VECTOR_DATA["cat"], "k": 2}
+
+    results = client.post(url, json=payload).json()
+    assert all("embedding" not in res["chunk"] for res in results)
+    assert results[0]["chunk"]["text"] == "cat"
+
+    results = client.post(
+        url, json=payload, params={"include_embedding": "true"}
+    ).json()
+    assert results[0]["chunk"]["embedding"] == pytest.approx(VECTOR_DATA["cat"])
+
+    batches = client.post(
+        f"{url}/batch", json={"queries": [payload]}, params={"fields": "text"}
+    ).json()
+    assert set(batches[0][0]["chunk"]) == {"id", "text"}
+
+
+def test_batch_search_rejects_empty_query_list(client, library_with_all_indices):
+    lib_id = library_with_all_indices["id"]
+    response = client.post(
+        f"/libraries/{lib_id}/search/flat-index/batch", json={"queries": []}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("index_type", SUPPORTED_INDEX_TYPES)
+def test_search_filter_restricts_results_by_metadata(
+    client,
+    create_library_via_api,
+    create_document_via_api,
+    create_chunk_via_api,
+    create_index_via_api,
+    index_type,
+):
+    """
+    QA Goal: Only chunks whose metadata matches the filter are returned, in
+    single and batch searches alike.
+    """
+    lib = create_library_via_api(metadata={"name": "Filter Library"})
+    doc = create_document_via_api(library_id=lib["id"])
+    animals = {"cat", "dog", "kitten", "puppy"}
+    for text, embedding in VECTOR_DATA.items():
+        metadata = {"kind": "animal" if text in animals else "object"}
+        if text in ("kitten", "puppy"):
+            metadata["age"] = 1
+        create_chunk_via_api(
+            lib["id"],
+            doc["id"],
+            {"text": text, "embedding": embedding, "metadata": metadata},
+        )
+    create_index_via_api(lib["id"], "index", {"index_type": index_type})
+    url = f"/libraries/{lib['id']}/search/index"
+
+    query = {
+        "query_embedding": VECTOR_DATA["cat"],
+        "k": 5,
+        "filter": {"kind": "animal", "age": {"$lt": 2}},
+    }
+    results = client.post(url, json=query).json()
+    assert {res["chunk"]["text"] for res in results} <= {"kitten", "puppy"}
+    if index_type != "lsh":
+        assert results[0]["chunk"]["text"] == "kitten"
+
+    query["filter"] = {"kind": {"$in": ["object"]}}
+    batches = client.post(
+        f"{url}/batch", json={"queries": [query, {**query, "filter": None}]}
+    ).json()
+    assert {res["chunk"]["text"] for res in batches[0]} <= {"computer"}
+    assert len(batches[1]) >= len(batches[0])
+
+
+def test_search_rejects_invalid_filter(client, library_with_all_indices):
+    lib_id = library_with_all_indices["id"]
+    response = client.post(
+        f"/libraries/{lib_id}/search/flat-index",
+        json={"query_embedding": VECTOR_DATA["cat"], "filter": {"$not": {"a": 1}}},
+    )
+    assert response.status_code == 422
+
+
+def test_hybrid_search_fuses_keyword_and_vector_rankings(
+    client, library_with_all_indices
+):
+    """
+    QA Goal: Hybrid search ranks keyword matches through BM25, lets
+    'vector_weight' trade the two rankings off, and sees text updates.
+    """
+    lib_id = library_with_all_indices["id"]
+    url = f"/libraries/{lib_id}/search/flat-index"
+
+    keyword_only = {"query_text": "computer", "k": 1, "hybrid": {"vector_weight": 0}}
+    results = client.post(url, json=keyword_only).json()
+    assert results[0]["chunk"]["text"] == "computer"
+    batches = client.post(f"{url}/batch", json={"queries": [keyword_only]}).json()
+    assert batches[0] == results
+
+    vector_only = {"query_text": "computer", "k": 2, "hybrid": {"vector_weight": 1}}
+    plain = client.post(url, json={"query_text": "computer", "k": 2}).json()
+    fused = client.post(url, json=vector_only).json()
+    assert [r["chunk"]["id"] for r in fused] == [r["chunk"]["id"] for r in plain]
+
+    chunk = results[0]["chunk"]
+    client.put(
+        f"/libraries/{lib_id}/documents/{chunk['document_id']}/chunks/{chunk['id']}",
+        json={"text": "laptop SKU-9000"},
+    ).raise_for_status()
+    weighted = {
+        "query_text": "sku-9000",
+        "k": 1,
+        "hybrid": {"fusion": "weighted", "vector_weight": 0.2},
+    }
+    results = client.post(url, json=weighted).json()
+    assert results[0]["chunk"]["text"] == "laptop SKU-9000"
+
+
+def test_hybrid_search_requires_query_text(client, library_with_all_indices):
+    lib_id = library_with_all_indices["id"]
+    response = client.post(
+        f"/libraries/{lib_id}/search/flat-index",
+        json={"query_embedding": VECTOR_DATA["cat"], "hybrid": {}},
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.parametrize("index_type", SUPPORTED_INDEX_TYPES)
 def test_search_respects_k_parameter(client, library_with_all_indices, index_type):
     """
@@ -341,7 +538,7 @@ def test_adding_chunk_handles_index_update_correctly(
     )
 
     # VERIFY behavior based on index type
-    if index_type == "avl" or index_type == "lsh":
+    if index_type in ("avl", "lsh", "flat", "hnsw", "ivf", "pq"):
         # AVL index should update live. It should still exist and have more vectors.
         status_res = client.get(f"/libraries/{lib['id']}/index/{index_name}")
         assert status_res.status_code == status.HTTP_200_OK
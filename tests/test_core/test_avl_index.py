@@ -66,21 +66,21 @@ def test_insert_duplicate_updates_chunk(avl_index, chunk_factory):
 
     avl_index.insert(chunk1)
     assert avl_index.vector_count == 1
-    assert avl_index.root.vector[0] == pytest.approx(
+    assert avl_index._vectors[avl_index.root.key][0] == pytest.approx(
         0.707, 0.01
     )  # Normalized [0.1, 0.1]
 
     # Insert update
     avl_index.insert(chunk2)
     assert avl_index.vector_count == 1
-    assert avl_index.root.vector[0] == pytest.approx(
+    assert avl_index._vectors[avl_index.root.key][0] == pytest.approx(
         0.707, 0.01
     )  # Normalized [0.9, 0.9] is same direction!
 
     # Let's try with a different vector direction
     chunk3 = chunk_factory([1.0, 0.0], uid=uid)
     avl_index.insert(chunk3)
-    assert avl_index.root.vector[0] == pytest.approx(1.0)
+    assert avl_index._vectors[avl_index.root.key][0] == pytest.approx(1.0)
 
 
 def test_delete_leaf_node(avl_index, chunk_factory):
@@ -0,0 +1,208 @@
+# tests/test_core/test_flat_index.py
+
+import pytest
+import numpy as np
+from uuid import uuid4
+from src.core.models import Chunk
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.avl_index import AvlIndex
+from src.core.indexing.base_index import top_k_rows, top_k_rows_batch
+from src.core.indexing.enums import Metric
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def chunk_factory():
+    def _create(embedding, uid=None):
+        return Chunk(uid=uid or uuid4(), text="test", embedding=embedding)
+
+    return _create
+
+
+@pytest.fixture
+def flat_index():
+    return FlatIndex(metric=Metric.COSINE)
+
+
+# --- Unit tests ---
+
+
+def test_initialization(flat_index):
+    assert flat_index.vector_count == 0
+    assert flat_index.metric == Metric.COSINE
+    assert flat_index._matrix is None
+
+
+def test_insert_single_chunk(flat_index, chunk_factory):
+    chunk = chunk_factory([3.0, 4.0])
+    flat_index.insert(chunk)
+
+    assert flat_index.vector_count == 1
+    assert flat_index._uid_to_row[chunk.uid] == 0
+    assert flat_index._matrix.dtype == np.float32
+    # Stored normalized for cosine
+    assert flat_index._matrix[0] == pytest.approx([0.6, 0.8])
+
+
+def test_insert_duplicate_overwrites_row(flat_index, chunk_factory):
+    uid = uuid4()
+    flat_index.insert(chunk_factory([1.0, 0.0], uid=uid))
+    flat_index.insert(chunk_factory([0.0, 1.0], uid=uid))
+
+    assert flat_index.vector_count == 1
+    assert flat_index._matrix[0] == pytest.approx([0.0, 1.0])
+
+
+def test_insert_dimension_mismatch_raises(flat_index, chunk_factory):
+    flat_index.insert(chunk_factory([1.0, 0.0]))
+    with pytest.raises(ValueError):
+        flat_index.insert(chunk_factory([1.0, 0.0, 0.0]))
+
+
+def test_delete_swaps_last_row_into_hole(flat_index, chunk_factory):
+    first = chunk_factory([1.0, 0.0])
+    middle = chunk_factory([0.0, 1.0])
+    last = chunk_factory([-1.0, 0.0])
+    flat_index.build([first, middle, last])
+
+    flat_index.delete(first.uid)
+
+    assert flat_index.vector_count == 2
+    assert first.uid not in flat_index._uid_to_row
+    # The last row was moved into row 0 to keep the matrix dense
+    assert flat_index._uid_to_row[last.uid] == 0
+    assert flat_index._matrix[0] == pytest.approx([-1.0, 0.0])
+    assert flat_index._row_chunks[0] is last
+
+
+def test_delete_unknown_uid_is_noop(flat_index, chunk_factory):
+    flat_index.insert(chunk_factory([1.0, 0.0]))
+    flat_index.delete(uuid4())
+    assert flat_index.vector_count == 1
+
+
+def test_matrix_grows_beyond_initial_capacity(chunk_factory):
+    index = FlatIndex()
+    index._INITIAL_CAPACITY = 2
+    chunks = [chunk_factory([float(i), 1.0]) for i in range(5)]
+    for chunk in chunks:
+        index.insert(chunk)
+
+    assert index.vector_count == 5
+    assert index._matrix.shape[0] >= 5
+    for chunk in chunks:
+        row = index._uid_to_row[chunk.uid]
+        assert index._row_chunks[row] is chunk
+
+
+@pytest.mark.parametrize("k", [1, 3, 8, 20])
+def test_top_k_rows_match_a_full_sort(k):
+    keys = np.random.default_rng(0).integers(0, 4, size=(5, 12)).astype(np.float32)
+    expected = np.sort(keys, axis=1)[:, :k]
+
+    batch = top_k_rows_batch(keys, k)
+    assert np.take_along_axis(keys, batch, axis=1).tolist() == expected.tolist()
+    for row, keys_row in zip(expected, keys):
+        top = top_k_rows(keys_row, k)
+        assert len(set(top.tolist())) == len(top)
+        assert keys_row[top].tolist() == row.tolist()
+
+
+# --- Accuracy tests ---
+
+
+def test_search_accuracy_cosine(flat_index, chunk_factory):
+    target = chunk_factory([1.0, 0.0])
+    far = chunk_factory([0.0, 1.0])
+    near = chunk_factory([0.9, 0.1])
+
+    flat_index.build([target, far, near])
+    results = flat_index.search([1.0, 0.0], k=2)
+
+    assert len(results) == 2
+    assert results[0][0].uid == target.uid
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[1][0].uid == near.uid
+
+
+def test_search_accuracy_euclidean(chunk_factory):
+    index = FlatIndex(metric=Metric.EUCLIDEAN)
+    target = chunk_factory([0, 0])
+    close = chunk_factory([0, 1])
+    far = chunk_factory([0, 10])
+
+    index.build([target, far, close])
+    results = index.search([0, 0], k=2)
+
+    assert [r[0].uid for r in results] == [target.uid, close.uid]
+    assert results[0][1] == pytest.approx(0.0)
+    assert results[1][1] == pytest.approx(1.0)
+
+
+def test_search_with_k_larger_than_dataset(flat_index, chunk_factory):
+    flat_index.build([chunk_factory([1.0, 0.0]), chunk_factory([0.0, 1.0])])
+    assert len(flat_index.search([1.0, 1.0], k=10)) == 2
+
+
+def test_search_empty_index_returns_empty(flat_index):
+    assert flat_index.search([1, 1], k=5) == []
+
+
+def test_search_dimension_mismatch_raises_value_error(flat_index, chunk_factory):
+    flat_index.insert(chunk_factory([1.0, 0.0, 0.0]))
+    with pytest.raises(ValueError):
+        flat_index.search([1.0, 0.0], k=1)
+
+
+@pytest.mark.parametrize("metric", [Metric.COSINE, Metric.EUCLIDEAN])
+def test_search_matches_avl_exact_baseline(chunk_factory, metric):
+    """Both indices are exact, so they must agree on the ranking."""
+    rng = np.random.default_rng(7)
+    chunks = [chunk_factory(rng.standard_normal(16).tolist()) for _ in range(200)]
+
+    flat, avl = FlatIndex(metric=metric), AvlIndex(metric=metric)
+    flat.build(chunks)
+    avl.build(chunks)
+
+    # Deletes exercise the swap-with-last path
+    for chunk in chunks[:20]:
+        flat.delete(chunk.uid)
+        avl.delete(chunk.uid)
+
+    query = rng.standard_normal(16).tolist()
+    flat_results = flat.search(query, k=10)
+    avl_results = avl.search(query, k=10)
+
+    assert [c.uid for c, _ in flat_results] == [c.uid for c, _ in avl_results]
+    for (_, s1), (_, s2) in zip(flat_results, avl_results):
+        assert s1 == pytest.approx(s2, abs=1e-4)
+
+
+@pytest.mark.parametrize("metric", [Metric.COSINE, Metric.EUCLIDEAN])
+def test_search_batch_matches_single_searches(chunk_factory, metric):
+    rng = np.random.default_rng(11)
+    chunks = [chunk_factory(rng.standard_normal(16).tolist()) for _ in range(300)]
+    index = FlatIndex(metric=metric)
+    index.build(chunks)
+
+    queries = rng.standard_normal((25, 16))
+    batched = index.search_batch(queries, k=5)
+
+    assert len(batched) == 25
+    for query, results in zip(queries.tolist(), batched):
+        single = index.search(query, k=5)
+        assert [c.uid for c, _ in results] == [c.uid for c, _ in single]
+        assert [s for _, s in results] == pytest.approx(
+            [s for _, s in single], abs=1e-4
+        )
+
+
+def test_search_batch_empty_index_returns_empty_lists(flat_index):
+    assert flat_index.search_batch([[1.0, 0.0], [0.0, 1.0]], k=3) == [[], []]
+
+
+def test_search_batch_dimension_mismatch_raises_value_error(flat_index, chunk_factory):
+    flat_index.insert(chunk_factory([1.0, 0.0, 0.0]))
+    with pytest.raises(ValueError):
+        flat_index.search_batch([[1.0, 0.0]], k=1)
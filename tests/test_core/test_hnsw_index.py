@@ -0,0 +1,196 @@
+# tests/test_core/test_hnsw_index.py
+
+import pytest
+import numpy as np
+from uuid import uuid4
+from src.core.models import Chunk
+from src.core.indexing.hnsw_index import HnswIndex
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.enums import Metric
+
+# --- Globals ---
+TEST_SEED = 42
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def chunk_factory():
+    def _create(embedding, uid=None):
+        return Chunk(uid=uid or uuid4(), text="test", embedding=embedding)
+
+    return _create
+
+
+@pytest.fixture
+def hnsw_index():
+    return HnswIndex(m=8, ef_construction=64, seed=TEST_SEED)
+
+
+@pytest.fixture
+def random_chunks(chunk_factory):
+    rng = np.random.default_rng(TEST_SEED)
+    return [chunk_factory(v) for v in rng.standard_normal((600, 16)).tolist()]
+
+
+def recall_at_k(index, exact, queries, k, **search_params) -> float:
+    hits = 0
+    for query in queries:
+        expected = {c.uid for c, _ in exact.search(query, k)}
+        found = {c.uid for c, _ in index.search(query, k, **search_params)}
+        hits += len(expected & found)
+    return hits / (k * len(queries))
+
+
+# --- Unit tests ---
+
+
+def test_initialization(hnsw_index):
+    assert hnsw_index.vector_count == 0
+    assert hnsw_index._entry_point is None
+
+
+def test_invalid_m_raises():
+    with pytest.raises(ValueError):
+        HnswIndex(m=1)
+
+
+def test_insert_single_chunk(hnsw_index, chunk_factory):
+    chunk = chunk_factory([0.1, 0.2, 0.3])
+    hnsw_index.insert(chunk)
+
+    assert hnsw_index.vector_count == 1
+    assert hnsw_index._entry_point == hnsw_index._uid_to_node[chunk.uid]
+
+
+def test_links_respect_degree_limits(hnsw_index, random_chunks):
+    hnsw_index.build(random_chunks)
+
+    for levels in hnsw_index._links:
+        assert len(levels[0]) <= hnsw_index._m0
+        for links in levels[1:]:
+            assert len(links) <= hnsw_index._m
+
+
+def test_insert_duplicate_replaces_entry(hnsw_index, chunk_factory):
+    uid = uuid4()
+    hnsw_index.insert(chunk_factory([1.0, 0.0], uid=uid))
+    hnsw_index.insert(chunk_factory([0.0, 1.0], uid=uid))
+
+    assert hnsw_index.vector_count == 1
+    results = hnsw_index.search([0.0, 1.0], k=5)
+    assert len(results) == 1
+    assert results[0][1] == pytest.approx(1.0)
+
+
+def test_delete_hides_chunk_from_results(hnsw_index, chunk_factory):
+    target = chunk_factory([1.0, 0.0])
+    other = chunk_factory([0.0, 1.0])
+    hnsw_index.build([target, other])
+
+    hnsw_index.delete(target.uid)
+
+    assert hnsw_index.vector_count == 1
+    results = hnsw_index.search([1.0, 0.0], k=2)
+    assert [c.uid for c, _ in results] == [other.uid]
+
+
+def test_delete_last_chunk_resets_index(hnsw_index, chunk_factory):
+    chunk = chunk_factory([1.0, 0.0])
+    hnsw_index.insert(chunk)
+    hnsw_index.delete(chunk.uid)
+
+    assert hnsw_index.vector_count == 0
+    assert hnsw_index.search([1.0, 0.0], k=1) == []
+
+
+def test_delete_relinks_neighbours_without_a_rebuild(hnsw_index, random_chunks):
+    hnsw_index.build(random_chunks)
+    nodes = [hnsw_index._uid_to_node[c.uid] for c in random_chunks[:300]]
+
+    for chunk in random_chunks[:300]:
+        hnsw_index.delete(chunk.uid)
+
+    assert hnsw_index.vector_count == 300
+    assert hnsw_index._deleted == set(nodes)
+    for node in nodes:
+        for level_c, links in enumerate(hnsw_index._links[node]):
+            # The neighbours a tombstone links to no longer link back to it
+            assert all(
+                node not in hnsw_index._links[n][level_c]
+                for n in links
+                if n not in hnsw_index._deleted
+            )
+
+
+def test_inserts_reuse_tombstoned_slots(hnsw_index, random_chunks, chunk_factory):
+    hnsw_index.build(random_chunks)
+    for chunk in random_chunks[:300]:
+        hnsw_index.delete(chunk.uid)
+
+    rng = np.random.default_rng(TEST_SEED + 1)
+    fresh = [chunk_factory(v) for v in rng.standard_normal((300, 16)).tolist()]
+    for chunk in fresh:
+        hnsw_index.insert(chunk)
+
+    assert hnsw_index._node_count == 600
+    assert not hnsw_index._deleted
+    live = random_chunks[300:] + fresh
+    exact = FlatIndex()
+    exact.build(live)
+    queries = [c.embedding.tolist() for c in live[::20]]
+    assert recall_at_k(hnsw_index, exact, queries, 10) >= 0.9
+
+
+def test_search_dimension_mismatch_raises_value_error(hnsw_index, chunk_factory):
+    hnsw_index.insert(chunk_factory([1.0, 0.0, 0.0]))
+    with pytest.raises(ValueError):
+        hnsw_index.search([1.0, 0.0], k=1)
+
+
+def test_search_empty_index_returns_empty(hnsw_index):
+    assert hnsw_index.search([1, 1], k=5) == []
+
+
+# --- Accuracy tests ---
+
+
+def test_search_accuracy_euclidean(chunk_factory):
+    index = HnswIndex(metric=Metric.EUCLIDEAN, seed=TEST_SEED)
+    target = chunk_factory([0, 0])
+    close = chunk_factory([0, 1])
+    far = chunk_factory([0, 10])
+
+    index.build([target, far, close])
+    results = index.search([0, 0], k=2)
+
+    assert [r[0].uid for r in results] == [target.uid, close.uid]
+    assert results[1][1] == pytest.approx(1.0)
+
+
+def test_recall_against_exact_baseline(hnsw_index, random_chunks):
+    exact = FlatIndex()
+    exact.build(random_chunks)
+    hnsw_index.build(random_chunks)
+
+    queries = np.random.default_rng(1).standard_normal((30, 16)).tolist()
+
+    assert recall_at_k(hnsw_index, exact, queries, k=10, ef_search=100) >= 0.95
+
+
+def test_recall_survives_deletes(hnsw_index, random_chunks):
+    hnsw_index.build(random_chunks)
+    for chunk in random_chunks[::3]:
+        hnsw_index.delete(chunk.uid)
+
+    exact = FlatIndex()
+    exact.build([c for i, c in enumerate(random_chunks) if i % 3 != 0])
+    queries = np.random.default_rng(2).standard_normal((30, 16)).tolist()
+
+    assert recall_at_k(hnsw_index, exact, queries, k=10, ef_search=100) >= 0.95
+
+
+def test_ef_search_is_never_below_k(hnsw_index, random_chunks):
+    hnsw_index.build(random_chunks)
+    results = hnsw_index.search(random_chunks[0].embedding, k=20, ef_search=1)
+    assert len(results) == 20
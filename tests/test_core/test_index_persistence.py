@@ -0,0 +1,149 @@
+# tests/test_core/test_index_persistence.py
+
+import json
+import pytest
+import numpy as np
+from src.core.models import Chunk
+from src.core.indexing.index_factory import IndexFactory
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.hnsw_index import HnswIndex
+from src.core.indexing.enums import IndexType, Metric, Quantization
+
+# --- Fixtures ---
+
+CONFIGS = [
+    {"index_type": IndexType.FLAT},
+    {"index_type": IndexType.FLAT, "quantization": Quantization.INT8},
+    {"index_type": IndexType.AVL, "metric": Metric.EUCLIDEAN},
+    {"index_type": IndexType.LSH, "num_bits": 4, "num_tables": 4, "seed": 1},
+    {"index_type": IndexType.HNSW, "m": 4, "seed": 1},
+    {"index_type": IndexType.HNSW, "quantization": Quantization.FLOAT16, "seed": 1},
+    {"index_type": IndexType.IVF, "n_lists": 4, "nprobe": 4, "seed": 1},
+    {"index_type": IndexType.PQ, "num_subspaces": 4, "num_centroids": 16, "seed": 1},
+]
+
+
+@pytest.fixture
+def chunks():
+    rng = np.random.default_rng(0)
+    return [
+        Chunk(text=str(i), embedding=rng.standard_normal(8).tolist())
+        for i in range(200)
+    ]
+
+
+def by_uid(chunks):
+    return {c.uid: c for c in chunks}
+
+
+def result_ids(results):
+    return [chunk.uid for chunk, _ in results]
+
+
+# --- Round trips ---
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda c: str(list(c.values())))
+def test_loaded_index_returns_the_same_results(config, chunks, tmp_path):
+    index = IndexFactory.create_index(**config)
+    index.build(chunks)
+    for chunk in chunks[:20]:
+        index.delete(chunk.uid)
+
+    index.save(str(tmp_path))
+    loaded = IndexFactory.load_index(str(tmp_path), by_uid(chunks))
+
+    assert type(loaded) is type(index)
+    assert loaded.vector_count == index.vector_count
+    for query in chunks[::25]:
+        expected = index.search(query.embedding, k=5)
+        results = loaded.search(query.embedding, k=5)
+        assert result_ids(results) == result_ids(expected)
+        assert [s for _, s in results] == pytest.approx([s for _, s in expected])
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda c: str(list(c.values())))
+def test_loaded_index_accepts_updates(config, chunks, tmp_path):
+    index = IndexFactory.create_index(**config)
+    index.build(chunks[:100])
+    index.save(str(tmp_path))
+
+    loaded = IndexFactory.load_index(str(tmp_path), by_uid(chunks))
+    for chunk in chunks[100:]:
+        loaded.insert(chunk)
+    loaded.delete(chunks[0].uid)
+
+    assert loaded.vector_count == 199
+    assert result_ids(loaded.search(chunks[150].embedding, k=1)) == [chunks[150].uid]
+
+    # Copy-on-write mapping: the saved files are untouched
+    reopened = IndexFactory.load_index(str(tmp_path), by_uid(chunks))
+    assert reopened.vector_count == 100
+
+
+@pytest.mark.parametrize(
+    "config", CONFIGS[:1] + CONFIGS[2:], ids=lambda c: c["index_type"]
+)
+def test_empty_index_round_trip(config, chunks, tmp_path):
+    IndexFactory.create_index(**config).save(str(tmp_path))
+
+    loaded = IndexFactory.load_index(str(tmp_path), {})
+    assert loaded.vector_count == 0
+    assert loaded.search([1.0] * 8, k=3) == []
+
+    loaded.insert(chunks[0])
+    assert result_ids(loaded.search(chunks[0].embedding, k=1)) == [chunks[0].uid]
+
+
+# --- Layout ---
+
+
+def test_vector_block_is_memory_mapped(chunks, tmp_path):
+    index = FlatIndex()
+    index.build(chunks)
+    index.save(str(tmp_path))
+
+    loaded = FlatIndex.load(str(tmp_path), by_uid(chunks))
+
+    assert isinstance(loaded._matrix, np.memmap)
+    assert loaded._row_chunks[0] is chunks[0]
+
+
+def test_hnsw_graph_is_restored_exactly(chunks, tmp_path):
+    index = HnswIndex(m=4, seed=3)
+    index.build(chunks)
+    index.delete(chunks[0].uid)
+    index.save(str(tmp_path))
+
+    loaded = HnswIndex.load(str(tmp_path), by_uid(chunks))
+
+    assert loaded._links == index._links
+    assert loaded._deleted == index._deleted
+    assert loaded._entry_point == index._entry_point
+
+
+def test_load_rejects_unknown_format_version(chunks, tmp_path):
+    FlatIndex().save(str(tmp_path))
+    header_path = tmp_path / "header.json"
+    header = json.loads(header_path.read_text())
+    header["format_version"] = 999
+    header_path.write_text(json.dumps(header))
+
+    with pytest.raises(ValueError, match="format version"):
+        IndexFactory.load_index(str(tmp_path), {})
+
+
+def test_load_rejects_missing_chunks(chunks, tmp_path):
+    index = FlatIndex()
+    index.build(chunks)
+    index.save(str(tmp_path))
+
+    with pytest.raises(ValueError, match="unknown chunk"):
+        FlatIndex.load(str(tmp_path), by_uid(chunks[1:]))
+
+
+def test_load_rejects_wrong_index_class(tmp_path):
+    FlatIndex().save(str(tmp_path))
+
+    with pytest.raises(ValueError, match="'flat' index"):
+        HnswIndex.load(str(tmp_path), {})
@@ -0,0 +1,157 @@
+# tests/test_core/test_ivf_index.py
+
+import pytest
+import numpy as np
+from uuid import uuid4
+from src.core.models import Chunk
+from src.core.indexing.ivf_index import IvfIndex
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.enums import Metric
+
+# --- Globals ---
+TEST_SEED = 42
+N_LISTS = 8
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def chunk_factory():
+    def _create(embedding, uid=None):
+        return Chunk(uid=uid or uuid4(), text="test", embedding=embedding)
+
+    return _create
+
+
+@pytest.fixture
+def ivf_index():
+    return IvfIndex(n_lists=N_LISTS, nprobe=2, seed=TEST_SEED)
+
+
+@pytest.fixture
+def clustered_chunks(chunk_factory):
+    rng = np.random.default_rng(TEST_SEED)
+    centers = rng.standard_normal((N_LISTS, 16)) * 5
+    points = centers[rng.integers(0, N_LISTS, 400)] + rng.standard_normal((400, 16))
+    return [chunk_factory(v) for v in points.tolist()]
+
+
+# --- Unit tests ---
+
+
+def test_initialization(ivf_index):
+    assert ivf_index.vector_count == 0
+    assert ivf_index._centroids is None
+
+
+def test_build_trains_centroids_and_fills_lists(ivf_index, clustered_chunks):
+    ivf_index.build(clustered_chunks)
+
+    assert ivf_index.vector_count == len(clustered_chunks)
+    assert ivf_index._centroids.shape == (N_LISTS, 16)
+    assert sum(p.size for p in ivf_index._lists) == len(clustered_chunks)
+
+
+def test_build_with_fewer_vectors_than_lists(ivf_index, chunk_factory):
+    ivf_index.build([chunk_factory([1.0, 0.0]), chunk_factory([0.0, 1.0])])
+    assert len(ivf_index._lists) == 2
+
+
+def test_insert_into_empty_index(ivf_index, chunk_factory):
+    chunk = chunk_factory([1.0, 0.0])
+    ivf_index.insert(chunk)
+
+    assert ivf_index.vector_count == 1
+    assert ivf_index.search([1.0, 0.0], k=1)[0][0].uid == chunk.uid
+
+
+def test_insert_duplicate_replaces_entry(ivf_index, chunk_factory):
+    uid = uuid4()
+    ivf_index.insert(chunk_factory([1.0, 0.0], uid=uid))
+    ivf_index.insert(chunk_factory([0.0, 1.0], uid=uid))
+
+    assert ivf_index.vector_count == 1
+    assert ivf_index.search([0.0, 1.0], k=1)[0][1] == pytest.approx(1.0)
+
+
+def test_delete_keeps_positions_consistent(ivf_index, clustered_chunks):
+    ivf_index.build(clustered_chunks)
+    for chunk in clustered_chunks[:100]:
+        ivf_index.delete(chunk.uid)
+
+    assert ivf_index.vector_count == 300
+    for list_id, posting in enumerate(ivf_index._lists):
+        for row, chunk in enumerate(posting.chunks):
+            assert ivf_index._uid_to_pos[chunk.uid] == (list_id, row)
+
+
+def test_skewed_inserts_trigger_retrain(chunk_factory):
+    index = IvfIndex(n_lists=4, nprobe=1, skew_threshold=2.0, seed=TEST_SEED)
+    rng = np.random.default_rng(TEST_SEED)
+    index.build([chunk_factory(v) for v in rng.standard_normal((200, 8)).tolist()])
+
+    # Flood one region of the space so one list grows far beyond the others
+    hotspot = np.ones(8)
+    for _ in range(150):
+        index.insert(chunk_factory((hotspot + 0.01 * rng.standard_normal(8)).tolist()))
+
+    # The quantizer was retrained on the grown, skewed data
+    assert index._inserts_since_train < 150
+    assert index._trained_count > 200
+    assert index.vector_count == 350
+
+
+def test_search_dimension_mismatch_raises_value_error(ivf_index, chunk_factory):
+    ivf_index.insert(chunk_factory([1.0, 0.0, 0.0]))
+    with pytest.raises(ValueError):
+        ivf_index.search([1.0, 0.0], k=1)
+
+
+def test_search_empty_index_returns_empty(ivf_index):
+    assert ivf_index.search([1, 1], k=5) == []
+
+
+# --- Accuracy tests ---
+
+
+def test_search_accuracy_euclidean(chunk_factory):
+    index = IvfIndex(metric=Metric.EUCLIDEAN, n_lists=2, nprobe=2, seed=TEST_SEED)
+    target = chunk_factory([0, 0])
+    close = chunk_factory([0, 1])
+    far = chunk_factory([0, 10])
+
+    index.build([target, far, close])
+    results = index.search([0, 0], k=2)
+
+    assert [r[0].uid for r in results] == [target.uid, close.uid]
+    assert results[1][1] == pytest.approx(1.0)
+
+
+def test_nprobe_all_lists_matches_exact_search(ivf_index, clustered_chunks):
+    exact = FlatIndex()
+    exact.build(clustered_chunks)
+    ivf_index.build(clustered_chunks)
+
+    query = clustered_chunks[0].embedding
+    expected = [c.uid for c, _ in exact.search(query, 10)]
+    found = [c.uid for c, _ in ivf_index.search(query, 10, nprobe=N_LISTS)]
+
+    assert found == expected
+
+
+def test_higher_nprobe_never_lowers_recall(ivf_index, clustered_chunks):
+    exact = FlatIndex()
+    exact.build(clustered_chunks)
+    ivf_index.build(clustered_chunks)
+    queries = np.random.default_rng(3).standard_normal((20, 16)).tolist()
+
+    def recall(nprobe):
+        hits = 0
+        for q in queries:
+            expected = {c.uid for c, _ in exact.search(q, 10)}
+            hits += len(
+                expected & {c.uid for c, _ in ivf_index.search(q, 10, nprobe=nprobe)}
+            )
+        return hits / (10 * len(queries))
+
+    assert recall(1) <= recall(4) <= recall(N_LISTS) == 1.0
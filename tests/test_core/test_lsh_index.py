@@ -36,7 +36,12 @@ def test_initialization(lsh_index):
     assert lsh_index._num_bits == NUM_BITS
     assert lsh_index._num_tables == NUM_TABLES
     assert isinstance(lsh_index._rng, np.random.Generator)
-    assert len(lsh_index._planes) == 0
+    assert lsh_index._planes is None
+
+
+def test_invalid_num_bits_raises():
+    with pytest.raises(ValueError):
+        LshIndex(num_bits=65)
 
 
 def test_insert_single_chunk(lsh_index, chunk_factory):
@@ -47,9 +52,9 @@ def test_insert_single_chunk(lsh_index, chunk_factory):
 
     assert lsh_index.vector_count == 1
     # Check internal storage
-    assert chunk.uid in lsh_index._chunks
-    # Verify planes were initialized
-    assert len(lsh_index._planes) == 5
+    assert chunk.uid in lsh_index._vectors
+    # Verify planes were initialized, stacked for all tables
+    assert lsh_index._planes.shape == (3, NUM_TABLES * NUM_BITS)
     assert lsh_index._dimension == 3
 
 
@@ -64,7 +69,7 @@ def test_hashing_consistency(lsh_index, chunk_factory):
 
     # Check internal hash tables
     for i in range(lsh_index._num_tables):
-        # We don't know the hash string, but we can find it
+        # We don't know the hash key, but we can find it
         # There should be exactly one bucket with 2 items
         buckets = list(lsh_index._tables[i].values())
         non_empty_buckets = [b for b in buckets if len(b) > 0]
@@ -83,7 +88,6 @@ def test_delete_removes_from_all_structures(lsh_index, chunk_factory):
     lsh_index.delete(chunk.uid)
 
     assert lsh_index.vector_count == 0
-    assert chunk.uid not in lsh_index._chunks
     assert chunk.uid not in lsh_index._vectors
 
     # Ensure it's gone from all hash tables
@@ -100,7 +104,34 @@ def test_build_bulk(lsh_index, chunk_factory):
     ]
     lsh_index.build(chunks)
     assert lsh_index.vector_count == 3
-    assert len(lsh_index._planes) == 5
+    assert lsh_index._planes.shape == (3, NUM_TABLES * NUM_BITS)
+
+
+def test_signatures_are_integer_keys_matching_plane_signs(lsh_index, chunk_factory):
+    chunk = chunk_factory([0.3, -0.2, 0.9])
+    lsh_index.insert(chunk)
+
+    vector = lsh_index._vectors[chunk.uid]
+    for table_index, table in enumerate(lsh_index._tables):
+        planes = lsh_index._planes[
+            :, table_index * NUM_BITS : (table_index + 1) * NUM_BITS
+        ]
+        expected = sum(1 << i for i, p in enumerate(vector @ planes) if p > 0)
+        assert list(table.keys()) == [expected]
+        assert isinstance(next(iter(table)), int)
+
+
+def test_bulk_build_matches_incremental_inserts(chunk_factory):
+    rng = np.random.default_rng(TEST_SEED)
+    chunks = [chunk_factory(v) for v in rng.standard_normal((50, 8)).tolist()]
+
+    built = LshIndex(num_bits=NUM_BITS, num_tables=NUM_TABLES, seed=TEST_SEED)
+    built.build(chunks)
+    inserted = LshIndex(num_bits=NUM_BITS, num_tables=NUM_TABLES, seed=TEST_SEED)
+    for chunk in chunks:
+        inserted.insert(chunk)
+
+    assert built._tables == inserted._tables
 
 
 # --- Accuracy tests ---
@@ -170,3 +201,47 @@ def test_search_accuracy_dense(lsh_index, chunk_factory):
 
     assert target_chunk.uid in found_ids
     assert neighbor_chunk.uid in found_ids
+
+
+def test_probe_masks_follow_smallest_margins():
+    # Bit 2 has the smallest margin, then bit 0, then bit 1
+    margins = np.array([0.2, 0.9, 0.1])
+    masks = LshIndex._probe_masks(margins, num_probes=4)
+
+    assert masks == [0b100, 0b001, 0b101, 0b010]
+
+
+def test_multi_probe_improves_recall(chunk_factory):
+    rng = np.random.default_rng(TEST_SEED)
+    chunks = [chunk_factory(v) for v in rng.standard_normal((500, 16)).tolist()]
+    index = LshIndex(num_bits=NUM_BITS, num_tables=2, seed=TEST_SEED)
+    index.build(chunks)
+    positions = {c.uid: i for i, c in enumerate(chunks)}
+
+    vectors = np.array([c.embedding for c in chunks])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = rng.standard_normal((30, 16))
+
+    def recall(num_probes):
+        hits = 0
+        for q in queries:
+            expected = set(np.argsort(-(vectors @ q))[:5].tolist())
+            found = index.search(q.tolist(), k=5, num_probes=num_probes)
+            hits += len(expected & {positions[c.uid] for c, _ in found})
+        return hits / (5 * len(queries))
+
+    assert recall(0) < recall(16) <= recall(64)
+    assert recall(64) >= 0.9
+
+
+def test_default_num_probes_comes_from_index(chunk_factory):
+    rng = np.random.default_rng(TEST_SEED)
+    chunks = [chunk_factory(v) for v in rng.standard_normal((200, 16)).tolist()]
+    probing = LshIndex(num_bits=12, num_tables=2, seed=TEST_SEED, num_probes=32)
+    plain = LshIndex(num_bits=12, num_tables=2, seed=TEST_SEED)
+    probing.build(chunks)
+    plain.build(chunks)
+
+    query = rng.standard_normal(16).tolist()
+    assert len(probing.search(query, k=10)) >= len(plain.search(query, k=10))
+    assert probing.search(query, k=10) == plain.search(query, k=10, num_probes=32)
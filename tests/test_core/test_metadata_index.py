@@ -0,0 +1,206 @@
+# tests/test_core/test_metadata_index.py
+
+import random
+import pytest
+import numpy as np
+from src.core.models import Chunk, Document, Library
+from src.core.indexing.bitmap import RowBitmap
+from src.core.indexing.enums import IndexType
+from src.core.indexing.index_factory import IndexFactory
+from src.core.indexing.metadata_index import (
+    MetadataFilter,
+    MetadataIndex,
+    parse_filter,
+)
+
+# --- Fixtures ---
+
+
+def make_chunks(n, dimension=8, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        Chunk(
+            text=f"c{i}",
+            embedding=rng.normal(size=dimension).tolist(),
+            metadata={
+                "tenant": ["acme", "globex", "initech"][i % 3],
+                "year": 2000 + i % 25,
+                "rare": i % 40 == 0,
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def indexed(chunks):
+    index = MetadataIndex()
+    for chunk in chunks:
+        index.put(chunk)
+    return index
+
+
+def matching(index, expression):
+    return {chunk.uid for chunk in index.select(MetadataFilter(expression)).chunks()}
+
+
+# --- RowBitmap ---
+
+
+def test_bitmap_matches_set_semantics_across_containers():
+    rng = random.Random(7)
+    # Sparse and dense containers, in several high-bit groups
+    a_rows = set(rng.sample(range(200_000), 12_000))
+    b_rows = set(rng.sample(range(70_000), 6_000))
+    a, b = RowBitmap(a_rows), RowBitmap(b_rows)
+
+    assert len(a) == len(a_rows)
+    assert list(a) == sorted(a_rows)
+    assert a.to_array().tolist() == sorted(a_rows)
+    assert set(a & b) == a_rows & b_rows
+    assert set(a | b) == a_rows | b_rows
+
+    for row in list(a_rows)[:9_000]:
+        a.discard(row)
+    assert set(a) == set(list(a_rows)[9_000:])
+
+
+# --- Filter parsing ---
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "acme",
+        {},
+        {"tenant": {}},
+        {"tenant": {"$regex": "a.*"}},
+        {"$not": {"tenant": "acme"}},
+        {"$or": []},
+        {"tenant": {"$in": "acme"}},
+        {"year": {"$gt": "2020"}},
+        {"tenant": ["acme"]},
+    ],
+)
+def test_invalid_filters_are_rejected(expression):
+    with pytest.raises(ValueError):
+        parse_filter(expression)
+
+
+# --- MetadataIndex ---
+
+
+@pytest.mark.parametrize(
+    "expression, predicate",
+    [
+        ({"tenant": "acme"}, lambda m: m["tenant"] == "acme"),
+        ({"tenant": {"$in": ["acme", "initech"]}}, lambda m: m["tenant"] != "globex"),
+        ({"year": {"$gte": 2010, "$lt": 2015}}, lambda m: 2010 <= m["year"] < 2015),
+        (
+            {"year": {"$gt": 2020}, "tenant": "globex"},
+            lambda m: m["year"] > 2020 and m["tenant"] == "globex",
+        ),
+        (
+            {"$or": [{"rare": True}, {"year": {"$lte": 2001}}]},
+            lambda m: m["rare"] or m["year"] <= 2001,
+        ),
+        ({"year": 1}, lambda m: False),
+        ({"rare": 1}, lambda m: False),
+    ],
+)
+def test_select_matches_a_brute_force_scan(expression, predicate):
+    chunks = make_chunks(300)
+    index = indexed(chunks)
+
+    assert matching(index, expression) == {
+        c.uid for c in chunks if predicate(c.metadata)
+    }
+
+
+def test_updates_and_deletes_move_postings():
+    chunks = make_chunks(10)
+    index = indexed(chunks)
+    moved = chunks[0].model_copy(update={"metadata": {"tenant": "umbrella"}})
+
+    index.put(moved)
+    index.delete(chunks[1].uid)
+
+    assert len(index) == 9
+    assert matching(index, {"tenant": "umbrella"}) == {moved.uid}
+    assert chunks[0].uid not in matching(index, {"tenant": "acme"})
+    assert chunks[1].uid not in matching(index, {"tenant": "globex"})
+    # The removed chunk's row is reused
+    index.put(Chunk(text="new", metadata={"tenant": "acme"}))
+    assert len(index._row_chunks) == 10
+
+
+def test_filter_selectivity_picks_the_strategy():
+    index = indexed(make_chunks(400))
+
+    assert index.select(MetadataFilter({"rare": True})).prefilter
+    assert not index.select(MetadataFilter({"tenant": "acme"})).prefilter
+
+
+def test_library_metadata_index_is_copied_on_write():
+    document = Document(chunks={c.uid: c for c in make_chunks(6)})
+    snapshot = Library(documents={document.uid: document})
+    snapshot.freeze()
+    acme = MetadataFilter({"tenant": "acme"})
+
+    draft = snapshot.fork()
+    draft.put_chunk(document.uid, Chunk(text="x", metadata={"tenant": "acme"}))
+
+    assert len(draft.filter_chunks(acme)) == 3
+    assert len(snapshot.filter_chunks(acme)) == 2
+
+
+# --- Filtered vector search ---
+
+
+INDEX_PARAMS = {
+    IndexType.FLAT: {},
+    IndexType.AVL: {},
+    IndexType.HNSW: {"seed": 1},
+    IndexType.IVF: {"n_lists": 8, "nprobe": 1, "seed": 1},
+    IndexType.LSH: {"num_bits": 4, "seed": 1},
+    IndexType.PQ: {"num_subspaces": 4, "num_centroids": 16, "seed": 1},
+}
+
+
+@pytest.mark.parametrize("index_type", list(INDEX_PARAMS))
+@pytest.mark.parametrize(
+    "expression", [{"rare": True}, {"tenant": "acme"}], ids=["prefilter", "postfilter"]
+)
+def test_filtered_search_returns_only_matching_chunks(index_type, expression):
+    chunks = make_chunks(400)
+    library = Library(documents={})
+    library.put_document(Document(chunks={c.uid: c for c in chunks}))
+    index = IndexFactory.create_index(index_type, **INDEX_PARAMS[index_type])
+    index.build(chunks)
+    chunk_filter = library.filter_chunks(MetadataFilter(expression))
+    query = chunks[3].embedding.tolist()
+
+    results = index.search_filtered(query, 5, chunk_filter)
+
+    assert len(results) == 5
+    assert all(chunk.uid in chunk_filter for chunk, _ in results)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("index_type", [IndexType.FLAT, IndexType.AVL])
+def test_exact_filtered_search_matches_brute_force(index_type):
+    chunks = make_chunks(400)
+    library = Library(documents={})
+    library.put_document(Document(chunks={c.uid: c for c in chunks}))
+    index = IndexFactory.create_index(index_type)
+    index.build(chunks)
+    query = chunks[0].embedding.tolist()
+
+    for expression in ({"rare": True}, {"tenant": "globex"}):
+        chunk_filter = library.filter_chunks(MetadataFilter(expression))
+        full = [c.uid for c, _ in index.search(query, 400)]
+        expected = [uid for uid in full if uid in chunk_filter][:5]
+
+        assert [
+            c.uid for c, _ in index.search_filtered(query, 5, chunk_filter)
+        ] == expected
@@ -0,0 +1,156 @@
+# tests/test_core/test_models.py
+
+import copy
+import pytest
+import numpy as np
+from uuid import uuid4
+from pydantic import ValidationError
+from src.core.exceptions import DocumentNotFound
+from src.core.models import Chunk, Document, Library, page_keys
+
+# --- Embedding storage ---
+
+
+def test_embedding_is_stored_as_read_only_float32():
+    chunk = Chunk(text="a", embedding=[1, 2.5, -3])
+
+    assert isinstance(chunk.embedding, np.ndarray)
+    assert chunk.embedding.dtype == np.float32
+    assert chunk.embedding.tolist() == [1.0, 2.5, -3.0]
+    with pytest.raises(ValueError):
+        chunk.embedding[0] = 0.0
+
+
+def test_copies_share_the_embedding_buffer():
+    chunk = Chunk(text="a", embedding=[1.0, 2.0])
+
+    assert chunk.model_copy().embedding is chunk.embedding
+    assert copy.deepcopy(chunk).embedding is chunk.embedding
+    assert Chunk(text="b", embedding=chunk.embedding).embedding is chunk.embedding
+
+
+def test_assigned_embedding_is_validated():
+    chunk = Chunk(text="a")
+    chunk.embedding = [0.5, 0.5]
+
+    assert chunk.embedding.dtype == np.float32
+    with pytest.raises(ValidationError):
+        chunk.embedding = [[1.0], [2.0]]
+
+
+def test_embedding_serializes_to_a_list_only_in_json_mode():
+    chunk = Chunk(text="a", embedding=[0.5, 0.25])
+
+    assert isinstance(chunk.model_dump()["embedding"], np.ndarray)
+    assert chunk.model_dump(mode="json")["embedding"] == [0.5, 0.25]
+    restored = Chunk.model_validate_json(chunk.model_dump_json())
+    assert restored.embedding.tolist() == [0.5, 0.25]
+
+
+# --- Chunk -> document map ---
+
+
+def make_document(*texts):
+    chunks = [Chunk(text=t) for t in texts]
+    return Document(chunks={c.uid: c for c in chunks})
+
+
+def test_chunk_map_is_built_from_documents():
+    document = make_document("a", "b")
+    library = Library(documents={document.uid: document})
+
+    for chunk_id in document.chunks:
+        assert library.find_document(chunk_id) is document
+    assert library.find_document(uuid4()) is None
+
+
+def test_targeted_writes_keep_chunk_map_current():
+    library = Library()
+    document = make_document("a", "b")
+    library.put_document(document)
+    first, second = list(document.chunks)
+
+    added = Chunk(text="c")
+    library.put_chunk(document.uid, added)
+    library.delete_chunk(document.uid, first)
+
+    assert library.find_document(added.uid).uid == document.uid
+    assert library.find_document(first) is None
+    assert first not in library._chunk_documents
+
+    # Replacing the document drops the chunks it no longer has
+    replacement = Document(uid=document.uid, chunks={added.uid: added})
+    library.put_document(replacement)
+    assert library.find_document(second) is None
+    assert library.find_document(added.uid) is replacement
+
+    library.delete_document(document.uid)
+    assert library._chunk_documents == {}
+
+
+def test_draft_writes_do_not_leak_into_the_snapshot():
+    document = make_document("a")
+    snapshot = Library(documents={document.uid: document})
+    snapshot.freeze()
+
+    draft = snapshot.fork()
+    added = Chunk(text="b")
+    draft.put_chunk(document.uid, added)
+
+    assert draft.find_document(added.uid) is not None
+    assert added.uid not in snapshot._chunk_documents
+
+
+def test_reindex_picks_up_direct_document_changes():
+    library = Library()
+    document = make_document("a")
+    library.documents[document.uid] = document
+    assert library.find_document(next(iter(document.chunks))) is None
+
+    library.reindex_chunk_documents()
+    assert library.find_document(next(iter(document.chunks))) is document
+
+
+# --- Pagination ---
+
+
+def test_page_keys_walks_sorted_keys_with_a_cursor():
+    keys = sorted(uuid4() for _ in range(5))
+
+    assert page_keys(keys, 2) == keys[:2]
+    assert page_keys(keys, 2, after=keys[1]) == keys[2:4]
+    assert page_keys(keys, after=keys[3]) == keys[4:]
+    assert page_keys(keys, 2, after=keys[4]) == []
+
+
+def test_pages_follow_writes():
+    library = Library()
+    documents = [make_document("a", "b") for _ in range(3)]
+    for document in documents:
+        library.put_document(document)
+    ordered = sorted(documents, key=lambda document: document.uid)
+
+    first = library.document_page(2)
+    assert first == ordered[:2]
+
+    library.delete_document(ordered[2].uid)
+    added = make_document("c")
+    library.put_document(added)
+    # The cursor keeps working across the writes
+    remaining = sorted(uid for uid in library.documents if uid > first[-1].uid)
+    assert [d.uid for d in library.document_page(after=first[-1].uid)] == remaining
+
+    doc_id = ordered[0].uid
+    chunk = Chunk(text="d")
+    library.put_chunk(doc_id, chunk)
+    chunk_ids = [c.uid for c in library.chunk_page(doc_id)]
+    assert chunk_ids == sorted(library.documents[doc_id].chunks)
+    assert chunk.uid in chunk_ids
+
+    library.delete_chunk(doc_id, chunk.uid)
+    assert chunk.uid not in [c.uid for c in library.chunk_page(doc_id)]
+
+
+def test_chunk_page_of_missing_document():
+    with pytest.raises(DocumentNotFound):
+        Library().chunk_page(uuid4())
@@ -0,0 +1,166 @@
+# tests/test_core/test_pq_index.py
+
+import pytest
+import numpy as np
+from uuid import uuid4
+from src.core.models import Chunk
+from src.core.indexing.pq_index import PqIndex
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.enums import Metric
+
+# --- Globals ---
+TEST_SEED = 42
+NUM_SUBSPACES = 4
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def chunk_factory():
+    def _create(embedding, uid=None):
+        return Chunk(uid=uid or uuid4(), text="test", embedding=embedding)
+
+    return _create
+
+
+@pytest.fixture
+def pq_index():
+    return PqIndex(num_subspaces=NUM_SUBSPACES, num_centroids=16, seed=TEST_SEED)
+
+
+@pytest.fixture
+def random_chunks(chunk_factory):
+    rng = np.random.default_rng(TEST_SEED)
+    return [chunk_factory(v) for v in rng.standard_normal((500, 16)).tolist()]
+
+
+def recall_at_k(index, exact, queries, k) -> float:
+    hits = 0
+    for query in queries:
+        expected = {c.uid for c, _ in exact.search(query, k)}
+        hits += len(expected & {c.uid for c, _ in index.search(query, k)})
+    return hits / (k * len(queries))
+
+
+# --- Unit tests ---
+
+
+def test_initialization(pq_index):
+    assert pq_index.vector_count == 0
+    assert pq_index._codebooks is None
+
+
+def test_invalid_num_centroids_raises():
+    with pytest.raises(ValueError):
+        PqIndex(num_centroids=300)
+
+
+def test_build_stores_uint8_codes(pq_index, random_chunks):
+    pq_index.build(random_chunks)
+
+    assert pq_index.vector_count == 500
+    assert pq_index._codes.dtype == np.uint8
+    assert pq_index._codes.shape[1] == NUM_SUBSPACES
+    assert pq_index._codebooks.shape == (NUM_SUBSPACES, 16, 4)
+    # 4 bytes per vector instead of 16 float32 values
+    assert pq_index._codes[: pq_index.vector_count].nbytes == 500 * NUM_SUBSPACES
+
+
+def test_dimension_not_divisible_by_subspaces_is_padded(chunk_factory):
+    index = PqIndex(num_subspaces=4, seed=TEST_SEED)
+    target = chunk_factory([1.0, 0.0, 0.0])
+    index.build([target, chunk_factory([0.0, 1.0, 0.0])])
+
+    assert index._sub_dim == 1
+    assert index.search([1.0, 0.0, 0.0], k=1)[0][0].uid == target.uid
+
+
+def test_insert_into_empty_index_trains_codebooks(pq_index, chunk_factory):
+    chunk = chunk_factory([1.0, 0.0, 0.0, 0.0])
+    pq_index.insert(chunk)
+
+    assert pq_index.vector_count == 1
+    assert pq_index._codebooks is not None
+    assert pq_index.search([1.0, 0.0, 0.0, 0.0], k=1)[0][0].uid == chunk.uid
+
+
+def test_codebooks_retrain_when_data_doubles(pq_index, random_chunks):
+    pq_index.build(random_chunks[:100])
+    for chunk in random_chunks[100:250]:
+        pq_index.insert(chunk)
+
+    assert pq_index._trained_count == 200
+    assert pq_index.vector_count == 250
+
+
+def test_insert_duplicate_overwrites_row(pq_index, random_chunks, chunk_factory):
+    pq_index.build(random_chunks)
+    updated = chunk_factory([5.0] * 16, uid=random_chunks[0].uid)
+    pq_index.insert(updated)
+
+    assert pq_index.vector_count == 500
+    assert pq_index._row_chunks[pq_index._uid_to_row[updated.uid]] is updated
+
+
+def test_delete_swaps_last_row_into_hole(pq_index, random_chunks):
+    pq_index.build(random_chunks)
+    last = random_chunks[-1]
+    last_code = pq_index._codes[pq_index._uid_to_row[last.uid]].copy()
+
+    pq_index.delete(random_chunks[0].uid)
+
+    assert pq_index.vector_count == 499
+    assert pq_index._uid_to_row[last.uid] == 0
+    assert (pq_index._codes[0] == last_code).all()
+
+
+def test_search_dimension_mismatch_raises_value_error(pq_index, chunk_factory):
+    pq_index.insert(chunk_factory([1.0, 0.0, 0.0, 0.0]))
+    with pytest.raises(ValueError):
+        pq_index.search([1.0, 0.0], k=1)
+
+
+def test_search_empty_index_returns_empty(pq_index):
+    assert pq_index.search([1, 1], k=5) == []
+
+
+# --- Accuracy tests ---
+
+
+def test_search_accuracy_euclidean(chunk_factory):
+    index = PqIndex(metric=Metric.EUCLIDEAN, num_subspaces=2, seed=TEST_SEED)
+    target = chunk_factory([0, 0])
+    close = chunk_factory([0, 1])
+    far = chunk_factory([0, 10])
+
+    index.build([target, far, close])
+    results = index.search([0, 0], k=2)
+
+    assert [r[0].uid for r in results] == [target.uid, close.uid]
+    assert results[1][1] == pytest.approx(1.0)
+
+
+def test_rerank_improves_recall_and_returns_exact_scores(random_chunks):
+    exact = FlatIndex()
+    exact.build(random_chunks)
+    queries = np.random.default_rng(1).standard_normal((20, 16)).tolist()
+
+    plain = PqIndex(num_subspaces=NUM_SUBSPACES, num_centroids=16, seed=TEST_SEED)
+    reranked = PqIndex(
+        num_subspaces=NUM_SUBSPACES,
+        num_centroids=16,
+        rerank_factor=10,
+        seed=TEST_SEED,
+    )
+    plain.build(random_chunks)
+    reranked.build(random_chunks)
+
+    assert recall_at_k(reranked, exact, queries, k=5) >= recall_at_k(
+        plain, exact, queries, k=5
+    )
+    assert recall_at_k(reranked, exact, queries, k=5) >= 0.9
+
+    exact_scores = {c.uid: s for c, s in exact.search(queries[0], 5)}
+    for chunk, score in reranked.search(queries[0], 5):
+        if chunk.uid in exact_scores:
+            assert score == pytest.approx(exact_scores[chunk.uid], abs=1e-5)
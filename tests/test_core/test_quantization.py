@@ -0,0 +1,202 @@
+# tests/test_core/test_quantization.py
+
+import pytest
+import numpy as np
+from uuid import uuid4
+from src.core.models import Chunk
+from src.core.indexing.quantization import ScalarQuantizer, rerank_exact
+from src.core.indexing.index_factory import IndexFactory
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.enums import IndexType, Metric, Quantization
+
+# --- Globals ---
+TEST_SEED = 42
+QUANTIZED_INDEX_TYPES = [
+    IndexType.AVL,
+    IndexType.LSH,
+    IndexType.FLAT,
+    IndexType.HNSW,
+    IndexType.IVF,
+]
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def chunk_factory():
+    def _create(embedding, uid=None):
+        return Chunk(uid=uid or uuid4(), text="test", embedding=embedding)
+
+    return _create
+
+
+@pytest.fixture
+def vectors():
+    return (
+        np.random.default_rng(TEST_SEED).standard_normal((300, 16)).astype(np.float32)
+    )
+
+
+@pytest.fixture
+def random_chunks(chunk_factory, vectors):
+    return [chunk_factory(v) for v in vectors.tolist()]
+
+
+def recall_at_k(index, exact, queries, k) -> float:
+    hits = 0
+    for query in queries:
+        expected = {c.uid for c, _ in exact.search(query, k)}
+        hits += len(expected & {c.uid for c, _ in index.search(query, k)})
+    return hits / (k * len(queries))
+
+
+# --- ScalarQuantizer unit tests ---
+
+
+@pytest.mark.parametrize(
+    "mode, dtype",
+    [
+        (Quantization.NONE, np.float32),
+        (Quantization.FLOAT16, np.float16),
+        (Quantization.INT8, np.int8),
+    ],
+)
+def test_encode_uses_mode_dtype(vectors, mode, dtype):
+    quantizer = ScalarQuantizer(mode)
+    quantizer.fit(vectors)
+    assert quantizer.encode(vectors).dtype == dtype
+
+
+def test_int8_round_trip_error_is_bounded_by_calibration_step(vectors):
+    quantizer = ScalarQuantizer(Quantization.INT8)
+    quantizer.fit(vectors)
+
+    decoded = quantizer.decode(quantizer.encode(vectors))
+    step = (vectors.max(axis=0) - vectors.min(axis=0)) / 255.0
+
+    assert (np.abs(decoded - vectors) <= step / 2 + 1e-6).all()
+
+
+def test_int8_dot_on_codes_matches_decoded_dot(vectors):
+    quantizer = ScalarQuantizer(Quantization.INT8)
+    quantizer.fit(vectors)
+    codes = quantizer.encode(vectors)
+    query = vectors[0]
+
+    dots = quantizer.dot(codes, quantizer.prepare_query(query))
+
+    np.testing.assert_allclose(
+        dots, quantizer.decode(codes) @ query, rtol=1e-4, atol=1e-4
+    )
+
+
+def test_int8_without_fit_uses_symmetric_range():
+    quantizer = ScalarQuantizer(Quantization.INT8)
+    vector = np.array([1.0, -1.0, 0.0], dtype=np.float32)
+    codes = quantizer.encode(vector)
+
+    assert codes[0] == 127 and codes[1] == -128
+    np.testing.assert_allclose(quantizer.decode(codes), vector, atol=1.0 / 255)
+
+
+def test_rerank_exact_orders_by_true_score(chunk_factory):
+    near = chunk_factory([1.0, 0.0])
+    far = chunk_factory([0.0, 1.0])
+
+    results = rerank_exact([1.0, 0.1], [far, near], k=1, metric=Metric.COSINE)
+
+    assert [c.uid for c, _ in results] == [near.uid]
+
+
+# --- Quantized indices ---
+
+
+@pytest.mark.parametrize("index_type", QUANTIZED_INDEX_TYPES)
+def test_int8_index_stores_int8_vectors(index_type, random_chunks):
+    index = IndexFactory.create_index(
+        index_type, quantization=Quantization.INT8, seed=TEST_SEED
+    )
+    index.build(random_chunks)
+
+    assert index.vector_count == len(random_chunks)
+    assert index._quantizer.dtype == np.int8
+
+
+@pytest.mark.parametrize("index_type", QUANTIZED_INDEX_TYPES)
+def test_int8_index_with_rerank_keeps_recall(index_type, random_chunks):
+    exact = FlatIndex()
+    exact.build(random_chunks)
+    index = IndexFactory.create_index(
+        index_type,
+        quantization=Quantization.INT8,
+        rerank_factor=4,
+        seed=TEST_SEED,
+        num_bits=4,
+    )
+    index.build(random_chunks)
+
+    # Queries near stored vectors so LSH buckets are populated
+    queries = [c.embedding for c in random_chunks[:20]]
+    baseline = IndexFactory.create_index(index_type, seed=TEST_SEED, num_bits=4)
+    baseline.build(random_chunks)
+
+    assert recall_at_k(index, exact, queries, k=5) >= (
+        recall_at_k(baseline, exact, queries, k=5) - 0.05
+    )
+
+
+def test_int8_flat_rerank_returns_exact_scores(random_chunks):
+    exact = FlatIndex()
+    exact.build(random_chunks)
+    index = FlatIndex(quantization=Quantization.INT8, rerank_factor=4)
+    index.build(random_chunks)
+
+    query = random_chunks[3].embedding
+    found = index.search(query, 5)
+    expected = exact.search(query, 5)
+
+    assert [c.uid for c, _ in found] == [c.uid for c, _ in expected]
+    assert [s for _, s in found] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+
+def test_float16_flat_euclidean_accuracy(chunk_factory):
+    index = FlatIndex(metric=Metric.EUCLIDEAN, quantization=Quantization.FLOAT16)
+    target = chunk_factory([0, 0])
+    close = chunk_factory([0, 1])
+    far = chunk_factory([0, 10])
+
+    index.build([target, far, close])
+    results = index.search([0, 0], k=2)
+
+    assert [r[0].uid for r in results] == [target.uid, close.uid]
+    assert results[1][1] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_int8_lsh_delete_removes_all_bucket_entries(random_chunks):
+    index = IndexFactory.create_index(
+        IndexType.LSH, quantization=Quantization.INT8, seed=TEST_SEED
+    )
+    index.build(random_chunks)
+
+    for chunk in random_chunks:
+        index.delete(chunk.uid)
+
+    assert index.vector_count == 0
+    assert all(not table for table in index._tables)
+
+
+@pytest.mark.parametrize("mode", [Quantization.FLOAT16, Quantization.INT8])
+@pytest.mark.parametrize("metric", [Metric.COSINE, Metric.EUCLIDEAN])
+def test_quantized_flat_search_batch_matches_single_searches(
+    random_chunks, mode, metric
+):
+    index = FlatIndex(metric=metric, quantization=mode)
+    index.build(random_chunks)
+    queries = np.random.default_rng(1).standard_normal((10, 16)).tolist()
+
+    for query, batched in zip(queries, index.search_batch(queries, k=5)):
+        single = index.search(query, k=5)
+        assert [c.uid for c, _ in batched] == [c.uid for c, _ in single]
+        assert [s for _, s in batched] == pytest.approx(
+            [s for _, s in single], abs=1e-3
+        )
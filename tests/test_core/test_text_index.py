@@ -0,0 +1,155 @@
+# tests/test_core/test_text_index.py
+
+import math
+import pytest
+from src.core.models import Chunk, Document, Library
+from src.core.indexing.enums import FusionMethod, IndexType, Metric
+from src.core.indexing.index_factory import IndexFactory
+from src.core.indexing.fusion import RRF_K, fuse_rankings
+from src.core.indexing.metadata_index import MetadataFilter
+from src.core.indexing.text_index import TextIndex, tokenize
+
+# --- Fixtures ---
+
+TEXTS = [
+    "Payment failed with error ERR-1042 after checkout",
+    "Checkout page loads slowly on mobile",
+    "Upgrade the SKU AB-77 firmware to v2.3.1",
+    "Error handling in the payment service",
+    "Mobile app crashes on startup",
+]
+
+
+def indexed(texts):
+    index = TextIndex()
+    chunks = [Chunk(text=text) for text in texts]
+    for chunk in chunks:
+        index.put(chunk)
+    return index, chunks
+
+
+def ranking(index, query, k=5):
+    return [chunk.text for chunk, _ in index.search(query, k)]
+
+
+# --- Tokenizer ---
+
+
+def test_tokenize_keeps_codes_whole_and_split():
+    assert tokenize("Error ERR-1042, see v2.3.1.") == [
+        "error",
+        "err-1042",
+        "err",
+        "1042",
+        "see",
+        "v2.3.1",
+        "v2",
+        "3",
+        "1",
+    ]
+
+
+# --- BM25 ---
+
+
+def test_exact_codes_rank_first():
+    index, _ = indexed(TEXTS)
+
+    assert ranking(index, "ERR-1042")[0] == TEXTS[0]
+    assert ranking(index, "sku ab-77")[0] == TEXTS[2]
+    assert ranking(index, "quantum") == []
+
+
+def test_bm25_score_matches_the_formula():
+    index, chunks = indexed(["apple banana", "apple", "cherry"])
+    [(top, score)] = index.search("banana", 2)
+
+    # banana: df=1 of 3 documents; tf=1 in a document of length 2 (average 4/3)
+    idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+    norm = 1.2 * (1 - 0.75 + 0.75 * 2 / (4 / 3))
+    assert top is chunks[0]
+    assert score == pytest.approx(idf * 2.2 / (1 + norm))
+
+
+def test_incremental_updates_match_a_rebuild():
+    index, chunks = indexed(TEXTS)
+    index.put(chunks[1].model_copy(update={"text": "Checkout error on tablet"}))
+    index.delete(chunks[3].uid)
+    index.put(Chunk(text="Payment error ERR-1042 again"))
+
+    rebuilt = TextIndex()
+    for chunk in index._chunks.values():
+        rebuilt.put(chunk)
+
+    for query in ("error", "checkout", "ERR-1042 payment", "mobile"):
+        assert index.search(query, 5) == rebuilt.search(query, 5)
+    assert "handling" not in index._postings
+    assert index._total_length == rebuilt._total_length
+
+
+def test_search_respects_a_chunk_filter():
+    chunks = [
+        Chunk(text=text, metadata={"team": "web" if i % 2 else "pay"})
+        for i, text in enumerate(TEXTS)
+    ]
+    library = Library()
+    library.put_document(Document(chunks={c.uid: c for c in chunks}))
+
+    hits = library.text_search("error checkout", 5, MetadataFilter({"team": "web"}))
+
+    # Both score the same: one query term each, equal lengths
+    assert {chunk.text for chunk, _ in hits} == {TEXTS[1], TEXTS[3]}
+
+
+def test_library_text_index_is_copied_on_write():
+    document = Document(chunks={c.uid: c for c in [Chunk(text=t) for t in TEXTS]})
+    snapshot = Library(documents={document.uid: document})
+    snapshot.freeze()
+
+    draft = snapshot.fork()
+    draft.put_chunk(document.uid, Chunk(text="Refund ERR-2000"))
+
+    assert len(draft.text_search("refund", 5)) == 1
+    assert snapshot.text_search("refund", 5) == []
+
+
+# --- Fusion ---
+
+
+def test_rrf_rewards_chunks_both_rankings_agree_on():
+    a, b, c = (Chunk(text=t) for t in "abc")
+    vector_hits = [(a, 0.9), (b, 0.8)]
+    text_hits = [(b, 12.0), (c, 3.0)]
+
+    fused = fuse_rankings(vector_hits, text_hits, 3, FusionMethod.RRF)
+
+    assert [chunk.text for chunk, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(0.5 / (RRF_K + 2) + 0.5 / (RRF_K + 1))
+
+
+def test_weighted_fusion_normalizes_each_ranking():
+    a, b, c = (Chunk(text=t) for t in "abc")
+    vector_hits = [(a, 0.9), (b, 0.5), (c, 0.1)]
+    text_hits = [(c, 30.0), (b, 10.0)]
+
+    fused = fuse_rankings(vector_hits, text_hits, 2, FusionMethod.WEIGHTED, 0.8)
+
+    # a: 0.8 * 1; b: 0.8 * 0.5 + 0.2 * 0; c: 0.8 * 0 + 0.2 * 1
+    assert [(chunk.text, score) for chunk, score in fused] == [
+        ("a", pytest.approx(0.8)),
+        ("b", pytest.approx(0.4)),
+    ]
+
+
+def test_weighted_fusion_reads_euclidean_scores_as_distances():
+    chunks = [Chunk(text=f"t{i}", embedding=[float(i), 0.0]) for i in range(5)]
+    index = IndexFactory.create_index(IndexType.FLAT, metric=Metric.EUCLIDEAN)
+    index.build(chunks)
+    vector_hits = index.search([0.0, 0.0], 5)
+
+    fused = fuse_rankings(
+        vector_hits, [], 5, FusionMethod.WEIGHTED, 1.0, Metric.EUCLIDEAN
+    )
+
+    assert [chunk.text for chunk, _ in fused] == ["t0", "t1", "t2", "t3", "t4"]
+    assert [score for _, score in fused] == pytest.approx([1.0, 0.75, 0.5, 0.25, 0.0])
@@ -0,0 +1,102 @@
+# tests/test_core/test_vector_store.py
+
+import pytest
+import numpy as np
+from uuid import uuid4
+from src.core.models import Chunk
+from src.core.indexing.vector_store import VectorStore
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def store():
+    return VectorStore()
+
+
+def make_chunk():
+    return Chunk(uid=uuid4(), text="test")
+
+
+# --- Unit tests ---
+
+
+def test_put_returns_stable_rows_and_views(store):
+    first, second = make_chunk(), make_chunk()
+
+    assert store.put(first, np.array([1.0, 2.0])) == 0
+    assert store.put(second, np.array([3.0, 4.0])) == 1
+    assert len(store) == 2
+    assert store[second.uid] == pytest.approx([3.0, 4.0])
+    assert store.chunk(1) is second
+    assert np.shares_memory(store[first.uid], store.vectors)
+
+
+def test_put_existing_uid_overwrites_in_place(store):
+    chunk = make_chunk()
+    store.put(chunk, np.array([1.0, 0.0]))
+
+    replacement = chunk.model_copy()
+    assert store.put(replacement, np.array([0.0, 1.0])) == 0
+    assert len(store) == 1
+    assert store[chunk.uid] == pytest.approx([0.0, 1.0])
+    assert store.chunk(0) is replacement
+
+
+def test_deleted_rows_are_reused(store):
+    chunks = [make_chunk() for _ in range(3)]
+    for chunk in chunks:
+        store.put(chunk, np.ones(2))
+
+    assert store.delete(chunks[1].uid) == 1
+    assert store.delete(chunks[1].uid) is None
+    assert chunks[1].uid not in store
+
+    # The freed row is handed out again, other rows do not move
+    assert store.put(make_chunk(), np.zeros(2)) == 1
+    assert store.row(chunks[2].uid) == 2
+    assert len(store.vectors) == 3
+
+
+def test_growth_keeps_rows(store):
+    chunks = [make_chunk() for _ in range(VectorStore._INITIAL_CAPACITY + 10)]
+    for i, chunk in enumerate(chunks):
+        store.put(chunk, np.full(4, float(i)))
+
+    assert store[chunks[0].uid] == pytest.approx([0.0] * 4)
+    assert store[chunks[-1].uid] == pytest.approx([float(len(chunks) - 1)] * 4)
+
+
+def test_dimension_mismatch_raises(store):
+    store.put(make_chunk(), np.ones(3))
+    with pytest.raises(ValueError):
+        store.put(make_chunk(), np.ones(2))
+
+
+def test_stored_format_follows_dtype():
+    store = VectorStore(np.int8)
+    store.put(make_chunk(), np.array([1, -2], dtype=np.int8))
+    assert store.vectors.dtype == np.int8
+
+
+def test_put_many_into_empty_store(store):
+    chunks = [make_chunk() for _ in range(3)]
+    rows = store.put_many(chunks, np.eye(3, dtype=np.float32))
+
+    assert rows.tolist() == [0, 1, 2]
+    assert store[chunks[2].uid] == pytest.approx([0.0, 0.0, 1.0])
+
+
+def test_dump_and_restore_keep_rows_and_free_list(store):
+    chunks = [make_chunk() for _ in range(3)]
+    for i, chunk in enumerate(chunks):
+        store.put(chunk, np.full(2, float(i)))
+    store.delete(chunks[0].uid)
+
+    restored = VectorStore()
+    restored.restore_arrays(store.dump_arrays(), {c.uid: c for c in chunks})
+
+    assert len(restored) == 2
+    assert restored.row(chunks[2].uid) == 2
+    assert restored[chunks[1].uid] == pytest.approx([1.0, 1.0])
+    assert restored.put(make_chunk(), np.zeros(2)) == 0
@@ -4,7 +4,6 @@ import pytest
 from uuid import uuid4
 from fastapi import status
 
-
 # ============================================================================
 # Test API Endpoint Behavior with Automatic Embeddings
 # ============================================================================
@@ -32,7 +31,7 @@ def test_create_chunk_without_embedding_generates_one(
     assert created_chunk["embedding"] is not None
 
     expected_embedding = [0.1, 0.2, 0.8]
-    assert created_chunk["embedding"] == expected_embedding
+    assert created_chunk["embedding"] == pytest.approx(expected_embedding)
 
 
 # ============================================================================
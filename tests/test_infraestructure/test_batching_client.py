@@ -0,0 +1,151 @@
+# tests/test_infraestructure/test_batching_client.py
+
+import asyncio
+import threading
+import pytest
+from tests.fakes import CountingEmbeddingsClient
+from src.infrastructure.embeddings.fake_client import FakeEmbeddingsClient
+from src.infrastructure.embeddings.batching_client import (
+    MicroBatchingEmbeddingsClient,
+)
+
+# --- Helpers ---
+
+
+def run_concurrently(client, texts, input_type="search_query"):
+    """Calls get_embeddings([text]) for every text from its own thread."""
+    results = {}
+    barrier = threading.Barrier(len(texts))
+
+    def call(text):
+        barrier.wait()
+        results[text] = client.get_embeddings([text], input_type=input_type)[0]
+
+    threads = [threading.Thread(target=call, args=(t,)) for t in texts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+# --- Tests ---
+
+
+def test_concurrent_single_text_calls_share_one_provider_call():
+    provider = CountingEmbeddingsClient(delay=0.01)
+    client = MicroBatchingEmbeddingsClient(provider, max_wait_ms=200)
+    texts = [f"query {i}" for i in range(8)]
+
+    results = run_concurrently(client, texts)
+
+    assert len(provider.calls) == 1
+    assert sorted(provider.calls[0][0]) == sorted(texts)
+    expected = FakeEmbeddingsClient().get_embeddings(texts)
+    for text, vector in zip(texts, expected):
+        assert results[text] == pytest.approx(vector)
+    assert client.stats == {"calls": 8, "provider_calls": 1}
+
+
+def test_batches_are_capped_at_max_batch_size():
+    provider = CountingEmbeddingsClient()
+    client = MicroBatchingEmbeddingsClient(provider, max_wait_ms=200, max_batch_size=3)
+
+    run_concurrently(client, [f"query {i}" for i in range(9)])
+
+    assert all(len(texts) <= 3 for texts, _ in provider.calls)
+    assert sum(len(texts) for texts, _ in provider.calls) == 9
+
+
+def test_input_types_are_not_mixed():
+    provider = CountingEmbeddingsClient()
+    client = MicroBatchingEmbeddingsClient(provider, max_wait_ms=50)
+    barrier = threading.Barrier(2)
+
+    def call(input_type):
+        barrier.wait()
+        client.get_embeddings(["cat"], input_type=input_type)
+
+    threads = [
+        threading.Thread(target=call, args=(t,))
+        for t in ("search_query", "search_document")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(input_type for _, input_type in provider.calls) == [
+        "search_document",
+        "search_query",
+    ]
+
+
+def test_large_calls_bypass_the_window():
+    provider = CountingEmbeddingsClient()
+    client = MicroBatchingEmbeddingsClient(
+        provider, max_wait_ms=10_000, max_batch_size=2
+    )
+
+    assert len(client.get_embeddings(["a", "b", "c"])) == 3
+    assert provider.calls == [(["a", "b", "c"], "search_document")]
+
+
+def test_provider_error_reaches_every_caller():
+    class FailingClient(FakeEmbeddingsClient):
+        def get_embeddings(self, texts, input_type="search_document"):
+            raise ConnectionError("provider down")
+
+    client = MicroBatchingEmbeddingsClient(FailingClient(), max_wait_ms=50)
+    errors = []
+    barrier = threading.Barrier(3)
+
+    def call(text):
+        barrier.wait()
+        try:
+            client.get_embeddings([text])
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(t,)) for t in "abc"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 3
+
+
+# --- Async path ---
+
+
+def test_concurrent_coroutines_share_one_provider_call():
+    provider = CountingEmbeddingsClient()
+    client = MicroBatchingEmbeddingsClient(provider, max_wait_ms=50)
+    texts = [f"query {i}" for i in range(5)]
+
+    async def main():
+        return await asyncio.gather(
+            *(client.aget_embeddings([t], input_type="search_query") for t in texts)
+        )
+
+    results = asyncio.run(main())
+
+    assert provider.calls == [(texts, "search_query")]
+    expected = FakeEmbeddingsClient().get_embeddings(texts)
+    assert [r[0] for r in results] == [pytest.approx(v) for v in expected]
+
+
+def test_cancelled_caller_does_not_strand_the_batch():
+    provider = CountingEmbeddingsClient()
+    client = MicroBatchingEmbeddingsClient(provider, max_wait_ms=50)
+
+    async def main():
+        first = asyncio.create_task(client.aget_embeddings(["a"]))
+        second = asyncio.create_task(client.aget_embeddings(["b"]))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert len(asyncio.run(main())) == 1
+    assert provider.calls == [(["a", "b"], "search_document")]
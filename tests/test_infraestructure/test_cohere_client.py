@@ -0,0 +1,160 @@
+# tests/test_infraestructure/test_cohere_client.py
+
+import asyncio
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from cohere.core.api_error import ApiError
+from src.infrastructure.embeddings.cohere_client import CohereClient
+
+# --- Fixtures ---
+
+
+class FakeCohere:
+    """Stands in for cohere.Client: embeds "t<i>" as [i], optionally failing first."""
+
+    def __init__(self, delay: float = 0.0, failures=None):
+        self.delay = delay
+        self.failures = dict(failures or {})  # first text -> errors still to raise
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def embed(self, texts, model, input_type):
+        with self.lock:
+            self.calls += 1
+            pending = self.failures.get(texts[0], [])
+            error = pending.pop(0) if pending else None
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if error is not None:
+                raise error
+            return SimpleNamespace(embeddings=[[float(t[1:])] for t in texts])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def make_client(fake, **kwargs):
+    kwargs.setdefault("backoff_base", 0.0)
+    client = CohereClient(api_key="test", **kwargs)
+    client._client = fake
+    return client
+
+
+TEXTS = [f"t{i}" for i in range(CohereClient.BATCH_SIZE * 5 + 7)]
+
+
+# --- Tests ---
+
+
+def test_concurrent_batches_keep_input_order():
+    fake = FakeCohere(delay=0.02)
+    client = make_client(fake, max_concurrency=4)
+
+    embeddings = client.get_embeddings(TEXTS)
+
+    assert embeddings == [[float(i)] for i in range(len(TEXTS))]
+    assert fake.calls == 6
+    assert 1 < fake.max_in_flight <= 4
+
+
+def test_single_concurrency_is_serial():
+    fake = FakeCohere(delay=0.01)
+    make_client(fake, max_concurrency=1).get_embeddings(TEXTS)
+
+    assert fake.max_in_flight == 1
+
+
+def test_transient_batch_failures_are_retried_alone():
+    second_batch = TEXTS[CohereClient.BATCH_SIZE]
+    fake = FakeCohere(
+        failures={second_batch: [ApiError(status_code=429), ApiError(status_code=503)]}
+    )
+
+    embeddings = make_client(fake, max_retries=2).get_embeddings(TEXTS)
+
+    assert len(embeddings) == len(TEXTS)
+    assert fake.calls == 6 + 2
+
+
+def test_permanent_failures_are_not_retried():
+    fake = FakeCohere(failures={TEXTS[0]: [ApiError(status_code=400)]})
+
+    with pytest.raises(ConnectionError, match="batch 0"):
+        make_client(fake).get_embeddings(TEXTS[:10])
+    assert fake.calls == 1
+
+
+def test_retries_are_bounded():
+    fake = FakeCohere(failures={TEXTS[0]: [ApiError(status_code=503)] * 5})
+
+    with pytest.raises(ConnectionError):
+        make_client(fake, max_retries=2).get_embeddings(TEXTS[:10])
+    assert fake.calls == 3
+
+
+def test_rate_limit_spaces_requests():
+    fake = FakeCohere()
+    client = make_client(fake, max_concurrency=4, max_requests_per_second=100)
+
+    start = time.monotonic()
+    client.get_embeddings(TEXTS)
+
+    # Six request starts at most 10ms apart
+    assert time.monotonic() - start >= 0.05
+
+
+# --- Async path ---
+
+
+class FakeAsyncCohere(FakeCohere):
+    """Stands in for cohere.AsyncClient."""
+
+    async def embed(self, texts, model, input_type):
+        with self.lock:
+            self.calls += 1
+            pending = self.failures.get(texts[0], [])
+            error = pending.pop(0) if pending else None
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if error is not None:
+                raise error
+            return SimpleNamespace(embeddings=[[float(t[1:])] for t in texts])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_async_batches_run_concurrently_in_order():
+    fake = FakeAsyncCohere(delay=0.01, failures={TEXTS[0]: [ApiError(status_code=503)]})
+    client = make_client(None, max_concurrency=3)
+    client._async_client = fake
+
+    embeddings = asyncio.run(client.aget_embeddings(TEXTS))
+
+    assert embeddings == [[float(i)] for i in range(len(TEXTS))]
+    assert fake.calls == 6 + 1
+    assert 1 < fake.max_in_flight <= 3
+
+
+def test_async_concurrency_is_shared_across_calls():
+    fake = FakeAsyncCohere(delay=0.01)
+    client = make_client(None, max_concurrency=2)
+    client._async_client = fake
+
+    async def concurrent_calls():
+        return await asyncio.gather(*(client.aget_embeddings(TEXTS) for _ in range(3)))
+
+    for embeddings in asyncio.run(concurrent_calls()):
+        assert embeddings == [[float(i)] for i in range(len(TEXTS))]
+    assert fake.calls == 3 * 6
+    assert fake.max_in_flight == 2
+    # A new event loop gets its own limiter
+    assert len(asyncio.run(client.aget_embeddings(TEXTS[:10]))) == 10
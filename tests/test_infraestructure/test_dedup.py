@@ -0,0 +1,41 @@
+# tests/test_infraestructure/test_dedup.py
+
+import asyncio
+import pytest
+from tests.fakes import CountingEmbeddingsClient
+from src.infrastructure.embeddings import dedup
+from src.infrastructure.embeddings.dedup import DeduplicatingEmbeddingsClient
+
+
+def test_dedupe_texts_keeps_first_seen_order_and_slots():
+    unique_texts, slots = dedup.dedupe_texts(["a", "b", "a", "", "b", ""])
+
+    assert unique_texts == ["a", "b", ""]
+    assert slots == [0, 1, 0, 2, 1, 2]
+
+
+def test_client_embeds_distinct_texts_once_and_counts_duplicates():
+    provider = CountingEmbeddingsClient()
+    client = DeduplicatingEmbeddingsClient(provider)
+    assert client.dedup_ratio() == 0.0
+
+    vectors = client.get_embeddings(["x", "y", "x", "x"])
+    asyncio.run(client.aget_embeddings(["z", "z"], input_type="search_query"))
+
+    assert provider.calls == [
+        (["x", "y"], "search_document"),
+        (["z"], "search_query"),
+    ]
+    assert vectors[0] is vectors[2] is vectors[3]
+    assert vectors[1] == provider.get_embeddings(["y"])[0]
+    assert client.stats == {"texts": 6, "unique_texts": 3}
+    assert client.dedup_ratio() == 0.5
+
+
+def test_client_rejects_a_short_provider_answer():
+    provider = CountingEmbeddingsClient()
+    provider.get_embeddings = lambda texts, input_type: [[0.1, 0.2, 0.3]]
+    client = DeduplicatingEmbeddingsClient(provider)
+
+    with pytest.raises(ValueError, match="1 vectors for 2 texts"):
+        client.get_embeddings(["x", "y", "x"])
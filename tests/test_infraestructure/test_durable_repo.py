@@ -0,0 +1,279 @@
+# tests/test_infraestructure/test_durable_repo.py
+
+import os
+import shutil
+import threading
+import pytest
+from src.core.models import Library, Document, Chunk, IndexMetadata, IndexConfig
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.enums import IndexType, Metric
+from src.infrastructure.repositories.durable_repo import DurableLibraryRepository
+from src.infrastructure.repositories.wal import WriteAheadLog
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def open_repo(tmp_path):
+    opened = []
+
+    def _open(**kwargs):
+        kwargs.setdefault("snapshot_every", None)
+        kwargs.setdefault("fsync", False)
+        repo = DurableLibraryRepository(str(tmp_path), **kwargs)
+        opened.append(repo)
+        return repo
+
+    yield _open
+    for repo in opened:
+        repo.close()
+
+
+def chunk(i: int) -> Chunk:
+    return Chunk(text=f"chunk {i}", embedding=[float(i), 1.0, 0.5])
+
+
+def add_flat_index(repo: DurableLibraryRepository, library_id):
+    draft = repo.get_for_update(library_id)
+    chunks = [c for d in draft.documents.values() for c in d.chunks.values()]
+    index = FlatIndex()
+    index.build(chunks)
+    draft.add_index("flat", index)
+    draft.index_metadata["flat"] = IndexMetadata(
+        name="flat",
+        config=IndexConfig(index_type=IndexType.FLAT, metric=Metric.COSINE),
+        vector_count=index.vector_count,
+        index_type="flat",
+    )
+    repo.update(draft)
+
+
+def populate(repo: DurableLibraryRepository) -> Library:
+    library = Library(metadata={"name": "books"})
+    repo.add(library)
+
+    document = Document(chunks={c.uid: c for c in [chunk(0), chunk(1)]})
+    repo.put_document(library.uid, document)
+    repo.put_chunk(library.uid, document.uid, chunk(2))
+    repo.delete_chunk(library.uid, document.uid, next(iter(document.chunks)))
+    add_flat_index(repo, library.uid)
+    return repo.get_by_id(library.uid)
+
+
+def assert_same_library(recovered: Library, expected: Library):
+    assert recovered.version == expected.version
+    assert recovered.metadata == expected.metadata
+    assert (
+        recovered.model_dump(mode="json")["documents"]
+        == expected.model_dump(mode="json")["documents"]
+    )
+    assert (
+        recovered.indices["flat"].vector_count == expected.indices["flat"].vector_count
+    )
+
+
+# --- Tests ---
+
+
+def test_recovers_state_from_log(open_repo):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.close()
+
+    recovered = open_repo()
+    assert_same_library(recovered.get_by_id(expected.uid), expected)
+    assert recovered.stats["records_replayed"] == 5
+
+
+def test_recovered_index_is_searchable(open_repo):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.close()
+
+    recovered = open_repo()
+    with recovered.snapshot(expected.uid) as library:
+        results = library.indices["flat"].search([2.0, 1.0, 0.5], k=1)
+    assert results[0][0].text == "chunk 2"
+
+
+def test_update_log_record_only_contains_changed_documents(open_repo, tmp_path):
+    repo = open_repo()
+    library = Library()
+    repo.add(library)
+    for i in range(3):
+        c = chunk(i)
+        repo.put_document(library.uid, Document(chunks={c.uid: c}))
+
+    draft = repo.get_for_update(library.uid)
+    draft.metadata = {"renamed": True}
+    repo.update(draft)
+    repo.close()
+
+    records, _ = WriteAheadLog.read(str(tmp_path / "wal-00000000.log"))
+    assert records[-1]["op"] == "update"
+    assert records[-1]["documents"] == []
+    assert open_repo().get_by_id(library.uid).metadata == {"renamed": True}
+
+
+def test_checkpoint_compacts_files_and_skips_covered_records(open_repo, tmp_path):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.checkpoint()
+
+    repo.put_chunk(expected.uid, next(iter(expected.documents)), chunk(3))
+    expected = repo.get_by_id(expected.uid)
+    repo.close()
+
+    assert sorted(os.listdir(tmp_path)) == [
+        "indices-00000001",
+        "snapshot-00000001.json",
+        "wal-00000001.log",
+    ]
+
+    recovered = open_repo()
+    assert_same_library(recovered.get_by_id(expected.uid), expected)
+    assert recovered.stats["records_replayed"] == 1
+
+
+def test_records_already_in_snapshot_are_skipped(open_repo, tmp_path):
+    repo = open_repo()
+    expected = populate(repo)
+    covered = (tmp_path / "wal-00000000.log").read_bytes()
+    repo.checkpoint()
+    repo.close()
+
+    # Records that land in the new segment while the snapshot is taken may
+    # already be part of it; replaying them on top must be a no-op
+    (tmp_path / "wal-00000001.log").write_bytes(covered)
+
+    recovered = open_repo()
+    assert_same_library(recovered.get_by_id(expected.uid), expected)
+
+
+def test_torn_tail_is_truncated(open_repo, tmp_path):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.close()
+
+    path = tmp_path / "wal-00000000.log"
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b'{"op":"put_chunk","libr')
+
+    recovered = open_repo()
+    assert_same_library(recovered.get_by_id(expected.uid), expected)
+    assert os.path.getsize(path) == size
+
+
+def test_concurrent_writers_are_all_durable(open_repo):
+    repo = open_repo(fsync=True)
+    library = Library()
+    repo.add(library)
+    document = Document()
+    repo.put_document(library.uid, document)
+
+    def write(offset):
+        for i in range(10):
+            repo.put_chunk(library.uid, document.uid, chunk(offset + i))
+
+    threads = [threading.Thread(target=write, args=(t * 100,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = repo.wal_stats
+    repo.close()
+
+    assert stats["records_written"] == 82
+    assert stats["syncs"] <= stats["records_written"]
+    recovered = open_repo().get_by_id(library.uid)
+    assert len(recovered.documents[document.uid].chunks) == 80
+    assert recovered.version == library.version + 81
+
+
+def test_automatic_checkpoint(open_repo, tmp_path):
+    repo = open_repo(snapshot_every=5)
+    library = Library()
+    repo.add(library)
+    document = Document()
+    repo.put_document(library.uid, document)
+    for i in range(10):
+        repo.put_chunk(library.uid, document.uid, chunk(i))
+    repo.close()
+
+    assert any(name.startswith("snapshot-") for name in os.listdir(tmp_path))
+    recovered = open_repo().get_by_id(library.uid)
+    assert len(recovered.documents[document.uid].chunks) == 10
+
+
+# --- Saved indices ---
+
+
+def test_recovery_maps_saved_indices_and_replays_on_top(open_repo):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.checkpoint()
+    doc_id = next(iter(expected.documents))
+    repo.put_chunk(expected.uid, doc_id, chunk(3))
+    repo.delete_chunk(
+        expected.uid, doc_id, next(iter(expected.documents[doc_id].chunks))
+    )
+    expected = repo.get_by_id(expected.uid)
+    repo.close()
+
+    recovered = open_repo()
+    assert recovered.stats["indices_loaded"] == 1
+    assert recovered.stats["indices_rebuilt"] == 0
+    library = recovered.get_by_id(expected.uid)
+    assert_same_library(library, expected)
+    results = library.indices["flat"].search([3.0, 1.0, 0.5], k=1)
+    assert results[0][0] is library.documents[doc_id].chunks[results[0][0].uid]
+    assert results[0][0].text == "chunk 3"
+
+
+def test_indices_changed_after_checkpoint_are_rebuilt_or_dropped(open_repo):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.checkpoint()
+
+    draft = repo.get_for_update(expected.uid)
+    draft.indices.pop("flat")
+    draft.index_metadata.pop("flat")
+    repo.update(draft)
+    repo.close()
+
+    recovered = open_repo()
+    assert recovered.get_by_id(expected.uid).indices == {}
+
+    # Same name, different configuration
+    draft = recovered.get_for_update(expected.uid)
+    draft.add_index("flat", FlatIndex(metric=Metric.EUCLIDEAN))
+    draft.index_metadata["flat"] = IndexMetadata(
+        name="flat",
+        config=IndexConfig(index_type=IndexType.FLAT, metric=Metric.EUCLIDEAN),
+        vector_count=0,
+        index_type="flat",
+    )
+    recovered.update(draft)
+    recovered.close()
+
+    reopened = open_repo()
+    assert reopened.stats["indices_rebuilt"] == 1
+    index = reopened.get_by_id(expected.uid).indices["flat"]
+    assert index.metric == Metric.EUCLIDEAN
+    assert index.vector_count == 2
+
+
+def test_unreadable_saved_index_is_rebuilt(open_repo, tmp_path):
+    repo = open_repo()
+    expected = populate(repo)
+    repo.checkpoint()
+    repo.close()
+
+    index_dir = tmp_path / "indices-00000001" / str(expected.uid)
+    shutil.rmtree(index_dir)
+
+    recovered = open_repo()
+    assert recovered.stats["indices_rebuilt"] == 1
+    assert_same_library(recovered.get_by_id(expected.uid), expected)
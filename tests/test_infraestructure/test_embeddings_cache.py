@@ -0,0 +1,140 @@
+# tests/test_infraestructure/test_embeddings_cache.py
+
+import asyncio
+import pytest
+import numpy as np
+from tests.fakes import CountingEmbeddingsClient
+from src.infrastructure.embeddings.cached_client import CachedEmbeddingsClient
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def provider():
+    return CountingEmbeddingsClient()
+
+
+@pytest.fixture
+def cached(provider):
+    return CachedEmbeddingsClient(provider, model_name="fake")
+
+
+# --- Memory tier ---
+
+
+def test_only_missing_texts_reach_the_provider(cached, provider):
+    first = cached.get_embeddings(["cat", "dog"])
+    second = cached.get_embeddings(["dog", "kitten", "cat"])
+
+    assert provider.calls == [
+        (["cat", "dog"], "search_document"),
+        (["kitten"], "search_document"),
+    ]
+    assert second[0] is first[1]
+    assert second[2] is first[0]
+    assert second[1] == pytest.approx([0.15, 0.25, 0.75])
+    assert cached.stats == {"hits": 2, "disk_hits": 0, "misses": 3, "evictions": 0}
+
+
+def test_repeated_texts_in_one_call_are_fetched_once(cached, provider):
+    vectors = cached.get_embeddings(["cat", "cat", "dog"])
+
+    assert provider.calls == [(["cat", "dog"], "search_document")]
+    assert vectors[0] is vectors[1]
+
+
+def test_input_type_is_part_of_the_key(cached, provider):
+    cached.get_embeddings(["cat"], input_type="search_document")
+    cached.get_embeddings(["cat"], input_type="search_query")
+
+    assert len(provider.calls) == 2
+
+
+def test_returned_vectors_are_read_only_float32(cached):
+    vector = cached.get_embeddings(["cat"])[0]
+
+    assert vector.dtype == np.float32
+    assert not vector.flags.writeable
+
+
+def test_lru_evicts_by_size(provider):
+    entry = 3 * 4 + CachedEmbeddingsClient._ENTRY_OVERHEAD
+    cached = CachedEmbeddingsClient(provider, max_bytes=2 * entry)
+
+    cached.get_embeddings(["cat", "dog"])
+    cached.get_embeddings(["cat"])  # "dog" is now the least recently used
+    cached.get_embeddings(["puppy"])
+    cached.get_embeddings(["cat", "dog"])
+
+    assert provider.calls[-1] == (["dog"], "search_document")
+    assert cached.stats["evictions"] == 2
+
+
+def test_provider_errors_are_not_cached(cached, provider):
+    def fail(texts, input_type="search_document"):
+        raise ConnectionError("provider down")
+
+    provider.get_embeddings = fail
+    with pytest.raises(ConnectionError):
+        cached.get_embeddings(["cat"])
+
+    assert cached.stats["misses"] == 0
+
+
+def test_short_provider_answers_are_rejected_before_caching(cached, provider):
+    provider.get_embeddings = lambda texts, input_type: [[0.1, 0.2, 0.3]]
+
+    with pytest.raises(ValueError, match="1 vectors for 2 texts"):
+        cached.get_embeddings(["cat", "dog"])
+
+    assert cached.stats["misses"] == 0
+    assert not cached._entries
+
+
+# --- Disk tier ---
+
+
+def test_disk_tier_survives_a_new_client(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    first = CachedEmbeddingsClient(
+        CountingEmbeddingsClient(), model_name="fake", path=path
+    )
+    expected = first.get_embeddings(["cat", "computer"])
+    first.close()
+
+    provider = CountingEmbeddingsClient()
+    second = CachedEmbeddingsClient(provider, model_name="fake", path=path)
+    vectors = second.get_embeddings(["computer", "cat", "dog"])
+
+    assert provider.calls == [(["dog"], "search_document")]
+    assert vectors[0] == pytest.approx(expected[1])
+    assert not vectors[0].flags.writeable
+    assert second.stats["disk_hits"] == 2
+
+    # Disk hits are promoted to memory
+    second.get_embeddings(["cat"])
+    assert second.stats["hits"] == 1
+    second.close()
+
+
+def test_disk_tier_is_scoped_by_model(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    CachedEmbeddingsClient(
+        CountingEmbeddingsClient(), model_name="a", path=path
+    ).get_embeddings(["cat"])
+
+    provider = CountingEmbeddingsClient()
+    CachedEmbeddingsClient(provider, model_name="b", path=path).get_embeddings(["cat"])
+    assert provider.calls == [(["cat"], "search_document")]
+
+
+# --- Async path ---
+
+
+def test_async_lookups_share_the_cache(cached, provider):
+    cached.get_embeddings(["cat"])
+    vectors = asyncio.run(cached.aget_embeddings(["cat", "dog"]))
+
+    assert provider.calls[-1] == (["dog"], "search_document")
+    assert vectors[0] is cached.get_embeddings(["cat"])[0]
+    assert not vectors[1].flags.writeable
@@ -0,0 +1,350 @@
+# tests/test_infraestructure/test_in_memory_repo.py
+
+import threading
+import pytest
+from uuid import uuid4
+from src.core.models import Library, Document, Chunk, IndexMetadata, IndexConfig
+from src.core.indexing.flat_index import FlatIndex
+from src.core.indexing.enums import IndexType, Metric
+from src.core.exceptions import LibraryNotFound, DocumentNotFound, ChunkNotFound
+from src.infrastructure.repositories.in_memory_repo import InMemoryLibraryRepository
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def library():
+    chunks = [Chunk(text=str(i), embedding=[float(i), 1.0]) for i in range(4)]
+    first = Document(chunks={c.uid: c for c in chunks[:2]})
+    second = Document(chunks={c.uid: c for c in chunks[2:]})
+    library = Library(documents={first.uid: first, second.uid: second})
+
+    index = FlatIndex()
+    index.build(chunks)
+    library.add_index("flat", index)
+    library.index_metadata["flat"] = IndexMetadata(
+        name="flat",
+        config=IndexConfig(index_type=IndexType.FLAT, metric=Metric.COSINE),
+        vector_count=index.vector_count,
+        index_type="flat",
+    )
+    return library
+
+
+@pytest.fixture
+def cow_repo(library):
+    repo = InMemoryLibraryRepository(copy_on_write=True)
+    repo.add(library)
+    return repo
+
+
+# --- Deep-copy mode ---
+
+
+def test_default_mode_returns_independent_copies(library):
+    repo = InMemoryLibraryRepository()
+    repo.add(library)
+
+    first = repo.get_by_id(library.uid)
+    second = repo.get_by_id(library.uid)
+
+    assert first is not second
+    assert first.indices["flat"] is not second.indices["flat"]
+
+
+# --- Copy-on-write mode ---
+
+
+def test_cow_reads_share_the_snapshot(cow_repo, library):
+    assert cow_repo.get_by_id(library.uid) is cow_repo.get_by_id(library.uid)
+    assert cow_repo.list_all()[0] is cow_repo.get_by_id(library.uid)
+
+
+def test_cow_writer_shares_unchanged_parts(cow_repo, library):
+    snapshot = cow_repo.get_by_id(library.uid)
+    first_id, second_id = list(snapshot.documents)
+
+    draft = cow_repo.get_for_update(library.uid)
+    new_chunk = Chunk(text="new", embedding=[0.5, 0.5])
+    draft.writable_document(first_id).chunks[new_chunk.uid] = new_chunk
+    cow_repo.update(draft)
+
+    current = cow_repo.get_by_id(library.uid)
+    assert current.version == snapshot.version + 1
+    assert new_chunk.uid in current.documents[first_id].chunks
+    assert new_chunk.uid not in snapshot.documents[first_id].chunks
+    # Untouched document and index are the very same objects
+    assert current.documents[second_id] is snapshot.documents[second_id]
+    assert current.indices["flat"] is snapshot.indices["flat"]
+
+
+def test_cow_index_write_copies_index_but_shares_chunks(cow_repo, library):
+    snapshot = cow_repo.get_by_id(library.uid)
+    draft = cow_repo.get_for_update(library.uid)
+
+    index = draft.writable_index("flat")
+    index.insert(Chunk(text="new", embedding=[0.5, 0.5]))
+    cow_repo.update(draft)
+
+    assert index is not snapshot.indices["flat"]
+    assert snapshot.indices["flat"].vector_count == 4
+    assert cow_repo.get_by_id(library.uid).indices["flat"].vector_count == 5
+
+    stored = {c.uid: c for d in snapshot.documents.values() for c in d.chunks.values()}
+    for chunk, _ in index.search([1.0, 1.0], k=4):
+        if chunk.uid in stored:
+            assert chunk is stored[chunk.uid]
+
+
+def test_cow_stale_draft_is_rejected(cow_repo, library):
+    first = cow_repo.get_for_update(library.uid)
+    second = cow_repo.get_for_update(library.uid)
+    cow_repo.update(first)
+
+    with pytest.raises(ValueError, match="Conflict"):
+        cow_repo.update(second)
+
+
+def test_cow_published_draft_is_frozen(cow_repo, library):
+    draft = cow_repo.get_for_update(library.uid)
+    draft.writable_index("flat")
+    cow_repo.update(draft)
+
+    # A writer reusing the published object must copy again
+    published = cow_repo.get_by_id(library.uid)
+    published_index = published.indices["flat"]
+    assert draft.writable_index("flat") is not published_index
+
+
+# --- Lock striping ---
+
+
+def run_in_thread(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_writer_on_one_library_does_not_block_another(library):
+    repo = InMemoryLibraryRepository()
+    other = Library()
+    repo.add(library)
+    repo.add(other)
+
+    with repo._library_lock(library.uid).write_lock():
+        reader = run_in_thread(lambda: repo.get_by_id(other.uid))
+        reader.join(timeout=2)
+        assert not reader.is_alive()
+
+
+def test_writer_blocks_readers_of_the_same_library(library):
+    repo = InMemoryLibraryRepository()
+    repo.add(library)
+    done = threading.Event()
+
+    def read():
+        repo.get_by_id(library.uid)
+        done.set()
+
+    with repo._library_lock(library.uid).write_lock():
+        reader = run_in_thread(read)
+        assert not done.wait(timeout=0.2)
+
+    reader.join(timeout=2)
+    assert done.is_set()
+
+
+def test_library_locks_are_created_lazily_and_dropped_on_delete(library):
+    repo = InMemoryLibraryRepository()
+    repo.add(library)
+    assert library.uid not in repo._library_locks
+
+    repo.get_by_id(library.uid)
+    assert library.uid in repo._library_locks
+
+    repo.delete(library.uid)
+    assert library.uid not in repo._library_locks
+    assert repo.list_all() == []
+
+
+# --- Targeted writes ---
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_put_chunk_indexes_chunk_and_bumps_version(library, copy_on_write):
+    repo = InMemoryLibraryRepository(copy_on_write=copy_on_write)
+    repo.add(library)
+    doc_id = next(iter(library.documents))
+    chunk = Chunk(text="new", embedding=[0.5, 0.5])
+
+    repo.put_chunk(library.uid, doc_id, chunk)
+
+    stored = repo.get_by_id(library.uid)
+    assert stored.version == library.version + 1
+    assert chunk.uid in stored.documents[doc_id].chunks
+    assert stored.indices["flat"].vector_count == 5
+    assert stored.index_metadata["flat"].vector_count == 5
+
+
+def test_cow_put_chunk_updates_index_in_place_and_shares_documents(cow_repo, library):
+    snapshot = cow_repo.get_by_id(library.uid)
+    first_id, second_id = list(snapshot.documents)
+
+    cow_repo.put_chunk(library.uid, first_id, Chunk(text="n", embedding=[0.5, 0.5]))
+
+    current = cow_repo.get_by_id(library.uid)
+    assert current is not snapshot
+    assert current.indices["flat"] is snapshot.indices["flat"]
+    assert current.documents[second_id] is snapshot.documents[second_id]
+    assert len(snapshot.documents[first_id].chunks) == 2
+    assert snapshot.index_metadata["flat"].vector_count == 4
+
+
+def test_metadata_only_chunk_update_skips_reindexing(cow_repo, library):
+    doc_id, document = next(iter(library.documents.items()))
+    chunk = next(iter(document.chunks.values()))
+    stored_chunk = cow_repo.get_by_id(library.uid).documents[doc_id].chunks[chunk.uid]
+    index = cow_repo.get_by_id(library.uid).indices["flat"]
+    row = index._uid_to_row[chunk.uid]
+
+    cow_repo.put_chunk(
+        library.uid, doc_id, stored_chunk.model_copy(update={"metadata": {"a": 1}})
+    )
+
+    assert index._row_chunks[row] is stored_chunk
+
+
+def test_delete_chunk_and_document_remove_index_entries(cow_repo, library):
+    first_id, second_id = list(library.documents)
+    chunk_id = next(iter(library.documents[first_id].chunks))
+
+    cow_repo.delete_chunk(library.uid, first_id, chunk_id)
+    cow_repo.delete_document(library.uid, second_id)
+
+    stored = cow_repo.get_by_id(library.uid)
+    assert stored.version == library.version + 2
+    assert list(stored.documents) == [first_id]
+    assert stored.indices["flat"].vector_count == 1
+
+
+def test_targeted_writes_validate_targets(cow_repo, library):
+    doc_id = next(iter(library.documents))
+
+    with pytest.raises(DocumentNotFound):
+        cow_repo.put_chunk(library.uid, uuid4(), Chunk(text="x"))
+    with pytest.raises(ChunkNotFound):
+        cow_repo.delete_chunk(library.uid, doc_id, uuid4())
+    with pytest.raises(LibraryNotFound):
+        cow_repo.delete_document(uuid4(), doc_id)
+
+    assert cow_repo.get_by_id(library.uid).version == library.version
+
+
+def test_put_document_indexes_only_changed_chunks(cow_repo, library):
+    doc_id, document = next(iter(library.documents.items()))
+    kept, dropped = list(document.chunks.values())
+    added = Chunk(text="added", embedding=[0.2, 0.9])
+    replacement = document.model_copy(
+        update={"chunks": {kept.uid: kept, added.uid: added}}
+    )
+
+    cow_repo.put_document(library.uid, replacement)
+
+    index = cow_repo.get_by_id(library.uid).indices["flat"]
+    assert index.vector_count == 4
+    assert dropped.uid not in index._uid_to_row
+    assert added.uid in index._uid_to_row
+
+
+def test_update_reindexes_directly_changed_documents():
+    repo = InMemoryLibraryRepository(copy_on_write=True)
+    library = Library()
+    repo.add(library)
+
+    draft = repo.get_for_update(library.uid)
+    chunk = Chunk(text="added directly")
+    document = Document(chunks={chunk.uid: chunk})
+    draft.documents[document.uid] = document
+    repo.update(draft)
+
+    with repo.snapshot(library.uid) as stored:
+        assert stored.find_document(chunk.uid).uid == document.uid
+        assert [c.uid for c, _ in stored.text_search("directly", 1)] == [chunk.uid]
+
+
+def test_cow_update_reindexes_only_changed_documents(cow_repo, library):
+    first, second = library.documents
+    with cow_repo.snapshot(library.uid) as stored:
+        text_index = stored._text_index
+
+    draft = cow_repo.get_for_update(library.uid)
+    draft.metadata = {"owner": "search"}
+    cow_repo.update(draft)
+
+    with cow_repo.snapshot(library.uid) as stored:
+        # Nothing to re-index: the new version still shares the text index
+        assert stored._text_index is text_index
+
+    draft = cow_repo.get_for_update(library.uid)
+    chunk = Chunk(text="replacement")
+    draft.documents[first] = Document(uid=first, chunks={chunk.uid: chunk})
+    del draft.documents[second]
+    cow_repo.update(draft)
+
+    with cow_repo.snapshot(library.uid) as stored:
+        assert len(stored._text_index) == 1
+        assert stored._chunk_documents == {chunk.uid: first}
+        assert [c.uid for c, _ in stored.text_search("replacement", 5)] == [chunk.uid]
+    # The previous version keeps its own index
+    assert len(text_index) == 4
+
+
+# --- Pagination ---
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_library_pages_are_ordered_by_id(copy_on_write):
+    repo = InMemoryLibraryRepository(copy_on_write=copy_on_write)
+    ids = sorted(uuid4() for _ in range(5))
+    for uid in reversed(ids):
+        repo.add(Library(uid=uid))
+
+    assert [lib.uid for lib in repo.list_page(limit=2)] == ids[:2]
+    assert [lib.uid for lib in repo.list_page(limit=2, after=ids[1])] == ids[2:4]
+
+    repo.delete(ids[2])
+    assert [lib.uid for lib in repo.list_page(after=ids[1])] == ids[3:]
+
+
+def test_document_and_chunk_pages_copy_only_the_page(library):
+    repo = InMemoryLibraryRepository()
+    repo.add(library)
+    doc_ids = sorted(library.documents)
+
+    page = repo.list_documents(library.uid, limit=1)
+    assert [doc.uid for doc in page] == doc_ids[:1]
+    # Deep-copy mode hands out copies, never the stored documents
+    page[0].metadata["changed"] = True
+    assert "changed" not in repo.list_documents(library.uid, limit=1)[0].metadata
+
+    chunk_ids = sorted(library.documents[doc_ids[1]].chunks)
+    chunks = repo.list_chunks(library.uid, doc_ids[1], after=chunk_ids[0])
+    assert [chunk.uid for chunk in chunks] == chunk_ids[1:]
+
+    with pytest.raises(DocumentNotFound):
+        repo.list_chunks(library.uid, uuid4())
+
+
+def test_cow_pages_share_the_snapshot(cow_repo, library):
+    doc_id = min(library.documents)
+    snapshot = cow_repo.get_by_id(library.uid)
+
+    assert cow_repo.list_page()[0] is snapshot
+    assert (
+        cow_repo.list_documents(library.uid, limit=1)[0] is snapshot.documents[doc_id]
+    )
+
+    # Targeted writes are visible in the next page
+    chunk = Chunk(text="new", embedding=[0.5, 0.5])
+    cow_repo.put_chunk(library.uid, doc_id, chunk)
+    assert chunk.uid in [c.uid for c in cow_repo.list_chunks(library.uid, doc_id)]
@@ -1,5 +1,6 @@
 # tests/test_services/test_chunk_services.py
 import pytest
+from contextlib import nullcontext
 from uuid import uuid4, UUID
 from unittest.mock import Mock
 
@@ -17,7 +18,28 @@ from ..fakes import FakeLibrary, FakeDocument, FakeChunk, FakeSchema
 # -------------------------
 @pytest.fixture
 def repo_mock():
-    return Mock(spec=["add", "get_by_id", "update", "delete", "list_all"])
+    repo = Mock(
+        spec=[
+            "add",
+            "get_by_id",
+            "get_for_update",
+            "snapshot",
+            "update",
+            "delete",
+            "list_all",
+            "list_page",
+            "list_documents",
+            "list_chunks",
+            "put_document",
+            "delete_document",
+            "put_chunk",
+            "delete_chunk",
+        ]
+    )
+    # Tests configure a single library for every read path
+    repo.get_for_update = repo.get_by_id
+    repo.snapshot = lambda library_id: nullcontext(repo.get_by_id(library_id))
+    return repo
 
 
 @pytest.fixture
@@ -64,8 +86,8 @@ def test_create_chunk_adds_chunk_and_updates_repo(repo_mock, embeddings_client_m
 
     # --- ASSERTIONS ---
     assert created.uid == chunk_uid
-    assert chunk_uid in fake_doc.chunks
-    repo_mock.update.assert_called_once_with(fake_lib)
+    repo_mock.put_chunk.assert_called_once_with(lib_id, doc_id, created)
+    repo_mock.update.assert_not_called()
 
 
 def test_create_chunk_missing_document_raises(repo_mock, embeddings_client_mock):
@@ -78,6 +100,7 @@ def test_create_chunk_missing_document_raises(repo_mock, embeddings_client_mock)
 
     with pytest.raises(core_exceptions.DocumentNotFound):
         svc.create_chunk(lib_id, uuid4(), FakeSchema({"uid": uuid4()}))
+    embeddings_client_mock.get_embeddings.assert_not_called()
 
 
 def test_get_chunk_returns_chunk(repo_mock, embeddings_client_mock):
@@ -128,11 +151,13 @@ def test_list_chunks_returns_list(repo_mock, embeddings_client_mock):
     doc_id = uuid4()
     c1 = FakeChunk(uid=uuid4())
     c2 = FakeChunk(uid=uuid4())
-    doc = FakeDocument(uid=doc_id, chunks={c1.uid: c1, c2.uid: c2})
-    lib = FakeLibrary(uid=lib_id, documents={doc_id: doc})
-    repo_mock.get_by_id.return_value = lib
+    repo_mock.list_chunks.return_value = [c1, c2]
     out = svc.list_chunks(lib_id, doc_id)
     assert set(out) == {c1, c2}
+    repo_mock.list_chunks.assert_called_once_with(lib_id, doc_id, None, None)
+
+    svc.list_chunks(lib_id, doc_id, limit=1, after=c1.uid)
+    repo_mock.list_chunks.assert_called_with(lib_id, doc_id, 1, c1.uid)
 
 
 def test_update_chunk_merges_and_updates(repo_mock, embeddings_client_mock):
@@ -150,10 +175,10 @@ def test_update_chunk_merges_and_updates(repo_mock, embeddings_client_mock):
     update_schema = FakeSchema({"text": "new"})
     updated = svc.update_chunk(lib_id, doc_id, chunk_id, update_schema)
 
-    repo_mock.update.assert_called_once_with(lib)
+    repo_mock.put_chunk.assert_called_once_with(lib_id, doc_id, updated)
     assert isinstance(updated, FakeChunk)
     assert updated.text == "new"
-    assert lib.documents[doc_id].chunks[chunk_id] is updated
+    assert updated.uid == chunk_id
 
 
 def test_update_chunk_missing_document_raises(repo_mock, embeddings_client_mock):
@@ -193,8 +218,7 @@ def test_delete_chunk_removes_and_updates(repo_mock, embeddings_client_mock):
     repo_mock.get_by_id.return_value = lib
 
     svc.delete_chunk(lib_id, doc_id, chunk_id)
-    assert chunk_id not in lib.documents[doc_id].chunks
-    repo_mock.update.assert_called_once_with(lib)
+    repo_mock.delete_chunk.assert_called_once_with(lib_id, doc_id, chunk_id)
 
 
 def test_delete_chunk_missing_document_raises(repo_mock, embeddings_client_mock):
@@ -1,5 +1,6 @@
 # tests/test_services/test_document_services.py
 import pytest
+from contextlib import nullcontext
 from uuid import uuid4, UUID
 from unittest.mock import Mock
 
@@ -8,6 +9,7 @@ from src.services import library_service, document_service, chunk_service
 
 # Import exceptions (these are referenced by the services)
 from src.core import exceptions as core_exceptions
+from src.infrastructure.embeddings.dedup import DeduplicatingEmbeddingsClient
 
 from ..fakes import FakeLibrary, FakeDocument, FakeChunk, FakeSchema
 
@@ -17,7 +19,28 @@ from ..fakes import FakeLibrary, FakeDocument, FakeChunk, FakeSchema
 # -------------------------
 @pytest.fixture
 def repo_mock():
-    return Mock(spec=["add", "get_by_id", "update", "delete", "list_all"])
+    repo = Mock(
+        spec=[
+            "add",
+            "get_by_id",
+            "get_for_update",
+            "snapshot",
+            "update",
+            "delete",
+            "list_all",
+            "list_page",
+            "list_documents",
+            "list_chunks",
+            "put_document",
+            "delete_document",
+            "put_chunk",
+            "delete_chunk",
+        ]
+    )
+    # Tests configure a single library for every read path
+    repo.get_for_update = repo.get_by_id
+    repo.snapshot = lambda library_id: nullcontext(repo.get_by_id(library_id))
+    return repo
 
 
 @pytest.fixture
@@ -66,7 +89,7 @@ def test_create_document_adds_document_and_chunks(repo_mock, embeddings_client_m
 
     # library should have the new document (either in lib.documents or created returned)
     assert created.uid == doc_uid
-    repo_mock.update.assert_called_once_with(lib)
+    repo_mock.put_document.assert_called_once_with(lib_id, created)
     assert isinstance(created, FakeDocument)
 
 
@@ -103,11 +126,14 @@ def test_list_documents_returns_all(repo_mock, embeddings_client_mock):
     lib_id = uuid4()
     doc1 = FakeDocument(uid=uuid4())
     doc2 = FakeDocument(uid=uuid4())
-    lib = FakeLibrary(uid=lib_id, documents={doc1.uid: doc1, doc2.uid: doc2})
-    repo_mock.get_by_id.return_value = lib
+    repo_mock.list_documents.return_value = [doc1, doc2]
 
     out = svc.list_documents(lib_id)
     assert set(out) == {doc1, doc2}
+    repo_mock.list_documents.assert_called_once_with(lib_id, None, None)
+
+    svc.list_documents(lib_id, limit=1, after=doc1.uid)
+    repo_mock.list_documents.assert_called_with(lib_id, 1, doc1.uid)
 
 
 def test_update_document_merges_and_updates(repo_mock, embeddings_client_mock):
@@ -123,10 +149,10 @@ def test_update_document_merges_and_updates(repo_mock, embeddings_client_mock):
     update_schema = FakeSchema({"title": "new"})
     updated = svc.update_document(lib_id, doc_id, update_schema)
 
-    repo_mock.update.assert_called_once_with(lib)
+    repo_mock.put_document.assert_called_once_with(lib_id, updated)
     assert isinstance(updated, FakeDocument)
     assert updated.title == "new"
-    assert lib.documents[doc_id] is updated
+    assert updated.uid == doc_id
 
 
 def test_delete_document_deletes_and_updates_repo(repo_mock, embeddings_client_mock):
@@ -140,8 +166,7 @@ def test_delete_document_deletes_and_updates_repo(repo_mock, embeddings_client_m
     repo_mock.get_by_id.return_value = lib
 
     svc.delete_document(lib_id, doc_id)
-    assert doc_id not in lib.documents
-    repo_mock.update.assert_called_once_with(lib)
+    repo_mock.delete_document.assert_called_once_with(lib_id, doc_id)
 
 
 def test_delete_document_missing_raises(repo_mock, embeddings_client_mock):
@@ -202,10 +227,43 @@ def test_create_document_generates_embeddings_for_nested_chunks(
     chunks_list.sort(key=lambda c: c.text)
 
     assert chunks_list[0].text == "chunk A"
-    assert chunks_list[0].embedding == [0.1, 0.1]
+    assert chunks_list[0].embedding == pytest.approx([0.1, 0.1])
 
     assert chunks_list[1].text == "chunk B"
-    assert chunks_list[1].embedding == [0.2, 0.2]
+    assert chunks_list[1].embedding == pytest.approx([0.2, 0.2])
+
+
+def test_create_document_embeds_identical_chunks_once(
+    repo_mock, embeddings_client_mock
+):
+    client = DeduplicatingEmbeddingsClient(embeddings_client_mock)
+    svc = document_service.DocumentService(
+        repository=repo_mock, embeddings_client=client
+    )
+    repo_mock.get_by_id.return_value = FakeLibrary(uid=uuid4(), documents={})
+    embeddings_client_mock.get_embeddings.return_value = [[0.1, 0.1], [0.2, 0.2]]
+
+    doc_schema = FakeSchema(
+        {
+            "chunks": [
+                FakeSchema({"text": "footer"}),
+                FakeSchema({"text": "body"}),
+                FakeSchema({"text": "footer"}),
+            ]
+        }
+    )
+    created_doc = svc.create_document(uuid4(), doc_schema)
+
+    embeddings_client_mock.get_embeddings.assert_called_once_with(
+        ["footer", "body"], input_type="search_document"
+    )
+    assert client.stats == {"texts": 3, "unique_texts": 2}
+    assert client.dedup_ratio() == pytest.approx(1 / 3)
+    footers = [c for c in created_doc.chunks.values() if c.text == "footer"]
+    assert len(footers) == 2
+    # Both chunks keep the same stored vector
+    assert footers[0].embedding is footers[1].embedding
+    assert footers[0].embedding == pytest.approx([0.1, 0.1])
 
 
 def test_create_document_updates_indices_for_nested_chunks(
@@ -214,30 +272,29 @@ def test_create_document_updates_indices_for_nested_chunks(
     """
     Verify that creating a document also updates the library's indices.
     """
-    svc = document_service.DocumentService(
-        repository=repo_mock, embeddings_client=embeddings_client_mock
-    )
-    lib_id = uuid4()
-
-    # Setup a library with an AVL index
-    # We use a real AvlIndex here to verify the insertion logic
+    # A real repository applies the targeted write to the library's indices
+    from src.core.models import Library
     from src.core.indexing.avl_index import AvlIndex
+    from src.infrastructure.repositories.in_memory_repo import (
+        InMemoryLibraryRepository,
+    )
 
     avl_index = AvlIndex()
-    fake_lib = FakeLibrary(
-        uid=lib_id,
-        documents={},
-        indices={"my-avl": avl_index},
-        index_metadata={"my-avl": Mock(vector_count=0)},  # Mock metadata
+    library = Library()
+    library.add_index("my-avl", avl_index)
+    repository = InMemoryLibraryRepository(copy_on_write=True)
+    repository.add(library)
+
+    svc = document_service.DocumentService(
+        repository=repository, embeddings_client=embeddings_client_mock
     )
-    repo_mock.get_by_id.return_value = fake_lib
     embeddings_client_mock.get_embeddings.return_value = [[0.1], [0.2]]
 
     doc_schema = FakeSchema(
         {"chunks": [FakeSchema({"text": "A"}), FakeSchema({"text": "B"})]}
     )
 
-    svc.create_document(lib_id, doc_schema)
+    svc.create_document(library.uid, doc_schema)
 
     # Verify the index actually received the vectors
-    assert avl_index.vector_count == 2
+    assert repository.get_by_id(library.uid).indices["my-avl"].vector_count == 2
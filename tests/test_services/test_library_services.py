@@ -1,5 +1,6 @@
 # tests/test_services/test_library_services.py
 import pytest
+from contextlib import nullcontext
 from uuid import uuid4
 from unittest.mock import Mock
 
@@ -15,7 +16,28 @@ from ..fakes import FakeLibrary, FakeDocument, FakeChunk, FakeSchema
 # -------------------------
 @pytest.fixture
 def repo_mock():
-    return Mock(spec=["add", "get_by_id", "update", "delete", "list_all"])
+    repo = Mock(
+        spec=[
+            "add",
+            "get_by_id",
+            "get_for_update",
+            "snapshot",
+            "update",
+            "delete",
+            "list_all",
+            "list_page",
+            "list_documents",
+            "list_chunks",
+            "put_document",
+            "delete_document",
+            "put_chunk",
+            "delete_chunk",
+        ]
+    )
+    # Tests configure a single library for every read path
+    repo.get_for_update = repo.get_by_id
+    repo.snapshot = lambda library_id: nullcontext(repo.get_by_id(library_id))
+    return repo
 
 
 @pytest.fixture
@@ -87,8 +109,12 @@ def test_delete_library_delegates_to_repo(repo_mock):
     repo_mock.delete.assert_called_once_with(lib_id)
 
 
-def test_list_libraries_returns_repo_list_all(repo_mock):
+def test_list_libraries_returns_repo_page(repo_mock):
     svc = library_service.LibraryService(repository=repo_mock)
-    repo_mock.list_all.return_value = ["a", "b"]
+    repo_mock.list_page.return_value = ["a", "b"]
     assert svc.list_libraries() == ["a", "b"]
-    repo_mock.list_all.assert_called_once()
+    repo_mock.list_page.assert_called_once_with(None, None)
+
+    after = uuid4()
+    svc.list_libraries(limit=2, after=after)
+    repo_mock.list_page.assert_called_with(2, after)
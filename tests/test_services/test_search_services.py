@@ -1,13 +1,18 @@
 # tests/test_services/test_search_service.py
 
+import asyncio
+import threading
 import pytest
-from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, Mock, patch
 from uuid import uuid4
 
 from src.services.search_service import SearchService
 from src.core.exceptions import IndexNotFound, IndexNotReady, VectorDimensionMismatch
-from src.api.schemas import IndexCreate
+from src.api.schemas import HybridSearch, IndexCreate, SearchQuery
 from src.core.indexing.index_factory import IndexType, Metric
+from src.infrastructure.embeddings.dedup import DeduplicatingEmbeddingsClient
 from fastapi import status
 
 from ..fakes import (
@@ -19,7 +24,6 @@ from ..fakes import (
     FakeIndexMetadata,
 )
 
-
 # ============================================================================
 # Fixtures
 # ============================================================================
@@ -34,7 +38,11 @@ def patch_models(monkeypatch):
 
 @pytest.fixture
 def mock_repo():
-    return Mock()
+    repo = Mock()
+    # Tests configure a single library for every read path
+    repo.get_for_update = repo.get_by_id
+    repo.snapshot = lambda library_id: nullcontext(repo.get_by_id(library_id))
+    return repo
 
 
 @pytest.fixture
@@ -261,3 +269,335 @@ def test_search_chunks_fails_gracefully_with_wrong_vector_dimension(
     error_msg = str(exc_info.value)
     assert "Vector dimension mismatch" in error_msg
     assert "shapes (3,) and (2,) not aligned" in error_msg
+
+
+def test_search_chunks_forwards_ef_search_to_index(search_service, mock_repo):
+    lib_id = uuid4()
+    mock_index = Mock()
+    mock_index.search.return_value = []
+
+    library = FakeLibrary(uid=lib_id, indices={"idx": mock_index})
+    mock_repo.get_by_id.return_value = library
+
+    search_service.search_chunks(
+        lib_id, "idx", k=3, query_embedding=[0.1, 0.2], ef_search=128
+    )
+
+    mock_index.search.assert_called_once_with([0.1, 0.2], 3, ef_search=128)
+
+
+def test_search_chunks_forwards_nprobe_to_index(search_service, mock_repo):
+    lib_id = uuid4()
+    mock_index = Mock()
+    mock_index.search.return_value = []
+
+    library = FakeLibrary(uid=lib_id, indices={"idx": mock_index})
+    mock_repo.get_by_id.return_value = library
+
+    search_service.search_chunks(lib_id, "idx", k=3, query_embedding=[0.1], nprobe=4)
+
+    mock_index.search.assert_called_once_with([0.1], 3, nprobe=4)
+
+
+def test_search_chunks_forwards_num_probes_to_index(search_service, mock_repo):
+    lib_id = uuid4()
+    mock_index = Mock()
+    mock_index.search.return_value = []
+
+    library = FakeLibrary(uid=lib_id, indices={"idx": mock_index})
+    mock_repo.get_by_id.return_value = library
+
+    search_service.search_chunks(
+        lib_id, "idx", k=3, query_embedding=[0.1], num_probes=8
+    )
+
+    mock_index.search.assert_called_once_with([0.1], 3, num_probes=8)
+
+
+def test_search_chunks_batch_fetches_library_once_and_embeds_texts_once(
+    search_service, mock_repo, mock_embeddings_client
+):
+    lib_id = uuid4()
+    chunk = FakeChunk(text="result", embedding=[0.1, 0.2])
+    doc = FakeDocument(chunks={chunk.uid: chunk})
+
+    mock_index = Mock()
+    mock_index.search_batch.return_value = [[(chunk, 0.9)]] * 3
+
+    library = FakeLibrary(
+        uid=lib_id, documents={doc.uid: doc}, indices={"idx": mock_index}
+    )
+    mock_repo.get_by_id.return_value = library
+    mock_embeddings_client.get_embeddings.return_value = [[0.3, 0.4], [0.5, 0.6]]
+
+    queries = [
+        SearchQuery(query_text="first", k=1),
+        SearchQuery(query_embedding=[0.1, 0.2], k=1),
+        SearchQuery(query_text="second", k=1),
+    ]
+    results = search_service.search_chunks_batch(lib_id, "idx", queries)
+
+    mock_repo.get_by_id.assert_called_once_with(lib_id)
+    mock_embeddings_client.get_embeddings.assert_called_once_with(
+        texts=["first", "second"], input_type="search_query"
+    )
+    mock_index.search_batch.assert_called_once_with(
+        [[0.3, 0.4], [0.1, 0.2], [0.5, 0.6]], 1
+    )
+    assert [len(r) for r in results] == [1, 1, 1]
+    assert results[0][0].chunk.id == chunk.uid
+
+
+def test_search_chunks_batch_embeds_repeated_texts_once(mock_repo):
+    lib_id = uuid4()
+    mock_index = Mock()
+    mock_index.search_batch.side_effect = lambda vectors, k, **params: [
+        [] for _ in vectors
+    ]
+    mock_repo.get_by_id.return_value = FakeLibrary(
+        uid=lib_id, indices={"idx": mock_index}
+    )
+    provider = Mock(spec=["get_embeddings"])
+    provider.get_embeddings.return_value = [[0.3, 0.4], [0.5, 0.6]]
+    client = DeduplicatingEmbeddingsClient(provider)
+    service = SearchService(repository=mock_repo, embeddings_client=client)
+
+    queries = [
+        SearchQuery(query_text="refund", k=1),
+        SearchQuery(query_text="invoice", k=1),
+        SearchQuery(query_text="refund", k=1),
+    ]
+    service.search_chunks_batch(lib_id, "idx", queries)
+
+    provider.get_embeddings.assert_called_once_with(
+        ["refund", "invoice"], input_type="search_query"
+    )
+    mock_index.search_batch.assert_called_once_with(
+        [[0.3, 0.4], [0.5, 0.6], [0.3, 0.4]], 1
+    )
+    assert client.stats == {"texts": 3, "unique_texts": 2}
+
+
+def test_search_chunks_batch_groups_queries_by_k_and_keeps_order(
+    search_service, mock_repo
+):
+    lib_id = uuid4()
+    mock_index = Mock()
+    mock_index.search_batch.side_effect = lambda vectors, k, **params: [
+        [] for _ in vectors
+    ]
+
+    library = FakeLibrary(uid=lib_id, indices={"idx": mock_index})
+    mock_repo.get_by_id.return_value = library
+
+    queries = [
+        SearchQuery(query_embedding=[0.1], k=1),
+        SearchQuery(query_embedding=[0.2], k=5, nprobe=2),
+        SearchQuery(query_embedding=[0.3], k=1),
+    ]
+    results = search_service.search_chunks_batch(lib_id, "idx", queries)
+
+    assert len(results) == 3
+    assert mock_index.search_batch.call_count == 2
+    mock_index.search_batch.assert_any_call([[0.1], [0.3]], 1)
+    mock_index.search_batch.assert_any_call([[0.2]], 5, nprobe=2)
+
+
+def test_search_chunks_batch_raises_dimension_mismatch(search_service, mock_repo):
+    lib_id = uuid4()
+    mock_index = Mock()
+    mock_index.search_batch.side_effect = ValueError("shapes not aligned")
+
+    library = FakeLibrary(uid=lib_id, indices={"idx": mock_index})
+    mock_repo.get_by_id.return_value = library
+
+    with pytest.raises(VectorDimensionMismatch):
+        search_service.search_chunks_batch(
+            lib_id, "idx", [SearchQuery(query_embedding=[0.1], k=1)]
+        )
+
+
+# ============================================================================
+# Async Path
+# ============================================================================
+
+
+def test_asearch_chunks_awaits_embeddings_and_searches_on_executor(
+    mock_repo, mock_embeddings_client
+):
+    lib_id = uuid4()
+    chunk = FakeChunk()
+    doc = FakeDocument(chunks={chunk.uid: chunk})
+
+    search_threads = []
+    mock_index = Mock()
+    mock_index.search.side_effect = lambda *args: (
+        search_threads.append(threading.current_thread().name) or [(chunk, 0.9)]
+    )
+    mock_repo.get_by_id.return_value = FakeLibrary(
+        uid=lib_id, documents={doc.uid: doc}, indices={"idx": mock_index}
+    )
+    mock_embeddings_client.aget_embeddings = AsyncMock(return_value=[[0.9, 0.9]])
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="search") as executor:
+        service = SearchService(
+            repository=mock_repo,
+            embeddings_client=mock_embeddings_client,
+            executor=executor,
+        )
+        results = asyncio.run(
+            service.asearch_chunks(lib_id, "idx", k=1, query_text="search for me")
+        )
+
+    mock_embeddings_client.aget_embeddings.assert_awaited_once_with(
+        texts=["search for me"], input_type="search_query"
+    )
+    mock_embeddings_client.get_embeddings.assert_not_called()
+    mock_index.search.assert_called_once_with([0.9, 0.9], 1)
+    assert search_threads[0].startswith("search")
+    assert results[0].chunk.id == chunk.uid
+
+
+def test_asearch_hybrid_runs_the_text_leg_while_embedding(
+    mock_repo, mock_embeddings_client
+):
+    lib_id = uuid4()
+    semantic, keyword = FakeChunk(text="semantic"), FakeChunk(text="ERR-1042")
+    doc = FakeDocument(chunks={semantic.uid: semantic, keyword.uid: keyword})
+
+    text_leg_ran = threading.Event()
+
+    def text_search(query, k, metadata_filter=None):
+        text_leg_ran.set()
+        return [(keyword, 7.5)]
+
+    async def aget_embeddings(texts, input_type):
+        # Only returns once the BM25 leg has run, so a sequential search would time out
+        assert await asyncio.to_thread(text_leg_ran.wait, 5)
+        return [[0.9, 0.9]]
+
+    mock_index = Mock()
+    mock_index.search.return_value = [(semantic, 0.9)]
+    mock_repo.get_by_id.return_value = FakeLibrary(
+        uid=lib_id,
+        documents={doc.uid: doc},
+        indices={"idx": mock_index},
+        text_search=text_search,
+    )
+    mock_embeddings_client.aget_embeddings = aget_embeddings
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        service = SearchService(
+            repository=mock_repo,
+            embeddings_client=mock_embeddings_client,
+            executor=executor,
+        )
+        results = asyncio.run(
+            service.asearch_chunks(
+                lib_id,
+                "idx",
+                k=2,
+                query_text="ERR-1042",
+                hybrid=HybridSearch(vector_weight=0.4),
+            )
+        )
+
+    mock_index.search.assert_called_once_with([0.9, 0.9], 50)
+    # Both rank first in their leg; the text leg weighs more
+    assert [r.chunk.id for r in results] == [keyword.uid, semantic.uid]
+
+
+def hybrid_library(lib_id, text_leg_ran):
+    """A library whose BM25 and vector legs each rank a different chunk first."""
+    semantic, keyword = FakeChunk(text="semantic"), FakeChunk(text="ERR-1042")
+    doc = FakeDocument(chunks={semantic.uid: semantic, keyword.uid: keyword})
+
+    def text_search(query, k, metadata_filter=None):
+        text_leg_ran.set()
+        return [(keyword, 7.5)]
+
+    mock_index = Mock()
+    mock_index.metric = Metric.COSINE
+    mock_index.search.return_value = [(semantic, 0.9)]
+    mock_index.search_batch.return_value = [[(semantic, 0.9)]]
+    library = FakeLibrary(
+        uid=lib_id,
+        documents={doc.uid: doc},
+        indices={"idx": mock_index},
+        text_search=text_search,
+    )
+    return library, semantic, keyword
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_sync_hybrid_runs_the_text_leg_while_embedding(
+    mock_repo, mock_embeddings_client, batch
+):
+    lib_id = uuid4()
+    text_leg_ran = threading.Event()
+    library, semantic, keyword = hybrid_library(lib_id, text_leg_ran)
+    mock_repo.get_by_id.return_value = library
+
+    def get_embeddings(texts, input_type):
+        # Only returns once the BM25 leg has run, so a sequential search would fail
+        assert text_leg_ran.wait(5)
+        return [[0.9, 0.9]] * len(texts)
+
+    mock_embeddings_client.get_embeddings.side_effect = get_embeddings
+    hybrid = HybridSearch(vector_weight=0.4)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service = SearchService(
+            repository=mock_repo,
+            embeddings_client=mock_embeddings_client,
+            executor=executor,
+        )
+        if batch:
+            queries = [
+                SearchQuery(query_text="ERR-1042", k=2, hybrid=hybrid),
+                SearchQuery(query_embedding=[0.1, 0.2], k=1),
+            ]
+            results, plain = service.search_chunks_batch(lib_id, "idx", queries)
+            assert [r.chunk.id for r in plain] == [semantic.uid]
+        else:
+            results = service.search_chunks(
+                lib_id, "idx", k=2, query_text="ERR-1042", hybrid=hybrid
+            )
+
+    assert [r.chunk.id for r in results] == [keyword.uid, semantic.uid]
+
+
+def test_hybrid_search_requires_query_text(search_service):
+    with pytest.raises(ValueError, match="query_text"):
+        search_service.search_chunks(
+            uuid4(), "idx", k=1, query_embedding=[0.1], hybrid=HybridSearch()
+        )
+
+
+def test_asearch_chunks_batch_matches_sync_results(mock_repo, mock_embeddings_client):
+    lib_id = uuid4()
+    chunk = FakeChunk(text="result", embedding=[0.1, 0.2])
+    doc = FakeDocument(chunks={chunk.uid: chunk})
+
+    mock_index = Mock()
+    mock_index.search_batch.return_value = [[(chunk, 0.9)]] * 2
+    mock_repo.get_by_id.return_value = FakeLibrary(
+        uid=lib_id, documents={doc.uid: doc}, indices={"idx": mock_index}
+    )
+    mock_embeddings_client.aget_embeddings = AsyncMock(return_value=[[0.3, 0.4]])
+    search_service = SearchService(
+        repository=mock_repo,
+        embeddings_client=DeduplicatingEmbeddingsClient(mock_embeddings_client),
+    )
+
+    queries = [
+        SearchQuery(query_text="same", k=1),
+        SearchQuery(query_text="same", k=1),
+    ]
+    results = asyncio.run(search_service.asearch_chunks_batch(lib_id, "idx", queries))
+
+    mock_embeddings_client.aget_embeddings.assert_awaited_once_with(
+        ["same"], input_type="search_query"
+    )
+    mock_index.search_batch.assert_called_once_with([[0.3, 0.4], [0.3, 0.4]], 1)
+    assert [len(r) for r in results] == [1, 1]